@@ -1,28 +1,20 @@
 import express from 'express';
+import path from 'path';
+import { Worker } from 'worker_threads';
 import routes from './server/routes';
 import cors from 'cors';
-import { Importer } from './data/importer';
 import { Generator } from './data/generator';
+import { Preprocessor } from './data/preprocessor';
+import { Snapshot } from './data/snapshot';
 import { Reliability } from './data/reliability';
+import { DelayFeed } from './data/delay-feed';
+import { BoundTable } from './data/bound-table';
+import { ServiceWindow } from './data/service-window';
+import { QueryPool } from './server/query-pool';
+import { ResponseCache } from './data/response-cache';
+import { COMPACT_TIMETABLE, DELAY_FEED, NUMBER_OF_QUERY_WORKERS } from './constants';
 const app = express();
 
-// imports the gtfs files
-Importer.importGoogleTransitData();
-// combines stops with the same name
-Generator.combineStops();
-// generates routes which can be used by the raptor algorithm
-Generator.generateValidRoutes();
-// sets the isAvailable array of each trip
-Generator.setIsAvailableOfTrips();
-// removes invalid trips and sorts the remaining by their departure time
-Generator.clearAndSortTrips();
-// genreates connections which can be used by the csa
-Generator.generateSortedConnections();
-// generates footpaths which can be used by raptor and csa
-Generator.generateFootpaths();
-// initializes the reliability values
-Reliability.initReliability();
-
 const port = 1337;
 const corsOptions = {
   origin: 'http://localhost:4200',
@@ -33,7 +25,82 @@ app.use(cors(corsOptions));
 // uses the defined routes
 app.use(routes);
 
-// initializes the http port of the backend
-app.listen(port, () => {
-  return console.log(`server is listening on ${port}`);
-});
\ No newline at end of file
+/**
+ * Loads the timetable of the snapshot or preprocesses the gtfs files if no valid snapshot exists. Creates the real-time
+ * delays and the lower bounds of the timetable. The delays of the previous timetable are kept.
+ */
+async function loadTimetable() {
+  const tripUpdates = DelayFeed.getTripUpdates();
+  if(!Snapshot.loadSnapshot()){
+    await Preprocessor.preprocessGoogleTransitData();
+    // the query workers and later loads of the service date window use the snapshot
+    if(NUMBER_OF_QUERY_WORKERS > 0 || ServiceWindow.isEnabled()){
+      Snapshot.writeSnapshot();
+    }
+  }
+  // stores the timetable in typed arrays which are used by the algorithms (opt-in) and removes the replaced objects
+  if(COMPACT_TIMETABLE){
+    Generator.generateCompactTimetable();
+    Generator.removeObjectTables();
+  }
+  // creates the real-time delays
+  DelayFeed.init();
+  DelayFeed.applyTripUpdates(tripUpdates);
+  // loads or creates the lower bounds which prune the meat searches
+  BoundTable.init();
+}
+
+/**
+ * Writes the snapshot and the bound table of the service date window in a worker thread. Resolves if the files are
+ * written.
+ * @param settings 
+ * @returns 
+ */
+function createTimetable(settings: any): Promise<void> {
+  return new Promise<void>((resolve, reject) => {
+    const worker = new Worker(path.join(__dirname, 'timetable-worker.js'), { workerData: settings });
+    worker.on('error', reject);
+    worker.on('exit', (code) => {
+      if(code !== 0){
+        reject(new Error('timetable worker exited with code ' + code));
+        return;
+      }
+      resolve();
+    });
+  });
+}
+
+/**
+ * Loads the timetable and initializes the http port of the backend.
+ */
+async function start() {
+  await loadTimetable();
+  // initializes the reliability values
+  Reliability.initReliability();
+  // starts the query workers which share the memory of the snapshot, the compact timetable, the delays and the bounds
+  if(NUMBER_OF_QUERY_WORKERS > 0){
+    await QueryPool.init(NUMBER_OF_QUERY_WORKERS, Snapshot.readSharedSnapshot(), Generator.getSharedCompactTimetable(), DelayFeed.getSharedDelays(), BoundTable.getSharedBounds());
+    // forwards the invalidations of the response cache to the caches of the workers
+    ResponseCache.setInvalidationListener(() => QueryPool.invalidateResponseCaches());
+  }
+  // loads the timetable of another service date window if a query date is outside of the loaded window. The window is
+  // preprocessed in a worker thread, so the queries of the loaded window are answered meanwhile.
+  ServiceWindow.setTimetableLoader(async (settings) => {
+    await createTimetable(settings);
+    ServiceWindow.setSettings(settings);
+    await loadTimetable();
+    if(NUMBER_OF_QUERY_WORKERS > 0){
+      await QueryPool.reload(Snapshot.readSharedSnapshot(), Generator.getSharedCompactTimetable(), DelayFeed.getSharedDelays(), BoundTable.getSharedBounds());
+    }
+  });
+  // applies the trip updates of the delay feed and checks it for new updates
+  if(DELAY_FEED !== ''){
+    DelayFeed.followFile(DELAY_FEED);
+  }
+
+  app.listen(port, () => {
+    return console.log(`server is listening on ${port}`);
+  });
+}
+
+start();
\ No newline at end of file
@@ -0,0 +1,37 @@
+import { parentPort, workerData } from 'worker_threads';
+import { Snapshot } from './data/snapshot';
+import { Generator } from './data/generator';
+import { Reliability } from './data/reliability';
+import { DelayFeed } from './data/delay-feed';
+import { BoundTable } from './data/bound-table';
+import { BenchmarkRunner } from './server/benchmark-runner';
+import { COMPACT_TIMETABLE } from './constants';
+
+// loads the timetable of the snapshot which is shared with the main thread. The connection and stop time objects are
+// not created if the compact timetable is used.
+if(!Snapshot.loadSharedSnapshot(workerData.sharedSnapshot, COMPACT_TIMETABLE)){
+  process.exit(1);
+}
+// uses the typed arrays which are generated once by the main thread (opt-in)
+if(COMPACT_TIMETABLE){
+  Generator.generateCompactTimetable(workerData.sharedCompactTimetable);
+}
+// initializes the reliability values
+Reliability.initReliability();
+// creates the delays which are used by the known delay algorithm
+DelayFeed.init();
+// uses the lower bounds of the main thread
+BoundTable.init(workerData.sharedBounds);
+// adds the delays and answers the warmup queries before the measurement starts
+BenchmarkRunner.prepare(workerData.settings, workerData.warmupQueries);
+
+// answers the benchmark queries of the main thread
+parentPort.on('message', (message) => {
+  try {
+    const record = BenchmarkRunner.runQuery(message.task.query, message.task.alpha, workerData.settings.algorithms);
+    parentPort.postMessage({ taskId: message.taskId, record: record });
+  } catch (err) {
+    parentPort.postMessage({ error: err.message });
+  }
+});
+parentPort.postMessage({ ready: true });
\ No newline at end of file
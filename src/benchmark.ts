@@ -0,0 +1,104 @@
+import path from 'path';
+import { Generator } from './data/generator';
+import { Preprocessor } from './data/preprocessor';
+import { Snapshot } from './data/snapshot';
+import { Reliability } from './data/reliability';
+import { DelayFeed } from './data/delay-feed';
+import { BoundTable } from './data/bound-table';
+import { QuerySet } from './data/query-set';
+import { Benchmark } from './data/benchmark';
+import { BenchmarkRunner } from './server/benchmark-runner';
+import { BenchmarkSettings } from './models/BenchmarkSettings';
+import { COMPACT_TIMETABLE } from './constants';
+
+// options of the command line (--name=value) and their default values
+const DEFAULT_OPTIONS: { [name: string]: string } = {
+  'query-set': 'default',
+  'queries': '1000',
+  'seed': '1',
+  'start-date': QuerySet.dateToString(new Date()),
+  'dates': '7',
+  'algorithms': BenchmarkRunner.ALGORITHMS.join(','),
+  'alphas': '1,2,3',
+  'warmup': '10',
+  'concurrency': '1',
+  'delay-seed': '1',
+  'output': '',
+  'compare-layouts': 'false',
+};
+
+/**
+ * Parses the options of the command line. Throws an error if an option is unknown.
+ * @param args 
+ * @returns 
+ */
+function parseOptions(args: string[]): { [name: string]: string } {
+  const options = Object.assign({}, DEFAULT_OPTIONS);
+  for(let arg of args){
+    const match = /^--([\w-]+)=(.*)$/.exec(arg);
+    if(match === null || DEFAULT_OPTIONS[match[1]] === undefined){
+      throw new Error('unknown option ' + arg + ' (expected one of --' + Object.keys(DEFAULT_OPTIONS).join('=, --') + '=)');
+    }
+    options[match[1]] = match[2];
+  }
+  return options;
+}
+
+/**
+ * Loads the timetable, loads or creates the query set and runs the benchmark.
+ */
+async function start() {
+  const options = parseOptions(process.argv.slice(2));
+  const settings: BenchmarkSettings = {
+    algorithms: options['algorithms'].split(','),
+    alphas: options['alphas'].split(',').map(Number),
+    warmup: Number(options['warmup']),
+    concurrency: Number(options['concurrency']),
+    delaySeed: Number(options['delay-seed']),
+  };
+  BenchmarkRunner.validateAlgorithms(settings.algorithms);
+  // loads the preprocessed timetable of the snapshot or preprocesses the gtfs files if no valid snapshot exists
+  if(!Snapshot.loadSnapshot()){
+    await Preprocessor.preprocessGoogleTransitData();
+    // the benchmark workers load the timetable from the snapshot
+    if(settings.concurrency > 1){
+      Snapshot.writeSnapshot();
+    }
+  }
+  // stores the timetable in typed arrays which are used by the algorithms (opt-in) and removes the replaced objects
+  if(COMPACT_TIMETABLE){
+    Generator.generateCompactTimetable();
+    // compares the object layout and the compact timetable before the objects are removed
+    if(options['compare-layouts'] === 'true'){
+      Benchmark.compareTimetableLayouts();
+      Benchmark.compareConnectionScans();
+    }
+    Generator.removeObjectTables();
+  }
+  // initializes the reliability values
+  Reliability.initReliability();
+  // creates the delays which are used by the known delay algorithm
+  DelayFeed.init();
+  // loads or creates the lower bounds which prune the meat searches
+  BoundTable.init();
+  // uses the stored query set to compare different builds. A new set is created if it does not exist.
+  const feedChecksum = BenchmarkRunner.getFeedChecksum();
+  let querySet = QuerySet.load(options['query-set']);
+  if(querySet === null){
+    const startDate = QuerySet.stringToDate(options['start-date']);
+    querySet = QuerySet.generate(options['query-set'], Number(options['queries']), Number(options['seed']), startDate, Number(options['dates']), feedChecksum);
+    QuerySet.save(querySet);
+    console.log('created query set ' + QuerySet.getPath(querySet.name));
+  } else if(querySet.feedChecksum !== feedChecksum){
+    console.log('query set ' + querySet.name + ' was created for other gtfs files');
+  }
+  const output = options['output'] || path.join('test_data', 'benchmark_' + querySet.name + '.ndjson');
+  await BenchmarkRunner.run(querySet, settings, output);
+}
+
+start().then(() => {
+  process.exit(0);
+}).catch((error) => {
+  console.log(error.message);
+  process.exit(1);
+});
\ No newline at end of file
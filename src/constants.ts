@@ -3,4 +3,42 @@ export const MAX_D_C_LONG: number = 1800;
 export const MAX_D_C_NORMAL: number = 900;
 export const CHANGE_TIME: number = 0;
 export const ALPHA: number = 2;
-export const NUMBER_OF_DAYS: number = 1;
\ No newline at end of file
+export const NUMBER_OF_DAYS: number = 1;
+// stores the timetable additionally in typed arrays which are used by the algorithms (set COMPACT_TIMETABLE=true)
+export const COMPACT_TIMETABLE: boolean = process.env.COMPACT_TIMETABLE === 'true';
+// maximum number of cached meat responses (0 disables the cache)
+export const RESPONSE_CACHE_SIZE: number = 1000;
+// number of worker threads which answer the routing queries (0 answers them in the main thread, set QUERY_WORKERS)
+export const NUMBER_OF_QUERY_WORKERS: number = Number(process.env.QUERY_WORKERS || 0);
+// maximum number of queries which wait for a free worker. Further queries are rejected with 503.
+export const MAX_QUEUED_QUERIES: number = 100;
+// maximum number of source and target pairs of a batch meat query
+export const MAX_BATCH_PAIRS: number = 1000;
+// maximum length (in seconds) of the departure range of a range query
+export const MAX_DEPARTURE_WINDOW: number = 14400;
+// maximum number of typos of long search strings which are matched by the stop name search
+export const MAX_STOP_NAME_EDIT_DISTANCE: number = 2;
+// number of worker threads which run the monte carlo simulations (0 runs them in the main thread, set SIMULATION_WORKERS)
+export const NUMBER_OF_SIMULATION_WORKERS: number = Number(process.env.SIMULATION_WORKERS || 0);
+// number of journeys which are simulated by one batch
+export const SIMULATION_BATCH_SIZE: number = 100000;
+// maximum number of simulated journeys of one query
+export const MAX_NUMBER_OF_SIMULATIONS: number = 10000000;
+// simulation stops if the 95% confidence interval of the expected arrival time is narrower (in seconds)
+export const SIMULATION_CONFIDENCE_INTERVAL_WIDTH: number = 1;
+// seed of the random numbers of the simulations (set SIMULATION_SEED)
+export const SIMULATION_SEED: number = Number(process.env.SIMULATION_SEED || 1);
+// records the durations and counters of the routing algorithms which are exported at /metrics (set METRICS=false to disable)
+export const METRICS_ENABLED: boolean = process.env.METRICS !== 'false';
+// gtfs-realtime trip updates which are applied to the delays, a json file or a stream of ndjson lines (set DELAY_FEED)
+export const DELAY_FEED: string = process.env.DELAY_FEED || '';
+// interval (in milliseconds) in which the delay feed file is checked for changes
+export const DELAY_FEED_POLL_INTERVAL: number = 1000;
+// number of landmarks of the precomputed table whose lower bounds of the earliest arrival times prune the meat searches (0 disables the table, set BOUND_TABLE_LANDMARKS)
+export const BOUND_TABLE_LANDMARKS: number = Number(process.env.BOUND_TABLE_LANDMARKS || 16);
+// number of days of the service date window whose trips are loaded. Queries of dates outside of the window load the window of their date (0 loads all trips, set SERVICE_DATE_WINDOW)
+export const SERVICE_DATE_WINDOW: number = Number(process.env.SERVICE_DATE_WINDOW || 0);
+// maximum number of days of a service date window which is extended by the partitions of later query dates. Dates further away replace the loaded window (set MAX_SERVICE_DATE_WINDOW)
+export const MAX_SERVICE_DATE_WINDOW: number = Number(process.env.MAX_SERVICE_DATE_WINDOW || 28);
+// walking footpaths are created between stops with a distance (in kilometers) less than the radius (0 creates only the change time footpaths, set FOOTPATH_RADIUS)
+export const FOOTPATH_RADIUS: number = Number(process.env.FOOTPATH_RADIUS || 0);
\ No newline at end of file
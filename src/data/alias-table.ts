@@ -0,0 +1,67 @@
+import { SeededRandom } from "./seeded-random";
+
+export class AliasTable {
+    private values: Float64Array;
+    private probabilities: Float64Array;
+    private aliases: Int32Array;
+
+    /**
+     * Creates the alias table of a discrete distribution (Vose's method). Each sample needs one random number and
+     * constant time.
+     * @param values 
+     * @param probabilities 
+     */
+    constructor(values: number[], probabilities: number[]) {
+        const n = values.length;
+        this.values = Float64Array.from(values);
+        this.probabilities = new Float64Array(n);
+        this.aliases = new Int32Array(n);
+        let sumOfProbabilities = 0;
+        for(let probability of probabilities){
+            sumOfProbabilities += probability;
+        }
+        // scales the probabilities to an average of 1 and splits them in small and large ones
+        const scaledProbabilities = probabilities.map(probability => probability * n / sumOfProbabilities);
+        const small: number[] = [];
+        const large: number[] = [];
+        for(let i = 0; i < n; i++){
+            if(scaledProbabilities[i] < 1){
+                small.push(i);
+            } else {
+                large.push(i);
+            }
+        }
+        // fills each column with a small probability and the rest of a large one
+        while(small.length > 0 && large.length > 0){
+            const smallIndex = small.pop();
+            const largeIndex = large.pop();
+            this.probabilities[smallIndex] = scaledProbabilities[smallIndex];
+            this.aliases[smallIndex] = largeIndex;
+            scaledProbabilities[largeIndex] = scaledProbabilities[largeIndex] + scaledProbabilities[smallIndex] - 1;
+            if(scaledProbabilities[largeIndex] < 1){
+                small.push(largeIndex);
+            } else {
+                large.push(largeIndex);
+            }
+        }
+        // remaining columns are full (differences are rounding errors)
+        for(let index of small.concat(large)){
+            this.probabilities[index] = 1;
+            this.aliases[index] = index;
+        }
+    }
+
+    /**
+     * Returns a random value of the distribution.
+     * @param random 
+     * @returns 
+     */
+    public sample(random: SeededRandom): number {
+        const position = random.next() * this.values.length;
+        const column = Math.floor(position);
+        if(position - column < this.probabilities[column]){
+            return this.values[column];
+        }
+        return this.values[this.aliases[column]];
+    }
+}
@@ -0,0 +1,107 @@
+import { performance } from 'perf_hooks';
+import { cloneDeep } from "lodash";
+import { GoogleTransitData } from "./google-transit-data";
+
+export class Benchmark {
+    /**
+     * Compares the heap size and the scan throughput of the object layout and the compact timetable. Must be called
+     * before the objects are removed (Generator.removeObjectTables). Start node with --expose-gc to get exact heap sizes.
+     */
+    public static compareTimetableLayouts() {
+        const typedArrays = [
+            GoogleTransitData.CONNECTION_DEPARTURE_STOPS, GoogleTransitData.CONNECTION_ARRIVAL_STOPS, GoogleTransitData.CONNECTION_DEPARTURE_TIMES,
+            GoogleTransitData.CONNECTION_ARRIVAL_TIMES, GoogleTransitData.CONNECTION_TRIPS, GoogleTransitData.CONNECTION_IS_AVAILABLE,
+            GoogleTransitData.CONNECTION_IS_LONG_DISTANCE, GoogleTransitData.STOPTIME_TRIPS, GoogleTransitData.STOPTIME_STOPS,
+            GoogleTransitData.STOPTIME_ARRIVAL_TIMES, GoogleTransitData.STOPTIME_DEPARTURE_TIMES, GoogleTransitData.TRIP_ROUTES,
+            GoogleTransitData.TRIP_IS_AVAILABLE, GoogleTransitData.TRIP_IS_LONG_DISTANCE, GoogleTransitData.FOOTPATH_DEPARTURE_STOPS,
+            GoogleTransitData.FOOTPATH_ARRIVAL_STOPS,
+        ];
+        let compactBytes = 0;
+        for(let typedArray of typedArrays){
+            compactBytes += typedArray.byteLength;
+        }
+        // measures the heap of a copy of the object tables
+        this.collectGarbage();
+        const heapBefore = process.memoryUsage().heapUsed;
+        let objectTables = cloneDeep([GoogleTransitData.CONNECTIONS, GoogleTransitData.STOPTIMES, GoogleTransitData.TRIPS,
+            GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP, GoogleTransitData.FOOTPATHS_SORTED_BY_ARRIVAL_STOP]);
+        this.collectGarbage();
+        const objectBytes = process.memoryUsage().heapUsed - heapBefore;
+        objectTables = null;
+        console.log('object layout heap size (MB): ' + (objectBytes / 1048576).toFixed(1));
+        console.log('compact timetable size (MB): ' + (compactBytes / 1048576).toFixed(1));
+
+        const numberOfScans = 7;
+        console.log('object layout scan throughput (connections/ms): ' + this.measureScan(numberOfScans, (weekday) => {
+            let availableConnections = 0;
+            for(let i = 0; i < GoogleTransitData.CONNECTIONS.length; i++){
+                const connection = GoogleTransitData.CONNECTIONS[i];
+                if(GoogleTransitData.isAvailable(weekday, GoogleTransitData.TRIPS[connection.trip].isAvailable) && connection.arrivalTime > connection.departureTime){
+                    availableConnections++;
+                }
+            }
+            return availableConnections;
+        }).toFixed(0));
+        console.log('compact timetable scan throughput (connections/ms): ' + this.measureScan(numberOfScans, (weekday) => {
+            let availableConnections = 0;
+            for(let i = 0; i < GoogleTransitData.CONNECTION_DEPARTURE_TIMES.length; i++){
+                if(GoogleTransitData.isAvailable(weekday, GoogleTransitData.CONNECTION_IS_AVAILABLE[i]) && GoogleTransitData.CONNECTION_ARRIVAL_TIMES[i] > GoogleTransitData.CONNECTION_DEPARTURE_TIMES[i]){
+                    availableConnections++;
+                }
+            }
+            return availableConnections;
+        }).toFixed(0));
+    }
+
+    /**
+     * Compares the scan throughput of the csa loop which checks the availability of each connection and the loop over
+     * the connections of a weekday.
+     */
+    public static compareConnectionScans() {
+        const numberOfScans = 7;
+        console.log('filtered connection scan throughput (connections/ms): ' + this.measureScan(numberOfScans, (weekday) => {
+            let reachedStops = 0;
+            for(let i = GoogleTransitData.getNumberOfConnections() - 1; i >= 0; i--){
+                if(!GoogleTransitData.isConnectionAvailable(i, weekday)){
+                    continue;
+                }
+                reachedStops += GoogleTransitData.getDepartureStopOfConnection(i);
+            }
+            return reachedStops;
+        }).toFixed(0));
+        console.log('connections of a weekday scan throughput (connections/ms): ' + this.measureScan(numberOfScans, (weekday) => {
+            let reachedStops = 0;
+            const connectionsOfWeekday = GoogleTransitData.CONNECTIONS_OF_A_WEEKDAY[weekday];
+            for(let i = connectionsOfWeekday.length - 1; i >= 0; i--){
+                reachedStops += GoogleTransitData.getDepartureStopOfConnection(connectionsOfWeekday[i]);
+            }
+            return reachedStops;
+        }).toFixed(0));
+    }
+
+    /**
+     * Performs a scan of all connections for each weekday and returns the scanned connections per millisecond.
+     * @param numberOfScans
+     * @param scan
+     * @returns
+     */
+    private static measureScan(numberOfScans: number, scan: (weekday: number) => number): number {
+        // warmup
+        scan(0);
+        const startTime = performance.now();
+        for(let i = 0; i < numberOfScans; i++){
+            scan(i % 7);
+        }
+        const duration = performance.now() - startTime;
+        return (numberOfScans * GoogleTransitData.getNumberOfConnections()) / duration;
+    }
+
+    /**
+     * Runs the garbage collector if node is started with --expose-gc.
+     */
+    private static collectGarbage() {
+        if(global.gc){
+            global.gc();
+        }
+    }
+}
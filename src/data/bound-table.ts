@@ -0,0 +1,339 @@
+import fs from 'fs';
+import path from 'path';
+import FastPriorityQueue from 'fastpriorityqueue';
+import { GoogleTransitData } from './google-transit-data';
+import { Importer } from './importer';
+import { Snapshot } from './snapshot';
+import { ServiceWindow } from './service-window';
+import { BoundTableHeader } from '../models/BoundTableHeader';
+import { BOUND_TABLE_LANDMARKS, FOOTPATH_RADIUS } from '../constants';
+
+// travel time of stops which can't be reached
+const UNREACHABLE = 0x7fffffff;
+
+// graph of the minimum travel times between the stops (edges of a stop: firstEdges[stop] to firstEdges[stop + 1] - 1)
+interface TravelTimeGraph {
+    firstEdges: Int32Array,
+    heads: Int32Array,
+    travelTimes: Int32Array,
+}
+
+// entries of the priority queue of the dijkstra search
+interface DijkstraEntry {
+    stop: number,
+    travelTime: number,
+}
+
+export class BoundTable {
+    // must be increased if the format or the computation of the travel times changes
+    public static readonly BOUND_TABLE_VERSION: number = 3;
+    private static readonly MAGIC: string = 'PTBOUNDS';
+    // minimum travel times from each landmark to each stop (index: landmark * number of stops + stop)
+    private static travelTimesFromLandmarks: Int32Array;
+    // minimum travel times from each stop to each landmark
+    private static travelTimesToLandmarks: Int32Array;
+    private static numberOfLandmarks: number = 0;
+
+    /**
+     * Loads the table of the minimum travel times from and to the landmarks. The table is created and written to its file
+     * if the file does not exist or was created for other gtfs files. The table is stored in shared memory which the
+     * workers use without copy, workers pass the memory of the main thread (null if the table is disabled).
+     * @param sharedBounds 
+     */
+    public static init(sharedBounds?: SharedArrayBuffer) {
+        if(sharedBounds === undefined && BOUND_TABLE_LANDMARKS > 0){
+            sharedBounds = this.loadBoundTable();
+            if(sharedBounds === null){
+                sharedBounds = this.createBoundTable();
+            }
+        }
+        if(sharedBounds === undefined || sharedBounds === null){
+            this.travelTimesFromLandmarks = undefined;
+            this.travelTimesToLandmarks = undefined;
+            this.numberOfLandmarks = 0;
+            return;
+        }
+        const numberOfStops = GoogleTransitData.STOPS.length;
+        this.numberOfLandmarks = sharedBounds.byteLength / (2 * Int32Array.BYTES_PER_ELEMENT * numberOfStops);
+        this.travelTimesFromLandmarks = new Int32Array(sharedBounds, 0, this.numberOfLandmarks * numberOfStops);
+        this.travelTimesToLandmarks = new Int32Array(sharedBounds, Int32Array.BYTES_PER_ELEMENT * this.numberOfLandmarks * numberOfStops, this.numberOfLandmarks * numberOfStops);
+    }
+
+    /**
+     * Gets the shared memory of the table. Returns null if the table is disabled.
+     * @returns 
+     */
+    public static getSharedBounds(): SharedArrayBuffer {
+        if(this.numberOfLandmarks === 0){
+            return null;
+        }
+        return this.travelTimesFromLandmarks.buffer as SharedArrayBuffer;
+    }
+
+    /**
+     * Gets the file of the precomputed travel times. Each service date window has its own file.
+     * @returns 
+     */
+    public static getBoundTableFile(): string {
+        return path.join(Importer.GOOGLE_TRANSIT_DIRECTORY, 'bounds' + ServiceWindow.getFileSuffix() + '.table');
+    }
+
+    /**
+     * Calculates a lower bound of the earliest arrival time at each stop with the triangle inequality of the landmark
+     * travel times. Stops which can't be reached or only after the maximum arrival time get Number.MAX_VALUE. Returns
+     * null if the table is disabled.
+     * @param sourceStop 
+     * @param sourceTime 
+     * @param maxArrivalTime 
+     * @returns 
+     */
+    public static getEarliestArrivalTimes(sourceStop: number, sourceTime: number, maxArrivalTime: number): number[] {
+        if(this.numberOfLandmarks === 0){
+            return null;
+        }
+        const numberOfStops = GoogleTransitData.STOPS.length;
+        const lowerBounds = new Int32Array(numberOfStops);
+        for(let landmark = 0; landmark < this.numberOfLandmarks; landmark++){
+            const offset = landmark * numberOfStops;
+            const travelTimeFromLandmarkToSource = this.travelTimesFromLandmarks[offset + sourceStop];
+            const travelTimeFromSourceToLandmark = this.travelTimesToLandmarks[offset + sourceStop];
+            for(let stop = 0; stop < numberOfStops; stop++){
+                if(lowerBounds[stop] === UNREACHABLE){
+                    continue;
+                }
+                const travelTimeFromLandmark = this.travelTimesFromLandmarks[offset + stop];
+                const travelTimeToLandmark = this.travelTimesToLandmarks[offset + stop];
+                // the stop can't be reached if the landmark reaches the source but not the stop or if the stop reaches the landmark but not the source
+                if((travelTimeFromLandmarkToSource !== UNREACHABLE && travelTimeFromLandmark === UNREACHABLE)
+                    || (travelTimeToLandmark !== UNREACHABLE && travelTimeFromSourceToLandmark === UNREACHABLE)){
+                    lowerBounds[stop] = UNREACHABLE;
+                    continue;
+                }
+                if(travelTimeFromLandmarkToSource !== UNREACHABLE && travelTimeFromLandmark - travelTimeFromLandmarkToSource > lowerBounds[stop]){
+                    lowerBounds[stop] = travelTimeFromLandmark - travelTimeFromLandmarkToSource;
+                }
+                if(travelTimeToLandmark !== UNREACHABLE && travelTimeFromSourceToLandmark - travelTimeToLandmark > lowerBounds[stop]){
+                    lowerBounds[stop] = travelTimeFromSourceToLandmark - travelTimeToLandmark;
+                }
+            }
+        }
+        const earliestArrivalTimes: number[] = new Array(numberOfStops);
+        for(let stop = 0; stop < numberOfStops; stop++){
+            const earliestArrivalTime = sourceTime + lowerBounds[stop];
+            if(lowerBounds[stop] === UNREACHABLE || earliestArrivalTime > maxArrivalTime){
+                earliestArrivalTimes[stop] = Number.MAX_VALUE;
+            } else {
+                earliestArrivalTimes[stop] = earliestArrivalTime;
+            }
+        }
+        return earliestArrivalTimes;
+    }
+
+    /**
+     * Reads the table from its file into shared memory. Returns null if the file does not exist or was created for other
+     * gtfs files or settings.
+     * @returns 
+     */
+    private static loadBoundTable(): SharedArrayBuffer {
+        if(!fs.existsSync(this.getBoundTableFile())){
+            console.log('no bound table found');
+            return null;
+        }
+        console.time('load bound table')
+        try {
+            const buffer = fs.readFileSync(this.getBoundTableFile());
+            if(buffer.length < this.MAGIC.length + 8 || buffer.toString('ascii', 0, this.MAGIC.length) !== this.MAGIC){
+                throw new Error('invalid file');
+            }
+            const version = buffer.readUInt32LE(this.MAGIC.length);
+            if(version !== this.BOUND_TABLE_VERSION){
+                throw new Error('version ' + version + ' instead of ' + this.BOUND_TABLE_VERSION);
+            }
+            const headerLength = buffer.readUInt32LE(this.MAGIC.length + 4);
+            const header: BoundTableHeader = JSON.parse(buffer.toString('utf8', this.MAGIC.length + 8, this.MAGIC.length + 8 + headerLength));
+            const dataOffset = this.align(this.MAGIC.length + 8 + headerLength);
+            const dataLength = 2 * Int32Array.BYTES_PER_ELEMENT * header.landmarks.length * header.numberOfStops;
+            if(header.snapshotVersion !== Snapshot.SNAPSHOT_VERSION || header.numberOfStops !== GoogleTransitData.STOPS.length
+                || header.landmarks.length !== Math.min(BOUND_TABLE_LANDMARKS, header.numberOfStops)
+                || header.footpathRadius !== FOOTPATH_RADIUS
+                || JSON.stringify(header.serviceWindow) !== JSON.stringify(ServiceWindow.getSettings())){
+                throw new Error('settings changed');
+            }
+            if(header.feedChecksum !== Snapshot.getFeedChecksum()){
+                throw new Error('gtfs files changed');
+            }
+            if(buffer.length < dataOffset + dataLength){
+                throw new Error('incomplete file');
+            }
+            const sharedBounds = new SharedArrayBuffer(dataLength);
+            buffer.copy(Buffer.from(sharedBounds), 0, dataOffset, dataOffset + dataLength);
+            console.timeEnd('load bound table')
+            return sharedBounds;
+        } catch(error) {
+            console.log('bound table rejected: ' + error.message);
+            console.timeEnd('load bound table')
+            return null;
+        }
+    }
+
+    /**
+     * Calculates the minimum travel times from and to the landmarks with dijkstra searches on the graph of the minimum
+     * travel times between the stops and writes the table to its file. The first landmark is the stop with the most
+     * edges, each further landmark is the stop with the longest travel times from and to the chosen landmarks.
+     * @returns 
+     */
+    private static createBoundTable(): SharedArrayBuffer {
+        console.time('create bound table')
+        const numberOfStops = GoogleTransitData.STOPS.length;
+        const numberOfLandmarks = Math.min(BOUND_TABLE_LANDMARKS, numberOfStops);
+        const graph = this.getTravelTimeGraph(false);
+        const reversedGraph = this.getTravelTimeGraph(true);
+        const sharedBounds = new SharedArrayBuffer(2 * Int32Array.BYTES_PER_ELEMENT * numberOfLandmarks * numberOfStops);
+        const travelTimesFromLandmarks = new Int32Array(sharedBounds, 0, numberOfLandmarks * numberOfStops);
+        const travelTimesToLandmarks = new Int32Array(sharedBounds, Int32Array.BYTES_PER_ELEMENT * numberOfLandmarks * numberOfStops, numberOfLandmarks * numberOfStops);
+        // sum of the travel times from and to the nearest landmark (unreachable landmarks count as far away)
+        const distancesToLandmarks = new Float64Array(numberOfStops).fill(Number.MAX_VALUE);
+        const landmarks: number[] = [];
+        let landmark = 0;
+        for(let stop = 1; stop < numberOfStops; stop++){
+            if(graph.firstEdges[stop + 1] - graph.firstEdges[stop] > graph.firstEdges[landmark + 1] - graph.firstEdges[landmark]){
+                landmark = stop;
+            }
+        }
+        while(landmarks.length < numberOfLandmarks){
+            const offset = landmarks.length * numberOfStops;
+            travelTimesFromLandmarks.set(this.getTravelTimes(graph, landmark), offset);
+            travelTimesToLandmarks.set(this.getTravelTimes(reversedGraph, landmark), offset);
+            landmarks.push(landmark);
+            for(let stop = 0; stop < numberOfStops; stop++){
+                const distance = travelTimesFromLandmarks[offset + stop] + travelTimesToLandmarks[offset + stop];
+                if(distance < distancesToLandmarks[stop]){
+                    distancesToLandmarks[stop] = distance;
+                }
+            }
+            for(let stop = 0; stop < numberOfStops; stop++){
+                if(distancesToLandmarks[stop] > distancesToLandmarks[landmark]){
+                    landmark = stop;
+                }
+            }
+        }
+        this.writeBoundTable(sharedBounds, landmarks);
+        console.timeEnd('create bound table')
+        return sharedBounds;
+    }
+
+    /**
+     * Writes the table to its file.
+     * @param sharedBounds 
+     * @param landmarks 
+     */
+    private static writeBoundTable(sharedBounds: SharedArrayBuffer, landmarks: number[]) {
+        const header: BoundTableHeader = {
+            feedChecksum: Snapshot.getFeedChecksum(),
+            snapshotVersion: Snapshot.SNAPSHOT_VERSION,
+            numberOfStops: GoogleTransitData.STOPS.length,
+            footpathRadius: FOOTPATH_RADIUS,
+            serviceWindow: ServiceWindow.getSettings(),
+            landmarks: landmarks,
+        };
+        const headerBuffer = Buffer.from(JSON.stringify(header));
+        const prefix = Buffer.alloc(this.align(this.MAGIC.length + 8 + headerBuffer.length));
+        prefix.write(this.MAGIC, 0, 'ascii');
+        prefix.writeUInt32LE(this.BOUND_TABLE_VERSION, this.MAGIC.length);
+        prefix.writeUInt32LE(headerBuffer.length, this.MAGIC.length + 4);
+        headerBuffer.copy(prefix, this.MAGIC.length + 8);
+        // writes a temporary file first to avoid incomplete tables
+        const temporaryFile = this.getBoundTableFile() + '.tmp';
+        fs.writeFileSync(temporaryFile, Buffer.concat([prefix, Buffer.from(sharedBounds)]));
+        fs.renameSync(temporaryFile, this.getBoundTableFile());
+    }
+
+    /**
+     * Creates the graph of the minimum travel times of the connections and footpaths between the stops. The edges of the
+     * reversed graph lead from the arrival to the departure stop.
+     * @param reversed 
+     * @returns 
+     */
+    private static getTravelTimeGraph(reversed: boolean): TravelTimeGraph {
+        const numberOfStops = GoogleTransitData.STOPS.length;
+        // minimum travel time of each pair of stops (key: tail * number of stops + head)
+        const travelTimesOfPairs = new Map<number, number>();
+        const addEdge = (departureStop: number, arrivalStop: number, travelTime: number) => {
+            if(departureStop === arrivalStop){
+                return;
+            }
+            const key = reversed ? arrivalStop * numberOfStops + departureStop : departureStop * numberOfStops + arrivalStop;
+            const currentTravelTime = travelTimesOfPairs.get(key);
+            if(currentTravelTime === undefined || travelTime < currentTravelTime){
+                travelTimesOfPairs.set(key, Math.max(travelTime, 0));
+            }
+        }
+        for(let i = 0; i < GoogleTransitData.getNumberOfConnections(); i++){
+            addEdge(GoogleTransitData.getDepartureStopOfConnection(i), GoogleTransitData.getArrivalStopOfConnection(i),
+                GoogleTransitData.getArrivalTimeOfConnection(i) - GoogleTransitData.getDepartureTimeOfConnection(i));
+        }
+        for(let footpath of GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP){
+            addEdge(footpath.departureStop, footpath.arrivalStop, footpath.duration);
+        }
+        // stores the edges sorted by tail
+        const firstEdges = new Int32Array(numberOfStops + 1);
+        for(let key of travelTimesOfPairs.keys()){
+            firstEdges[Math.floor(key / numberOfStops) + 1]++;
+        }
+        for(let stop = 0; stop < numberOfStops; stop++){
+            firstEdges[stop + 1] += firstEdges[stop];
+        }
+        const nextEdges = firstEdges.slice(0, numberOfStops);
+        const heads = new Int32Array(travelTimesOfPairs.size);
+        const travelTimes = new Int32Array(travelTimesOfPairs.size);
+        for(let [key, travelTime] of travelTimesOfPairs){
+            const edge = nextEdges[Math.floor(key / numberOfStops)]++;
+            heads[edge] = key % numberOfStops;
+            travelTimes[edge] = travelTime;
+        }
+        return {
+            firstEdges: firstEdges,
+            heads: heads,
+            travelTimes: travelTimes,
+        };
+    }
+
+    /**
+     * Calculates the minimum travel time from the source to each stop of the graph.
+     * @param graph 
+     * @param source 
+     * @returns 
+     */
+    private static getTravelTimes(graph: TravelTimeGraph, source: number): Int32Array {
+        const travelTimes = new Int32Array(graph.firstEdges.length - 1).fill(UNREACHABLE);
+        travelTimes[source] = 0;
+        const priorityQueue = new FastPriorityQueue<DijkstraEntry>((a, b) => {
+            return a.travelTime < b.travelTime;
+        });
+        priorityQueue.add({stop: source, travelTime: 0});
+        while(!priorityQueue.isEmpty()){
+            const entry = priorityQueue.poll();
+            // skips entries of stops which were reached faster
+            if(entry.travelTime > travelTimes[entry.stop]){
+                continue;
+            }
+            for(let edge = graph.firstEdges[entry.stop]; edge < graph.firstEdges[entry.stop + 1]; edge++){
+                const travelTime = entry.travelTime + graph.travelTimes[edge];
+                if(travelTime < travelTimes[graph.heads[edge]]){
+                    travelTimes[graph.heads[edge]] = travelTime;
+                    priorityQueue.add({stop: graph.heads[edge], travelTime: travelTime});
+                }
+            }
+        }
+        return travelTimes;
+    }
+
+    /**
+     * Rounds the offset up to the next multiple of 8.
+     * @param offset 
+     * @returns 
+     */
+    private static align(offset: number): number {
+        return Math.ceil(offset / 8) * 8;
+    }
+}
\ No newline at end of file
@@ -0,0 +1,401 @@
+import { Converter } from './converter';
+import { GoogleTransitData } from './google-transit-data';
+import { DecisionGraph } from '../models/DecisionGraph';
+import { Stop } from '../models/Stop';
+import { Node } from '../models/Node';
+import { Cluster } from '../models/Cluster';
+
+// labels of the edge types
+const EDGE_TYPES: string[] = ['Train', 'Footpath'];
+// node types
+const DEPARTURE = 0;
+const ARRIVAL = 1;
+
+export class DecisionGraphBuilder {
+    // stops with the same name are represented by the same name id
+    private static indexedStops: Stop[];
+    private static nameIdsOfStops: Int32Array;
+    private static namesOfNameIds: string[];
+    // columns of the added edges
+    private departureStops: Int32Array;
+    private departureTimes: Int32Array;
+    private arrivalStops: Int32Array;
+    private arrivalTimes: Int32Array;
+    private types: Uint8Array;
+    private numberOfEdges: number = 0;
+
+    /**
+     * Creates an empty builder. The edge columns grow if needed.
+     * @param capacity 
+     */
+    constructor(capacity: number = 64) {
+        this.departureStops = new Int32Array(capacity);
+        this.departureTimes = new Int32Array(capacity);
+        this.arrivalStops = new Int32Array(capacity);
+        this.arrivalTimes = new Int32Array(capacity);
+        this.types = new Uint8Array(capacity);
+        DecisionGraphBuilder.createNameIds();
+    }
+
+    /**
+     * Adds an edge of the expanded decision graph. Duplicate edges are removed when the graphs are built.
+     * @param departureStop 
+     * @param departureTime 
+     * @param arrivalStop 
+     * @param arrivalTime 
+     * @param type 
+     */
+    public addEdge(departureStop: number, departureTime: number, arrivalStop: number, arrivalTime: number, type: string) {
+        if(this.numberOfEdges === this.types.length){
+            this.grow();
+        }
+        const i = this.numberOfEdges;
+        this.departureStops[i] = DecisionGraphBuilder.nameIdsOfStops[departureStop];
+        this.departureTimes[i] = departureTime;
+        this.arrivalStops[i] = DecisionGraphBuilder.nameIdsOfStops[arrivalStop];
+        this.arrivalTimes[i] = arrivalTime;
+        this.types[i] = EDGE_TYPES.indexOf(type);
+        this.numberOfEdges++;
+    }
+
+    /**
+     * Creates the expanded and the compact decision graph of the added edges. Duplicate edges and nodes are found with
+     * hash tables of their stop, time and type.
+     * @param targetStop 
+     * @returns 
+     */
+    public build(targetStop: number) {
+        this.setDepartureTimesOfFootpaths();
+        const edges = this.getDistinctEdges();
+        // sorts the edges by departure and arrival time
+        edges.sort((a, b) => {
+            return this.departureTimes[a] - this.departureTimes[b] || this.arrivalTimes[a] - this.arrivalTimes[b] ||
+                this.departureStops[a] - this.departureStops[b] || this.arrivalStops[a] - this.arrivalStops[b] || this.types[a] - this.types[b];
+        });
+        let idCounter = 0;
+        const expandedDecisionGraph = this.getExpandedDecisionGraph(edges, idCounter);
+        idCounter += expandedDecisionGraph.nodes.length + expandedDecisionGraph.links.length + expandedDecisionGraph.clusters.length;
+        const compactDecisionGraph = this.getCompactDecisionGraph(edges, DecisionGraphBuilder.nameIdsOfStops[targetStop], idCounter);
+        return {
+            expandedDecisionGraph: expandedDecisionGraph,
+            compactDecisionGraph: compactDecisionGraph,
+        };
+    }
+
+    /**
+     * Creates the expanded decision graph. Each edge connects a departure and an arrival node, nodes with the same stop,
+     * time and type are merged. The nodes of a stop form a cluster.
+     * @param edges 
+     * @param idCounter 
+     * @returns 
+     */
+    private getExpandedDecisionGraph(edges: Int32Array, idCounter: number): DecisionGraph {
+        const decisionGraph: DecisionGraph = {
+            nodes: [],
+            links: [],
+            clusters: [],
+        };
+        // columns of the distinct nodes
+        const nodeStops = new Int32Array(2 * edges.length);
+        const nodeTimes = new Int32Array(2 * edges.length);
+        const nodeTypes = new Uint8Array(2 * edges.length);
+        const nodeIds: string[] = [];
+        const table = DecisionGraphBuilder.createHashTable(2 * edges.length);
+        const mask = table.length - 1;
+        // gets the id of the node and adds it if it's new
+        const getNodeId = (stop: number, time: number, type: number) => {
+            let slot = DecisionGraphBuilder.hash(DecisionGraphBuilder.hash(DecisionGraphBuilder.hash(0, stop), time), type) & mask;
+            while(table[slot] !== -1){
+                const node = table[slot];
+                if(nodeStops[node] === stop && nodeTimes[node] === time && nodeTypes[node] === type){
+                    return nodeIds[node];
+                }
+                slot = (slot + 1) & mask;
+            }
+            const node = nodeIds.length;
+            table[slot] = node;
+            nodeStops[node] = stop;
+            nodeTimes[node] = time;
+            nodeTypes[node] = type;
+            nodeIds.push('id_' + (idCounter++).toString());
+            return nodeIds[node];
+        }
+        for(let edge of edges){
+            const source = getNodeId(this.departureStops[edge], this.departureTimes[edge], DEPARTURE);
+            const target = getNodeId(this.arrivalStops[edge], this.arrivalTimes[edge], ARRIVAL);
+            decisionGraph.links.push({
+                id: 'id_' + (idCounter++).toString(),
+                source: source,
+                target: target,
+                label: EDGE_TYPES[this.types[edge]],
+            });
+        }
+        // sorts the nodes by time
+        const nodes = new Int32Array(nodeIds.length);
+        for(let i = 0; i < nodes.length; i++){
+            nodes[i] = i;
+        }
+        nodes.sort((a, b) => nodeTimes[a] - nodeTimes[b] || nodeStops[a] - nodeStops[b] || nodeTypes[a] - nodeTypes[b]);
+        const clusters = new Map<number, Cluster>();
+        for(let i of nodes){
+            const node: Node = {
+                id: nodeIds[i],
+                label: Converter.secondsToTime(nodeTimes[i]),
+            }
+            decisionGraph.nodes.push(node);
+            let cluster = clusters.get(nodeStops[i]);
+            if(cluster === undefined){
+                cluster = {
+                    id: 'id_' + (idCounter++).toString(),
+                    label: DecisionGraphBuilder.namesOfNameIds[nodeStops[i]],
+                    childNodeIds: [],
+                }
+                clusters.set(nodeStops[i], cluster);
+                decisionGraph.clusters.push(cluster);
+            }
+            cluster.childNodeIds.push(node.id);
+        }
+        return decisionGraph;
+    }
+
+    /**
+     * Creates the compact decision graph. Edges with the same stops and type are merged to one edge whose label contains
+     * the first and last departure time. Each stop has one arrival node.
+     * @param edges 
+     * @param targetStop 
+     * @param idCounter 
+     * @returns 
+     */
+    private getCompactDecisionGraph(edges: Int32Array, targetStop: number, idCounter: number): DecisionGraph {
+        const decisionGraph: DecisionGraph = {
+            nodes: [],
+            links: [],
+            clusters: [],
+        };
+        // the first edge of each group is the edge with the first departure time (the edges are sorted)
+        const firstEdges: number[] = [];
+        const lastDepartureTimes: number[] = [];
+        const table = DecisionGraphBuilder.createHashTable(edges.length);
+        const mask = table.length - 1;
+        let earliestArrivalTime = Number.MAX_VALUE;
+        let latestArrivalTime = 0;
+        for(let edge of edges){
+            if(this.arrivalStops[edge] === targetStop){
+                earliestArrivalTime = Math.min(earliestArrivalTime, this.arrivalTimes[edge]);
+                latestArrivalTime = Math.max(latestArrivalTime, this.arrivalTimes[edge]);
+            }
+            let slot = DecisionGraphBuilder.hash(DecisionGraphBuilder.hash(DecisionGraphBuilder.hash(0, this.departureStops[edge]), this.arrivalStops[edge]), this.types[edge]) & mask;
+            while(table[slot] !== -1){
+                const firstEdge = firstEdges[table[slot]];
+                if(this.departureStops[firstEdge] === this.departureStops[edge] && this.arrivalStops[firstEdge] === this.arrivalStops[edge] && this.types[firstEdge] === this.types[edge]){
+                    break;
+                }
+                slot = (slot + 1) & mask;
+            }
+            if(table[slot] === -1){
+                table[slot] = firstEdges.length;
+                firstEdges.push(edge);
+                lastDepartureTimes.push(undefined);
+            } else {
+                lastDepartureTimes[table[slot]] = this.departureTimes[edge];
+            }
+        }
+        let arrivalTimeOfTarget = '';
+        if(edges.length > 0){
+            arrivalTimeOfTarget = Converter.secondsToTime(earliestArrivalTime);
+            if(earliestArrivalTime < latestArrivalTime){
+                arrivalTimeOfTarget += ' - ' + Converter.secondsToTime(latestArrivalTime);
+            }
+        }
+        const clusters = new Map<number, Cluster>();
+        const arrivalNodeIds = new Map<number, string>();
+        for(let i = 0; i < firstEdges.length; i++){
+            const edge = firstEdges[i];
+            const departureStop = this.departureStops[edge];
+            const arrivalStop = this.arrivalStops[edge];
+            // the stops are reached before their first departure, except the source stop
+            let departureCluster = clusters.get(departureStop);
+            if(departureCluster === undefined){
+                departureCluster = {
+                    id: 'id_' + (idCounter++).toString(),
+                    label: DecisionGraphBuilder.namesOfNameIds[departureStop],
+                    childNodeIds: [],
+                }
+                clusters.set(departureStop, departureCluster);
+                decisionGraph.clusters.push(departureCluster);
+            }
+            const departureNode: Node = {
+                id: 'id_' + (idCounter++).toString(),
+                label: Converter.secondsToTime(this.departureTimes[edge]),
+            }
+            if(lastDepartureTimes[i] !== undefined){
+                departureNode.label = departureNode.label + ' - ' + Converter.secondsToTime(lastDepartureTimes[i]);
+            }
+            decisionGraph.nodes.push(departureNode);
+            departureCluster.childNodeIds.push(departureNode.id);
+            if(!arrivalNodeIds.has(arrivalStop)){
+                const arrivalNode: Node = {
+                    id: 'id_' + (idCounter++).toString(),
+                    label: arrivalStop === targetStop ? arrivalTimeOfTarget : ' ',
+                }
+                decisionGraph.nodes.push(arrivalNode);
+                arrivalNodeIds.set(arrivalStop, arrivalNode.id);
+                let cluster = clusters.get(arrivalStop);
+                if(cluster === undefined){
+                    cluster = {
+                        id: 'id_' + (idCounter++).toString(),
+                        label: DecisionGraphBuilder.namesOfNameIds[arrivalStop],
+                        childNodeIds: [],
+                    }
+                    clusters.set(arrivalStop, cluster);
+                    decisionGraph.clusters.push(cluster);
+                }
+                cluster.childNodeIds.push(arrivalNode.id);
+            }
+            decisionGraph.links.push({
+                id: 'id_' + (idCounter++).toString(),
+                source: departureNode.id,
+                target: arrivalNodeIds.get(arrivalStop),
+                label: EDGE_TYPES[this.types[edge]],
+            });
+        }
+        return decisionGraph;
+    }
+
+    /**
+     * Gets the positions of the distinct edges in the order in which they were added.
+     * @returns 
+     */
+    private getDistinctEdges(): Int32Array {
+        const edges = new Int32Array(this.numberOfEdges);
+        let numberOfDistinctEdges = 0;
+        const table = DecisionGraphBuilder.createHashTable(this.numberOfEdges);
+        const mask = table.length - 1;
+        for(let i = 0; i < this.numberOfEdges; i++){
+            let hash = DecisionGraphBuilder.hash(0, this.departureStops[i]);
+            hash = DecisionGraphBuilder.hash(hash, this.departureTimes[i]);
+            hash = DecisionGraphBuilder.hash(hash, this.arrivalStops[i]);
+            hash = DecisionGraphBuilder.hash(hash, this.arrivalTimes[i]);
+            let slot = DecisionGraphBuilder.hash(hash, this.types[i]) & mask;
+            let isDuplicate = false;
+            while(table[slot] !== -1){
+                const j = table[slot];
+                if(this.departureStops[i] === this.departureStops[j] && this.departureTimes[i] === this.departureTimes[j] && this.arrivalStops[i] === this.arrivalStops[j] &&
+                    this.arrivalTimes[i] === this.arrivalTimes[j] && this.types[i] === this.types[j]){
+                    isDuplicate = true;
+                    break;
+                }
+                slot = (slot + 1) & mask;
+            }
+            if(!isDuplicate){
+                table[slot] = i;
+                edges[numberOfDistinctEdges++] = i;
+            }
+        }
+        return edges.slice(0, numberOfDistinctEdges);
+    }
+
+    /**
+     * Sets the departure time of each footpath to the latest arrival time at its departure stop before the departure.
+     */
+    private setDepartureTimesOfFootpaths() {
+        const footpathType = EDGE_TYPES.indexOf('Footpath');
+        if(!this.types.subarray(0, this.numberOfEdges).includes(footpathType)){
+            return;
+        }
+        const arrivalTimesPerStop = new Map<number, number[]>();
+        for(let i = 0; i < this.numberOfEdges; i++){
+            if(!arrivalTimesPerStop.has(this.arrivalStops[i])){
+                arrivalTimesPerStop.set(this.arrivalStops[i], []);
+            }
+            arrivalTimesPerStop.get(this.arrivalStops[i]).push(this.arrivalTimes[i]);
+        }
+        for(let arrivalTimes of arrivalTimesPerStop.values()){
+            arrivalTimes.sort((a, b) => a - b);
+        }
+        for(let i = 0; i < this.numberOfEdges; i++){
+            const arrivalTimes = arrivalTimesPerStop.get(this.departureStops[i]);
+            if(this.types[i] !== footpathType || arrivalTimes === undefined){
+                continue;
+            }
+            // binary search of the last arrival time which is not after the departure time
+            let low = 0;
+            let high = arrivalTimes.length;
+            while(low < high){
+                const middle = (low + high) >>> 1;
+                if(arrivalTimes[middle] <= this.departureTimes[i]){
+                    low = middle + 1;
+                } else {
+                    high = middle;
+                }
+            }
+            const duration = this.arrivalTimes[i] - this.departureTimes[i];
+            this.departureTimes[i] = arrivalTimes[Math.max(low - 1, 0)];
+            this.arrivalTimes[i] = this.departureTimes[i] + duration;
+        }
+    }
+
+    /**
+     * Doubles the capacity of the edge columns.
+     */
+    private grow() {
+        const capacity = 2 * this.types.length;
+        const copy = <T extends Int32Array | Uint8Array>(column: T, newColumn: T) => {
+            newColumn.set(column);
+            return newColumn;
+        }
+        this.departureStops = copy(this.departureStops, new Int32Array(capacity));
+        this.departureTimes = copy(this.departureTimes, new Int32Array(capacity));
+        this.arrivalStops = copy(this.arrivalStops, new Int32Array(capacity));
+        this.arrivalTimes = copy(this.arrivalTimes, new Int32Array(capacity));
+        this.types = copy(this.types, new Uint8Array(capacity));
+    }
+
+    /**
+     * Creates an empty hash table (-1 marks free slots) with at least twice as many slots as entries.
+     * @param numberOfEntries 
+     * @returns 
+     */
+    private static createHashTable(numberOfEntries: number): Int32Array {
+        let size = 16;
+        while(size < 2 * numberOfEntries){
+            size *= 2;
+        }
+        return new Int32Array(size).fill(-1);
+    }
+
+    /**
+     * Combines the hash with the value.
+     * @param hash 
+     * @param value 
+     * @returns 
+     */
+    private static hash(hash: number, value: number): number {
+        hash = Math.imul(hash ^ value, 0x9e3779b1);
+        return hash ^ (hash >>> 15);
+    }
+
+    /**
+     * Assigns the same id to the stops with the same name. The ids are created again if the stops changed.
+     */
+    private static createNameIds() {
+        if(this.indexedStops === GoogleTransitData.STOPS && this.nameIdsOfStops.length === GoogleTransitData.STOPS.length){
+            return;
+        }
+        const nameIds = new Map<string, number>();
+        this.indexedStops = GoogleTransitData.STOPS;
+        this.nameIdsOfStops = new Int32Array(GoogleTransitData.STOPS.length);
+        this.namesOfNameIds = [];
+        for(let i = 0; i < GoogleTransitData.STOPS.length; i++){
+            const name = GoogleTransitData.STOPS[i].name;
+            let nameId = nameIds.get(name);
+            if(nameId === undefined){
+                nameId = this.namesOfNameIds.length;
+                nameIds.set(name, nameId);
+                this.namesOfNameIds.push(name);
+            }
+            this.nameIdsOfStops[i] = nameId;
+        }
+    }
+
+}
\ No newline at end of file
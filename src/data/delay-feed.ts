@@ -0,0 +1,411 @@
+import fs from 'fs';
+import { performance } from 'perf_hooks';
+import { GoogleTransitData } from './google-transit-data';
+import { ResponseCache } from './response-cache';
+import { Metrics } from './metrics';
+import { FeedMessage } from '../models/FeedMessage';
+import { FeedEntity } from '../models/FeedEntity';
+import { TripUpdate } from '../models/TripUpdate';
+import { StopTimeUpdate } from '../models/StopTimeUpdate';
+import { DELAY_FEED_POLL_INTERVAL } from '../constants';
+
+export class DelayFeed {
+    // internal trip id of each trip_id of the gtfs feeds
+    private static tripIdsByGtfsId: Map<string, number>;
+    // connection which arrives at each stop time (-1 at the first stop time of a trip)
+    private static connectionOfAStopTime: Int32Array;
+    // counters of the applied messages
+    private static numberOfMessages: number = 0;
+    private static numberOfTripUpdates: number = 0;
+    private static numberOfRejectedTripUpdates: number = 0;
+    private static numberOfChangedStopTimes: number = 0;
+    private static totalDuration: number = 0;
+    private static maxDuration: number = 0;
+    private static lastFeedAge: number;
+
+    /**
+     * Creates the delay columns of the stop times and connections. The columns are stored in shared memory which the
+     * workers use without copy, workers pass the memory of the main thread.
+     * @param sharedDelays 
+     */
+    public static init(sharedDelays?: SharedArrayBuffer) {
+        const numberOfStopTimes = GoogleTransitData.getNumberOfStopTimes();
+        const numberOfConnections = GoogleTransitData.getNumberOfConnections();
+        if(sharedDelays === undefined){
+            sharedDelays = new SharedArrayBuffer(Int32Array.BYTES_PER_ELEMENT * (2 * numberOfStopTimes + numberOfConnections));
+        }
+        GoogleTransitData.STOPTIME_ARRIVAL_DELAYS = new Int32Array(sharedDelays, 0, numberOfStopTimes);
+        GoogleTransitData.STOPTIME_DEPARTURE_DELAYS = new Int32Array(sharedDelays, Int32Array.BYTES_PER_ELEMENT * numberOfStopTimes, numberOfStopTimes);
+        GoogleTransitData.CONNECTION_ARRIVAL_DELAYS = new Int32Array(sharedDelays, Int32Array.BYTES_PER_ELEMENT * 2 * numberOfStopTimes, numberOfConnections);
+        // the indexes are created with the first update
+        this.tripIdsByGtfsId = undefined;
+        this.connectionOfAStopTime = undefined;
+    }
+
+    /**
+     * Gets the delays of the delayed trips as trip updates with an update of each stop time. They keep the delays if the
+     * timetable of another service date window is loaded (applyTripUpdates).
+     * @returns 
+     */
+    public static getTripUpdates(): TripUpdate[] {
+        const tripUpdates: TripUpdate[] = [];
+        // the delays are only set after the indexes are created
+        if(this.tripIdsByGtfsId === undefined){
+            return tripUpdates;
+        }
+        for(let [gtfsId, tripId] of this.tripIdsByGtfsId){
+            const firstStopTime = GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId];
+            if(firstStopTime === undefined){
+                continue;
+            }
+            const lastStopTime = this.getLastStopTimeOfTrip(tripId);
+            let isDelayed = false;
+            for(let i = firstStopTime; i <= lastStopTime && !isDelayed; i++){
+                isDelayed = GoogleTransitData.STOPTIME_ARRIVAL_DELAYS[i] !== 0 || GoogleTransitData.STOPTIME_DEPARTURE_DELAYS[i] !== 0;
+            }
+            if(!isDelayed){
+                continue;
+            }
+            const stopTimeUpdates: StopTimeUpdate[] = [];
+            for(let i = firstStopTime; i <= lastStopTime; i++){
+                stopTimeUpdates.push({
+                    stopSequence: GoogleTransitData.getStopSequenceOfStopTime(i),
+                    arrival: { delay: GoogleTransitData.STOPTIME_ARRIVAL_DELAYS[i] },
+                    departure: { delay: GoogleTransitData.STOPTIME_DEPARTURE_DELAYS[i] },
+                });
+            }
+            tripUpdates.push({ trip: { tripId: gtfsId }, stopTimeUpdate: stopTimeUpdates });
+        }
+        return tripUpdates;
+    }
+
+    /**
+     * Applies the trip updates of getTripUpdates to the current timetable. Updates of trips which are not loaded are
+     * ignored, the counters of the feed don't change.
+     * @param tripUpdates 
+     */
+    public static applyTripUpdates(tripUpdates: TripUpdate[]) {
+        if(tripUpdates.length === 0){
+            return;
+        }
+        this.createIndexes();
+        for(let tripUpdate of tripUpdates){
+            this.applyTripUpdate(tripUpdate, false);
+        }
+    }
+
+    /**
+     * Gets the shared memory of the delay columns.
+     * @returns 
+     */
+    public static getSharedDelays(): SharedArrayBuffer {
+        return GoogleTransitData.STOPTIME_ARRIVAL_DELAYS.buffer as SharedArrayBuffer;
+    }
+
+    /**
+     * Sets the delay of all stop times and connections of the trip.
+     * @param tripId 
+     * @param delay 
+     */
+    public static setTripDelay(tripId: number, delay: number) {
+        this.createIndexes();
+        const lastStopTime = this.getLastStopTimeOfTrip(tripId);
+        for(let i = GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId]; i <= lastStopTime; i++){
+            this.setStopTimeDelays(i, delay, delay);
+        }
+    }
+
+    /**
+     * Gets the arrival delay of the trip at the stop. Returns 0 if the trip doesn't serve the stop.
+     * @param tripId 
+     * @param stopId 
+     * @returns 
+     */
+    public static getArrivalDelay(tripId: number, stopId: number): number {
+        const lastStopTime = this.getLastStopTimeOfTrip(tripId);
+        for(let i = GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId]; i <= lastStopTime; i++){
+            if(GoogleTransitData.getStopOfStopTime(i) === stopId){
+                return GoogleTransitData.STOPTIME_ARRIVAL_DELAYS[i];
+            }
+        }
+        return 0;
+    }
+
+    /**
+     * Applies the trip updates of a gtfs-realtime message (json format of the gtfs-realtime bindings). Only the stop
+     * times and connections of the updated trips are changed. Updates of unknown or canceled trips are rejected, other
+     * entities are ignored.
+     * @param message 
+     * @param source 
+     * @returns 
+     */
+    public static applyFeedMessage(message: FeedMessage, source: string) {
+        const startTime = performance.now();
+        this.createIndexes();
+        let numberOfTripUpdates = 0;
+        let numberOfRejectedTripUpdates = 0;
+        let numberOfChangedStopTimes = 0;
+        const entities: FeedEntity[] = message && Array.isArray(message.entity) ? message.entity : [];
+        for(let entity of entities){
+            if(!entity || !entity.tripUpdate){
+                continue;
+            }
+            const changedStopTimes = this.applyTripUpdate(entity.tripUpdate, entity.isDeleted === true);
+            if(changedStopTimes === -1){
+                numberOfRejectedTripUpdates++;
+            } else {
+                numberOfTripUpdates++;
+                numberOfChangedStopTimes += changedStopTimes;
+            }
+        }
+        // cached responses could depend on the old delays, the cache is invalidated once per message
+        if(numberOfChangedStopTimes > 0){
+            ResponseCache.invalidate();
+        }
+        const duration = performance.now() - startTime;
+        // age of the message (the timestamp of the header is optional)
+        let age: number;
+        if(message && message.header && message.header.timestamp !== undefined){
+            age = Math.max(0, Date.now() / 1000 - Number(message.header.timestamp));
+            this.lastFeedAge = age;
+        }
+        this.numberOfMessages++;
+        this.numberOfTripUpdates += numberOfTripUpdates;
+        this.numberOfRejectedTripUpdates += numberOfRejectedTripUpdates;
+        this.numberOfChangedStopTimes += numberOfChangedStopTimes;
+        this.totalDuration += duration;
+        this.maxDuration = Math.max(this.maxDuration, duration);
+        Metrics.observeDelayUpdate(source, duration / 1000, age);
+        Metrics.incrementTripUpdates(source, 'applied', numberOfTripUpdates);
+        Metrics.incrementTripUpdates(source, 'rejected', numberOfRejectedTripUpdates);
+        return {
+            tripUpdates: numberOfTripUpdates,
+            rejectedTripUpdates: numberOfRejectedTripUpdates,
+            changedStopTimes: numberOfChangedStopTimes,
+            duration: duration,
+        };
+    }
+
+    /**
+     * Applies the messages of the file and checks it for changes. A json file contains one message and is applied again
+     * if it changes. A ndjson file is a stream of messages or entities (one per line) of which only the appended lines
+     * are applied.
+     * @param file 
+     */
+    public static followFile(file: string) {
+        const isStream = file.endsWith('.ndjson');
+        let offset = 0;
+        let incompleteLine = Buffer.alloc(0);
+        const readFile = (stats: fs.Stats) => {
+            // the file doesn't exist (yet)
+            if(stats === undefined || stats.mtimeMs === 0){
+                return;
+            }
+            try {
+                if(!isStream){
+                    this.applyFeedMessage(JSON.parse(fs.readFileSync(file, 'utf8')), 'file');
+                    return;
+                }
+                // starts again if the file was replaced by a shorter one
+                if(stats.size < offset){
+                    offset = 0;
+                    incompleteLine = Buffer.alloc(0);
+                }
+                if(stats.size === offset){
+                    return;
+                }
+                const appendedData = Buffer.alloc(stats.size - offset);
+                const fileDescriptor = fs.openSync(file, 'r');
+                try {
+                    fs.readSync(fileDescriptor, appendedData, 0, appendedData.length, offset);
+                } finally {
+                    fs.closeSync(fileDescriptor);
+                }
+                offset = stats.size;
+                // the last line is applied when it is complete
+                const data = Buffer.concat([incompleteLine, appendedData]);
+                const endOfLastLine = data.lastIndexOf(10);
+                incompleteLine = data.subarray(endOfLastLine + 1);
+                for(let line of data.subarray(0, endOfLastLine + 1).toString('utf8').split('\n')){
+                    if(line.trim() === ''){
+                        continue;
+                    }
+                    const value = JSON.parse(line);
+                    this.applyFeedMessage(Array.isArray(value.entity) ? value : { entity: [value] }, 'file');
+                }
+            } catch(error) {
+                console.log('could not apply the delay feed ' + file + ': ' + error.message);
+            }
+        };
+        readFile(fs.existsSync(file) ? fs.statSync(file) : undefined);
+        fs.watchFile(file, { interval: DELAY_FEED_POLL_INTERVAL }, (stats) => readFile(stats));
+    }
+
+    /**
+     * Gets the counters and durations (in milliseconds) of the applied messages.
+     * @returns 
+     */
+    public static getStatistics() {
+        return {
+            messages: this.numberOfMessages,
+            tripUpdates: this.numberOfTripUpdates,
+            rejectedTripUpdates: this.numberOfRejectedTripUpdates,
+            changedStopTimes: this.numberOfChangedStopTimes,
+            averageDuration: this.numberOfMessages > 0 ? this.totalDuration / this.numberOfMessages : 0,
+            maxDuration: this.maxDuration,
+            tripUpdatesPerSecond: this.totalDuration > 0 ? this.numberOfTripUpdates / (this.totalDuration / 1000) : 0,
+            lastFeedAge: this.lastFeedAge,
+        };
+    }
+
+    /**
+     * Applies the update of a trip. The delays of the updated stops are propagated to the following stops until the next
+     * update. Stops before the first update keep their delays unless the update has a trip delay. Deleted updates reset
+     * the delays of the trip. Returns the number of changed stop times or -1 if the update is rejected.
+     * @param tripUpdate 
+     * @param isDeleted 
+     * @returns 
+     */
+    private static applyTripUpdate(tripUpdate: TripUpdate, isDeleted: boolean): number {
+        if(!tripUpdate.trip || tripUpdate.trip.scheduleRelationship === 'CANCELED'){
+            return -1;
+        }
+        const tripId = this.tripIdsByGtfsId.get(tripUpdate.trip.tripId);
+        if(tripId === undefined){
+            return -1;
+        }
+        const stopTimeUpdates: StopTimeUpdate[] = isDeleted || !Array.isArray(tripUpdate.stopTimeUpdate) ? [] :
+            tripUpdate.stopTimeUpdate.filter(update => update && typeof update.stopSequence === 'number').sort((a, b) => a.stopSequence - b.stopSequence);
+        let delay: number;
+        if(isDeleted){
+            delay = 0;
+        } else if(typeof tripUpdate.delay === 'number'){
+            delay = tripUpdate.delay;
+        }
+        let numberOfChangedStopTimes = 0;
+        let nextUpdate = 0;
+        const lastStopTime = this.getLastStopTimeOfTrip(tripId);
+        for(let i = GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId]; i <= lastStopTime; i++){
+            const stopSequence = GoogleTransitData.getStopSequenceOfStopTime(i);
+            // skips updates of stops which are not part of the trip
+            while(nextUpdate < stopTimeUpdates.length && stopTimeUpdates[nextUpdate].stopSequence < stopSequence){
+                nextUpdate++;
+            }
+            let arrivalDelay = delay;
+            let departureDelay = delay;
+            if(nextUpdate < stopTimeUpdates.length && stopTimeUpdates[nextUpdate].stopSequence === stopSequence){
+                const stopTimeUpdate = stopTimeUpdates[nextUpdate];
+                if(stopTimeUpdate.scheduleRelationship === 'NO_DATA'){
+                    // the stop and the following stops have no real-time information
+                    delay = 0;
+                    arrivalDelay = 0;
+                    departureDelay = 0;
+                } else {
+                    const hasArrivalDelay = stopTimeUpdate.arrival && typeof stopTimeUpdate.arrival.delay === 'number';
+                    const hasDepartureDelay = stopTimeUpdate.departure && typeof stopTimeUpdate.departure.delay === 'number';
+                    if(hasArrivalDelay){
+                        arrivalDelay = stopTimeUpdate.arrival.delay;
+                    } else if(hasDepartureDelay && delay === undefined){
+                        arrivalDelay = stopTimeUpdate.departure.delay;
+                    }
+                    departureDelay = hasDepartureDelay ? stopTimeUpdate.departure.delay : arrivalDelay;
+                    delay = departureDelay;
+                }
+            }
+            if(arrivalDelay !== undefined){
+                numberOfChangedStopTimes += this.setStopTimeDelays(i, arrivalDelay, departureDelay);
+            }
+        }
+        return numberOfChangedStopTimes;
+    }
+
+    /**
+     * Sets the delays of the stop time and the arrival delay of its connection. Returns 1 if a delay changed.
+     * @param stopTime 
+     * @param arrivalDelay 
+     * @param departureDelay 
+     * @returns 
+     */
+    private static setStopTimeDelays(stopTime: number, arrivalDelay: number, departureDelay: number): number {
+        if(GoogleTransitData.STOPTIME_ARRIVAL_DELAYS[stopTime] === arrivalDelay && GoogleTransitData.STOPTIME_DEPARTURE_DELAYS[stopTime] === departureDelay){
+            return 0;
+        }
+        GoogleTransitData.STOPTIME_ARRIVAL_DELAYS[stopTime] = arrivalDelay;
+        GoogleTransitData.STOPTIME_DEPARTURE_DELAYS[stopTime] = departureDelay;
+        const connectionId = this.connectionOfAStopTime[stopTime];
+        if(connectionId !== -1){
+            GoogleTransitData.CONNECTION_ARRIVAL_DELAYS[connectionId] = arrivalDelay;
+        }
+        return 1;
+    }
+
+    /**
+     * Gets the position of the last stop time of the trip. The stop times of a trip are stored in sequence.
+     * @param tripId 
+     * @returns 
+     */
+    private static getLastStopTimeOfTrip(tripId: number): number {
+        const numberOfStopTimes = GoogleTransitData.getNumberOfStopTimes();
+        let lastStopTime = GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId];
+        while(lastStopTime + 1 < numberOfStopTimes && GoogleTransitData.getTripOfStopTime(lastStopTime + 1) === tripId){
+            lastStopTime++;
+        }
+        return lastStopTime;
+    }
+
+    /**
+     * Creates the map of the gtfs trip ids and the connection of each stop time. The connections of a trip are matched
+     * with its stop times by the stop sequence.
+     */
+    private static createIndexes() {
+        if(this.connectionOfAStopTime !== undefined){
+            return;
+        }
+        this.tripIdsByGtfsId = new Map<string, number>();
+        for(let trip of GoogleTransitData.TRIPS){
+            // trip ids which occur in both feeds refer to the trip of the first feed
+            if(trip.gtfsId !== undefined && trip.gtfsId !== null && !this.tripIdsByGtfsId.has(trip.gtfsId)){
+                this.tripIdsByGtfsId.set(trip.gtfsId, trip.id);
+            }
+        }
+        // groups the connections by trip
+        const numberOfConnections = GoogleTransitData.getNumberOfConnections();
+        const tripsOfConnections = new Int32Array(numberOfConnections);
+        const stopSequencesOfConnections = new Int32Array(numberOfConnections);
+        for(let i = 0; i < numberOfConnections; i++){
+            tripsOfConnections[i] = GoogleTransitData.getTripOfConnection(i);
+            stopSequencesOfConnections[i] = GoogleTransitData.getStopSequenceOfConnection(i);
+        }
+        const firstConnectionOfATrip = new Int32Array(GoogleTransitData.TRIPS.length + 1);
+        for(let i = 0; i < numberOfConnections; i++){
+            firstConnectionOfATrip[tripsOfConnections[i] + 1]++;
+        }
+        for(let i = 1; i < firstConnectionOfATrip.length; i++){
+            firstConnectionOfATrip[i] += firstConnectionOfATrip[i - 1];
+        }
+        const connectionsOfTrips = new Int32Array(numberOfConnections);
+        const nextPosition = firstConnectionOfATrip.slice();
+        for(let i = 0; i < numberOfConnections; i++){
+            connectionsOfTrips[nextPosition[tripsOfConnections[i]]++] = i;
+        }
+        this.connectionOfAStopTime = new Int32Array(GoogleTransitData.getNumberOfStopTimes()).fill(-1);
+        for(let tripId = 0; tripId < GoogleTransitData.TRIPS.length; tripId++){
+            if(GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId] === undefined){
+                continue;
+            }
+            const connectionsOfTrip = Array.from(connectionsOfTrips.subarray(firstConnectionOfATrip[tripId], firstConnectionOfATrip[tripId + 1]));
+            connectionsOfTrip.sort((a, b) => stopSequencesOfConnections[a] - stopSequencesOfConnections[b]);
+            // each connection arrives at the stop time with the same stop sequence
+            let stopTime = GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId];
+            const lastStopTime = this.getLastStopTimeOfTrip(tripId);
+            for(let connectionId of connectionsOfTrip){
+                while(stopTime < lastStopTime && GoogleTransitData.getStopSequenceOfStopTime(stopTime) < stopSequencesOfConnections[connectionId]){
+                    stopTime++;
+                }
+                if(GoogleTransitData.getStopSequenceOfStopTime(stopTime) === stopSequencesOfConnections[connectionId]){
+                    this.connectionOfAStopTime[stopTime] = connectionId;
+                }
+            }
+        }
+    }
+}
\ No newline at end of file
@@ -5,14 +5,40 @@ import { GoogleTransitData } from "./google-transit-data";
 import { Sorter } from "./sorter";
 import { Stop } from "../models/Stop";
 import { Calculator } from "./calculator";
-import { CHANGE_TIME } from "../constants";
+import { ServiceWindow } from "./service-window";
+import { CHANGE_TIME, FOOTPATH_RADIUS } from "../constants";
 import { cloneDeep } from "lodash";
 
+// length of a degree of latitude in kilometers (see Calculator.calculateDistance)
+const KILOMETERS_PER_DEGREE = 111.319;
+// number of the counts (connections, stop times, trips and footpaths) in front of the columns of the compact timetable
+const NUMBER_OF_COMPACT_COUNTS = 4;
+// columns of the compact timetable in the order of the shared memory with the position of their count. The int32
+// columns are stored before the uint8 columns, so each column is aligned.
+const COMPACT_COLUMNS: [string, 'int32' | 'uint8', number][] = [
+    ['CONNECTION_DEPARTURE_STOPS', 'int32', 0], ['CONNECTION_ARRIVAL_STOPS', 'int32', 0], ['CONNECTION_DEPARTURE_TIMES', 'int32', 0],
+    ['CONNECTION_ARRIVAL_TIMES', 'int32', 0], ['CONNECTION_TRIPS', 'int32', 0], ['CONNECTION_STOP_SEQUENCES', 'int32', 0],
+    ['STOPTIME_TRIPS', 'int32', 1], ['STOPTIME_STOPS', 'int32', 1], ['STOPTIME_ARRIVAL_TIMES', 'int32', 1],
+    ['STOPTIME_DEPARTURE_TIMES', 'int32', 1], ['STOPTIME_STOP_SEQUENCES', 'int32', 1], ['TRIP_ROUTES', 'int32', 2],
+    ['FOOTPATH_DEPARTURE_STOPS', 'int32', 3], ['FOOTPATH_ARRIVAL_STOPS', 'int32', 3],
+    ['CONNECTION_IS_AVAILABLE', 'uint8', 0], ['CONNECTION_IS_LONG_DISTANCE', 'uint8', 0], ['TRIP_IS_AVAILABLE', 'uint8', 2],
+    ['TRIP_IS_LONG_DISTANCE', 'uint8', 2],
+];
+
 interface newStopMapEntry {
     stopId: number,
     stopSequence: number,
 }
 
+// grid of the stops which is used to find the stops within the footpath radius
+interface StopGrid {
+    numberOfColumns: number,
+    rowsOfStops: Int32Array,
+    columnsOfStops: Int32Array,
+    // stop ids of each cell (row * numberOfColumns + column)
+    cells: Map<number, number[]>,
+}
+
 interface TripDeparturePair {
     tripId: number,
     departureTime: number,
@@ -61,9 +87,40 @@ export class Generator {
         GoogleTransitData.CONNECTIONS = connections;
     }
 
+    /**
+     * Generates for each weekday the ids and departure times of the available connections. The connection scans
+     * use these arrays instead of checking the availability of each connection.
+     */
+    public static generateConnectionsOfWeekdays() {
+        GoogleTransitData.CONNECTIONS_OF_A_WEEKDAY = new Array(7);
+        GoogleTransitData.CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY = new Array(7);
+        for(let weekday = 0; weekday < 7; weekday++){
+            let numberOfConnections = 0;
+            for(let connection of GoogleTransitData.CONNECTIONS){
+                if(GoogleTransitData.isAvailable(weekday, GoogleTransitData.TRIPS[connection.trip].isAvailable)){
+                    numberOfConnections++;
+                }
+            }
+            const connectionIds = new Int32Array(numberOfConnections);
+            const departureTimes = new Int32Array(numberOfConnections);
+            let position = 0;
+            for(let connection of GoogleTransitData.CONNECTIONS){
+                if(GoogleTransitData.isAvailable(weekday, GoogleTransitData.TRIPS[connection.trip].isAvailable)){
+                    connectionIds[position] = connection.id;
+                    departureTimes[position] = connection.departureTime;
+                    position++;
+                }
+            }
+            GoogleTransitData.CONNECTIONS_OF_A_WEEKDAY[weekday] = connectionIds;
+            GoogleTransitData.CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY[weekday] = departureTimes;
+        }
+    }
+
     /**
      * Generates all footpaths within stops. Sets footpaths between stop entries of the same stop to 2 minutes and footpath within the same stop entry to 0 minutes.
      * Footpaths are reflexive: if a foothpath between stop a and b exits, there is also a footpath between b and a with the same duration.
+     * Walking footpaths are created between stops with a distance less than FOOTPATH_RADIUS. The stops are stored in a grid, so only the stops
+     * of neighboring cells are compared.
      */
     public static generateFootpaths(){
         console.time('generate footpaths')
@@ -78,35 +135,59 @@ export class Generator {
             }
             GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.push(footpath);
             GoogleTransitData.FOOTPATHS_SORTED_BY_ARRIVAL_STOP.push(footpath);
-            // reflexive footpaths between stops with a distance less than 1km
-            // for(let j = i+1; j < GoogleTransitData.STOPS.length; j++) {
-            //     const stop2 = GoogleTransitData.STOPS[j];
-            //     let duration: number;
-            //     // calculates the distance between the stops
-            //     const distance = Calculator.calculateDistance(stop1.lat, stop2.lat, stop1.lon, stop2.lon);
-            //     // adds only foothpaths with a distance smaller than 1km
-            //     if(distance < 1){
-            //         // assume a speed of 4km/h
-            //         duration = Math.floor(15 * distance) * 60 + CHANGE_TIME;
-            //         // creates reflexive footpaths
-            //         let footpath: Footpath = {
-            //             id: GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.length,
-            //             departureStop: stop1.id,
-            //             arrivalStop: stop2.id,
-            //             duration: duration
-            //         };
-            //         GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.push(footpath);
-            //         GoogleTransitData.FOOTPATHS_SORTED_BY_ARRIVAL_STOP.push(footpath);
-            //         footpath = {
-            //             id: GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.length,
-            //             departureStop: stop2.id,
-            //             arrivalStop: stop1.id,
-            //             duration: duration
-            //         }
-            //         GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.push(footpath);
-            //         GoogleTransitData.FOOTPATHS_SORTED_BY_ARRIVAL_STOP.push(footpath);
-            //     }
-            // }
+        }
+
+        // reflexive footpaths between stops with a distance less than the radius
+        if(FOOTPATH_RADIUS > 0){
+            const stopGrid = this.getStopGrid(FOOTPATH_RADIUS);
+            for(let i = 0; i < GoogleTransitData.STOPS.length; i++){
+                const stop1 = GoogleTransitData.STOPS[i];
+                const row = stopGrid.rowsOfStops[i];
+                const column = stopGrid.columnsOfStops[i];
+                // the stops of the cell and its neighbors contain all stops within the radius
+                for(let neighborRow = row - 1; neighborRow <= row + 1; neighborRow++){
+                    for(let neighborColumn = column - 1; neighborColumn <= column + 1; neighborColumn++){
+                        if(neighborColumn < 0 || neighborColumn >= stopGrid.numberOfColumns){
+                            continue;
+                        }
+                        const stopsOfCell = stopGrid.cells.get(neighborRow * stopGrid.numberOfColumns + neighborColumn);
+                        if(stopsOfCell === undefined){
+                            continue;
+                        }
+                        for(let j of stopsOfCell){
+                            // compares each pair of stops only once
+                            if(j <= i){
+                                continue;
+                            }
+                            const stop2 = GoogleTransitData.STOPS[j];
+                            // calculates the distance between the stops
+                            const distance = Calculator.calculateDistance(stop1.lat, stop2.lat, stop1.lon, stop2.lon);
+                            if(distance >= FOOTPATH_RADIUS){
+                                continue;
+                            }
+                            // assume a speed of 4km/h
+                            const duration = Math.floor(15 * distance) * 60 + CHANGE_TIME;
+                            // creates reflexive footpaths
+                            let footpath: Footpath = {
+                                id: GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.length,
+                                departureStop: stop1.id,
+                                arrivalStop: stop2.id,
+                                duration: duration
+                            };
+                            GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.push(footpath);
+                            GoogleTransitData.FOOTPATHS_SORTED_BY_ARRIVAL_STOP.push(footpath);
+                            footpath = {
+                                id: GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.length,
+                                departureStop: stop2.id,
+                                arrivalStop: stop1.id,
+                                duration: duration
+                            }
+                            GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.push(footpath);
+                            GoogleTransitData.FOOTPATHS_SORTED_BY_ARRIVAL_STOP.push(footpath);
+                        }
+                    }
+                }
+            }
         }
 
         // sorts the footpaths by departure stop
@@ -162,6 +243,51 @@ export class Generator {
         }
     }
 
+    /**
+     * Stores the stops in a grid whose cells are at least as high and wide as the radius. Two stops with a distance less than
+     * the radius are in the same or in neighboring cells. The width of the cells uses the latitude which is farthest from
+     * the equator, as the approximated distance of Calculator.calculateDistance uses the mean latitude of two stops.
+     * @param radius 
+     * @returns 
+     */
+    private static getStopGrid(radius: number): StopGrid {
+        let minLat = Infinity;
+        let minLon = Infinity;
+        let maxLon = -Infinity;
+        let maxAbsoluteLat = 0;
+        for(let stop of GoogleTransitData.STOPS){
+            minLat = Math.min(minLat, stop.lat);
+            minLon = Math.min(minLon, stop.lon);
+            maxLon = Math.max(maxLon, stop.lon);
+            maxAbsoluteLat = Math.max(maxAbsoluteLat, Math.abs(stop.lat));
+        }
+        const cellHeight = radius / KILOMETERS_PER_DEGREE;
+        // uses one column if the cells would be wider than the stops
+        const cellWidth = Math.min(radius / (KILOMETERS_PER_DEGREE * Math.cos(maxAbsoluteLat * Math.PI / 180)), maxLon - minLon + 1);
+        const numberOfColumns = Math.floor((maxLon - minLon) / cellWidth) + 1;
+        const stopGrid: StopGrid = {
+            numberOfColumns: numberOfColumns,
+            rowsOfStops: new Int32Array(GoogleTransitData.STOPS.length),
+            columnsOfStops: new Int32Array(GoogleTransitData.STOPS.length),
+            cells: new Map<number, number[]>(),
+        }
+        for(let i = 0; i < GoogleTransitData.STOPS.length; i++){
+            const stop = GoogleTransitData.STOPS[i];
+            const row = Math.floor((stop.lat - minLat) / cellHeight);
+            const column = Math.floor((stop.lon - minLon) / cellWidth);
+            stopGrid.rowsOfStops[i] = row;
+            stopGrid.columnsOfStops[i] = column;
+            const cell = row * numberOfColumns + column;
+            let stopsOfCell = stopGrid.cells.get(cell);
+            if(stopsOfCell === undefined){
+                stopsOfCell = [];
+                stopGrid.cells.set(cell, stopsOfCell);
+            }
+            stopsOfCell.push(i);
+        }
+        return stopGrid;
+    }
+
     /**
      * Uses all stop times to generate routes which satisfy the following condition of the raptor algorithms: all trips of a route have the same sequence of stops.
      */
@@ -264,20 +390,13 @@ export class Generator {
     }
 
     /**
-     * Uses the calendar entries to set the IsAvailable value of each trip.
+     * Uses the calendar entries to set the IsAvailable value of each trip. Only the weekdays of the service date window
+     * are set if the window is enabled.
      */
     public static setIsAvailableOfTrips(){
         let serviceIdToBinaryNumberMap = new Map<number, number>();
         for(let calendarEntry of GoogleTransitData.CALENDAR){
-            let bit = 1;
-            let binaryNumber = 0;
-            for(let i = 6; i >= 0; i--){
-                if(calendarEntry.isAvailable[i]){
-                    binaryNumber += bit;
-                }
-                bit *= 2;
-            }
-            serviceIdToBinaryNumberMap.set(calendarEntry.serviceId, binaryNumber);
+            serviceIdToBinaryNumberMap.set(calendarEntry.serviceId, ServiceWindow.getAvailability(calendarEntry));
         }
         for(let trip of GoogleTransitData.TRIPS){
             trip.isAvailable = serviceIdToBinaryNumberMap.get(trip.serviceId);
@@ -370,4 +489,144 @@ export class Generator {
             stopTime.stopId = oldStopIdToNewStopIdMap.get(stopTime.stopId);
         }
     }
+
+    /**
+     * Generates the departure index of the raptor algorithms. It contains for each route and stop position the trip,
+     * arrival time and departure time of all trips of the route sorted by their departure time at this stop.
+     */
+    public static generateDepartureIndex() {
+        let numberOfEntries = 0;
+        for(let r = 0; r < GoogleTransitData.ROUTES.length; r++){
+            numberOfEntries += GoogleTransitData.TRIPS_OF_A_ROUTE[r].length * GoogleTransitData.STOPS_OF_A_ROUTE[r].length;
+        }
+        GoogleTransitData.DEPARTURE_INDEX_OF_A_ROUTE = new Array(GoogleTransitData.ROUTES.length);
+        GoogleTransitData.DEPARTURE_INDEX_TRIPS = new Int32Array(numberOfEntries);
+        GoogleTransitData.DEPARTURE_INDEX_ARRIVAL_TIMES = new Int32Array(numberOfEntries);
+        GoogleTransitData.DEPARTURE_INDEX_DEPARTURE_TIMES = new Int32Array(numberOfEntries);
+        GoogleTransitData.MAX_DWELL_TIMES_OF_A_ROUTE = new Array(GoogleTransitData.ROUTES.length);
+
+        let entry = 0;
+        for(let r = 0; r < GoogleTransitData.ROUTES.length; r++){
+            const tripsOfRoute = GoogleTransitData.TRIPS_OF_A_ROUTE[r];
+            const numberOfStops = GoogleTransitData.STOPS_OF_A_ROUTE[r].length;
+            const maxDwellTimes: number[] = new Array(numberOfStops);
+            GoogleTransitData.DEPARTURE_INDEX_OF_A_ROUTE[r] = entry;
+            for(let position = 0; position < numberOfStops; position++){
+                // all trips of a route have the same stop sequence
+                const stopTimes: StopTime[] = [];
+                for(let tripId of tripsOfRoute){
+                    stopTimes.push(GoogleTransitData.getStopTimeByTripAndPosition(tripId, position));
+                }
+                stopTimes.sort((a: StopTime, b: StopTime) => {
+                    return a.departureTime - b.departureTime;
+                });
+                maxDwellTimes[position] = 0;
+                for(let stopTime of stopTimes){
+                    GoogleTransitData.DEPARTURE_INDEX_TRIPS[entry] = stopTime.tripId;
+                    GoogleTransitData.DEPARTURE_INDEX_ARRIVAL_TIMES[entry] = stopTime.arrivalTime;
+                    GoogleTransitData.DEPARTURE_INDEX_DEPARTURE_TIMES[entry] = stopTime.departureTime;
+                    maxDwellTimes[position] = Math.max(maxDwellTimes[position], stopTime.departureTime - stopTime.arrivalTime);
+                    entry++;
+                }
+            }
+            GoogleTransitData.MAX_DWELL_TIMES_OF_A_ROUTE[r] = maxDwellTimes;
+        }
+    }
+
+    /**
+     * Stores the connections, stop times, trips and footpaths additionally as typed columns (struct of arrays) in
+     * shared memory. Must be called after all other generation steps and before removeObjectTables. The columns of
+     * another thread are used without copy if their shared memory is passed, the object tables are not needed then.
+     * @param sharedCompactTimetable 
+     */
+    public static generateCompactTimetable(sharedCompactTimetable?: SharedArrayBuffer) {
+        if(sharedCompactTimetable !== undefined){
+            this.createCompactColumns(sharedCompactTimetable);
+            return;
+        }
+        const counts = [GoogleTransitData.CONNECTIONS.length, GoogleTransitData.STOPTIMES.length, GoogleTransitData.TRIPS.length,
+            GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.length];
+        let byteLength = Int32Array.BYTES_PER_ELEMENT * NUMBER_OF_COMPACT_COUNTS;
+        for(let [, type, count] of COMPACT_COLUMNS){
+            byteLength += (type === 'int32' ? Int32Array.BYTES_PER_ELEMENT : Uint8Array.BYTES_PER_ELEMENT) * counts[count];
+        }
+        sharedCompactTimetable = new SharedArrayBuffer(byteLength);
+        new Int32Array(sharedCompactTimetable, 0, NUMBER_OF_COMPACT_COUNTS).set(counts);
+        this.createCompactColumns(sharedCompactTimetable);
+
+        const connections = GoogleTransitData.CONNECTIONS;
+        for(let i = 0; i < connections.length; i++){
+            const trip = GoogleTransitData.TRIPS[connections[i].trip];
+            GoogleTransitData.CONNECTION_DEPARTURE_STOPS[i] = connections[i].departureStop;
+            GoogleTransitData.CONNECTION_ARRIVAL_STOPS[i] = connections[i].arrivalStop;
+            GoogleTransitData.CONNECTION_DEPARTURE_TIMES[i] = connections[i].departureTime;
+            GoogleTransitData.CONNECTION_ARRIVAL_TIMES[i] = connections[i].arrivalTime;
+            GoogleTransitData.CONNECTION_TRIPS[i] = connections[i].trip;
+            GoogleTransitData.CONNECTION_STOP_SEQUENCES[i] = connections[i].stopSequence;
+            // the trip values are copied to avoid the lookup of the trip in the scans
+            GoogleTransitData.CONNECTION_IS_AVAILABLE[i] = trip.isAvailable;
+            GoogleTransitData.CONNECTION_IS_LONG_DISTANCE[i] = trip.isLongDistance ? 1 : 0;
+        }
+
+        const stopTimes = GoogleTransitData.STOPTIMES;
+        for(let i = 0; i < stopTimes.length; i++){
+            GoogleTransitData.STOPTIME_TRIPS[i] = stopTimes[i].tripId;
+            GoogleTransitData.STOPTIME_STOPS[i] = stopTimes[i].stopId;
+            GoogleTransitData.STOPTIME_ARRIVAL_TIMES[i] = stopTimes[i].arrivalTime;
+            GoogleTransitData.STOPTIME_DEPARTURE_TIMES[i] = stopTimes[i].departureTime;
+            GoogleTransitData.STOPTIME_STOP_SEQUENCES[i] = stopTimes[i].stopSequence;
+        }
+
+        const trips = GoogleTransitData.TRIPS;
+        for(let i = 0; i < trips.length; i++){
+            GoogleTransitData.TRIP_ROUTES[i] = trips[i].routeId;
+            GoogleTransitData.TRIP_IS_AVAILABLE[i] = trips[i].isAvailable;
+            GoogleTransitData.TRIP_IS_LONG_DISTANCE[i] = trips[i].isLongDistance ? 1 : 0;
+        }
+
+        for(let i = 0; i < GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.length; i++){
+            GoogleTransitData.FOOTPATH_DEPARTURE_STOPS[i] = GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP[i].departureStop;
+            GoogleTransitData.FOOTPATH_ARRIVAL_STOPS[i] = GoogleTransitData.FOOTPATHS_SORTED_BY_ARRIVAL_STOP[i].arrivalStop;
+        }
+    }
+
+    /**
+     * Gets the shared memory of the compact timetable which is passed to the worker threads. Returns null if the
+     * compact timetable is not generated.
+     * @returns 
+     */
+    public static getSharedCompactTimetable(): SharedArrayBuffer {
+        if(GoogleTransitData.CONNECTION_DEPARTURE_STOPS === undefined){
+            return null;
+        }
+        return GoogleTransitData.CONNECTION_DEPARTURE_STOPS.buffer as SharedArrayBuffer;
+    }
+
+    /**
+     * Removes the connection and stop time objects which are replaced by the columns of the compact timetable. The
+     * algorithms read them by the accessors of GoogleTransitData. The snapshot has to be written before. The trips and
+     * footpaths are kept because the responses use their objects.
+     */
+    public static removeObjectTables() {
+        GoogleTransitData.CONNECTIONS = undefined;
+        GoogleTransitData.STOPTIMES = undefined;
+    }
+
+    /**
+     * Creates the columns of the compact timetable as views of the shared memory.
+     * @param sharedCompactTimetable 
+     */
+    private static createCompactColumns(sharedCompactTimetable: SharedArrayBuffer) {
+        const counts = new Int32Array(sharedCompactTimetable, 0, NUMBER_OF_COMPACT_COUNTS);
+        let byteOffset = Int32Array.BYTES_PER_ELEMENT * NUMBER_OF_COMPACT_COUNTS;
+        for(let [column, type, count] of COMPACT_COLUMNS){
+            if(type === 'int32'){
+                GoogleTransitData[column] = new Int32Array(sharedCompactTimetable, byteOffset, counts[count]);
+                byteOffset += Int32Array.BYTES_PER_ELEMENT * counts[count];
+            } else {
+                GoogleTransitData[column] = new Uint8Array(sharedCompactTimetable, byteOffset, counts[count]);
+                byteOffset += Uint8Array.BYTES_PER_ELEMENT * counts[count];
+            }
+        }
+    }
 }
\ No newline at end of file
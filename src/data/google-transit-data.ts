@@ -6,6 +6,8 @@ import { Footpath } from "../models/Footpath";
 import { Trip } from "../models/Trip";
 import { Connection } from "../models/Connection";
 import { RouteStopMapping } from "../models/RouteStopMapping";
+import { COMPACT_TIMETABLE } from "../constants";
+import { StopNameIndex } from "./stop-name-index";
 
 export class GoogleTransitData {
     // Stores data of the imported gtfs files.
@@ -18,30 +20,57 @@ export class GoogleTransitData {
     public static TRIPS: Trip[] = [];
     // connections of connection scan algorithm
     public static CONNECTIONS: Connection[] = [];
+    // ids and departure times of the connections which are available on each weekday (sorted by departure time)
+    public static CONNECTIONS_OF_A_WEEKDAY: Int32Array[];
+    public static CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY: Int32Array[];
     // pointer to optimize the raptor algorithm
     public static ROUTES_SERVING_STOPS: RouteStopMapping[][];
     public static STOPS_OF_A_ROUTE: number[][];
     public static STOPTIMES_OF_A_TRIP: number[];
     public static TRIPS_OF_A_ROUTE: number[][];
+    // departure index: entries of each route and stop position sorted by departure time
+    public static DEPARTURE_INDEX_OF_A_ROUTE: number[];
+    public static DEPARTURE_INDEX_TRIPS: Int32Array;
+    public static DEPARTURE_INDEX_ARRIVAL_TIMES: Int32Array;
+    public static DEPARTURE_INDEX_DEPARTURE_TIMES: Int32Array;
+    // maximum difference between departure and arrival time of the trips of a route at each stop position
+    public static MAX_DWELL_TIMES_OF_A_ROUTE: number[][];
     // pointer to get faster all footpaths of a stop
     public static FOOTPATHS_OF_A_DEPARTURE_STOP: number[];
     public static FOOTPATHS_OF_A_ARRIVAL_STOP: number[];
+    // typed columns of the compact timetable (only generated if COMPACT_TIMETABLE is enabled). They replace the connection
+    // and stop time objects, which are removed after the columns are generated.
+    public static CONNECTION_DEPARTURE_STOPS: Int32Array;
+    public static CONNECTION_ARRIVAL_STOPS: Int32Array;
+    public static CONNECTION_DEPARTURE_TIMES: Int32Array;
+    public static CONNECTION_ARRIVAL_TIMES: Int32Array;
+    public static CONNECTION_TRIPS: Int32Array;
+    public static CONNECTION_IS_AVAILABLE: Uint8Array;
+    public static CONNECTION_IS_LONG_DISTANCE: Uint8Array;
+    public static CONNECTION_STOP_SEQUENCES: Int32Array;
+    public static STOPTIME_TRIPS: Int32Array;
+    public static STOPTIME_STOPS: Int32Array;
+    public static STOPTIME_ARRIVAL_TIMES: Int32Array;
+    public static STOPTIME_DEPARTURE_TIMES: Int32Array;
+    public static STOPTIME_STOP_SEQUENCES: Int32Array;
+    public static TRIP_ROUTES: Int32Array;
+    public static TRIP_IS_AVAILABLE: Uint8Array;
+    public static TRIP_IS_LONG_DISTANCE: Uint8Array;
+    // departure stops of FOOTPATHS_SORTED_BY_DEPARTURE_STOP and arrival stops of FOOTPATHS_SORTED_BY_ARRIVAL_STOP
+    public static FOOTPATH_DEPARTURE_STOPS: Int32Array;
+    public static FOOTPATH_ARRIVAL_STOPS: Int32Array;
+    // real-time delays (in seconds) of the stop times and the arrival delays of the connections (set by the delay feed)
+    public static STOPTIME_ARRIVAL_DELAYS: Int32Array;
+    public static STOPTIME_DEPARTURE_DELAYS: Int32Array;
+    public static CONNECTION_ARRIVAL_DELAYS: Int32Array;
 
     /**
-     * Gets all stop ids with a given stop name.
+     * Gets all stop ids with a given stop name (ignores case and diacritics).
      * @param name 
      * @returns 
      */
     public static getStopIdsByName(name: string): number[]{
-        const searchName = name.toLowerCase();
-        const stops: number[] = [];
-        for(let i = 0; i < this.STOPS.length; i++){
-            const stopName = this.STOPS[i].name.toLowerCase();
-            if(stopName === searchName){
-                stops.push(this.STOPS[i].id)
-            }
-        }
-        return stops;
+        return StopNameIndex.getStopIds(name);
     }
 
     /**
@@ -50,14 +79,7 @@ export class GoogleTransitData {
      * @returns 
      */
      public static getStopIdByName(name: string): number{
-        const searchName = name.toLowerCase();
-        for(let i = 0; i < this.STOPS.length; i++){
-            const stopName = this.STOPS[i].name.toLowerCase();
-            if(stopName === searchName){
-                return this.STOPS[i].id;
-            }
-        }
-        return null;
+        return StopNameIndex.getStopId(name);
     }
 
     /**
@@ -70,7 +92,7 @@ export class GoogleTransitData {
         let firstFootpathOfStop = GoogleTransitData.FOOTPATHS_OF_A_DEPARTURE_STOP[stopID];
         if(firstFootpathOfStop !== undefined){
             for(let i = firstFootpathOfStop; i < this.FOOTPATHS_SORTED_BY_DEPARTURE_STOP.length; i++){
-                if(this.FOOTPATHS_SORTED_BY_DEPARTURE_STOP[i].departureStop === stopID){
+                if(this.getDepartureStopOfFootpath(i) === stopID){
                     footpaths.push(this.FOOTPATHS_SORTED_BY_DEPARTURE_STOP[i]);
                 } else {
                     break;
@@ -90,7 +112,7 @@ export class GoogleTransitData {
         let firstFootpathOfStop = GoogleTransitData.FOOTPATHS_OF_A_ARRIVAL_STOP[stopID];
         if(firstFootpathOfStop !== undefined){
             for(let i = firstFootpathOfStop; i < this.FOOTPATHS_SORTED_BY_ARRIVAL_STOP.length; i++){
-                if(this.FOOTPATHS_SORTED_BY_ARRIVAL_STOP[i].arrivalStop === stopID){
+                if(this.getArrivalStopOfFootpath(i) === stopID){
                     footpaths.push(this.FOOTPATHS_SORTED_BY_ARRIVAL_STOP[i]);
                 } else {
                     break;
@@ -111,13 +133,12 @@ export class GoogleTransitData {
             return null;
         }
         let firstStopTimeOfTrip = GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId];
-        for(let i = firstStopTimeOfTrip; i < GoogleTransitData.STOPTIMES.length; i++) {
-            let stopTime = GoogleTransitData.STOPTIMES[i];
-            if(stopTime.tripId !== tripId){
+        for(let i = firstStopTimeOfTrip; i < this.getNumberOfStopTimes(); i++) {
+            if(this.getTripOfStopTime(i) !== tripId){
                 break;
             }
-            if(stopTime.tripId === tripId && stopTime.stopId === stopId){
-                return stopTime;
+            if(this.getStopOfStopTime(i) === stopId){
+                return this.getStopTime(i);
             }
         }
         return null;
@@ -134,8 +155,8 @@ export class GoogleTransitData {
         }
         let stopTimes = [];
         let firstStopTimeOfTrip = GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId];
-        for(let i = firstStopTimeOfTrip; i < GoogleTransitData.STOPTIMES.length; i++) {
-            let stopTime = GoogleTransitData.STOPTIMES[i];
+        for(let i = firstStopTimeOfTrip; i < this.getNumberOfStopTimes(); i++) {
+            let stopTime = this.getStopTime(i);
             if(stopTime.tripId !== tripId){
                 break;
             }
@@ -145,32 +166,35 @@ export class GoogleTransitData {
     }
 
     /**
-     * Gets all stop times of a given stop and route.
-     * @param stopId 
+     * Gets the stop time of a trip at the given stop position of its route.
+     * @param tripId 
+     * @param position 
+     * @returns 
+     */
+    public static getStopTimeByTripAndPosition(tripId: number, position: number): StopTime {
+        return this.getStopTime(GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId] + position);
+    }
+
+    /**
+     * Gets the id of the stop time of a trip at the given stop position of its route. The values of the stop time are read
+     * with the column accessors (e.g. getDepartureTimeOfStopTime) without creating a stop time object.
+     * @param tripId 
+     * @param position 
+     * @returns 
+     */
+    public static getStopTimeIdByTripAndPosition(tripId: number, position: number): number {
+        return GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId] + position;
+    }
+
+    /**
+     * Gets the first entry of the departure index of a route at the given stop position.
+     * The entries of the route stop end after TRIPS_OF_A_ROUTE[r].length entries.
      * @param r 
+     * @param position 
      * @returns 
      */
-    public static getStopTimesByStopAndRoute(stopId: number, r: number): StopTime[] {
-        if(r === undefined || stopId === undefined){
-            return [];
-        }
-        let stopTimes = [];
-        let tripsOfRoute = GoogleTransitData.TRIPS_OF_A_ROUTE[r];
-        for(let i = 0; i < tripsOfRoute.length; i++){
-            let tripId = tripsOfRoute[i];
-            let firstStopTimeOfTrip = GoogleTransitData.STOPTIMES_OF_A_TRIP[tripId];
-            for(let j = firstStopTimeOfTrip; j < GoogleTransitData.STOPTIMES.length; j++) {
-                let stopTime = GoogleTransitData.STOPTIMES[j];
-                if(tripId !== stopTime.tripId){
-                    break;
-                }
-                let routeId = GoogleTransitData.TRIPS[stopTime.tripId].routeId;
-                if(stopTime.stopId === stopId && routeId === r){
-                    stopTimes.push(stopTime);
-                }
-            }
-        }
-        return stopTimes;
+    public static getFirstEntryOfDepartureIndex(r: number, position: number): number {
+        return GoogleTransitData.DEPARTURE_INDEX_OF_A_ROUTE[r] + position * GoogleTransitData.TRIPS_OF_A_ROUTE[r].length;
     }
 
     /**
@@ -198,4 +222,287 @@ export class GoogleTransitData {
             return false;
         }
     }
+
+    /**
+     * Checks if a trip is available at a given weekday.
+     * @param tripId 
+     * @param weekday 
+     * @returns 
+     */
+    public static isTripAvailable(tripId: number, weekday: number): boolean {
+        if(COMPACT_TIMETABLE){
+            return this.isAvailable(weekday, this.TRIP_IS_AVAILABLE[tripId]);
+        }
+        return this.isAvailable(weekday, this.TRIPS[tripId].isAvailable);
+    }
+
+    /**
+     * Checks if a trip is a long distance trip.
+     * @param tripId 
+     * @returns 
+     */
+    public static isLongDistanceTrip(tripId: number): boolean {
+        if(COMPACT_TIMETABLE){
+            return this.TRIP_IS_LONG_DISTANCE[tripId] === 1;
+        }
+        return this.TRIPS[tripId].isLongDistance;
+    }
+
+    /**
+     * Gets the route of a trip.
+     * @param tripId 
+     * @returns 
+     */
+    public static getRouteOfTrip(tripId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.TRIP_ROUTES[tripId];
+        }
+        return this.TRIPS[tripId].routeId;
+    }
+
+    /**
+     * Gets the number of connections.
+     * @returns 
+     */
+    public static getNumberOfConnections(): number {
+        if(this.CONNECTIONS === undefined){
+            return this.CONNECTION_DEPARTURE_TIMES.length;
+        }
+        return this.CONNECTIONS.length;
+    }
+
+    /**
+     * Gets a connection. The connection is created from the columns of the compact timetable if the connection objects
+     * are removed.
+     * @param connectionId 
+     * @returns 
+     */
+    public static getConnection(connectionId: number): Connection {
+        if(this.CONNECTIONS === undefined){
+            return {
+                id: connectionId,
+                departureStop: this.CONNECTION_DEPARTURE_STOPS[connectionId],
+                arrivalStop: this.CONNECTION_ARRIVAL_STOPS[connectionId],
+                departureTime: this.CONNECTION_DEPARTURE_TIMES[connectionId],
+                arrivalTime: this.CONNECTION_ARRIVAL_TIMES[connectionId],
+                trip: this.CONNECTION_TRIPS[connectionId],
+                stopSequence: this.CONNECTION_STOP_SEQUENCES[connectionId],
+            };
+        }
+        return this.CONNECTIONS[connectionId];
+    }
+
+    /**
+     * Gets the departure time of a connection. Returns undefined if the connection doesn't exist.
+     * @param connectionId 
+     * @returns 
+     */
+    public static getDepartureTimeOfConnection(connectionId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.CONNECTION_DEPARTURE_TIMES[connectionId];
+        }
+        const connection = this.CONNECTIONS[connectionId];
+        return connection !== undefined ? connection.departureTime : undefined;
+    }
+
+    /**
+     * Gets the arrival time of a connection.
+     * @param connectionId 
+     * @returns 
+     */
+    public static getArrivalTimeOfConnection(connectionId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.CONNECTION_ARRIVAL_TIMES[connectionId];
+        }
+        return this.CONNECTIONS[connectionId].arrivalTime;
+    }
+
+    /**
+     * Gets the departure stop of a connection.
+     * @param connectionId 
+     * @returns 
+     */
+    public static getDepartureStopOfConnection(connectionId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.CONNECTION_DEPARTURE_STOPS[connectionId];
+        }
+        return this.CONNECTIONS[connectionId].departureStop;
+    }
+
+    /**
+     * Gets the arrival stop of a connection.
+     * @param connectionId 
+     * @returns 
+     */
+    public static getArrivalStopOfConnection(connectionId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.CONNECTION_ARRIVAL_STOPS[connectionId];
+        }
+        return this.CONNECTIONS[connectionId].arrivalStop;
+    }
+
+    /**
+     * Gets the trip of a connection.
+     * @param connectionId 
+     * @returns 
+     */
+    public static getTripOfConnection(connectionId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.CONNECTION_TRIPS[connectionId];
+        }
+        return this.CONNECTIONS[connectionId].trip;
+    }
+
+    /**
+     * Gets the stop sequence of a connection.
+     * @param connectionId 
+     * @returns 
+     */
+    public static getStopSequenceOfConnection(connectionId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.CONNECTION_STOP_SEQUENCES[connectionId];
+        }
+        return this.CONNECTIONS[connectionId].stopSequence;
+    }
+
+    /**
+     * Checks if the trip of a connection is available at a given weekday.
+     * @param connectionId 
+     * @param weekday 
+     * @returns 
+     */
+    public static isConnectionAvailable(connectionId: number, weekday: number): boolean {
+        if(COMPACT_TIMETABLE){
+            return this.isAvailable(weekday, this.CONNECTION_IS_AVAILABLE[connectionId]);
+        }
+        return this.isAvailable(weekday, this.TRIPS[this.CONNECTIONS[connectionId].trip].isAvailable);
+    }
+
+    /**
+     * Checks if the trip of a connection is a long distance trip.
+     * @param connectionId 
+     * @returns 
+     */
+    public static isLongDistanceConnection(connectionId: number): boolean {
+        if(COMPACT_TIMETABLE){
+            return this.CONNECTION_IS_LONG_DISTANCE[connectionId] === 1;
+        }
+        return this.TRIPS[this.CONNECTIONS[connectionId].trip].isLongDistance;
+    }
+
+    /**
+     * Gets the trip of a stop time.
+     * @param stopTimeId 
+     * @returns 
+     */
+    public static getTripOfStopTime(stopTimeId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.STOPTIME_TRIPS[stopTimeId];
+        }
+        return this.STOPTIMES[stopTimeId].tripId;
+    }
+
+    /**
+     * Gets the stop of a stop time.
+     * @param stopTimeId 
+     * @returns 
+     */
+    public static getStopOfStopTime(stopTimeId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.STOPTIME_STOPS[stopTimeId];
+        }
+        return this.STOPTIMES[stopTimeId].stopId;
+    }
+
+    /**
+     * Gets the arrival time of a stop time.
+     * @param stopTimeId 
+     * @returns 
+     */
+    public static getArrivalTimeOfStopTime(stopTimeId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.STOPTIME_ARRIVAL_TIMES[stopTimeId];
+        }
+        return this.STOPTIMES[stopTimeId].arrivalTime;
+    }
+
+    /**
+     * Gets the departure time of a stop time.
+     * @param stopTimeId 
+     * @returns 
+     */
+    public static getDepartureTimeOfStopTime(stopTimeId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.STOPTIME_DEPARTURE_TIMES[stopTimeId];
+        }
+        return this.STOPTIMES[stopTimeId].departureTime;
+    }
+
+    /**
+     * Gets the number of stop times.
+     * @returns 
+     */
+    public static getNumberOfStopTimes(): number {
+        if(this.STOPTIMES === undefined){
+            return this.STOPTIME_TRIPS.length;
+        }
+        return this.STOPTIMES.length;
+    }
+
+    /**
+     * Gets a stop time. The stop time is created from the columns of the compact timetable if the stop time objects are
+     * removed, the columns don't contain the pickup and drop off types because the algorithms don't use them.
+     * @param stopTimeId 
+     * @returns 
+     */
+    public static getStopTime(stopTimeId: number): StopTime {
+        if(this.STOPTIMES === undefined){
+            return {
+                tripId: this.STOPTIME_TRIPS[stopTimeId],
+                arrivalTime: this.STOPTIME_ARRIVAL_TIMES[stopTimeId],
+                departureTime: this.STOPTIME_DEPARTURE_TIMES[stopTimeId],
+                stopId: this.STOPTIME_STOPS[stopTimeId],
+                stopSequence: this.STOPTIME_STOP_SEQUENCES[stopTimeId],
+                pickupType: undefined,
+                dropOffType: undefined,
+            };
+        }
+        return this.STOPTIMES[stopTimeId];
+    }
+
+    /**
+     * Gets the stop sequence of a stop time.
+     * @param stopTimeId 
+     * @returns 
+     */
+    public static getStopSequenceOfStopTime(stopTimeId: number): number {
+        if(this.STOPTIMES === undefined){
+            return this.STOPTIME_STOP_SEQUENCES[stopTimeId];
+        }
+        return this.STOPTIMES[stopTimeId].stopSequence;
+    }
+
+    /**
+     * Gets the departure stop of a footpath of FOOTPATHS_SORTED_BY_DEPARTURE_STOP.
+     * @param footpathId 
+     * @returns 
+     */
+    public static getDepartureStopOfFootpath(footpathId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.FOOTPATH_DEPARTURE_STOPS[footpathId];
+        }
+        return this.FOOTPATHS_SORTED_BY_DEPARTURE_STOP[footpathId].departureStop;
+    }
+
+    /**
+     * Gets the arrival stop of a footpath of FOOTPATHS_SORTED_BY_ARRIVAL_STOP.
+     * @param footpathId 
+     * @returns 
+     */
+    public static getArrivalStopOfFootpath(footpathId: number): number {
+        if(COMPACT_TIMETABLE){
+            return this.FOOTPATH_ARRIVAL_STOPS[footpathId];
+        }
+        return this.FOOTPATHS_SORTED_BY_ARRIVAL_STOP[footpathId].arrivalStop;
+    }
 }
\ No newline at end of file
@@ -1,4 +1,7 @@
-import {readFileSync} from 'fs';
+import fs from 'fs';
+import zlib from 'zlib';
+import { Readable } from 'stream';
+import csv from 'csv-parser';
 import { GoogleTransitData } from './google-transit-data';
 import { Stop  } from '../models/Stop';
 import path from 'path'
@@ -7,37 +10,63 @@ import { Route } from '../models/Routes';
 import { StopTime } from '../models/StopTime';
 import { Trip } from '../models/Trip';
 import { Converter } from './converter';
+import { ServiceWindow } from './service-window';
 
 export class Importer {
     // directory of the gtfs files.
     public static readonly GOOGLE_TRANSIT_DIRECTORY: string = path.join(__dirname, '../../data/');
+    // imported gtfs feeds (directory or zip file with the same name) and whether their trips are long distance trips
+    private static readonly DIRECTORIES: [string, boolean][] = [['latest_schienenregionalverkehr', false], ['latest_schienenfernverkehr', true]];
+    // imported files of each gtfs feed
+    private static readonly FILES: string[] = ['calendar.txt', 'routes.txt', 'stops.txt', 'trips.txt', 'stop_times.txt'];
     // maps to set the new ids. New ids should be equal to the position of the entry in the array.
-    private static stopIdMap = new Map<number, number>();
-    private static tripIdMap = new Map<number, number>();
-    private static routeIdMap = new Map<number, number>();
-    private static serviceIdMap = new Map<number, number>();
+    private static stopIdMap = new Map<string, number>();
+    private static tripIdMap = new Map<string, number>();
+    private static routeIdMap = new Map<string, number>();
+    private static serviceIdMap = new Map<string, number>();
 
     /**
-     * Imports the files of all gtfs directories.
+     * Imports the files of all gtfs feeds.
      */
-    public static importGoogleTransitData(): void {
+    public static async importGoogleTransitData(): Promise<void> {
         console.time('complete import')
         this.resetArrays();
-        this.importDirectory('latest_schienenregionalverkehr', false)
-        this.importDirectory('latest_schienenfernverkehr', true)
+        for(let [directoryName, isLongDistance] of this.DIRECTORIES){
+            await this.importDirectory(directoryName, isLongDistance);
+        }
         console.timeEnd('complete import')
     }
 
     /**
-     * Imports all relevant files of the given directory.
+     * Gets the paths of all imported gtfs files. Returns the zip file if a feed is not extracted.
+     * @returns 
+     */
+    public static getImportedFiles(): string[] {
+        let files: string[] = [];
+        for(let [directoryName] of this.DIRECTORIES){
+            const directory = path.join(this.GOOGLE_TRANSIT_DIRECTORY, directoryName);
+            if(!fs.existsSync(directory)){
+                files.push(directory + '.zip');
+                continue;
+            }
+            for(let filename of this.FILES){
+                files.push(path.join(directory, filename));
+            }
+        }
+        return files;
+    }
+
+    /**
+     * Imports all relevant files of the given feed.
      * @param directoryName 
+     * @param isLongDistance 
      */
-    private static importDirectory(directoryName: string, isLongDistance: boolean): void {
-        Importer.importCalendar(directoryName + '/calendar.txt');
-        Importer.importRoutes(directoryName + '/routes.txt');
-        Importer.importStops(directoryName + '/stops.txt');
-        Importer.importTrips(directoryName + '/trips.txt', isLongDistance);
-        Importer.importStopTimes(directoryName + '/stop_times.txt');
+    private static async importDirectory(directoryName: string, isLongDistance: boolean): Promise<void> {
+        await Importer.importCalendar(directoryName);
+        await Importer.importRoutes(directoryName);
+        await Importer.importStops(directoryName);
+        await Importer.importTrips(directoryName, isLongDistance);
+        await Importer.importStopTimes(directoryName);
     }
 
     /**
@@ -49,24 +78,136 @@ export class Importer {
         GoogleTransitData.STOPS = [];
         GoogleTransitData.TRIPS = [];
         GoogleTransitData.STOPTIMES = [];
+        // the footpaths are generated again from the imported stops
+        GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP = [];
+        GoogleTransitData.FOOTPATHS_SORTED_BY_ARRIVAL_STOP = [];
+        GoogleTransitData.FOOTPATHS_OF_A_DEPARTURE_STOP = [];
+        GoogleTransitData.FOOTPATHS_OF_A_ARRIVAL_STOP = [];
+    }
+
+    /**
+     * Reads a gtfs file row by row. The rows contain the values of each column name and are passed to the callback
+     * without storing the file. Rejects if a required column is missing.
+     * @param directoryName 
+     * @param filename 
+     * @param requiredColumns 
+     * @param processRow 
+     * @returns 
+     */
+    private static readTable(directoryName: string, filename: string, requiredColumns: string[], processRow: (row: any) => void): Promise<void> {
+        return new Promise<void>((resolve, reject) => {
+            const file = this.openFile(directoryName, filename);
+            file.on('error', reject);
+            file.pipe(csv({
+                    // removes the byte order mark and whitespaces of the column names
+                    mapHeaders: ({ header }) => header.replace(/^\uFEFF/, '').trim(),
+                }))
+                .on('headers', (headers: string[]) => {
+                    for(let column of requiredColumns){
+                        if(!headers.includes(column)){
+                            file.destroy();
+                            reject(new Error('column ' + column + ' is missing in ' + directoryName + '/' + filename));
+                            return;
+                        }
+                    }
+                })
+                .on('data', processRow)
+                .on('end', () => resolve())
+                .on('error', reject);
+        });
+    }
+
+    /**
+     * Opens a file of the feed directory or, if the directory does not exist, the file of the zipped feed.
+     * @param directoryName 
+     * @param filename 
+     * @returns 
+     */
+    private static openFile(directoryName: string, filename: string): Readable {
+        const directory = path.join(this.GOOGLE_TRANSIT_DIRECTORY, directoryName);
+        if(fs.existsSync(directory)){
+            return fs.createReadStream(path.join(directory, filename));
+        }
+        return this.openZipEntry(directory + '.zip', filename);
+    }
+
+    /**
+     * Opens a stream of a (stored or deflated) file in a zip archive. Uses the central directory to find the file.
+     * @param zipFile 
+     * @param filename 
+     * @returns 
+     */
+    private static openZipEntry(zipFile: string, filename: string): Readable {
+        const fileDescriptor = fs.openSync(zipFile, 'r');
+        let method: number;
+        let dataStart: number;
+        let compressedSize: number;
+        try {
+            // the end of central directory record is followed by a comment of at most 65535 bytes
+            const fileSize = fs.fstatSync(fileDescriptor).size;
+            const tail = Buffer.alloc(Math.min(fileSize, 65557));
+            fs.readSync(fileDescriptor, tail, 0, tail.length, fileSize - tail.length);
+            const endOfCentralDirectory = tail.lastIndexOf(Buffer.from([0x50, 0x4b, 0x05, 0x06]));
+            if(endOfCentralDirectory === -1){
+                throw new Error(zipFile + ' is not a zip file');
+            }
+            const centralDirectorySize = tail.readUInt32LE(endOfCentralDirectory + 12);
+            const centralDirectoryOffset = tail.readUInt32LE(endOfCentralDirectory + 16);
+            if(centralDirectoryOffset === 0xFFFFFFFF){
+                throw new Error('zip64 files are not supported: ' + zipFile);
+            }
+            const centralDirectory = Buffer.alloc(centralDirectorySize);
+            fs.readSync(fileDescriptor, centralDirectory, 0, centralDirectorySize, centralDirectoryOffset);
+            let position = 0;
+            while(position + 46 <= centralDirectorySize && centralDirectory.readUInt32LE(position) === 0x02014b50){
+                const nameLength = centralDirectory.readUInt16LE(position + 28);
+                const name = centralDirectory.toString('utf8', position + 46, position + 46 + nameLength);
+                // files can be stored in a sub directory of the archive
+                if(path.posix.basename(name) === filename){
+                    method = centralDirectory.readUInt16LE(position + 10);
+                    compressedSize = centralDirectory.readUInt32LE(position + 20);
+                    const localHeaderOffset = centralDirectory.readUInt32LE(position + 42);
+                    const localHeader = Buffer.alloc(30);
+                    fs.readSync(fileDescriptor, localHeader, 0, 30, localHeaderOffset);
+                    dataStart = localHeaderOffset + 30 + localHeader.readUInt16LE(26) + localHeader.readUInt16LE(28);
+                    break;
+                }
+                position += 46 + nameLength + centralDirectory.readUInt16LE(position + 30) + centralDirectory.readUInt16LE(position + 32);
+            }
+        } finally {
+            fs.closeSync(fileDescriptor);
+        }
+        if(dataStart === undefined){
+            throw new Error(filename + ' is missing in ' + zipFile);
+        }
+        if(method !== 0 && method !== 8){
+            throw new Error('compression method ' + method + ' of ' + filename + ' is not supported');
+        }
+        if(compressedSize === 0){
+            return new Readable({ read() { this.push(null); } });
+        }
+        const compressedData = fs.createReadStream(zipFile, {start: dataStart, end: dataStart + compressedSize - 1});
+        if(method === 0){
+            return compressedData;
+        }
+        const inflate = zlib.createInflateRaw();
+        compressedData.on('error', (error) => inflate.destroy(error));
+        return compressedData.pipe(inflate);
     }
 
     /**
      * Imports the calendar table.
+     * @param directoryName 
      */
-    private static importCalendar(filename: string): void {
+    private static async importCalendar(directoryName: string): Promise<void> {
         console.time('import calendar table');
         const importedCalendar = GoogleTransitData.CALENDAR;
-        this.serviceIdMap = new Map<number, number>();
-        const calendarData: string[] = readFileSync(path.join(this.GOOGLE_TRANSIT_DIRECTORY, filename), 'utf-8').toString().split('\n');
-        for(let i = 1; i < calendarData.length - 1; i++){
-            const currentCalendarAsArray: string[] = calendarData[i].split(',');
-            const startDate = currentCalendarAsArray[7]
-            const endDate = currentCalendarAsArray[8];
-            const serviceId = Number(currentCalendarAsArray[9]);
+        this.serviceIdMap = new Map<string, number>();
+        const weekdays = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'];
+        await this.readTable(directoryName, 'calendar.txt', weekdays.concat(['start_date', 'end_date', 'service_id']), (row) => {
             const isAvailable = new Array(7);
             for(let i = 0; i < 7; i++){
-                if(currentCalendarAsArray[i] === '1'){
+                if(row[weekdays[i]] === '1'){
                     isAvailable[i] = true;
                 } else {
                     isAvailable[i] = false;
@@ -75,144 +216,122 @@ export class Importer {
             const calendar: Calendar = {
                 serviceId: importedCalendar.length,
                 isAvailable: isAvailable,
-                startDate: startDate,
-                endDate: endDate
+                startDate: row['start_date'],
+                endDate: row['end_date']
             }
             // sets the new id
-            this.serviceIdMap.set(serviceId, calendar.serviceId);
+            this.serviceIdMap.set(row['service_id'], calendar.serviceId);
             importedCalendar.push(calendar);
-        }
+        });
         GoogleTransitData.CALENDAR = importedCalendar;
         console.timeEnd('import calendar table');
     }
 
     /**
      * Imports the routes table.
+     * @param directoryName 
      */
-    private static importRoutes(filename: string): void {
+    private static async importRoutes(directoryName: string): Promise<void> {
         console.time('import route table');
         const importedRoutes = GoogleTransitData.ROUTES;
-        this.routeIdMap = new Map<number, number>();
-        const routeData: string[] = readFileSync(path.join(this.GOOGLE_TRANSIT_DIRECTORY, filename), 'utf-8').toString().split('\n');
-        for(let i = 1; i < routeData.length - 1; i++){
-            const currentRouteAsArray: string[] = routeData[i].split(',');
-            const id = Number(currentRouteAsArray[4]);
-            const agencyId = Number(currentRouteAsArray[2]);
-            const shortName = currentRouteAsArray[1];
-            const longName = currentRouteAsArray[0];
-            const routeType = Number(currentRouteAsArray[3]);
+        this.routeIdMap = new Map<string, number>();
+        await this.readTable(directoryName, 'routes.txt', ['route_id', 'route_type'], (row) => {
             const route: Route = {
                 id: importedRoutes.length,
-                agencyId: agencyId,
-                shortName: shortName,
-                longName: longName,
-                routeType: routeType,
+                agencyId: Number(row['agency_id']),
+                shortName: row['route_short_name'],
+                longName: row['route_long_name'],
+                routeType: Number(row['route_type']),
             }
             // sets the new id
-            this.routeIdMap.set(id, route.id);
+            this.routeIdMap.set(row['route_id'], route.id);
             importedRoutes.push(route);
-        }
+        });
         GoogleTransitData.ROUTES = importedRoutes;
         console.timeEnd('import route table');
     }
     
     /**
      * Imports the stop table.
+     * @param directoryName 
      */
-    private static importStops(filename: string): void {
+    private static async importStops(directoryName: string): Promise<void> {
         console.time('import stops table');
         const importedStops = GoogleTransitData.STOPS;
-        this.stopIdMap = new Map<number, number>();
-        const stopData: string[] = readFileSync(path.join(this.GOOGLE_TRANSIT_DIRECTORY, filename), 'utf-8').toString().split('\n');
-        for(let i = 1; i < stopData.length - 1; i++){
-            const currentStopAsArray: string[] = stopData[i].split(',');
-            const id = Number(currentStopAsArray[1]);
-            const name = currentStopAsArray[0];
-            const lat = Number(currentStopAsArray[2]);
-            const lon = Number(currentStopAsArray[3]);
+        this.stopIdMap = new Map<string, number>();
+        await this.readTable(directoryName, 'stops.txt', ['stop_id', 'stop_name', 'stop_lat', 'stop_lon'], (row) => {
             const stop: Stop = {
                 id: importedStops.length,
-                name: name,
-                lat: lat,
-                lon: lon
+                name: row['stop_name'],
+                lat: Number(row['stop_lat']),
+                lon: Number(row['stop_lon'])
             }
             // sets the new id
-            this.stopIdMap.set(id, stop.id);
+            this.stopIdMap.set(row['stop_id'], stop.id);
             importedStops.push(stop);
-        }
+        });
         GoogleTransitData.STOPS = importedStops;
         console.timeEnd('import stops table');
     }
 
     /**
      * Imports the stop times table.
+     * @param directoryName 
      */
-    private static importStopTimes(filename: string): void {
+    private static async importStopTimes(directoryName: string): Promise<void> {
         console.time('import stop times table');
         const importedStopTimes = GoogleTransitData.STOPTIMES;
-        const stopTimeData: string[] = readFileSync(path.join(this.GOOGLE_TRANSIT_DIRECTORY, filename), 'utf-8').toString().split('\n');
-        for(let i = 1; i < stopTimeData.length - 1; i++){
-            const currentStopTimeAsArray: string[] = stopTimeData[i].split(',');
-            const tripId = Number(currentStopTimeAsArray[0]);
-            const arrivalTime = currentStopTimeAsArray[1];
-            const departureTime = currentStopTimeAsArray[2];
-            const stopId = Number(currentStopTimeAsArray[3]);
-            const stopSequence = Number(currentStopTimeAsArray[4]);
-            const pickupType = currentStopTimeAsArray[5];
-            const dropOffType = currentStopTimeAsArray[6];
+        await this.readTable(directoryName, 'stop_times.txt', ['trip_id', 'arrival_time', 'departure_time', 'stop_id', 'stop_sequence'], (row) => {
             const stopTime: StopTime = {
                 // mapping to the new id
-                tripId: this.tripIdMap.get(tripId),
+                tripId: this.tripIdMap.get(row['trip_id']),
                 // converts the times
-                arrivalTime: Converter.timeToSeconds(arrivalTime),
-                departureTime: Converter.timeToSeconds(departureTime),
+                arrivalTime: Converter.timeToSeconds(row['arrival_time']),
+                departureTime: Converter.timeToSeconds(row['departure_time']),
                 // mapping to the new id
-                stopId: this.stopIdMap.get(stopId),
-                stopSequence: stopSequence,
-                pickupType: pickupType,
-                dropOffType: dropOffType,
+                stopId: this.stopIdMap.get(row['stop_id']),
+                stopSequence: Number(row['stop_sequence']),
+                pickupType: row['pickup_type'],
+                dropOffType: row['drop_off_type'],
             }
             // adds the stop time only when related trips and stops exists.
             if(stopTime.tripId !== undefined && stopTime.stopId !== undefined){
                 importedStopTimes.push(stopTime);
             }
-        }
+        });
         GoogleTransitData.STOPTIMES = importedStopTimes;
         console.timeEnd('import stop times table');
     }
 
     /**
      * Imports the trip table.
-     * @param filename 
+     * @param directoryName 
      * @param isLongDistance 
      */
-    private static importTrips(filename: string, isLongDistance: boolean): void {
+    private static async importTrips(directoryName: string, isLongDistance: boolean): Promise<void> {
         console.time('import trips table');
         const importedTrips = GoogleTransitData.TRIPS;
-        this.tripIdMap = new Map<number, number>();
-        const tripData: string[] = readFileSync(path.join(this.GOOGLE_TRANSIT_DIRECTORY, filename), 'utf-8').toString().split('\n');
-        for(let i = 1; i < tripData.length - 1; i++){
-            const currentTripAsArray: string[] = tripData[i].split(',');
-            const routeId = Number(currentTripAsArray[0]);
-            const serviceId = Number(currentTripAsArray[1]);
-            const id = Number(currentTripAsArray[3]);
-            const directionId = Number(currentTripAsArray[2]);
+        this.tripIdMap = new Map<string, number>();
+        await this.readTable(directoryName, 'trips.txt', ['route_id', 'service_id', 'trip_id'], (row) => {
             const trip: Trip = {
                 // mapping to the new id
-                routeId: this.routeIdMap.get(routeId),
+                routeId: this.routeIdMap.get(row['route_id']),
                 // mapping to the new id
-                serviceId: this.serviceIdMap.get(serviceId),
+                serviceId: this.serviceIdMap.get(row['service_id']),
                 id: importedTrips.length,
-                directionId: directionId,
+                directionId: Number(row['direction_id']),
                 isLongDistance: isLongDistance,
+                // original id which is used by the real-time feeds
+                gtfsId: row['trip_id'],
             }
-            // adds the trip only when a related route exists
-            if(trip.routeId !== undefined && trip.serviceId !== undefined){
+            // adds the trip only when a related route exists and the trip runs in the service date window
+            if(trip.routeId !== undefined && trip.serviceId !== undefined
+                && (!ServiceWindow.isEnabled() || ServiceWindow.getAvailability(GoogleTransitData.CALENDAR[trip.serviceId]) > 0)){
                 // mapping to the new id
-                this.tripIdMap.set(id, trip.id);
+                this.tripIdMap.set(row['trip_id'], trip.id);
                 importedTrips.push(trip);
             }
-        }
+        });
         GoogleTransitData.TRIPS = importedTrips;
         console.timeEnd('import trips table');
     }
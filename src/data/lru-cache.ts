@@ -0,0 +1,62 @@
+export class LruCache<T> {
+    // entries in the order of their last use (least recently used first)
+    private entries = new Map<string, T>();
+    private capacity: number;
+    public hits: number = 0;
+    public misses: number = 0;
+    public evictions: number = 0;
+
+    constructor(capacity: number) {
+        this.capacity = capacity;
+    }
+
+    /**
+     * Gets the entry of the key and marks it as most recently used.
+     * @param key 
+     * @returns 
+     */
+    public get(key: string): T {
+        const value = this.entries.get(key);
+        if(value === undefined){
+            this.misses++;
+            return undefined;
+        }
+        this.hits++;
+        // moves the entry to the end of the map
+        this.entries.delete(key);
+        this.entries.set(key, value);
+        return value;
+    }
+
+    /**
+     * Adds the entry and removes the least recently used entries if the capacity is exceeded.
+     * @param key 
+     * @param value 
+     */
+    public set(key: string, value: T) {
+        if(this.capacity <= 0){
+            return;
+        }
+        this.entries.delete(key);
+        this.entries.set(key, value);
+        while(this.entries.size > this.capacity){
+            this.entries.delete(this.entries.keys().next().value);
+            this.evictions++;
+        }
+    }
+
+    /**
+     * Removes all entries.
+     */
+    public clear() {
+        this.entries.clear();
+    }
+
+    public get size(): number {
+        return this.entries.size;
+    }
+
+    public get maxSize(): number {
+        return this.capacity;
+    }
+}
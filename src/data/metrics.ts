@@ -0,0 +1,232 @@
+import { performance } from 'perf_hooks';
+import { METRICS_ENABLED } from '../constants';
+
+// upper bounds of the histogram buckets of the phase durations (in seconds) and the decision graph sizes
+const DURATION_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+const SIZE_BUCKETS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000];
+// upper bounds of the histogram buckets of the age of the delay feed messages (in seconds)
+const AGE_BUCKETS = [1, 5, 10, 30, 60, 120, 300, 600];
+
+// histogram or counter of one metric and label combination
+interface MetricEntry {
+    name: string,
+    labels: string,
+    value: number,
+    bucketBounds?: number[],
+    bucketCounts?: number[],
+    sum?: number,
+}
+
+export class Metrics {
+    private static histograms = new Map<string, MetricEntry>();
+    private static counters = new Map<string, MetricEntry>();
+    private static descriptions = new Map<string, string>([
+        ['routing_phase_duration_seconds', 'Duration of the phases of the routing algorithms.'],
+        ['routing_decision_graph_links', 'Number of links of the expanded decision graphs.'],
+        ['routing_connections_scanned_total', 'Number of connections which are scanned by the connection scan algorithms.'],
+        ['routing_rounds_total', 'Number of rounds of the raptor algorithms.'],
+        ['routing_labels_created_total', 'Number of labels which are created by the raptor meat algorithms.'],
+        ['realtime_update_duration_seconds', 'Duration of applying a message of the delay feed.'],
+        ['realtime_feed_age_seconds', 'Age of the messages of the delay feed when they are applied.'],
+        ['realtime_trip_updates_total', 'Number of trip updates of the delay feed.'],
+    ]);
+
+    /**
+     * Starts a span. Returns 0 if metrics are disabled.
+     * @returns 
+     */
+    public static startSpan(): number {
+        if(!METRICS_ENABLED){
+            return 0;
+        }
+        return performance.now();
+    }
+
+    /**
+     * Observes the duration of a phase which started at the given time and returns the start time of the next phase.
+     * @param algorithm 
+     * @param phase 
+     * @param startTime 
+     * @returns 
+     */
+    public static endSpan(algorithm: string, phase: string, startTime: number): number {
+        if(!METRICS_ENABLED){
+            return 0;
+        }
+        const endTime = performance.now();
+        this.observe('routing_phase_duration_seconds', '{algorithm="' + algorithm + '",phase="' + phase + '"}', DURATION_BUCKETS, (endTime - startTime) / 1000);
+        return endTime;
+    }
+
+    /**
+     * Increases the counter of the algorithm.
+     * @param algorithm 
+     * @param counter 
+     * @param value 
+     */
+    public static increment(algorithm: string, counter: string, value: number = 1) {
+        if(!METRICS_ENABLED){
+            return;
+        }
+        const name = 'routing_' + counter + '_total';
+        const labels = '{algorithm="' + algorithm + '"}';
+        const key = name + labels;
+        let entry = this.counters.get(key);
+        if(entry === undefined){
+            entry = {name: name, labels: labels, value: 0};
+            this.counters.set(key, entry);
+        }
+        entry.value += value;
+    }
+
+    /**
+     * Observes the number of links of a decision graph.
+     * @param algorithm 
+     * @param numberOfLinks 
+     */
+    public static observeDecisionGraphSize(algorithm: string, numberOfLinks: number) {
+        if(!METRICS_ENABLED){
+            return;
+        }
+        this.observe('routing_decision_graph_links', '{algorithm="' + algorithm + '"}', SIZE_BUCKETS, numberOfLinks);
+    }
+
+    /**
+     * Observes the duration and the age (if known) of an applied message of the delay feed.
+     * @param source 
+     * @param duration 
+     * @param age 
+     */
+    public static observeDelayUpdate(source: string, duration: number, age?: number) {
+        if(!METRICS_ENABLED){
+            return;
+        }
+        const labels = '{source="' + source + '"}';
+        this.observe('realtime_update_duration_seconds', labels, DURATION_BUCKETS, duration);
+        if(age !== undefined){
+            this.observe('realtime_feed_age_seconds', labels, AGE_BUCKETS, age);
+        }
+    }
+
+    /**
+     * Increases the counter of the applied or rejected trip updates of the delay feed.
+     * @param source 
+     * @param result 
+     * @param value 
+     */
+    public static incrementTripUpdates(source: string, result: string, value: number) {
+        if(!METRICS_ENABLED || value === 0){
+            return;
+        }
+        const name = 'realtime_trip_updates_total';
+        const labels = '{source="' + source + '",result="' + result + '"}';
+        let entry = this.counters.get(name + labels);
+        if(entry === undefined){
+            entry = {name: name, labels: labels, value: 0};
+            this.counters.set(name + labels, entry);
+        }
+        entry.value += value;
+    }
+
+    /**
+     * Returns the metrics which were recorded since the last call and resets them. Used by the query workers to send
+     * their metrics to the main thread.
+     * @returns 
+     */
+    public static collect(): MetricEntry[] {
+        if(!METRICS_ENABLED || (this.histograms.size === 0 && this.counters.size === 0)){
+            return undefined;
+        }
+        const entries = Array.from(this.histograms.values()).concat(Array.from(this.counters.values()));
+        this.histograms.clear();
+        this.counters.clear();
+        return entries;
+    }
+
+    /**
+     * Adds the metrics of a query worker.
+     * @param entries 
+     */
+    public static merge(entries: MetricEntry[]) {
+        if(!METRICS_ENABLED || entries === undefined){
+            return;
+        }
+        for(let entry of entries){
+            const key = entry.name + entry.labels;
+            const metrics = entry.bucketBounds === undefined ? this.counters : this.histograms;
+            const currentEntry = metrics.get(key);
+            if(currentEntry === undefined){
+                metrics.set(key, entry);
+                continue;
+            }
+            currentEntry.value += entry.value;
+            if(entry.bucketBounds !== undefined){
+                currentEntry.sum += entry.sum;
+                for(let i = 0; i < entry.bucketCounts.length; i++){
+                    currentEntry.bucketCounts[i] += entry.bucketCounts[i];
+                }
+            }
+        }
+    }
+
+    /**
+     * Returns all metrics in the text format of prometheus.
+     * @returns 
+     */
+    public static toPrometheusFormat(): string {
+        const lines: string[] = [];
+        let lastName: string;
+        const histograms = Array.from(this.histograms.values()).sort((a, b) => a.name.localeCompare(b.name));
+        for(let histogram of histograms){
+            if(histogram.name !== lastName){
+                lastName = histogram.name;
+                lines.push('# HELP ' + histogram.name + ' ' + this.descriptions.get(histogram.name));
+                lines.push('# TYPE ' + histogram.name + ' histogram');
+            }
+            // the buckets are cumulative
+            const labelsWithoutBrace = histogram.labels.substring(0, histogram.labels.length - 1);
+            let cumulativeCount = 0;
+            for(let i = 0; i < histogram.bucketBounds.length; i++){
+                cumulativeCount += histogram.bucketCounts[i];
+                lines.push(histogram.name + '_bucket' + labelsWithoutBrace + ',le="' + histogram.bucketBounds[i] + '"} ' + cumulativeCount);
+            }
+            lines.push(histogram.name + '_bucket' + labelsWithoutBrace + ',le="+Inf"} ' + histogram.value);
+            lines.push(histogram.name + '_sum' + histogram.labels + ' ' + histogram.sum);
+            lines.push(histogram.name + '_count' + histogram.labels + ' ' + histogram.value);
+        }
+        const counters = Array.from(this.counters.values()).sort((a, b) => a.name.localeCompare(b.name));
+        for(let counter of counters){
+            if(counter.name !== lastName){
+                lastName = counter.name;
+                lines.push('# HELP ' + counter.name + ' ' + this.descriptions.get(counter.name));
+                lines.push('# TYPE ' + counter.name + ' counter');
+            }
+            lines.push(counter.name + counter.labels + ' ' + counter.value);
+        }
+        return lines.join('\n') + '\n';
+    }
+
+    /**
+     * Adds the value to the histogram.
+     * @param name 
+     * @param labels 
+     * @param bucketBounds 
+     * @param value 
+     */
+    private static observe(name: string, labels: string, bucketBounds: number[], value: number) {
+        const key = name + labels;
+        let entry = this.histograms.get(key);
+        if(entry === undefined){
+            entry = {name: name, labels: labels, value: 0, bucketBounds: bucketBounds, bucketCounts: new Array(bucketBounds.length).fill(0), sum: 0};
+            this.histograms.set(key, entry);
+        }
+        entry.value++;
+        entry.sum += value;
+        for(let i = 0; i < bucketBounds.length; i++){
+            if(value <= bucketBounds[i]){
+                entry.bucketCounts[i]++;
+                break;
+            }
+        }
+    }
+}
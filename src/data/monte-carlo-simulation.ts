@@ -0,0 +1,374 @@
+import path from 'path';
+import { Worker } from 'worker_threads';
+import { GoogleTransitData } from './google-transit-data';
+import { Reliability } from './reliability';
+import { AliasTable } from './alias-table';
+import { SeededRandom } from './seeded-random';
+import { SimulationProfile } from '../models/SimulationProfile';
+import { SimulationResult } from '../models/SimulationResult';
+import { MAX_NUMBER_OF_SIMULATIONS, NUMBER_OF_SIMULATION_WORKERS, SIMULATION_BATCH_SIZE, SIMULATION_CONFIDENCE_INTERVAL_WIDTH, SIMULATION_SEED } from '../constants';
+
+// exit stops of entries which reach the target or have no trip (default entries)
+const TARGET_STOP = -1;
+const NO_EXIT_STOP = -2;
+
+// simulated journeys of one batch (mean and sum of squared differences of the arrival times)
+interface BatchResult {
+    numberOfSimulations: number,
+    mean: number,
+    m2: number,
+}
+
+// batch which waits for or is simulated by a worker
+interface BatchTask {
+    message: any,
+    resolve: (result: BatchResult) => void,
+    reject: (error: Error) => void,
+}
+
+export class MonteCarloSimulation {
+    // worker script (compiled to dist/simulation-worker.js)
+    private static readonly WORKER_FILE: string = path.join(__dirname, '../simulation-worker.js');
+    private static workers: Worker[] = [];
+    private static idleWorkers: Worker[] = [];
+    private static runningTasks = new Map<Worker, BatchTask>();
+    private static queue: BatchTask[] = [];
+    private static longDistanceDelays: AliasTable;
+    private static normalDistanceDelays: AliasTable;
+
+    /**
+     * Creates the simulation profile of a csa meat s array.
+     * @param s 
+     * @param sourceStop 
+     * @param targetStop 
+     * @returns 
+     */
+    public static createProfileOfSArray(s: any[][], sourceStop: number, targetStop: number): SimulationProfile {
+        return this.createProfile(s, sourceStop, targetStop, (entry) => entry.exitStop, (entry) => entry.exitTime, (entry) => entry.tripId);
+    }
+
+    /**
+     * Creates the simulation profile of the raptor meat expected arrival times.
+     * @param expectedArrivalTimes 
+     * @param sourceStop 
+     * @param targetStop 
+     * @returns 
+     */
+    public static createProfileOfExpectedArrivalTimes(expectedArrivalTimes: any[][], sourceStop: number, targetStop: number): SimulationProfile {
+        return this.createProfile(expectedArrivalTimes, sourceStop, targetStop, (label) => label.exitTripAtStop,
+            (label) => label.associatedTrip ? label.associatedTrip.tripArrival : undefined, (label) => label.associatedTrip ? label.associatedTrip.tripId : undefined);
+    }
+
+    /**
+     * Approximates the expected arrival time of the profile. Simulates batches of journeys (in parallel if simulation
+     * workers are enabled) until the confidence interval is narrow enough or the maximum number of simulations is reached.
+     * The result depends only on the seed.
+     * @param profile 
+     * @param maxNumberOfSimulations 
+     * @param confidenceIntervalWidth 
+     * @param seed 
+     * @returns 
+     */
+    public static async approximateExpectedArrivalTime(profile: SimulationProfile, maxNumberOfSimulations: number = MAX_NUMBER_OF_SIMULATIONS,
+        confidenceIntervalWidth: number = SIMULATION_CONFIDENCE_INTERVAL_WIDTH, seed: number = SIMULATION_SEED): Promise<SimulationResult> {
+        const numberOfBatches = Math.ceil(maxNumberOfSimulations / SIMULATION_BATCH_SIZE);
+        const parallelBatches = Math.max(NUMBER_OF_SIMULATION_WORKERS, 1);
+        const runningBatches = new Map<number, Promise<BatchResult>>();
+        let total: BatchResult = {numberOfSimulations: 0, mean: 0, m2: 0};
+        let nextBatch = 0;
+        // combines the batches in the order of their indices to get the same result with any number of workers
+        for(let batch = 0; batch < numberOfBatches; batch++){
+            while(nextBatch < numberOfBatches && runningBatches.size < parallelBatches){
+                const batchSize = Math.min(SIMULATION_BATCH_SIZE, maxNumberOfSimulations - nextBatch * SIMULATION_BATCH_SIZE);
+                const runningBatch = this.runBatch(profile, SeededRandom.deriveSeed(seed, nextBatch), batchSize);
+                // batches which are still running after the simulation stopped are ignored
+                runningBatch.catch(() => undefined);
+                runningBatches.set(nextBatch, runningBatch);
+                nextBatch++;
+            }
+            const batchResult = await runningBatches.get(batch);
+            runningBatches.delete(batch);
+            total = this.combineResults(total, batchResult);
+            if(batch > 0 && this.getConfidenceIntervalWidth(total) <= confidenceIntervalWidth){
+                break;
+            }
+        }
+        return {
+            expectedArrivalTime: total.mean,
+            numberOfSimulations: total.numberOfSimulations,
+            standardDeviation: Math.sqrt(total.m2 / (total.numberOfSimulations - 1)),
+            confidenceIntervalWidth: this.getConfidenceIntervalWidth(total),
+        };
+    }
+
+    /**
+     * Simulates a batch of journeys. Throws an error if a journey reaches an entry without a trip.
+     * @param profile 
+     * @param seed 
+     * @param batchSize 
+     * @returns 
+     */
+    public static simulateBatch(profile: SimulationProfile, seed: number, batchSize: number): BatchResult {
+        if(this.longDistanceDelays === undefined){
+            this.longDistanceDelays = this.createDelayTable(true);
+            this.normalDistanceDelays = this.createDelayTable(false);
+        }
+        const random = new SeededRandom(seed);
+        let mean = 0;
+        let m2 = 0;
+        for(let i = 1; i <= batchSize; i++){
+            let entry = profile.sourceEntry;
+            let arrivalTime: number;
+            while(true){
+                const exitStop = profile.exitStops[entry];
+                if(exitStop === NO_EXIT_STOP){
+                    throw new Error("Journey didn't reach the target stop.");
+                }
+                const delays = profile.isLongDistance[entry] === 1 ? this.longDistanceDelays : this.normalDistanceDelays;
+                arrivalTime = profile.exitTimes[entry] + delays.sample(random);
+                if(exitStop === TARGET_STOP){
+                    break;
+                }
+                // takes the first entry of the next stop which departs after the arrival (keeps the entry if no one exists)
+                const nextEntry = this.findFirstDeparture(profile, exitStop, arrivalTime);
+                if(nextEntry !== -1){
+                    entry = nextEntry;
+                }
+            }
+            // updates mean and squared differences (welford)
+            const difference = arrivalTime - mean;
+            mean += difference / i;
+            m2 += difference * (arrivalTime - mean);
+        }
+        return {
+            numberOfSimulations: batchSize,
+            mean: mean,
+            m2: m2,
+        };
+    }
+
+    /**
+     * Stops the simulation workers.
+     */
+    public static stopWorkers() {
+        for(let worker of this.workers){
+            worker.removeAllListeners('exit');
+            worker.terminate();
+        }
+        this.workers = [];
+        this.idleWorkers = [];
+    }
+
+    /**
+     * Creates the simulation profile of a profile array. Contains only the stops which can be reached from the source
+     * stop. Entries which are never the first one departing after an arrival are removed.
+     * @param entriesOfStops 
+     * @param sourceStop 
+     * @param targetStop 
+     * @param getExitStop 
+     * @param getExitTime 
+     * @param getTripId 
+     * @returns 
+     */
+    private static createProfile(entriesOfStops: any[][], sourceStop: number, targetStop: number, getExitStop: (entry: any) => number,
+        getExitTime: (entry: any) => number, getTripId: (entry: any) => number): SimulationProfile {
+        // finds the reachable stops
+        const indexOfStop = new Map<number, number>([[sourceStop, 0]]);
+        const stops: number[] = [sourceStop];
+        const entries: any[][] = [];
+        for(let i = 0; i < stops.length; i++){
+            let latestDepartureTime = -Infinity;
+            const entriesOfStop: any[] = [];
+            for(let entry of entriesOfStops[stops[i]]){
+                if(entry.departureTime <= latestDepartureTime){
+                    continue;
+                }
+                latestDepartureTime = entry.departureTime;
+                entriesOfStop.push(entry);
+                const exitStop = getExitStop(entry);
+                if(exitStop !== undefined && exitStop !== targetStop && !indexOfStop.has(exitStop)){
+                    indexOfStop.set(exitStop, stops.length);
+                    stops.push(exitStop);
+                }
+            }
+            entries.push(entriesOfStop);
+        }
+        // stores the entries in columns
+        let numberOfEntries = 0;
+        for(let entriesOfStop of entries){
+            numberOfEntries += entriesOfStop.length;
+        }
+        const profile: SimulationProfile = {
+            sourceEntry: 0,
+            firstEntryOfStop: new Int32Array(stops.length + 1),
+            departureTimes: new Float64Array(numberOfEntries),
+            exitTimes: new Float64Array(numberOfEntries),
+            exitStops: new Int32Array(numberOfEntries),
+            isLongDistance: new Uint8Array(numberOfEntries),
+        }
+        let position = 0;
+        for(let i = 0; i < entries.length; i++){
+            profile.firstEntryOfStop[i] = position;
+            for(let entry of entries[i]){
+                const exitStop = getExitStop(entry);
+                const tripId = getTripId(entry);
+                profile.departureTimes[position] = entry.departureTime;
+                if(exitStop === undefined || tripId === undefined){
+                    profile.exitStops[position] = NO_EXIT_STOP;
+                } else {
+                    profile.exitStops[position] = exitStop === targetStop ? TARGET_STOP : indexOfStop.get(exitStop);
+                    profile.exitTimes[position] = getExitTime(entry);
+                    profile.isLongDistance[position] = GoogleTransitData.isLongDistanceTrip(tripId) ? 1 : 0;
+                }
+                position++;
+            }
+        }
+        profile.firstEntryOfStop[entries.length] = position;
+        return profile;
+    }
+
+    /**
+     * Uses a binary search to find the first entry of the stop which departs after the arrival time. Returns -1 if no
+     * such entry exists.
+     * @param profile 
+     * @param stop 
+     * @param arrivalTime 
+     * @returns 
+     */
+    private static findFirstDeparture(profile: SimulationProfile, stop: number, arrivalTime: number): number {
+        let start = profile.firstEntryOfStop[stop];
+        const end = profile.firstEntryOfStop[stop + 1];
+        let last = end;
+        while(start < last) {
+            let middle = Math.floor((start + last) / 2);
+            if(profile.departureTimes[middle] < arrivalTime) {
+                start = middle + 1;
+            } else {
+                last = middle;
+            }
+        }
+        return start < end ? start : -1;
+    }
+
+    /**
+     * Creates the alias table of the delays of long distance or normal trips.
+     * @param isLongDistance 
+     * @returns 
+     */
+    private static createDelayTable(isLongDistance: boolean): AliasTable {
+        const probabilities = Reliability.getDelayProbabilities(isLongDistance);
+        const delays = probabilities.map((probability, i) => i * 60);
+        return new AliasTable(delays, probabilities);
+    }
+
+    /**
+     * Combines the results of two batches (parallel algorithm of chan et al.).
+     * @param a 
+     * @param b 
+     * @returns 
+     */
+    private static combineResults(a: BatchResult, b: BatchResult): BatchResult {
+        const numberOfSimulations = a.numberOfSimulations + b.numberOfSimulations;
+        const difference = b.mean - a.mean;
+        return {
+            numberOfSimulations: numberOfSimulations,
+            mean: a.mean + difference * b.numberOfSimulations / numberOfSimulations,
+            m2: a.m2 + b.m2 + difference * difference * a.numberOfSimulations * b.numberOfSimulations / numberOfSimulations,
+        };
+    }
+
+    /**
+     * Gets the width of the 95% confidence interval of the mean.
+     * @param result 
+     * @returns 
+     */
+    private static getConfidenceIntervalWidth(result: BatchResult): number {
+        const variance = result.m2 / (result.numberOfSimulations - 1);
+        return 2 * 1.96 * Math.sqrt(variance / result.numberOfSimulations);
+    }
+
+    /**
+     * Simulates the batch in a worker or, if no workers are enabled, in the main thread.
+     * @param profile 
+     * @param seed 
+     * @param batchSize 
+     * @returns 
+     */
+    private static runBatch(profile: SimulationProfile, seed: number, batchSize: number): Promise<BatchResult> {
+        if(NUMBER_OF_SIMULATION_WORKERS === 0){
+            try {
+                return Promise.resolve(this.simulateBatch(profile, seed, batchSize));
+            } catch (error) {
+                return Promise.reject(error);
+            }
+        }
+        if(this.workers.length === 0){
+            for(let i = 0; i < NUMBER_OF_SIMULATION_WORKERS; i++){
+                this.startWorker();
+            }
+        }
+        return new Promise<BatchResult>((resolve, reject) => {
+            this.queue.push({
+                message: {profile: profile, seed: seed, batchSize: batchSize},
+                resolve: resolve,
+                reject: reject,
+            });
+            this.dispatchBatches();
+        });
+    }
+
+    /**
+     * Sends waiting batches to the idle workers.
+     */
+    private static dispatchBatches() {
+        while(this.queue.length > 0 && this.idleWorkers.length > 0){
+            const worker = this.idleWorkers.pop();
+            const task = this.queue.shift();
+            this.runningTasks.set(worker, task);
+            worker.postMessage(task.message);
+        }
+    }
+
+    /**
+     * Starts a worker. A worker which crashes during a simulation is replaced by a new one. The workers don't keep the
+     * process alive.
+     */
+    private static startWorker() {
+        const worker = new Worker(this.WORKER_FILE);
+        worker.unref();
+        this.workers.push(worker);
+        this.idleWorkers.push(worker);
+        worker.on('message', (message) => {
+            const task = this.runningTasks.get(worker);
+            this.runningTasks.delete(worker);
+            if(message.error !== undefined){
+                task.reject(new Error(message.error));
+            } else {
+                task.resolve(message.result);
+            }
+            this.idleWorkers.push(worker);
+            this.dispatchBatches();
+        });
+        worker.on('error', (error) => {
+            console.log('simulation worker failed: ' + error.message);
+        });
+        worker.on('exit', () => {
+            this.workers = this.workers.filter(otherWorker => otherWorker !== worker);
+            this.idleWorkers = this.idleWorkers.filter(idleWorker => idleWorker !== worker);
+            const task = this.runningTasks.get(worker);
+            if(task !== undefined){
+                // replaces a worker which crashed during a simulation
+                this.runningTasks.delete(worker);
+                task.reject(new Error('simulation worker stopped'));
+                this.startWorker();
+            } else if(this.workers.length === 0){
+                // rejects the waiting batches if no worker could be started
+                for(let waitingTask of this.queue){
+                    waitingTask.reject(new Error('simulation workers could not be started'));
+                }
+                this.queue = [];
+            }
+            this.dispatchBatches();
+        });
+    }
+}
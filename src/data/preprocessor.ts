@@ -0,0 +1,36 @@
+import { Importer } from './importer';
+import { Generator } from './generator';
+import { ResponseCache } from './response-cache';
+import { StopNameIndex } from './stop-name-index';
+
+export class Preprocessor {
+    /**
+     * Imports the gtfs files and generates all data structures which are used by the algorithms.
+     */
+    public static async preprocessGoogleTransitData(): Promise<void> {
+        console.time('complete preprocessing')
+        // imports the gtfs files
+        await Importer.importGoogleTransitData();
+        // combines stops with the same name
+        Generator.combineStops();
+        // builds the index which is used by the stop name lookups
+        StopNameIndex.build();
+        // generates routes which can be used by the raptor algorithm
+        Generator.generateValidRoutes();
+        // sets the isAvailable array of each trip
+        Generator.setIsAvailableOfTrips();
+        // removes invalid trips and sorts the remaining by their departure time
+        Generator.clearAndSortTrips();
+        // generates the departure index which is used by the raptor algorithms
+        Generator.generateDepartureIndex();
+        // genreates connections which can be used by the csa
+        Generator.generateSortedConnections();
+        // generates the connections of each weekday which are used by the csa
+        Generator.generateConnectionsOfWeekdays();
+        // generates footpaths which can be used by raptor and csa
+        Generator.generateFootpaths();
+        // removes the responses of the previous timetable
+        ResponseCache.invalidate();
+        console.timeEnd('complete preprocessing')
+    }
+}
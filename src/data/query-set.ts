@@ -0,0 +1,154 @@
+import fs from 'fs';
+import path from 'path';
+import { GoogleTransitData } from './google-transit-data';
+import { Calculator } from './calculator';
+import { SeededRandom } from './seeded-random';
+import { BenchmarkQuery } from '../models/BenchmarkQuery';
+import { BenchmarkQuerySet } from '../models/BenchmarkQuerySet';
+
+// lower and upper bound of the straight-line distance (in km) between the source and target stop of each distance stratum
+const DISTANCE_STRATA: [string, number, number][] = [['short', 0, 25], ['medium', 25, 100], ['long', 100, 300], ['veryLong', 300, Number.MAX_VALUE]];
+// start and end hour of the source times of each time stratum
+const TIME_STRATA: [string, number, number][] = [['night', 0, 6], ['morningPeak', 6, 9], ['daytime', 9, 16], ['eveningPeak', 16, 19], ['evening', 19, 24]];
+// number of random stop pairs which are tried before a distance stratum is skipped
+const MAX_ATTEMPTS_OF_A_STRATUM = 100000;
+
+export class QuerySet {
+    // format version of the query set files. Query sets of other versions are rejected.
+    public static readonly VERSION: number = 1;
+    public static readonly DIRECTORY: string = path.join('test_data', 'query-sets');
+
+    /**
+     * Creates a reproducible set of random queries. The queries are distributed evenly over the combinations of distance and
+     * time strata, the source dates over the days which follow the start date. Distance strata without valid stop pairs are
+     * skipped.
+     * @param name 
+     * @param numberOfQueries 
+     * @param seed 
+     * @param startDate 
+     * @param numberOfDates 
+     * @param feedChecksum 
+     * @returns 
+     */
+    public static generate(name: string, numberOfQueries: number, seed: number, startDate: Date, numberOfDates: number, feedChecksum: string): BenchmarkQuerySet {
+        const random = new SeededRandom(seed);
+        const stops = GoogleTransitData.STOPS;
+        const dates: string[] = [];
+        for(let i = 0; i < numberOfDates; i++){
+            const date = new Date(startDate.getFullYear(), startDate.getMonth(), startDate.getDate() + i);
+            dates.push(this.dateToString(date));
+        }
+        let distanceStrata = DISTANCE_STRATA.slice();
+        const queries: BenchmarkQuery[] = [];
+        while(queries.length < numberOfQueries && distanceStrata.length > 0){
+            // alternates the strata to keep them balanced for each prefix of the set
+            const distanceStratumIndex = Math.floor(queries.length / TIME_STRATA.length) % distanceStrata.length;
+            const distanceStratum = distanceStrata[distanceStratumIndex];
+            const timeStratum = TIME_STRATA[queries.length % TIME_STRATA.length];
+            const stopPair = this.findStopPair(random, distanceStratum[1], distanceStratum[2]);
+            if(stopPair === null){
+                console.log('skipped distance stratum ' + distanceStratum[0] + ' (no stop pairs found)');
+                distanceStrata.splice(distanceStratumIndex, 1);
+                continue;
+            }
+            const firstSecond = timeStratum[1] * 3600;
+            queries.push({
+                id: queries.length,
+                sourceStop: stops[stopPair[0]].name,
+                targetStop: stops[stopPair[1]].name,
+                sourceTime: firstSecond + random.nextInt(timeStratum[2] * 3600 - firstSecond),
+                sourceDate: dates[random.nextInt(dates.length)],
+                distanceStratum: distanceStratum[0],
+                timeStratum: timeStratum[0],
+            });
+        }
+        return {
+            version: this.VERSION,
+            name: name,
+            seed: seed,
+            feedChecksum: feedChecksum,
+            queries: queries,
+        };
+    }
+
+    /**
+     * Gets the path of the query set file with the given name.
+     * @param name 
+     * @returns 
+     */
+    public static getPath(name: string): string {
+        return path.join(this.DIRECTORY, name + '.json');
+    }
+
+    /**
+     * Writes the query set to its file.
+     * @param querySet 
+     */
+    public static save(querySet: BenchmarkQuerySet) {
+        fs.mkdirSync(this.DIRECTORY, { recursive: true });
+        fs.writeFileSync(this.getPath(querySet.name), JSON.stringify(querySet, null, 1));
+    }
+
+    /**
+     * Reads the query set with the given name. Returns null if it does not exist and throws an error if it has another
+     * version.
+     * @param name 
+     * @returns 
+     */
+    public static load(name: string): BenchmarkQuerySet {
+        const file = this.getPath(name);
+        if(!fs.existsSync(file)){
+            return null;
+        }
+        const querySet: BenchmarkQuerySet = JSON.parse(fs.readFileSync(file, 'utf8'));
+        if(querySet.version !== this.VERSION){
+            throw new Error('query set ' + name + ' has version ' + querySet.version + ' (expected ' + this.VERSION + ')');
+        }
+        return querySet;
+    }
+
+    /**
+     * Converts a date of the format yyyy-mm-dd to a local date.
+     * @param date 
+     * @returns 
+     */
+    public static stringToDate(date: string): Date {
+        const dateParts = date.split('-');
+        return new Date(Number(dateParts[0]), Number(dateParts[1]) - 1, Number(dateParts[2]));
+    }
+
+    /**
+     * Converts the date to yyyy-mm-dd (local time).
+     * @param date 
+     * @returns 
+     */
+    public static dateToString(date: Date): string {
+        const month = (date.getMonth() + 1).toString().padStart(2, '0');
+        const day = date.getDate().toString().padStart(2, '0');
+        return date.getFullYear() + '-' + month + '-' + day;
+    }
+
+    /**
+     * Finds a random pair of stops with different names whose distance is in [minDistance, maxDistance). Returns null if
+     * no pair is found.
+     * @param random 
+     * @param minDistance 
+     * @param maxDistance 
+     * @returns 
+     */
+    private static findStopPair(random: SeededRandom, minDistance: number, maxDistance: number): [number, number] {
+        const stops = GoogleTransitData.STOPS;
+        for(let i = 0; i < MAX_ATTEMPTS_OF_A_STRATUM; i++){
+            const sourceStop = stops[random.nextInt(stops.length)];
+            const targetStop = stops[random.nextInt(stops.length)];
+            if(sourceStop.name === targetStop.name){
+                continue;
+            }
+            const distance = Calculator.calculateDistance(sourceStop.lat, targetStop.lat, sourceStop.lon, targetStop.lon);
+            if(distance >= minDistance && distance < maxDistance){
+                return [sourceStop.id, targetStop.id];
+            }
+        }
+        return null;
+    }
+}
\ No newline at end of file
@@ -1,3 +1,5 @@
+import { SeededRandom } from './seeded-random';
+
 export class Reliability {
 
     private static longDistanceValues: number[];
@@ -77,12 +79,27 @@ export class Reliability {
     }
 
     /**
-     * Uses reliability values to return a random delay.
+     * Gets the probability of each delay (in steps of one minute) which is returned by getRandomDelay.
+     * @param isLongDistance 
+     * @returns 
+     */
+    public static getDelayProbabilities(isLongDistance: boolean): number[] {
+        const values = isLongDistance ? this.longDistanceValues : this.normalDistanceValues;
+        const probabilities: number[] = [values[0]];
+        for(let i = 1; i < values.length; i++){
+            probabilities.push(values[i] - values[i-1]);
+        }
+        return probabilities;
+    }
+
+    /**
+     * Uses reliability values to return a random delay. Uses the seeded generator if it is given.
      * @param isLongDistance 
+     * @param random 
      * @returns 
      */
-    public static getRandomDelay(isLongDistance: boolean): number {
-        let probability = Math.random();
+    public static getRandomDelay(isLongDistance: boolean, random?: SeededRandom): number {
+        let probability = random !== undefined ? random.next() : Math.random();
         if(isLongDistance){
             for(let i = 0; i < this.longDistanceValues.length; i++){
                 if(probability <= this.longDistanceValues[i]){
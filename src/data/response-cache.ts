@@ -0,0 +1,132 @@
+import { MeatResponse } from "../models/MeatResponse";
+import { RESPONSE_CACHE_SIZE } from "../constants";
+import { Calculator } from "./calculator";
+import { LruCache } from "./lru-cache";
+
+// cached meat response and the day offsets of its dates to the source date
+interface CachedMeatResponse {
+    meatResponse: MeatResponse,
+    departureDayOffset: number,
+    meatDayOffset: number,
+}
+
+export class ResponseCache {
+    private static meatResponses = new LruCache<CachedMeatResponse>(RESPONSE_CACHE_SIZE);
+    private static invalidations: number = 0;
+    // called after each invalidation, forwards it to the caches of the query workers
+    private static invalidationListener: () => void = null;
+
+    /**
+     * Gets the cached meat response of the request. The dates of the response are adjusted to the source date.
+     * @param algorithm 
+     * @param sourceStop 
+     * @param targetStop 
+     * @param sourceTime 
+     * @param sourceDate 
+     * @param alpha 
+     * @returns 
+     */
+    public static getMeatResponse(algorithm: string, sourceStop: number, targetStop: number, sourceTime: number, sourceDate: Date, alpha: number): MeatResponse {
+        const cachedMeatResponse = this.meatResponses.get(this.getKey(algorithm, sourceStop, targetStop, sourceTime, sourceDate, alpha));
+        if(cachedMeatResponse === undefined){
+            return undefined;
+        }
+        const meatResponse: MeatResponse = Object.assign({}, cachedMeatResponse.meatResponse);
+        meatResponse.departureDate = this.addDays(sourceDate, cachedMeatResponse.departureDayOffset);
+        meatResponse.meatDate = this.addDays(sourceDate, cachedMeatResponse.meatDayOffset);
+        return meatResponse;
+    }
+
+    /**
+     * Stores the meat response of the request.
+     * @param algorithm 
+     * @param sourceStop 
+     * @param targetStop 
+     * @param sourceTime 
+     * @param sourceDate 
+     * @param alpha 
+     * @param meatResponse 
+     */
+    public static setMeatResponse(algorithm: string, sourceStop: number, targetStop: number, sourceTime: number, sourceDate: Date, alpha: number, meatResponse: MeatResponse) {
+        this.meatResponses.set(this.getKey(algorithm, sourceStop, targetStop, sourceTime, sourceDate, alpha), {
+            meatResponse: meatResponse,
+            departureDayOffset: this.getDayOffset(sourceDate, meatResponse.departureDate),
+            meatDayOffset: this.getDayOffset(sourceDate, meatResponse.meatDate),
+        });
+    }
+
+    /**
+     * Removes all cached responses. Must be called if the timetable or the delays of the trips change.
+     */
+    public static invalidate() {
+        this.meatResponses.clear();
+        this.invalidations++;
+        if(this.invalidationListener !== null){
+            this.invalidationListener();
+        }
+    }
+
+    /**
+     * Sets the function which is called after each invalidation.
+     * @param invalidationListener 
+     */
+    public static setInvalidationListener(invalidationListener: () => void) {
+        this.invalidationListener = invalidationListener;
+    }
+
+    /**
+     * Gets the hit, miss and eviction counters of the cache.
+     * @returns 
+     */
+    public static getStatistics() {
+        return {
+            size: this.meatResponses.size,
+            maxSize: this.meatResponses.maxSize,
+            hits: this.meatResponses.hits,
+            misses: this.meatResponses.misses,
+            evictions: this.meatResponses.evictions,
+            invalidations: this.invalidations,
+        };
+    }
+
+    /**
+     * Creates the key of a request. The results depend only on the weekday of the source date. The exact source time is
+     * part of the key because a response of an earlier source time can depart before the requested time.
+     * @param algorithm 
+     * @param sourceStop 
+     * @param targetStop 
+     * @param sourceTime 
+     * @param sourceDate 
+     * @param alpha 
+     * @returns 
+     */
+    private static getKey(algorithm: string, sourceStop: number, targetStop: number, sourceTime: number, sourceDate: Date, alpha: number): string {
+        const sourceWeekday = Calculator.moduloSeven(sourceDate.getDay() - 1);
+        return algorithm + ',' + sourceStop + ',' + targetStop + ',' + sourceTime + ',' + sourceWeekday + ',' + alpha;
+    }
+
+    /**
+     * Gets the number of days between the source date and a date of the response (format of de-DE).
+     * @param sourceDate 
+     * @param date 
+     * @returns 
+     */
+    private static getDayOffset(sourceDate: Date, date: string): number {
+        const dateParts = date.split('.');
+        const responseDate = new Date(Number(dateParts[2]), Number(dateParts[1])-1, Number(dateParts[0]));
+        const startOfSourceDate = new Date(sourceDate.getFullYear(), sourceDate.getMonth(), sourceDate.getDate());
+        return Math.round((responseDate.getTime() - startOfSourceDate.getTime()) / 86400000);
+    }
+
+    /**
+     * Adds the number of days to the source date and returns it in the format of de-DE.
+     * @param sourceDate 
+     * @param days 
+     * @returns 
+     */
+    private static addDays(sourceDate: Date, days: number): string {
+        const date = new Date(sourceDate);
+        date.setDate(date.getDate() + days);
+        return date.toLocaleDateString('de-DE');
+    }
+}
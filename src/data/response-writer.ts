@@ -0,0 +1,139 @@
+import express from 'express';
+
+// minimum length (in characters) of the chunks which are written to the response
+const CHUNK_SIZE = 65536;
+// arrays with more elements are serialized element by element
+const MAX_ARRAY_LENGTH = 64;
+
+export class ResponseWriter {
+    /**
+     * Sends the body as json. Objects and arrays are serialized in chunks which are written when the response can take
+     * more data, so large decision graphs are not stored a second time as one string. Other bodies and responses without
+     * a stream (the responses of the query workers) are sent at once. Calls onFinish when the body is written, the
+     * serialization is stopped if the client disconnects before.
+     * @param res 
+     * @param body 
+     * @param onFinish 
+     */
+    public static sendJson(res: express.Response, body: any, onFinish?: () => void) {
+        if(typeof res.write !== 'function' || body === null || typeof body !== 'object' || Buffer.isBuffer(body)){
+            res.send(body);
+            if(onFinish !== undefined){
+                onFinish();
+            }
+            return;
+        }
+        res.type('json');
+        let chunks = this.getChunks(body);
+        // stops the serialization if the client disconnects or the response fails, so the generator and the body
+        // are not kept by a listener which waits for 'drain'
+        const abort = () => {
+            if(chunks === null){
+                return;
+            }
+            res.removeListener('drain', writeChunks);
+            chunks.return(undefined);
+            chunks = null;
+        }
+        const writeChunks = () => {
+            if(chunks === null){
+                return;
+            }
+            let chunk = chunks.next();
+            while(!chunk.done){
+                // waits until the written chunks are sent
+                if(!res.write(chunk.value)){
+                    res.once('drain', writeChunks);
+                    return;
+                }
+                chunk = chunks.next();
+            }
+            chunks = null;
+            res.removeListener('close', abort);
+            res.removeListener('error', abort);
+            res.end();
+            if(onFinish !== undefined){
+                onFinish();
+            }
+        }
+        res.once('close', abort);
+        res.once('error', abort);
+        writeChunks();
+    }
+
+    /**
+     * Joins the parts of the json string to chunks.
+     * @param value 
+     * @returns 
+     */
+    private static *getChunks(value: any): IterableIterator<string> {
+        let chunk = '';
+        for(let part of this.getParts(value)){
+            chunk += part;
+            if(chunk.length >= CHUNK_SIZE){
+                yield chunk;
+                chunk = '';
+            }
+        }
+        yield chunk;
+    }
+
+    /**
+     * Serializes the value like JSON.stringify. Large arrays and objects which contain other objects are split into
+     * parts, all other values are serialized at once.
+     * @param value 
+     * @returns 
+     */
+    private static *getParts(value: any): IterableIterator<string> {
+        if(Array.isArray(value) && value.length > MAX_ARRAY_LENGTH){
+            yield '[';
+            for(let i = 0; i < value.length; i++){
+                if(i > 0){
+                    yield ',';
+                }
+                yield* this.isSerializable(value[i]) ? this.getParts(value[i]) : ['null'];
+            }
+            yield ']';
+        } else if(this.isContainer(value)){
+            yield '{';
+            let isFirstProperty = true;
+            for(let key of Object.keys(value)){
+                if(!this.isSerializable(value[key])){
+                    continue;
+                }
+                yield (isFirstProperty ? '' : ',') + JSON.stringify(key) + ':';
+                yield* this.getParts(value[key]);
+                isFirstProperty = false;
+            }
+            yield '}';
+        } else {
+            yield JSON.stringify(value);
+        }
+    }
+
+    /**
+     * Checks if the value is a plain object which contains other objects.
+     * @param value 
+     * @returns 
+     */
+    private static isContainer(value: any): boolean {
+        if(value === null || typeof value !== 'object' || Array.isArray(value) || typeof value.toJSON === 'function'){
+            return false;
+        }
+        for(let key of Object.keys(value)){
+            if(value[key] !== null && typeof value[key] === 'object'){
+                return true;
+            }
+        }
+        return false;
+    }
+
+    /**
+     * Checks if JSON.stringify keeps the value in objects.
+     * @param value 
+     * @returns 
+     */
+    private static isSerializable(value: any): boolean {
+        return value !== undefined && typeof value !== 'function' && typeof value !== 'symbol';
+    }
+}
\ No newline at end of file
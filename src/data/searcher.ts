@@ -9,17 +9,59 @@ export class Searcher {
      */
     public static binarySearchOfConnections(value: number): number{
         let start = 0;
-        let end = GoogleTransitData.CONNECTIONS.length -1;
+        let end = GoogleTransitData.getNumberOfConnections() -1;
         while(start <= end) {
             let middle = Math.floor((start + end) / 2);
-            if(GoogleTransitData.CONNECTIONS[middle].departureTime >= value && ( middle === 0 || GoogleTransitData.CONNECTIONS[middle - 1].departureTime < value)){
+            if(GoogleTransitData.getDepartureTimeOfConnection(middle) >= value && ( middle === 0 || GoogleTransitData.getDepartureTimeOfConnection(middle - 1) < value)){
                 return middle;
-            } else if(GoogleTransitData.CONNECTIONS[middle].departureTime < value) {
+            } else if(GoogleTransitData.getDepartureTimeOfConnection(middle) < value) {
                 start = middle + 1;
             } else {
                 end = middle - 1;
             }
         }
-        return GoogleTransitData.CONNECTIONS.length;
+        return GoogleTransitData.getNumberOfConnections();
+    }
+
+    /**
+     * Uses a binary search to find the first entry of the departure index between start (inclusive) and end (exclusive)
+     * with a departure after the given value. Returns end if no such entry exists.
+     * @param start 
+     * @param end 
+     * @param value 
+     * @returns 
+     */
+    public static binarySearchOfDepartureIndex(start: number, end: number, value: number): number{
+        while(start < end) {
+            let middle = Math.floor((start + end) / 2);
+            if(GoogleTransitData.DEPARTURE_INDEX_DEPARTURE_TIMES[middle] < value) {
+                start = middle + 1;
+            } else {
+                end = middle;
+            }
+        }
+        return start;
+    }
+
+    /**
+     * Uses a binary search to find the first connection of the weekday with a departure after the given value.
+     * Returns the number of connections of the weekday if no such connection exists.
+     * @param weekday 
+     * @param value 
+     * @returns 
+     */
+    public static binarySearchOfConnectionsOfWeekday(weekday: number, value: number): number{
+        const departureTimes = GoogleTransitData.CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY[weekday];
+        let start = 0;
+        let end = departureTimes.length;
+        while(start < end) {
+            let middle = Math.floor((start + end) / 2);
+            if(departureTimes[middle] < value) {
+                start = middle + 1;
+            } else {
+                end = middle;
+            }
+        }
+        return start;
     }
 }
\ No newline at end of file
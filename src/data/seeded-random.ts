@@ -0,0 +1,44 @@
+export class SeededRandom {
+    private state: number;
+
+    /**
+     * Creates a generator which returns the same sequence of random numbers for the same seed.
+     * @param seed 
+     */
+    constructor(seed: number) {
+        this.state = seed >>> 0;
+    }
+
+    /**
+     * Derives the seed of a stream from a base seed. Used to give each simulation batch its own reproducible sequence.
+     * @param seed 
+     * @param stream 
+     * @returns 
+     */
+    public static deriveSeed(seed: number, stream: number): number {
+        let value = (seed ^ Math.imul(stream + 1, 0x9e3779b1)) >>> 0;
+        value = Math.imul(value ^ (value >>> 16), 0x85ebca6b);
+        value = Math.imul(value ^ (value >>> 13), 0xc2b2ae35);
+        return (value ^ (value >>> 16)) >>> 0;
+    }
+
+    /**
+     * Returns a random number of the interval [0, 1) (mulberry32).
+     * @returns 
+     */
+    public next(): number {
+        this.state = (this.state + 0x6d2b79f5) | 0;
+        let value = Math.imul(this.state ^ (this.state >>> 15), 1 | this.state);
+        value = (value + Math.imul(value ^ (value >>> 7), 61 | value)) ^ value;
+        return ((value ^ (value >>> 14)) >>> 0) / 4294967296;
+    }
+
+    /**
+     * Returns a random integer of the interval [0, max).
+     * @param max 
+     * @returns 
+     */
+    public nextInt(max: number): number {
+        return Math.floor(this.next() * max);
+    }
+}
@@ -0,0 +1,211 @@
+import { Calendar } from '../models/Calendar';
+import { MAX_SERVICE_DATE_WINDOW, SERVICE_DATE_WINDOW } from '../constants';
+
+// days before and after the date of a query whose trips can be used by the algorithms
+const DAYS_BEFORE_A_QUERY = 1;
+const DAYS_AFTER_A_QUERY = 2;
+const MILLISECONDS_OF_A_DAY = 86400000;
+
+export class ServiceWindow {
+    // first day of the loaded window (days since 1970-01-01)
+    private static firstDay: number;
+    // number of days of the loaded window, a window grows if it loads the partitions next to it
+    private static numberOfDays: number;
+    // loads the timetable of a window (passes its settings), set by the entry point of the server
+    private static timetableLoader: (settings: any) => Promise<void> = null;
+    // last started load of a window
+    private static loading: Promise<void> = Promise.resolve();
+
+    /**
+     * Checks if only the trips of a service date window are loaded.
+     * @returns 
+     */
+    public static isEnabled(): boolean {
+        return SERVICE_DATE_WINDOW > 0;
+    }
+
+    /**
+     * Sets the function which loads the timetable of a window. It is called with the settings of the window if a query
+     * date is outside of the loaded window and has to set the window (setSettings) before it replaces the timetable.
+     * @param timetableLoader 
+     */
+    public static setTimetableLoader(timetableLoader: (settings: any) => Promise<void>) {
+        this.timetableLoader = timetableLoader;
+    }
+
+    /**
+     * Sets the window of the settings (format of getSettings).
+     * @param settings 
+     */
+    public static setSettings(settings: any) {
+        const firstDate: string = settings.firstDate;
+        this.firstDay = Math.round(Date.UTC(Number(firstDate.slice(0, 4)), Number(firstDate.slice(4, 6)) - 1, Number(firstDate.slice(6, 8))) / MILLISECONDS_OF_A_DAY);
+        this.numberOfDays = settings.numberOfDays;
+    }
+
+    /**
+     * Calculates the weekdays on which the trips of the calendar entry run (binary number, monday = 64, sunday = 1).
+     * If the window is enabled, only the weekdays of the dates in the window and in the validity of the entry are set.
+     * Windows of up to seven days are exact for each date.
+     * @param calendar 
+     * @returns 
+     */
+    public static getAvailability(calendar: Calendar): number {
+        let availability = 0;
+        if(!this.isEnabled()){
+            let bit = 1;
+            for(let i = 6; i >= 0; i--){
+                if(calendar.isAvailable[i]){
+                    availability += bit;
+                }
+                bit *= 2;
+            }
+            return availability;
+        }
+        const firstDay = this.getFirstDay();
+        for(let day = firstDay; day < firstDay + this.getNumberOfDays(); day++){
+            const date = this.getDateString(day);
+            // converts the weekday to monday = 0
+            const weekday = (new Date(day * MILLISECONDS_OF_A_DAY).getUTCDay() + 6) % 7;
+            if(calendar.isAvailable[weekday] && calendar.startDate <= date && date <= calendar.endDate){
+                availability |= 1 << (6 - weekday);
+            }
+        }
+        return availability;
+    }
+
+    /**
+     * Checks if the trips of the date and the days around it are loaded. Returns true if the window is disabled or the
+     * date is invalid.
+     * @param date 
+     * @returns 
+     */
+    public static containsDate(date: Date): boolean {
+        if(!this.isEnabled() || isNaN(date.getTime())){
+            return true;
+        }
+        const day = this.getDay(date);
+        const firstDay = this.getFirstDay();
+        return day - DAYS_BEFORE_A_QUERY >= firstDay && day + DAYS_AFTER_A_QUERY < firstDay + this.getNumberOfDays();
+    }
+
+    /**
+     * Loads the timetable of a window which contains the date. The window is extended by the partitions up to the one
+     * of the date, so the dates of the loaded window stay available and alternating dates don't load the timetables
+     * again. If the extended window would be longer than MAX_SERVICE_DATE_WINDOW, only the partition of the date is
+     * loaded. Loads are done one after another, the timetable is not loaded again if a previous load already contains
+     * the date.
+     * @param date 
+     * @returns 
+     */
+    public static loadDate(date: Date): Promise<void> {
+        const loading = this.loading.then(async () => {
+            if(this.containsDate(date)){
+                return;
+            }
+            if(this.timetableLoader === null){
+                throw new Error('no timetable loader');
+            }
+            const firstDayOfPartition = this.getFirstDayOfPartition(this.getDay(date));
+            let firstDay = Math.min(this.getFirstDay(), firstDayOfPartition);
+            let lastDay = Math.max(this.getFirstDay() + this.getNumberOfDays(), firstDayOfPartition + this.getNumberOfDaysOfAPartition());
+            if(lastDay - firstDay > Math.max(MAX_SERVICE_DATE_WINDOW, this.getNumberOfDaysOfAPartition())){
+                firstDay = firstDayOfPartition;
+                lastDay = firstDayOfPartition + this.getNumberOfDaysOfAPartition();
+            }
+            const settings = {
+                firstDate: this.getDateString(firstDay),
+                numberOfDays: lastDay - firstDay,
+            };
+            console.log('loads the service date window of ' + settings.firstDate + ' (' + settings.numberOfDays + ' days)');
+            await this.timetableLoader(settings);
+        });
+        this.loading = loading.catch(() => undefined);
+        return loading;
+    }
+
+    /**
+     * Gets the window which is stored in the snapshot and bound table files. Returns null if the window is disabled.
+     * @returns 
+     */
+    public static getSettings(): any {
+        if(!this.isEnabled()){
+            return null;
+        }
+        return {
+            firstDate: this.getDateString(this.getFirstDay()),
+            numberOfDays: this.getNumberOfDays(),
+        };
+    }
+
+    /**
+     * Gets the suffix of the snapshot and bound table files which keeps the files of each window.
+     * @returns 
+     */
+    public static getFileSuffix(): string {
+        if(!this.isEnabled()){
+            return '';
+        }
+        return '.' + this.getDateString(this.getFirstDay()) + '-' + this.getNumberOfDays();
+    }
+
+    /**
+     * Gets the first day of the loaded window. The partition of the current date is used until another window is loaded.
+     * @returns 
+     */
+    private static getFirstDay(): number {
+        if(this.firstDay === undefined){
+            this.firstDay = this.getFirstDayOfPartition(this.getDay(new Date()));
+        }
+        return this.firstDay;
+    }
+
+    /**
+     * Gets the number of days of the loaded window. The partition of the current date is used until another window is
+     * loaded.
+     * @returns 
+     */
+    private static getNumberOfDays(): number {
+        if(this.numberOfDays === undefined){
+            this.numberOfDays = this.getNumberOfDaysOfAPartition();
+        }
+        return this.numberOfDays;
+    }
+
+    /**
+     * Gets the number of days of a partition. Each partition contains at least one query date with the days around it.
+     * @returns 
+     */
+    private static getNumberOfDaysOfAPartition(): number {
+        return Math.max(SERVICE_DATE_WINDOW, DAYS_BEFORE_A_QUERY + DAYS_AFTER_A_QUERY + 1);
+    }
+
+    /**
+     * Gets the first day of the partition which contains the query day. The partitions are fixed parts of the calendar
+     * and the windows consist of partitions, so the files of a window can be used again.
+     * @param day 
+     * @returns 
+     */
+    private static getFirstDayOfPartition(day: number): number {
+        const queryDaysOfAWindow = this.getNumberOfDaysOfAPartition() - DAYS_BEFORE_A_QUERY - DAYS_AFTER_A_QUERY;
+        return Math.floor((day - DAYS_BEFORE_A_QUERY) / queryDaysOfAWindow) * queryDaysOfAWindow;
+    }
+
+    /**
+     * Converts the date (local time) to the number of days since 1970-01-01.
+     * @param date 
+     * @returns 
+     */
+    private static getDay(date: Date): number {
+        return Math.round(Date.UTC(date.getFullYear(), date.getMonth(), date.getDate()) / MILLISECONDS_OF_A_DAY);
+    }
+
+    /**
+     * Converts the day to the date format of the gtfs calendar (yyyymmdd).
+     * @param day 
+     * @returns 
+     */
+    private static getDateString(day: number): string {
+        return new Date(day * MILLISECONDS_OF_A_DAY).toISOString().slice(0, 10).replace(/-/g, '');
+    }
+}
\ No newline at end of file
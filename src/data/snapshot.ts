@@ -0,0 +1,506 @@
+import fs from 'fs';
+import path from 'path';
+import crypto from 'crypto';
+import { GoogleTransitData } from './google-transit-data';
+import { Importer } from './importer';
+import { SnapshotHeader } from '../models/SnapshotHeader';
+import { SnapshotSection } from '../models/SnapshotSection';
+import { CHANGE_TIME, FOOTPATH_RADIUS } from '../constants';
+import { ResponseCache } from './response-cache';
+import { StopNameIndex } from './stop-name-index';
+import { ServiceWindow } from './service-window';
+
+// types of the snapshot sections
+type SectionType = 'float64' | 'int32' | 'uint8' | 'json';
+// types of the stored object fields: numbers (float64, NaN if undefined), booleans (uint8) and other values (dictionary encoded)
+type FieldType = 'number' | 'boolean' | 'value';
+
+export class Snapshot {
+    // must be increased if the format or the preprocessing changes
+    public static readonly SNAPSHOT_VERSION: number = 4;
+    private static readonly MAGIC: string = 'PTSNAPSH';
+    // fields of the stored object tables
+    private static readonly TABLES: [string, [string, FieldType][]][] = [
+        ['CALENDAR', [['serviceId', 'number'], ['isAvailable', 'value'], ['startDate', 'value'], ['endDate', 'value']]],
+        ['ROUTES', [['id', 'number'], ['agencyId', 'number'], ['shortName', 'value'], ['longName', 'value'], ['routeType', 'number']]],
+        ['STOPS', [['id', 'number'], ['name', 'value'], ['lat', 'number'], ['lon', 'number']]],
+        ['STOPTIMES', [['tripId', 'number'], ['arrivalTime', 'number'], ['departureTime', 'number'], ['stopId', 'number'],
+            ['stopSequence', 'number'], ['pickupType', 'value'], ['dropOffType', 'value']]],
+        ['TRIPS', [['routeId', 'number'], ['serviceId', 'number'], ['id', 'number'], ['directionId', 'number'],
+            ['isLongDistance', 'boolean'], ['isAvailable', 'number'], ['gtfsId', 'value']]],
+        ['CONNECTIONS', [['id', 'number'], ['departureStop', 'number'], ['arrivalStop', 'number'], ['departureTime', 'number'],
+            ['arrivalTime', 'number'], ['trip', 'number'], ['stopSequence', 'number']]],
+        ['FOOTPATHS_SORTED_BY_DEPARTURE_STOP', [['id', 'number'], ['departureStop', 'number'], ['arrivalStop', 'number'],
+            ['duration', 'number'], ['idArrival', 'number']]],
+    ];
+    // pointer arrays which can contain undefined entries
+    private static readonly POINTERS: string[] = ['STOPTIMES_OF_A_TRIP', 'DEPARTURE_INDEX_OF_A_ROUTE', 'FOOTPATHS_OF_A_DEPARTURE_STOP', 'FOOTPATHS_OF_A_ARRIVAL_STOP'];
+    // arrays of number arrays
+    private static readonly NESTED_ARRAYS: string[] = ['STOPS_OF_A_ROUTE', 'TRIPS_OF_A_ROUTE', 'MAX_DWELL_TIMES_OF_A_ROUTE'];
+    // typed arrays which are used without copy
+    private static readonly TYPED_ARRAYS: string[] = ['DEPARTURE_INDEX_TRIPS', 'DEPARTURE_INDEX_ARRIVAL_TIMES', 'DEPARTURE_INDEX_DEPARTURE_TIMES'];
+    // tables which are replaced by the columns of the compact timetable
+    private static readonly COMPACT_TABLES: string[] = ['CONNECTIONS', 'STOPTIMES'];
+    // typed arrays of each weekday which are used without copy
+    private static readonly TYPED_ARRAYS_OF_A_WEEKDAY: string[] = ['CONNECTIONS_OF_A_WEEKDAY', 'CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY'];
+    // checksum of the gtfs files which are read once per process
+    private static feedChecksum: string;
+
+    /**
+     * Gets the file of the preprocessed timetable. Each service date window has its own file.
+     * @returns 
+     */
+    public static getSnapshotFile(): string {
+        return path.join(Importer.GOOGLE_TRANSIT_DIRECTORY, 'timetable' + ServiceWindow.getFileSuffix() + '.snapshot');
+    }
+
+    /**
+     * Writes the preprocessed google transit data to the snapshot file. Must be called after the preprocessing.
+     */
+    public static writeSnapshot(): void {
+        console.time('write snapshot')
+        const sections = new Map<string, [SectionType, Buffer]>();
+        for(let [table, fields] of this.TABLES){
+            this.encodeTable(sections, table, GoogleTransitData[table], fields);
+        }
+        // stores the footpaths sorted by arrival stop as permutation to keep the shared footpath objects
+        sections.set('FOOTPATHS_SORTED_BY_ARRIVAL_STOP', ['float64', this.encodeNumbers(GoogleTransitData.FOOTPATHS_SORTED_BY_ARRIVAL_STOP.map(footpath => footpath.id))]);
+        for(let pointer of this.POINTERS){
+            sections.set(pointer, ['float64', this.encodeNumbers(GoogleTransitData[pointer])]);
+        }
+        for(let nestedArray of this.NESTED_ARRAYS){
+            this.encodeNestedArray(sections, nestedArray, GoogleTransitData[nestedArray], [[nestedArray, (value: number) => value]]);
+        }
+        this.encodeNestedArray(sections, 'ROUTES_SERVING_STOPS', GoogleTransitData.ROUTES_SERVING_STOPS, [
+            ['ROUTES_SERVING_STOPS.routeId', (value: any) => value.routeId],
+            ['ROUTES_SERVING_STOPS.stopSequence', (value: any) => value.stopSequence]
+        ]);
+        for(let typedArray of this.TYPED_ARRAYS){
+            const values: Int32Array = GoogleTransitData[typedArray];
+            sections.set(typedArray, ['int32', Buffer.from(values.buffer, values.byteOffset, values.byteLength)]);
+        }
+        for(let typedArrays of this.TYPED_ARRAYS_OF_A_WEEKDAY){
+            for(let weekday = 0; weekday < 7; weekday++){
+                const values: Int32Array = GoogleTransitData[typedArrays][weekday];
+                sections.set(typedArrays + '.' + weekday, ['int32', Buffer.from(values.buffer, values.byteOffset, values.byteLength)]);
+            }
+        }
+
+        // computes the position and the checksum of each section
+        const header: SnapshotHeader = {
+            feedChecksum: this.getFeedChecksum(),
+            settings: this.getSettings(),
+            serviceWindow: ServiceWindow.getSettings(),
+            sections: [],
+        };
+        let byteOffset = 0;
+        for(let [name, [type, data]] of sections){
+            header.sections.push({
+                name: name,
+                type: type,
+                byteOffset: byteOffset,
+                length: data.length,
+                checksum: this.getChecksum(data),
+            });
+            byteOffset = this.align(byteOffset + data.length);
+        }
+        const headerBuffer = Buffer.from(JSON.stringify(header));
+        const prefix = Buffer.alloc(this.align(this.MAGIC.length + 8 + headerBuffer.length));
+        prefix.write(this.MAGIC, 0, 'ascii');
+        prefix.writeUInt32LE(this.SNAPSHOT_VERSION, this.MAGIC.length);
+        prefix.writeUInt32LE(headerBuffer.length, this.MAGIC.length + 4);
+        headerBuffer.copy(prefix, this.MAGIC.length + 8);
+
+        // writes a temporary file first to avoid incomplete snapshots
+        const temporaryFile = this.getSnapshotFile() + '.tmp';
+        const fileDescriptor = fs.openSync(temporaryFile, 'w');
+        try {
+            fs.writeSync(fileDescriptor, prefix);
+            let position = prefix.length;
+            for(let section of header.sections){
+                const data = sections.get(section.name)[1];
+                fs.writeSync(fileDescriptor, data, 0, data.length, prefix.length + section.byteOffset);
+                position = prefix.length + section.byteOffset + data.length;
+            }
+            // pads the last section
+            const padding = this.align(position) - position;
+            if(padding > 0){
+                fs.writeSync(fileDescriptor, Buffer.alloc(padding), 0, padding, position);
+            }
+        } finally {
+            fs.closeSync(fileDescriptor);
+        }
+        fs.renameSync(temporaryFile, this.getSnapshotFile());
+        console.timeEnd('write snapshot')
+    }
+
+    /**
+     * Loads the google transit data from the snapshot file. Returns false if no valid snapshot exists, e.g. if the
+     * version, the settings or the gtfs files changed since the snapshot was written.
+     * @returns 
+     */
+    public static loadSnapshot(): boolean {
+        if(!fs.existsSync(this.getSnapshotFile())){
+            console.log('no timetable snapshot found');
+            return false;
+        }
+        return this.loadSnapshotBuffer(fs.readFileSync(this.getSnapshotFile()), true, false);
+    }
+
+    /**
+     * Reads the snapshot file into shared memory which can be passed to worker threads. Must be called after a
+     * successful check of the snapshot.
+     * @returns 
+     */
+    public static readSharedSnapshot(): SharedArrayBuffer {
+        const sharedSnapshot = new SharedArrayBuffer(fs.statSync(this.getSnapshotFile()).size);
+        const buffer = Buffer.from(sharedSnapshot);
+        const fileDescriptor = fs.openSync(this.getSnapshotFile(), 'r');
+        try {
+            let position = 0;
+            while(position < buffer.length){
+                position += fs.readSync(fileDescriptor, buffer, position, buffer.length - position, position);
+            }
+        } finally {
+            fs.closeSync(fileDescriptor);
+        }
+        return sharedSnapshot;
+    }
+
+    /**
+     * Loads the google transit data from a snapshot in shared memory. The gtfs files and the checksums are not
+     * checked again. The typed arrays of the timetable are views of the shared memory.
+     * @param sharedSnapshot 
+     * @param skipCompactTables the connection and stop time objects are not created, the compact timetable of the main
+     * thread replaces them
+     * @returns 
+     */
+    public static loadSharedSnapshot(sharedSnapshot: SharedArrayBuffer, skipCompactTables: boolean): boolean {
+        return this.loadSnapshotBuffer(Buffer.from(sharedSnapshot), false, skipCompactTables);
+    }
+
+    /**
+     * Loads the google transit data from the content of a snapshot file.
+     * @param buffer 
+     * @param checkData checks the gtfs files, the service date window and the checksums of the sections
+     * @param skipCompactTables doesn't decode the tables which are replaced by the compact timetable
+     * @returns 
+     */
+    private static loadSnapshotBuffer(buffer: Buffer, checkData: boolean, skipCompactTables: boolean): boolean {
+        console.time('load snapshot')
+        let header: SnapshotHeader;
+        let dataOffset: number;
+        try {
+            // checks the header before any data is changed
+            if(buffer.length < this.MAGIC.length + 8 || buffer.toString('ascii', 0, this.MAGIC.length) !== this.MAGIC){
+                throw new Error('invalid file');
+            }
+            const version = buffer.readUInt32LE(this.MAGIC.length);
+            if(version !== this.SNAPSHOT_VERSION){
+                throw new Error('version ' + version + ' instead of ' + this.SNAPSHOT_VERSION);
+            }
+            const headerLength = buffer.readUInt32LE(this.MAGIC.length + 4);
+            header = JSON.parse(buffer.toString('utf8', this.MAGIC.length + 8, this.MAGIC.length + 8 + headerLength));
+            dataOffset = this.align(this.MAGIC.length + 8 + headerLength);
+            if(JSON.stringify(header.settings) !== JSON.stringify(this.getSettings())){
+                throw new Error('settings changed');
+            }
+            if(checkData){
+                if(header.feedChecksum !== this.getFeedChecksum()){
+                    throw new Error('gtfs files changed');
+                }
+                if(JSON.stringify(header.serviceWindow) !== JSON.stringify(ServiceWindow.getSettings())){
+                    throw new Error('service date window changed');
+                }
+                for(let section of header.sections){
+                    const start = dataOffset + section.byteOffset;
+                    if(start + section.length > buffer.length || this.getChecksum(buffer.slice(start, start + section.length)) !== section.checksum){
+                        throw new Error('checksum of section ' + section.name + ' does not match');
+                    }
+                }
+            }
+        } catch(error) {
+            console.log('timetable snapshot rejected: ' + error.message);
+            console.timeEnd('load snapshot')
+            return false;
+        }
+
+        const sections = new Map<string, any>();
+        for(let section of header.sections){
+            if(skipCompactTables && this.COMPACT_TABLES.includes(section.name.split('.')[0])){
+                continue;
+            }
+            sections.set(section.name, this.decodeSection(buffer, dataOffset, section));
+        }
+        for(let [table, fields] of this.TABLES){
+            if(skipCompactTables && this.COMPACT_TABLES.includes(table)){
+                GoogleTransitData[table] = undefined;
+                continue;
+            }
+            GoogleTransitData[table] = this.decodeTable(sections, table, fields);
+        }
+        GoogleTransitData.FOOTPATHS_SORTED_BY_ARRIVAL_STOP = Array.from(sections.get('FOOTPATHS_SORTED_BY_ARRIVAL_STOP'),
+            (id: number) => GoogleTransitData.FOOTPATHS_SORTED_BY_DEPARTURE_STOP[id]);
+        for(let pointer of this.POINTERS){
+            GoogleTransitData[pointer] = this.decodeNumbers(sections.get(pointer));
+        }
+        for(let nestedArray of this.NESTED_ARRAYS){
+            GoogleTransitData[nestedArray] = this.decodeNestedArray(sections, nestedArray, [nestedArray],
+                (values: Float64Array[], i: number) => values[0][i]);
+        }
+        GoogleTransitData.ROUTES_SERVING_STOPS = this.decodeNestedArray(sections, 'ROUTES_SERVING_STOPS',
+            ['ROUTES_SERVING_STOPS.routeId', 'ROUTES_SERVING_STOPS.stopSequence'],
+            (values: Float64Array[], i: number) => ({routeId: values[0][i], stopSequence: values[1][i]}));
+        for(let typedArray of this.TYPED_ARRAYS){
+            GoogleTransitData[typedArray] = sections.get(typedArray);
+        }
+        for(let typedArrays of this.TYPED_ARRAYS_OF_A_WEEKDAY){
+            GoogleTransitData[typedArrays] = [];
+            for(let weekday = 0; weekday < 7; weekday++){
+                GoogleTransitData[typedArrays].push(sections.get(typedArrays + '.' + weekday));
+            }
+        }
+        // builds the index which is used by the stop name lookups
+        StopNameIndex.build();
+        // removes the responses of the previous timetable
+        ResponseCache.invalidate();
+        console.timeEnd('load snapshot')
+        return true;
+    }
+
+    /**
+     * Stores each field of the objects as a column.
+     * @param sections 
+     * @param table 
+     * @param objects 
+     * @param fields 
+     */
+    private static encodeTable(sections: Map<string, [SectionType, Buffer]>, table: string, objects: any[], fields: [string, FieldType][]) {
+        for(let [field, fieldType] of fields){
+            const name = table + '.' + field;
+            if(fieldType === 'number'){
+                sections.set(name, ['float64', this.encodeNumbers(objects.map(object => object[field]))]);
+            } else if(fieldType === 'boolean'){
+                sections.set(name, ['uint8', Buffer.from(objects.map(object => object[field] ? 1 : 0))]);
+            } else {
+                // stores the distinct values once and the position of the value of each object
+                const dictionary = new Map<string, number>();
+                const positions = new Int32Array(objects.length);
+                for(let i = 0; i < objects.length; i++){
+                    const key = JSON.stringify(objects[i][field] === undefined ? null : objects[i][field]);
+                    let position = dictionary.get(key);
+                    if(position === undefined){
+                        position = dictionary.size;
+                        dictionary.set(key, position);
+                    }
+                    positions[i] = position;
+                }
+                sections.set(name + '.values', ['json', Buffer.from('[' + Array.from(dictionary.keys()).join(',') + ']')]);
+                sections.set(name, ['int32', Buffer.from(positions.buffer)]);
+            }
+        }
+    }
+
+    /**
+     * Creates the objects of a table from its columns.
+     * @param sections 
+     * @param table 
+     * @param fields 
+     * @returns 
+     */
+    private static decodeTable(sections: Map<string, any>, table: string, fields: [string, FieldType][]): any[] {
+        const objects = [];
+        const numberOfObjects = sections.get(table + '.' + fields[0][0]).length;
+        for(let i = 0; i < numberOfObjects; i++){
+            objects.push({});
+        }
+        for(let [field, fieldType] of fields){
+            const column = sections.get(table + '.' + field);
+            if(fieldType === 'number'){
+                for(let i = 0; i < numberOfObjects; i++){
+                    // undefined values are stored as NaN
+                    if(!isNaN(column[i])){
+                        objects[i][field] = column[i];
+                    }
+                }
+            } else if(fieldType === 'boolean'){
+                for(let i = 0; i < numberOfObjects; i++){
+                    objects[i][field] = column[i] === 1;
+                }
+            } else {
+                const values = sections.get(table + '.' + field + '.values');
+                for(let i = 0; i < numberOfObjects; i++){
+                    const value = values[column[i]];
+                    if(value !== null){
+                        // arrays are copied because they could be changed
+                        objects[i][field] = Array.isArray(value) ? value.slice() : value;
+                    }
+                }
+            }
+        }
+        return objects;
+    }
+
+    /**
+     * Stores arrays of arrays as lengths (NaN if undefined) and the concatenated values of each given getter.
+     * @param sections 
+     * @param name 
+     * @param nestedArray 
+     * @param getters 
+     */
+    private static encodeNestedArray(sections: Map<string, [SectionType, Buffer]>, name: string, nestedArray: any[][], getters: [string, (value: any) => number][]) {
+        const lengths: number[] = [];
+        for(let i = 0; i < nestedArray.length; i++){
+            lengths.push(nestedArray[i] === undefined ? undefined : nestedArray[i].length);
+        }
+        sections.set(name + '.lengths', ['float64', this.encodeNumbers(lengths)]);
+        for(let [valueName, getter] of getters){
+            const values: number[] = [];
+            for(let array of nestedArray){
+                if(array !== undefined){
+                    for(let value of array){
+                        values.push(getter(value));
+                    }
+                }
+            }
+            sections.set(valueName, ['float64', this.encodeNumbers(values)]);
+        }
+    }
+
+    /**
+     * Creates an array of arrays from the lengths and the values of the given sections.
+     * @param sections 
+     * @param name 
+     * @param valueNames 
+     * @param createEntry 
+     * @returns 
+     */
+    private static decodeNestedArray(sections: Map<string, any>, name: string, valueNames: string[], createEntry: (values: Float64Array[], i: number) => any): any[][] {
+        const lengths: Float64Array = sections.get(name + '.lengths');
+        const values: Float64Array[] = valueNames.map(valueName => sections.get(valueName));
+        const nestedArray = new Array(lengths.length);
+        let position = 0;
+        for(let i = 0; i < lengths.length; i++){
+            if(isNaN(lengths[i])){
+                continue;
+            }
+            const array = [];
+            for(let j = 0; j < lengths[i]; j++){
+                array.push(createEntry(values, position));
+                position++;
+            }
+            nestedArray[i] = array;
+        }
+        return nestedArray;
+    }
+
+    /**
+     * Stores numbers as float64 values. Undefined values are stored as NaN.
+     * @param numbers 
+     * @returns 
+     */
+    private static encodeNumbers(numbers: number[]): Buffer {
+        const values = new Float64Array(numbers.length);
+        for(let i = 0; i < numbers.length; i++){
+            values[i] = numbers[i] === undefined ? NaN : numbers[i];
+        }
+        return Buffer.from(values.buffer);
+    }
+
+    /**
+     * Creates a number array from float64 values. NaN values are converted to undefined.
+     * @param values 
+     * @returns 
+     */
+    private static decodeNumbers(values: Float64Array): number[] {
+        const numbers: number[] = new Array(values.length);
+        for(let i = 0; i < values.length; i++){
+            if(!isNaN(values[i])){
+                numbers[i] = values[i];
+            }
+        }
+        return numbers;
+    }
+
+    /**
+     * Decodes a section. Numeric sections are views of the file buffer if the position is aligned.
+     * @param buffer 
+     * @param dataOffset 
+     * @param section 
+     * @returns 
+     */
+    private static decodeSection(buffer: Buffer, dataOffset: number, section: SnapshotSection): any {
+        const start = dataOffset + section.byteOffset;
+        if(section.type === 'json'){
+            return JSON.parse(buffer.toString('utf8', start, start + section.length));
+        }
+        let data = buffer.slice(start, start + section.length);
+        if(data.byteOffset % 8 !== 0){
+            // copies the data into an aligned buffer
+            data = Buffer.from(new Uint8Array(data).buffer);
+        }
+        if(section.type === 'float64'){
+            return new Float64Array(data.buffer, data.byteOffset, section.length / 8);
+        } else if(section.type === 'int32'){
+            return new Int32Array(data.buffer, data.byteOffset, section.length / 4);
+        }
+        return new Uint8Array(data.buffer, data.byteOffset, section.length);
+    }
+
+    /**
+     * Calculates the checksum of all imported gtfs files. Throws an error if a file is missing. The files are only read
+     * by the first call.
+     * @returns 
+     */
+    public static getFeedChecksum(): string {
+        if(this.feedChecksum !== undefined){
+            return this.feedChecksum;
+        }
+        const hash = crypto.createHash('sha256');
+        const chunk = Buffer.alloc(1048576);
+        for(let file of Importer.getImportedFiles()){
+            hash.update(path.relative(Importer.GOOGLE_TRANSIT_DIRECTORY, file));
+            const fileDescriptor = fs.openSync(file, 'r');
+            try {
+                let bytesRead = fs.readSync(fileDescriptor, chunk, 0, chunk.length, null);
+                while(bytesRead > 0){
+                    hash.update(chunk.slice(0, bytesRead));
+                    bytesRead = fs.readSync(fileDescriptor, chunk, 0, chunk.length, null);
+                }
+            } finally {
+                fs.closeSync(fileDescriptor);
+            }
+        }
+        this.feedChecksum = hash.digest('hex');
+        return this.feedChecksum;
+    }
+
+    /**
+     * Gets the settings which are used by the preprocessing.
+     * @returns 
+     */
+    private static getSettings(): any {
+        return {
+            changeTime: CHANGE_TIME,
+            footpathRadius: FOOTPATH_RADIUS,
+        };
+    }
+
+    /**
+     * Calculates the checksum of a section.
+     * @param data 
+     * @returns 
+     */
+    private static getChecksum(data: Buffer): string {
+        return crypto.createHash('sha1').update(data).digest('hex');
+    }
+
+    /**
+     * Rounds the offset up to the next multiple of 8.
+     * @param offset 
+     * @returns 
+     */
+    private static align(offset: number): number {
+        return Math.ceil(offset / 8) * 8;
+    }
+}
@@ -0,0 +1,255 @@
+import { GoogleTransitData } from "./google-transit-data";
+import { MAX_STOP_NAME_EDIT_DISTANCE } from "../constants";
+
+// ranks of the matches (lower is better, fuzzy matches add their edit distance)
+const EXACT_MATCH = 0;
+const NAME_PREFIX_MATCH = 1;
+const WORD_PREFIX_MATCH = 2;
+const SUBSTRING_MATCH = 3;
+const FUZZY_MATCH = 4;
+
+export class StopNameIndex {
+    // distinct stop names (first spelling of the timetable), their normalized form and their stop ids
+    private static names: string[] = [];
+    private static normalizedNames: string[] = [];
+    private static stopIdsOfName: number[][] = [];
+    private static nameIdsByNormalizedName = new Map<string, number>();
+    // suffix array of all suffixes of the normalized names: the name and start of each suffix in sorted order and if the
+    // suffix starts at a word
+    private static nameIdsOfSuffixes = new Int32Array(0);
+    private static startsOfSuffixes = new Int32Array(0);
+    private static wordStartsOfSuffixes = new Uint8Array(0);
+
+    /**
+     * Builds the index of the stop names. Must be called if the stops change.
+     */
+    public static build() {
+        console.time('build stop name index')
+        this.names = [];
+        this.normalizedNames = [];
+        this.stopIdsOfName = [];
+        this.nameIdsByNormalizedName = new Map<string, number>();
+        for(let stop of GoogleTransitData.STOPS){
+            const normalizedName = this.normalize(stop.name);
+            let nameId = this.nameIdsByNormalizedName.get(normalizedName);
+            if(nameId === undefined){
+                nameId = this.names.length;
+                this.names.push(stop.name);
+                this.normalizedNames.push(normalizedName);
+                this.stopIdsOfName.push([]);
+                this.nameIdsByNormalizedName.set(normalizedName, nameId);
+            }
+            this.stopIdsOfName[nameId].push(stop.id);
+        }
+        // collects all suffixes of the names and sorts them
+        const suffixes: {suffix: string, nameId: number, start: number}[] = [];
+        for(let nameId = 0; nameId < this.normalizedNames.length; nameId++){
+            const normalizedName = this.normalizedNames[nameId];
+            for(let i = 0; i < normalizedName.length; i++){
+                suffixes.push({suffix: normalizedName.substring(i), nameId: nameId, start: i});
+            }
+        }
+        suffixes.sort((a, b) => a.suffix < b.suffix ? -1 : a.suffix > b.suffix ? 1 : a.nameId - b.nameId);
+        this.nameIdsOfSuffixes = new Int32Array(suffixes.length);
+        this.startsOfSuffixes = new Int32Array(suffixes.length);
+        this.wordStartsOfSuffixes = new Uint8Array(suffixes.length);
+        for(let i = 0; i < suffixes.length; i++){
+            const normalizedName = this.normalizedNames[suffixes[i].nameId];
+            const start = suffixes[i].start;
+            this.nameIdsOfSuffixes[i] = suffixes[i].nameId;
+            this.startsOfSuffixes[i] = start;
+            if(this.isWordCharacter(normalizedName[start]) && (start === 0 || !this.isWordCharacter(normalizedName[start-1]))){
+                this.wordStartsOfSuffixes[i] = 1;
+            }
+        }
+        console.timeEnd('build stop name index')
+    }
+
+    /**
+     * Gets all stop ids with the given name (ignores case and diacritics).
+     * @param name 
+     * @returns 
+     */
+    public static getStopIds(name: string): number[] {
+        const nameId = this.nameIdsByNormalizedName.get(this.normalize(name));
+        if(nameId === undefined){
+            return [];
+        }
+        return this.stopIdsOfName[nameId].slice();
+    }
+
+    /**
+     * Gets the first stop id with the given name (ignores case and diacritics). Returns null if no stop has this name.
+     * @param name 
+     * @returns 
+     */
+    public static getStopId(name: string): number {
+        const nameId = this.nameIdsByNormalizedName.get(this.normalize(name));
+        if(nameId === undefined){
+            return null;
+        }
+        return this.stopIdsOfName[nameId][0];
+    }
+
+    /**
+     * Gets the best stop names which match the search string. Exact matches are ranked before names and words which start
+     * with the search string, followed by names which contain it. If fuzzy is set, names with a word that starts with
+     * a misspelled search string fill the remaining results.
+     * @param searchString 
+     * @param limit 
+     * @param fuzzy 
+     * @returns 
+     */
+    public static getMatchingNames(searchString: string, limit: number, fuzzy: boolean): string[] {
+        const searchName = this.normalize(searchString);
+        if(searchName.length === 0 || !(limit > 0)){
+            return [];
+        }
+        // best rank of each matching name
+        const ranks = new Map<number, number>();
+        // finds the suffixes which start with the search name, the names and words which start with it are ranked before
+        // the names which contain it inside of a word
+        for(let i = this.findFirstSuffix(searchName); i < this.nameIdsOfSuffixes.length && this.getSuffix(i).startsWith(searchName); i++){
+            const nameId = this.nameIdsOfSuffixes[i];
+            let rank = SUBSTRING_MATCH;
+            if(this.startsOfSuffixes[i] === 0){
+                rank = this.normalizedNames[nameId].length === searchName.length ? EXACT_MATCH : NAME_PREFIX_MATCH;
+            } else if(this.wordStartsOfSuffixes[i] === 1){
+                rank = WORD_PREFIX_MATCH;
+            }
+            this.setRank(ranks, nameId, rank);
+        }
+        // finds words which start with the search name if some characters are changed (the first character must match)
+        const maxDistance = this.getMaxEditDistance(searchName);
+        if(fuzzy && ranks.size < limit && maxDistance > 0){
+            const firstCharacter = searchName[0];
+            for(let i = this.findFirstSuffix(firstCharacter); i < this.nameIdsOfSuffixes.length && this.normalizedNames[this.nameIdsOfSuffixes[i]][this.startsOfSuffixes[i]] === firstCharacter; i++){
+                const nameId = this.nameIdsOfSuffixes[i];
+                if(this.wordStartsOfSuffixes[i] === 0 || (ranks.has(nameId) && ranks.get(nameId) <= FUZZY_MATCH)){
+                    continue;
+                }
+                const distance = this.getPrefixEditDistance(searchName, this.getSuffix(i), maxDistance);
+                if(distance <= maxDistance){
+                    this.setRank(ranks, nameId, FUZZY_MATCH + distance);
+                }
+            }
+        }
+        // sorts the matches by rank, length and name
+        const nameIds = Array.from(ranks.keys());
+        nameIds.sort((a, b) => {
+            if(ranks.get(a) !== ranks.get(b)){
+                return ranks.get(a) - ranks.get(b);
+            }
+            if(this.normalizedNames[a].length !== this.normalizedNames[b].length){
+                return this.normalizedNames[a].length - this.normalizedNames[b].length;
+            }
+            return this.normalizedNames[a] < this.normalizedNames[b] ? -1 : 1;
+        });
+        return nameIds.slice(0, limit).map(nameId => this.names[nameId]);
+    }
+
+    /**
+     * Converts the name to lower case, removes diacritics and duplicate whitespaces.
+     * @param name 
+     * @returns 
+     */
+    public static normalize(name: string): string {
+        return name.normalize('NFD').replace(/[\u0300-\u036f]/g, '').toLowerCase().replace(/ß/g, 'ss').replace(/\s+/g, ' ').trim();
+    }
+
+    /**
+     * Sets the rank of the name if it is better than the current one.
+     * @param ranks 
+     * @param nameId 
+     * @param rank 
+     */
+    private static setRank(ranks: Map<number, number>, nameId: number, rank: number) {
+        const currentRank = ranks.get(nameId);
+        if(currentRank === undefined || rank < currentRank){
+            ranks.set(nameId, rank);
+        }
+    }
+
+    /**
+     * Gets the suffix at the given position of the suffix array.
+     * @param position 
+     * @returns 
+     */
+    private static getSuffix(position: number): string {
+        return this.normalizedNames[this.nameIdsOfSuffixes[position]].substring(this.startsOfSuffixes[position]);
+    }
+
+    /**
+     * Uses a binary search to find the first suffix which is not smaller than the value.
+     * @param value 
+     * @returns 
+     */
+    private static findFirstSuffix(value: string): number {
+        let start = 0;
+        let end = this.nameIdsOfSuffixes.length;
+        while(start < end) {
+            let middle = Math.floor((start + end) / 2);
+            if(this.getSuffix(middle) < value) {
+                start = middle + 1;
+            } else {
+                end = middle;
+            }
+        }
+        return start;
+    }
+
+    /**
+     * Gets the number of allowed typos of the search name (short search names must match exactly).
+     * @param searchName 
+     * @returns 
+     */
+    private static getMaxEditDistance(searchName: string): number {
+        if(searchName.length < 4){
+            return 0;
+        } else if(searchName.length < 8){
+            return Math.min(1, MAX_STOP_NAME_EDIT_DISTANCE);
+        }
+        return MAX_STOP_NAME_EDIT_DISTANCE;
+    }
+
+    /**
+     * Calculates the minimal edit distance between the search name and the prefixes of the value. Returns a value greater
+     * than the maximum distance if the distance exceeds it.
+     * @param searchName 
+     * @param value 
+     * @param maxDistance 
+     * @returns 
+     */
+    private static getPrefixEditDistance(searchName: string, value: string, maxDistance: number): number {
+        const valueLength = Math.min(value.length, searchName.length + maxDistance);
+        // distances between the search name and the prefixes of the value (rows of the search name)
+        let previousRow: number[] = [];
+        for(let j = 0; j <= valueLength; j++){
+            previousRow.push(j);
+        }
+        for(let i = 1; i <= searchName.length; i++){
+            const currentRow: number[] = [i];
+            let minimalDistance = i;
+            for(let j = 1; j <= valueLength; j++){
+                const substitutionCost = searchName[i-1] === value[j-1] ? 0 : 1;
+                const distance = Math.min(previousRow[j] + 1, currentRow[j-1] + 1, previousRow[j-1] + substitutionCost);
+                currentRow.push(distance);
+                minimalDistance = Math.min(minimalDistance, distance);
+            }
+            if(minimalDistance > maxDistance){
+                return maxDistance + 1;
+            }
+            previousRow = currentRow;
+        }
+        return Math.min(...previousRow);
+    }
+
+    /**
+     * Checks if the character belongs to a word (is no whitespace or punctuation).
+     * @param character 
+     * @returns 
+     */
+    private static isWordCharacter(character: string): boolean {
+        return !/[\s\-_(),.\/'"]/.test(character);
+    }
+}
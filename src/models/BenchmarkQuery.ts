@@ -0,0 +1,11 @@
+// query of a benchmark query set. The stops are stored by name and the date as yyyy-mm-dd to keep the set valid for
+// other builds of the timetable.
+export interface BenchmarkQuery {
+    id: number,
+    sourceStop: string,
+    targetStop: string,
+    sourceTime: number,
+    sourceDate: string,
+    distanceStratum: string,
+    timeStratum: string,
+}
\ No newline at end of file
@@ -0,0 +1,10 @@
+import { BenchmarkQuery } from "./BenchmarkQuery";
+
+// versioned set of benchmark queries which is stored as json file
+export interface BenchmarkQuerySet {
+    version: number,
+    name: string,
+    seed: number,
+    feedChecksum: string,
+    queries: BenchmarkQuery[],
+}
\ No newline at end of file
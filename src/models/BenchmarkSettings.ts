@@ -0,0 +1,11 @@
+// settings of a benchmark run which are written to the metadata of the result file
+export interface BenchmarkSettings {
+    algorithms: string[],
+    alphas: number[],
+    // number of queries of the set which are answered by each thread before the measurement
+    warmup: number,
+    // number of threads which answer the queries (1 answers them in the main thread)
+    concurrency: number,
+    // seed of the delays which are used by the knownDelay algorithm
+    delaySeed: number,
+}
\ No newline at end of file
@@ -0,0 +1,8 @@
+export interface BoundTableHeader {
+    feedChecksum: string,
+    snapshotVersion: number,
+    numberOfStops: number,
+    footpathRadius: number,
+    serviceWindow: any,
+    landmarks: number[],
+}
\ No newline at end of file
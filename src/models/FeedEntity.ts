@@ -0,0 +1,7 @@
+import { TripUpdate } from "./TripUpdate";
+
+export interface FeedEntity {
+    id?: string,
+    isDeleted?: boolean,
+    tripUpdate?: TripUpdate,
+}
\ No newline at end of file
@@ -0,0 +1,9 @@
+import { FeedEntity } from "./FeedEntity";
+
+export interface FeedMessage {
+    header?: {
+        // posix time (in seconds) of the creation of the message
+        timestamp?: number | string,
+    },
+    entity: FeedEntity[],
+}
\ No newline at end of file
@@ -0,0 +1,18 @@
+import { DecisionGraph } from "./DecisionGraph";
+
+export interface MeatBatchResult {
+    sourceStop: string,
+    targetStop: string,
+    sourceTime: string,
+    departureTime?: string,
+    departureDate?: string,
+    meatTime?: string,
+    meatDate?: string,
+    eatTime?: string,
+    esatTime?: string,
+    // the result was answered with the wider alpha bound of another pair with the same target
+    widenedAlphaBound?: boolean,
+    expandedDecisionGraph?: DecisionGraph,
+    compactDecisionGraph?: DecisionGraph,
+    error?: string,
+}
\ No newline at end of file
@@ -0,0 +1,8 @@
+import { MeatRangeResult } from "./MeatRangeResult";
+
+export interface MeatRangeResponse {
+    sourceStop: string,
+    targetStop: string,
+    eatTime: string,
+    results: MeatRangeResult[],
+}
\ No newline at end of file
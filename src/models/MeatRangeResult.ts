@@ -0,0 +1,6 @@
+export interface MeatRangeResult {
+    departureTime: string,
+    departureDate: string,
+    meatTime: string,
+    meatDate: string,
+}
\ No newline at end of file
@@ -0,0 +1,12 @@
+// profile of a meat response which is used by the monte carlo simulation. The entries of each stop are sorted by
+// departure time and stored in columns.
+export interface SimulationProfile {
+    sourceEntry: number,
+    // first entry of each stop (the entries of stop i are in [firstEntryOfStop[i], firstEntryOfStop[i+1]))
+    firstEntryOfStop: Int32Array,
+    departureTimes: Float64Array,
+    exitTimes: Float64Array,
+    // stop of the next entry, TARGET_STOP if the entry reaches the target or NO_EXIT_STOP if it has no trip
+    exitStops: Int32Array,
+    isLongDistance: Uint8Array,
+}
\ No newline at end of file
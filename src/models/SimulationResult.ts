@@ -0,0 +1,7 @@
+export interface SimulationResult {
+    expectedArrivalTime: number,
+    numberOfSimulations: number,
+    standardDeviation: number,
+    // width of the 95% confidence interval of the expected arrival time
+    confidenceIntervalWidth: number,
+}
\ No newline at end of file
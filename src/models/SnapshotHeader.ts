@@ -0,0 +1,8 @@
+import { SnapshotSection } from "./SnapshotSection";
+
+export interface SnapshotHeader {
+    feedChecksum: string,
+    settings: any,
+    serviceWindow: any,
+    sections: SnapshotSection[],
+}
\ No newline at end of file
@@ -0,0 +1,7 @@
+export interface SnapshotSection {
+    name: string,
+    type: string,
+    byteOffset: number,
+    length: number,
+    checksum: string,
+}
\ No newline at end of file
@@ -0,0 +1,10 @@
+export interface StopTimeUpdate {
+    stopSequence: number,
+    arrival?: {
+        delay?: number,
+    },
+    departure?: {
+        delay?: number,
+    },
+    scheduleRelationship?: string,
+}
\ No newline at end of file
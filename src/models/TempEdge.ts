@@ -1,8 +0,0 @@
-export interface TempEdge {
-    departureStop: string,
-    arrivalStop: string,
-    departureTime: number,
-    lastDepartureTime?: number
-    arrivalTime?: number,
-    type: string,
-}
\ No newline at end of file
@@ -1,6 +0,0 @@
-export interface TempNode {
-    id: string,
-    stop: string,
-    time: number,
-    type: string,
-}
\ No newline at end of file
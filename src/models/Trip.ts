@@ -5,5 +5,5 @@ export interface Trip {
     directionId: number,
     isLongDistance: boolean,
     isAvailable?: number,
-    givenDelay?: number,
+    gtfsId?: string,
 }
\ No newline at end of file
@@ -0,0 +1,12 @@
+import { StopTimeUpdate } from "./StopTimeUpdate";
+
+export interface TripUpdate {
+    trip: {
+        // trip_id of the gtfs feed
+        tripId: string,
+        scheduleRelationship?: string,
+    },
+    // delay (in seconds) of all stops which are not updated
+    delay?: number,
+    stopTimeUpdate?: StopTimeUpdate[],
+}
\ No newline at end of file
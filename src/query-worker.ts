@@ -0,0 +1,69 @@
+import { parentPort, workerData } from 'worker_threads';
+import { Snapshot } from './data/snapshot';
+import { Generator } from './data/generator';
+import { Reliability } from './data/reliability';
+import { DelayFeed } from './data/delay-feed';
+import { BoundTable } from './data/bound-table';
+import { QUERY_HANDLERS } from './server/query-handlers';
+import { COMPACT_TIMETABLE } from './constants';
+import { Metrics } from './data/metrics';
+import { ResponseCache } from './data/response-cache';
+
+/**
+ * Loads the timetable of the snapshot and uses the compact timetable, the real-time delays and the lower bounds which
+ * are shared with the main thread.
+ * @param sharedMemory 
+ */
+function loadTimetable(sharedMemory: any) {
+  // the connection and stop time objects are not created if the compact timetable is used
+  if(!Snapshot.loadSharedSnapshot(sharedMemory.sharedSnapshot, COMPACT_TIMETABLE)){
+    process.exit(1);
+  }
+  // uses the typed arrays which are generated once by the main thread (opt-in)
+  if(COMPACT_TIMETABLE){
+    Generator.generateCompactTimetable(sharedMemory.sharedCompactTimetable);
+  }
+  DelayFeed.init(sharedMemory.sharedDelays);
+  BoundTable.init(sharedMemory.sharedBounds);
+}
+
+loadTimetable(workerData);
+// initializes the reliability values
+Reliability.initReliability();
+
+// answers the queries of the main thread. The controllers send their response and the recorded metrics to the main thread.
+// the controllers keep the state of a query in static fields and are not reentrant. Queries are only answered in
+// parallel by the workers, each worker answers one query at a time with its own module instances. Without workers
+// (NUMBER_OF_QUERY_WORKERS=0, the default) the main thread still answers one query after another.
+parentPort.on('message', (message) => {
+  // removes the cached responses if the main thread invalidates its cache (no answer is sent)
+  if(message.invalidateResponseCache === true){
+    ResponseCache.invalidate();
+    return;
+  }
+  // loads the timetable of another service date window
+  if(message.sharedSnapshot !== undefined){
+    loadTimetable(message);
+    parentPort.postMessage({ ready: true });
+    return;
+  }
+  let status = 200;
+  let body: any;
+  const res: any = {
+    status: (code: number) => {
+      status = code;
+      return res;
+    },
+    send: (value?: any) => {
+      body = value;
+      return res;
+    },
+  };
+  QUERY_HANDLERS[message.handler]({ query: message.query, body: message.body } as any, res);
+  try {
+    parentPort.postMessage({ status: status, body: body, metrics: Metrics.collect() });
+  } catch (err) {
+    parentPort.postMessage({ status: 500 });
+  }
+});
+parentPort.postMessage({ ready: true });
\ No newline at end of file
@@ -0,0 +1,399 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { execSync } from 'child_process';
+import { performance } from 'perf_hooks';
+import { Worker } from 'worker_threads';
+import { BOUND_TABLE_LANDMARKS, COMPACT_TIMETABLE } from '../constants';
+import { Converter } from '../data/converter';
+import { GoogleTransitData } from '../data/google-transit-data';
+import { QuerySet } from '../data/query-set';
+import { Snapshot } from '../data/snapshot';
+import { Generator } from '../data/generator';
+import { BoundTable } from '../data/bound-table';
+import { BenchmarkQuery } from '../models/BenchmarkQuery';
+import { BenchmarkQuerySet } from '../models/BenchmarkQuerySet';
+import { BenchmarkSettings } from '../models/BenchmarkSettings';
+import { ConnectionScanExpATAlgorithmController } from './controller/connectionScanExpATAlgorithmController';
+import { ConnectionScanMeatAlgorithmController } from './controller/connectionScanMeatAlgorithmController';
+import { DelayTestController } from './controller/delayTestController';
+import { RaptorMeatAlgorithmController } from './controller/raptorMeatAlgorithmController';
+import { RaptorMeatTransferOptimisationAlgorithmController } from './controller/raptorMeatTransferOptimisationAlgorithmController';
+
+// names of the algorithms which can be benchmarked (known delay evaluates the decision graph of the raptor meat algorithm)
+const RAPTOR_MEAT = 'raptorMinimumExpectedArrivalTime';
+const RAPTOR_MEAT_TRANSFER_OPTIMISATION = 'raptorMinimumExpectedArrivalTimeTransferOptimisation';
+const CSA_EXPECTED_ARRIVAL_TIME = 'csaExpectedArrivalTime';
+const CSA_MEAT = 'csaMinimumExpectedArrivalTime';
+const KNOWN_DELAY = 'knownDelay';
+// number of rounds of the transfer optimisation which are written to the records
+const NUMBER_OF_TB_ROUNDS = 10;
+
+// query and alpha of a benchmark record
+interface BenchmarkTask {
+    query: BenchmarkQuery,
+    alpha: number,
+}
+
+export class BenchmarkRunner {
+    // format version of the result files. Must be increased if columns are renamed or removed.
+    public static readonly SCHEMA_VERSION: number = 1;
+    public static readonly ALGORITHMS: string[] = [RAPTOR_MEAT, RAPTOR_MEAT_TRANSFER_OPTIMISATION, CSA_EXPECTED_ARRIVAL_TIME, CSA_MEAT, KNOWN_DELAY];
+    // worker script (compiled to dist/benchmark-worker.js)
+    private static readonly WORKER_FILE: string = path.join(__dirname, '../benchmark-worker.js');
+
+    /**
+     * Answers each query of the set for each alpha with the chosen algorithms and writes the results to the output file.
+     * The first line of the file contains the metadata of the run, each further line one record. The columns of the
+     * records use the titles of the former csv files of the test controller.
+     * @param querySet 
+     * @param settings 
+     * @param output 
+     */
+    public static async run(querySet: BenchmarkQuerySet, settings: BenchmarkSettings, output: string): Promise<void> {
+        this.validateAlgorithms(settings.algorithms);
+        const tasks: BenchmarkTask[] = [];
+        for(let alpha of settings.alphas){
+            for(let query of querySet.queries){
+                tasks.push({query: query, alpha: alpha});
+            }
+        }
+        const warmupQueries = querySet.queries.slice(0, settings.warmup);
+        fs.mkdirSync(path.dirname(output), { recursive: true });
+        const fileDescriptor = fs.openSync(output, 'w');
+        try {
+            fs.writeSync(fileDescriptor, JSON.stringify({ metadata: this.getMetadata(querySet, settings) }) + '\n');
+            const writeRecord = (record: any) => fs.writeSync(fileDescriptor, JSON.stringify(record) + '\n');
+            console.time('benchmark')
+            if(settings.concurrency > 1){
+                await this.runInWorkers(tasks, settings, warmupQueries, writeRecord);
+            } else {
+                this.prepare(settings, warmupQueries);
+                const startTime = performance.now();
+                for(let task of tasks){
+                    const record = this.runQuery(task.query, task.alpha, settings.algorithms);
+                    record['Completed At'] = performance.now() - startTime;
+                    writeRecord(record);
+                }
+            }
+            console.timeEnd('benchmark')
+        } finally {
+            fs.closeSync(fileDescriptor);
+        }
+        console.log('wrote ' + tasks.length + ' records to ' + output);
+    }
+
+    /**
+     * Adds the delays which are used by the known delay algorithm and answers the warmup queries. Must be called by each
+     * thread before the queries are measured.
+     * @param settings 
+     * @param warmupQueries 
+     */
+    public static prepare(settings: BenchmarkSettings, warmupQueries: BenchmarkQuery[]) {
+        if(settings.algorithms.includes(KNOWN_DELAY)){
+            DelayTestController.addDelaysToTrips(settings.delaySeed);
+        }
+        for(let query of warmupQueries){
+            this.runQuery(query, settings.alphas[0], settings.algorithms);
+        }
+    }
+
+    /**
+     * Answers the query with the chosen algorithms and returns the record of the results and durations. Columns of
+     * algorithms without result are null.
+     * @param query 
+     * @param alpha 
+     * @param algorithms 
+     * @returns 
+     */
+    public static runQuery(query: BenchmarkQuery, alpha: number, algorithms: string[]): any {
+        const sourceTime = Converter.secondsToTime(query.sourceTime);
+        const sourceDate = QuerySet.stringToDate(query.sourceDate);
+        const record: any = {
+            'Query Id': query.id,
+            'Alpha': alpha,
+            'Distance Stratum': query.distanceStratum,
+            'Time Stratum': query.timeStratum,
+            'Source Stop': query.sourceStop,
+            'Target Stop': query.targetStop,
+            'Source Time': query.sourceTime,
+            'Source Date': sourceDate.toLocaleDateString('de-DE'),
+            'Success': true,
+        };
+        const startTime = performance.now();
+        let raptorMeatResponse = undefined;
+        if(algorithms.includes(RAPTOR_MEAT)){
+            raptorMeatResponse = RaptorMeatAlgorithmController.testRaptorMeatAlgorithm(query.sourceStop, query.targetStop, sourceTime, sourceDate, alpha);
+            const response: any = raptorMeatResponse || {};
+            record['EAT'] = this.getValue(response.earliestArrivalTime);
+            record['ESAT'] = this.getValue(response.earliestSafeArrivalTime);
+            record['MEAT'] = this.getValue(response.expectedArrivalTime);
+            record['Raptor MEAT Complete'] = this.getValue(response.completeDuration);
+            record['Raptor MEAT Init'] = this.getValue(response.initDuration);
+            record['Raptor MEAT Algorithm'] = this.getValue(response.algorithmDuration);
+            record['Raptor MEAT Init Loop'] = this.getValue(response.initLoopDuration);
+            record['Raptor MEAT Traverse Routes Loop'] = this.getValue(response.traverseRoutesLoopDuration);
+            record['Raptor MEAT Update Loop'] = this.getValue(response.updateExpectedArrivalTimesLoopDuration);
+            record['Raptor MEAT Decision Graph'] = this.getValue(response.decisionGraphDuration);
+            record['Raptor MEAT Computed Rounds'] = this.getValue(response.computedRounds);
+            record['Raptor MEAT Rounds Of Result'] = this.getValue(response.transferCountOfResult);
+            record['Raptor MEAT Stops in Graph'] = this.getValue(response.numberOfStops);
+            record['Raptor MEAT Legs in Graph'] = this.getValue(response.numberOfLegs);
+            record['Raptor MEAT Edges in Graph'] = this.getValue(response.numberOfEdgesInCompactGraph);
+            record['Success'] = record['Success'] && !!raptorMeatResponse;
+        }
+        if(algorithms.includes(RAPTOR_MEAT_TRANSFER_OPTIMISATION)){
+            const raptorMeatTOResponse = RaptorMeatTransferOptimisationAlgorithmController.testRaptorMeatTransferOptimisationAlgorithm(query.sourceStop, query.targetStop, sourceTime, sourceDate, alpha);
+            const response: any = raptorMeatTOResponse || {};
+            record['Raptor MEAT TO ExpAT'] = this.getValue(response.expectedArrivalTime);
+            record['Raptor MEAT TO Complete'] = this.getValue(response.completeDuration);
+            record['Raptor MEAT TO Init'] = this.getValue(response.initDuration);
+            record['Raptor MEAT TO Algorithm'] = this.getValue(response.algorithmDuration);
+            record['Raptor MEAT TO Init Loop'] = this.getValue(response.initLoopDuration);
+            record['Raptor MEAT TO Traverse Routes Loop'] = this.getValue(response.traverseRoutesLoopDuration);
+            record['Raptor MEAT TO Update Loop'] = this.getValue(response.updateExpectedArrivalTimesLoopDuration);
+            record['Raptor MEAT TO Decision Graph'] = this.getValue(response.decisionGraphDuration);
+            record['Raptor MEAT TO Rounds Of Result'] = this.getValue(response.optimalRound);
+            record['Raptor MEAT TO Stops in Graph'] = this.getValue(response.numberOfStops);
+            record['Raptor MEAT TO Legs in Graph'] = this.getValue(response.numberOfLegs);
+            record['Raptor MEAT TO Edges in Graph'] = this.getValue(response.numberOfEdgesInCompactGraph);
+            for(let i = 1; i <= NUMBER_OF_TB_ROUNDS; i++){
+                record['Raptor MEAT TB ExpAT ' + i] = this.getValue(response.meatResults && response.meatResults[i]);
+            }
+            for(let i = 1; i <= NUMBER_OF_TB_ROUNDS; i++){
+                record['Raptor MEAT TB Algorithm ' + i] = this.getValue(response.algorithmDurations && response.algorithmDurations[i]);
+            }
+            record['Success'] = record['Success'] && !!raptorMeatTOResponse;
+        }
+        if(algorithms.includes(CSA_EXPECTED_ARRIVAL_TIME)){
+            const csaExpATResponse = ConnectionScanExpATAlgorithmController.testConnectionScanExpATAlgorithm(query.sourceStop, query.targetStop, sourceTime, sourceDate, alpha);
+            const response: any = csaExpATResponse || {};
+            record['CSA ExpAT'] = this.getValue(response.expectedArrivalTime);
+            record['CSA ExpAT Complete'] = this.getValue(response.completeDuration);
+            record['CSA ExpAT Init'] = this.getValue(response.initDuration);
+            record['CSA ExpAT Algorithm'] = this.getValue(response.algorithmDuration);
+            record['CSA ExpAT Decision Graph'] = this.getValue(response.decisionGraphDuration);
+            record['Success'] = record['Success'] && !!csaExpATResponse;
+        }
+        if(algorithms.includes(CSA_MEAT)){
+            const csaMeatResponse = ConnectionScanMeatAlgorithmController.testConnectionScanMeatAlgorithm(query.sourceStop, query.targetStop, sourceTime, sourceDate, alpha);
+            const response: any = csaMeatResponse || {};
+            record['CSA MEAT Complete'] = this.getValue(response.completeDuration);
+            record['CSA MEAT Init'] = this.getValue(response.initDuration);
+            record['CSA MEAT Algorithm'] = this.getValue(response.algorithmDuration);
+            record['CSA MEAT Decision Graph'] = this.getValue(response.decisionGraphDuration);
+            record['Success'] = record['Success'] && !!csaMeatResponse;
+        }
+        if(algorithms.includes(KNOWN_DELAY)){
+            let knownDelayResultCSA = null;
+            let knownDelayResultRaptorMEAT = null;
+            if(raptorMeatResponse){
+                const sourceStop = GoogleTransitData.getStopIdByName(query.sourceStop);
+                const targetStop = GoogleTransitData.getStopIdByName(query.targetStop);
+                knownDelayResultCSA = this.getValue(DelayTestController.getEarliestArrivalTimeCSA(sourceStop, targetStop, query.sourceTime, sourceDate));
+                try {
+                    knownDelayResultRaptorMEAT = this.getValue(DelayTestController.getEarliestArrivalTimeRaptorMeat(sourceStop, targetStop, raptorMeatResponse.expectedArrivalTimes));
+                } catch(error) {
+                    knownDelayResultRaptorMEAT = null;
+                }
+            }
+            record['CSA AT Known Delay'] = knownDelayResultCSA;
+            record['Raptor MEAT AT Known Delay'] = knownDelayResultRaptorMEAT;
+            record['Success'] = record['Success'] && knownDelayResultCSA !== null && knownDelayResultRaptorMEAT !== null;
+        }
+        record['Latency'] = performance.now() - startTime;
+        return record;
+    }
+
+    /**
+     * Throws an error if an algorithm is unknown or the known delay algorithm is chosen without the raptor meat algorithm.
+     * @param algorithms 
+     */
+    public static validateAlgorithms(algorithms: string[]) {
+        for(let algorithm of algorithms){
+            if(!this.ALGORITHMS.includes(algorithm)){
+                throw new Error('unknown algorithm ' + algorithm + ' (expected one of ' + this.ALGORITHMS.join(', ') + ')');
+            }
+        }
+        if(algorithms.includes(KNOWN_DELAY) && !algorithms.includes(RAPTOR_MEAT)){
+            throw new Error(KNOWN_DELAY + ' requires ' + RAPTOR_MEAT);
+        }
+    }
+
+    /**
+     * Gets the checksum of the gtfs files. Returns null if a file is missing.
+     * @returns 
+     */
+    public static getFeedChecksum(): string {
+        try {
+            return Snapshot.getFeedChecksum();
+        } catch(error) {
+            return null;
+        }
+    }
+
+    /**
+     * Distributes the tasks over the workers. Each worker answers the warmup queries before it gets the first task.
+     * The records are written in the order of the tasks.
+     * @param tasks 
+     * @param settings 
+     * @param warmupQueries 
+     * @param writeRecord 
+     * @returns 
+     */
+    private static runInWorkers(tasks: BenchmarkTask[], settings: BenchmarkSettings, warmupQueries: BenchmarkQuery[], writeRecord: (record: any) => void): Promise<void> {
+        if(tasks.length === 0){
+            return Promise.resolve();
+        }
+        return new Promise<void>((resolve, reject) => {
+            const sharedSnapshot = Snapshot.readSharedSnapshot();
+            const workers: Worker[] = [];
+            const records: any[] = new Array(tasks.length);
+            let nextTask = 0;
+            let nextRecord = 0;
+            let numberOfReadyWorkers = 0;
+            let startTime: number;
+            let failed = false;
+            const stop = (error?: Error) => {
+                failed = true;
+                for(let worker of workers){
+                    worker.terminate();
+                }
+                if(error !== undefined){
+                    reject(error);
+                } else {
+                    resolve();
+                }
+            };
+            const sendTask = (worker: Worker) => {
+                if(nextTask < tasks.length){
+                    worker.postMessage({ taskId: nextTask, task: tasks[nextTask] });
+                    nextTask++;
+                }
+            };
+            for(let i = 0; i < settings.concurrency; i++){
+                const worker = new Worker(this.WORKER_FILE, { workerData: { sharedSnapshot: sharedSnapshot, sharedCompactTimetable: Generator.getSharedCompactTimetable(), sharedBounds: BoundTable.getSharedBounds(), settings: settings, warmupQueries: warmupQueries } });
+                workers.push(worker);
+                worker.on('message', (message) => {
+                    if(failed){
+                        return;
+                    }
+                    if(message.error !== undefined){
+                        stop(new Error('benchmark worker failed: ' + message.error));
+                        return;
+                    }
+                    if(message.ready){
+                        // the measurement starts when all workers finished their warmup
+                        numberOfReadyWorkers++;
+                        if(numberOfReadyWorkers === workers.length){
+                            startTime = performance.now();
+                            workers.forEach(sendTask);
+                        }
+                        return;
+                    }
+                    message.record['Completed At'] = performance.now() - startTime;
+                    records[message.taskId] = message.record;
+                    while(nextRecord < tasks.length && records[nextRecord] !== undefined){
+                        writeRecord(records[nextRecord]);
+                        records[nextRecord] = null;
+                        nextRecord++;
+                    }
+                    if(nextRecord === tasks.length){
+                        stop();
+                        return;
+                    }
+                    sendTask(worker);
+                });
+                worker.on('error', (error) => {
+                    if(!failed){
+                        stop(new Error('benchmark worker failed: ' + error.message));
+                    }
+                });
+                worker.on('exit', () => {
+                    if(!failed){
+                        stop(new Error('benchmark worker stopped unexpectedly'));
+                    }
+                });
+            }
+        });
+    }
+
+    /**
+     * Gets the metadata of the run: versions of the result format and the build, the checksum and size of the gtfs feed,
+     * the query set and the settings.
+     * @param querySet 
+     * @param settings 
+     * @returns 
+     */
+    private static getMetadata(querySet: BenchmarkQuerySet, settings: BenchmarkSettings): any {
+        return {
+            schemaVersion: this.SCHEMA_VERSION,
+            createdAt: new Date().toISOString(),
+            build: {
+                version: this.getPackageVersion(),
+                commit: this.getCommit(),
+                node: process.version,
+                platform: process.platform + '-' + process.arch,
+                cpu: os.cpus().length > 0 ? os.cpus()[0].model : null,
+                numberOfCpus: os.cpus().length,
+                compactTimetable: COMPACT_TIMETABLE,
+                boundTableLandmarks: BOUND_TABLE_LANDMARKS,
+            },
+            feed: {
+                checksum: this.getFeedChecksum(),
+                snapshotVersion: Snapshot.SNAPSHOT_VERSION,
+                numberOfStops: GoogleTransitData.STOPS.length,
+                numberOfTrips: GoogleTransitData.TRIPS.length,
+                numberOfConnections: GoogleTransitData.getNumberOfConnections(),
+            },
+            querySet: {
+                name: querySet.name,
+                version: querySet.version,
+                seed: querySet.seed,
+                feedChecksum: querySet.feedChecksum,
+                numberOfQueries: querySet.queries.length,
+            },
+            settings: settings,
+        };
+    }
+
+    /**
+     * Gets the version of the package.json. Returns null if it can't be read.
+     * @returns 
+     */
+    private static getPackageVersion(): string {
+        try {
+            return JSON.parse(fs.readFileSync(path.join(__dirname, '../../package.json'), 'utf8')).version;
+        } catch(error) {
+            return null;
+        }
+    }
+
+    /**
+     * Gets the current git commit (marked with -dirty if the tree has uncommitted changes). Returns null outside of a
+     * git repository.
+     * @returns 
+     */
+    private static getCommit(): string {
+        try {
+            const options: any = { stdio: ['ignore', 'pipe', 'ignore'] };
+            const commit = execSync('git rev-parse HEAD', options).toString().trim();
+            const isDirty = execSync('git status --porcelain --untracked-files=no', options).toString().trim().length > 0;
+            return isDirty ? commit + '-dirty' : commit;
+        } catch(error) {
+            return null;
+        }
+    }
+
+    /**
+     * Replaces undefined and non-finite values (used for unreachable targets) by null.
+     * @param value 
+     * @returns 
+     */
+    private static getValue(value: number): number {
+        if(value === undefined || value === null || !isFinite(value)){
+            return null;
+        }
+        return value;
+    }
+}
\ No newline at end of file
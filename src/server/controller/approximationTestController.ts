@@ -1,6 +1,7 @@
-import { SECONDS_OF_A_DAY } from "../../constants";
+import { MAX_NUMBER_OF_SIMULATIONS, SECONDS_OF_A_DAY, SIMULATION_SEED } from "../../constants";
 import { GoogleTransitData } from "../../data/google-transit-data";
-import { Reliability } from "../../data/reliability";
+import { MonteCarloSimulation } from "../../data/monte-carlo-simulation";
+import { SeededRandom } from "../../data/seeded-random";
 import { ConnectionScanMeatAlgorithmController } from "./connectionScanMeatAlgorithmController";
 import { RaptorMeatAlgorithmController } from "./raptorMeatAlgorithmController";
 
@@ -44,7 +45,8 @@ export class ApproximationTestController{
     /**
      * Performs the CSA and Raptor MEAT approximation tests for randomly selected requests.
      */
-    public static performApproximationTests(alpha: number){
+    public static async performApproximationTests(alpha: number){
+        const random = new SeededRandom(SIMULATION_SEED);
         const numberOfStops = GoogleTransitData.STOPS.length;
         const numberOfSeconds = SECONDS_OF_A_DAY;
         const numberOfDates = 7;
@@ -60,13 +62,13 @@ export class ApproximationTestController{
         let raptorProportionalDifference = 0;
         let csaProportionalDifference = 0;
         for(let i = 0; i < 1000; i++){
-            const randomSourceStop = this.getRandomInt(numberOfStops);
-            const randomTargetStop = this.getRandomInt(numberOfStops);
-            const randomSourceTime = this.getRandomInt(numberOfSeconds);
-            const randomSourceDate = dates[this.getRandomInt(numberOfDates)];
+            const randomSourceStop = random.nextInt(numberOfStops);
+            const randomTargetStop = random.nextInt(numberOfStops);
+            const randomSourceTime = random.nextInt(numberOfSeconds);
+            const randomSourceDate = dates[random.nextInt(numberOfDates)];
             try {
-                let csaResult = this.performApproximationTestForCsaMeatAlgorithm(randomSourceStop, randomTargetStop, randomSourceTime, randomSourceDate, 10000000, alpha);
-                let raptorResult = this.performApproximationTestForRaptorMeatAlgorithm(randomSourceStop, randomTargetStop, randomSourceTime, randomSourceDate, 10000000, alpha);
+                let csaResult = await this.performApproximationTestForCsaMeatAlgorithm(randomSourceStop, randomTargetStop, randomSourceTime, randomSourceDate, MAX_NUMBER_OF_SIMULATIONS, alpha);
+                let raptorResult = await this.performApproximationTestForRaptorMeatAlgorithm(randomSourceStop, randomTargetStop, randomSourceTime, randomSourceDate, MAX_NUMBER_OF_SIMULATIONS, alpha);
                 csaAbsoluteDifference += Math.abs(csaResult.csaExpectedArrivalTime - csaResult.approximatedExpectedArrivalTime)
                 raptorAbsoluteDifference += Math.abs(raptorResult.raptorExpectedArrivalTime - raptorResult.approximatedExpectedArrivalTime)
                 csaProportionalDifference += Math.abs((csaResult.csaExpectedArrivalTime - csaResult.approximatedExpectedArrivalTime)/(csaResult.csaExpectedArrivalTime - randomSourceTime));
@@ -91,68 +93,33 @@ export class ApproximationTestController{
      * @param iterationCounter 
      * @returns 
      */
-    private static performApproximationTestForCsaMeatAlgorithm(sourceStop: number, targetStop: number, sourceTime: number, sourceDate: Date, iterationCounter: number, alpha: number){
+    private static async performApproximationTestForCsaMeatAlgorithm(sourceStop: number, targetStop: number, sourceTime: number, sourceDate: Date, iterationCounter: number, alpha: number){
         const s = ConnectionScanMeatAlgorithmController.getSArray(sourceStop, targetStop, sourceTime, sourceDate, alpha);
         if(s === null) {
             throw new Error("Couldn't find a connection.")
         }
-
-        let expectedArrivalTime: number = 0;
-        for(let i = 0; i < iterationCounter; i++){
-            let currentPair = s[sourceStop][0];
-            while(currentPair.exitStop !== targetStop){
-                let nextStop = currentPair.exitStop;
-                let delay = Reliability.getRandomDelay(GoogleTransitData.TRIPS[currentPair.tripId].isLongDistance);
-                let arrivalTime = currentPair.exitTime + delay;
-                for(let j = 0; j < s[nextStop].length; j++){
-                    if(arrivalTime <= s[nextStop][j].departureTime){
-                        currentPair = s[nextStop][j];
-                        break;
-                    }
-                }
-            }
-            let delay = Reliability.getRandomDelay(GoogleTransitData.TRIPS[currentPair.tripId].isLongDistance);
-            let arrivalTime = currentPair.exitTime + delay;
-            expectedArrivalTime += arrivalTime;
-        }
+        const approximatedExpectedArrivalTime = await this.performApproximationTestForCsaMeatAlgorithmWithGivenSArray(sourceStop, targetStop, s, iterationCounter);
         return {
             csaExpectedArrivalTime: s[sourceStop][0].expectedArrivalTime,
-            approximatedExpectedArrivalTime: expectedArrivalTime/iterationCounter
+            approximatedExpectedArrivalTime: approximatedExpectedArrivalTime
         };
     }
 
     /**
-     * Performs the approximation test for the CSA MEAT algorithm.
+     * Performs the approximation test for the CSA MEAT algorithm. Stops before the maximum number of iterations if the
+     * approximation is precise enough.
      * @param sourceStop 
      * @param targetStop 
-     * @param sourceTime 
-     * @param sourceDate 
+     * @param s 
      * @param iterationCounter 
      * @returns 
      */
-     public static performApproximationTestForCsaMeatAlgorithmWithGivenSArray(sourceStop: number, targetStop: number, s: SEntry[][], iterationCounter: number){
-        let expectedArrivalTime: number = 0;
-        for(let i = 0; i < iterationCounter; i++){
-            let currentPair = s[sourceStop][0];
-            while(currentPair.exitStop !== targetStop){
-                let nextStop = currentPair.exitStop;
-                let delay = Reliability.getRandomDelay(GoogleTransitData.TRIPS[currentPair.tripId].isLongDistance);
-                let arrivalTime = currentPair.exitTime + delay;
-                for(let j = 0; j < s[nextStop].length; j++){
-                    if(arrivalTime <= s[nextStop][j].departureTime){
-                        currentPair = s[nextStop][j];
-                        break;
-                    }
-                }
-            }
-            let delay = Reliability.getRandomDelay(GoogleTransitData.TRIPS[currentPair.tripId].isLongDistance);
-            let arrivalTime = currentPair.exitTime + delay;
-            expectedArrivalTime += arrivalTime;
-        }
-        return expectedArrivalTime/iterationCounter;
+    public static async performApproximationTestForCsaMeatAlgorithmWithGivenSArray(sourceStop: number, targetStop: number, s: SEntry[][], iterationCounter: number){
+        const profile = MonteCarloSimulation.createProfileOfSArray(s, sourceStop, targetStop);
+        const result = await MonteCarloSimulation.approximateExpectedArrivalTime(profile, iterationCounter);
+        return result.expectedArrivalTime;
     }
 
-
     /**
      * Performs the approximation test for the Raptor MEAT algorithm.
      * @param sourceStop 
@@ -162,73 +129,30 @@ export class ApproximationTestController{
      * @param iterationCounter 
      * @returns 
      */
-    private static performApproximationTestForRaptorMeatAlgorithm(sourceStop: number, targetStop: number, sourceTime: number, sourceDate: Date, iterationCounter: number, alpha: number){
+    private static async performApproximationTestForRaptorMeatAlgorithm(sourceStop: number, targetStop: number, sourceTime: number, sourceDate: Date, iterationCounter: number, alpha: number){
         const expectedArrivalTimes = RaptorMeatAlgorithmController.getExpectedArrivalTimesArray(sourceStop, targetStop, sourceTime, sourceDate, alpha);
         if(expectedArrivalTimes === null) {
             throw new Error("Couldn't find a connection.")
         }
-
-        let expectedArrivalTime: number = 0;
-        for(let i = 0; i < iterationCounter; i++){
-            let currentLabel = expectedArrivalTimes[sourceStop][0];
-            while(currentLabel.exitTripAtStop !== targetStop){
-                let nextStop = currentLabel.exitTripAtStop;
-                let delay = Reliability.getRandomDelay(GoogleTransitData.TRIPS[currentLabel.associatedTrip.tripId].isLongDistance);
-                let arrivalTime = currentLabel.associatedTrip.tripArrival + delay;
-                for(let j = 0; j < expectedArrivalTimes[nextStop].length; j++){
-                    if(arrivalTime <= expectedArrivalTimes[nextStop][j].departureTime){
-                        currentLabel = expectedArrivalTimes[nextStop][j];
-                        break;
-                    }
-                }
-            }
-            let delay = Reliability.getRandomDelay(GoogleTransitData.TRIPS[currentLabel.associatedTrip.tripId].isLongDistance);
-            let arrivalTime = currentLabel.associatedTrip.tripArrival + delay;
-            expectedArrivalTime += arrivalTime;
-        }
+        const approximatedExpectedArrivalTime = await this.performApproximationTestForRaptorMeatAlgorithmWithGivenExpectedArrivalTimes(sourceStop, targetStop, expectedArrivalTimes, iterationCounter);
         return {
             raptorExpectedArrivalTime: expectedArrivalTimes[sourceStop][0].expectedArrivalTime,
-            approximatedExpectedArrivalTime: expectedArrivalTime/iterationCounter
+            approximatedExpectedArrivalTime: approximatedExpectedArrivalTime
         };
     }
 
     /**
-     * Performs the approximation test for the Raptor MEAT algorithm.
+     * Performs the approximation test for the Raptor MEAT algorithm. Stops before the maximum number of iterations if the
+     * approximation is precise enough.
      * @param sourceStop 
      * @param targetStop 
-     * @param sourceTime 
-     * @param sourceDate 
+     * @param expectedArrivalTimes 
      * @param iterationCounter 
      * @returns 
      */
-     public static performApproximationTestForRaptorMeatAlgorithmWithGivenExpectedArrivalTimes(sourceStop: number, targetStop: number, expectedArrivalTimes: Label[][], iterationCounter: number){
-        let expectedArrivalTime: number = 0;
-        for(let i = 0; i < iterationCounter; i++){
-            let currentLabel = expectedArrivalTimes[sourceStop][0];
-            while(currentLabel.exitTripAtStop !== targetStop){
-                let nextStop = currentLabel.exitTripAtStop;
-                let delay = Reliability.getRandomDelay(GoogleTransitData.TRIPS[currentLabel.associatedTrip.tripId].isLongDistance);
-                let arrivalTime = currentLabel.associatedTrip.tripArrival + delay;
-                for(let j = 0; j < expectedArrivalTimes[nextStop].length; j++){
-                    if(arrivalTime <= expectedArrivalTimes[nextStop][j].departureTime){
-                        currentLabel = expectedArrivalTimes[nextStop][j];
-                        break;
-                    }
-                }
-            }
-            let delay = Reliability.getRandomDelay(GoogleTransitData.TRIPS[currentLabel.associatedTrip.tripId].isLongDistance);
-            let arrivalTime = currentLabel.associatedTrip.tripArrival + delay;
-            expectedArrivalTime += arrivalTime;
-        }
-        return expectedArrivalTime/iterationCounter;
-    }
-
-    /**
-     * Returns a random integer of the interval [0, max).
-     * @param max 
-     * @returns 
-     */
-     private static getRandomInt(max: number) {
-        return Math.floor(Math.random() * max);
+    public static async performApproximationTestForRaptorMeatAlgorithmWithGivenExpectedArrivalTimes(sourceStop: number, targetStop: number, expectedArrivalTimes: Label[][], iterationCounter: number){
+        const profile = MonteCarloSimulation.createProfileOfExpectedArrivalTimes(expectedArrivalTimes, sourceStop, targetStop);
+        const result = await MonteCarloSimulation.approximateExpectedArrivalTime(profile, iterationCounter);
+        return result.expectedArrivalTime;
     }
 }
\ No newline at end of file
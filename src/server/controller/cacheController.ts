@@ -0,0 +1,13 @@
+import express from 'express';
+import { ResponseCache } from '../../data/response-cache';
+
+export class CacheController {
+    /**
+     * Returns the size and the hit, miss, eviction and invalidation counters of the response cache.
+     * @param req 
+     * @param res 
+     */
+    public static getStatistics(req: express.Request, res: express.Response){
+        res.send(ResponseCache.getStatistics());
+    }
+}
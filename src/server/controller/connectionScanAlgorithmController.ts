@@ -9,10 +9,10 @@ import { Transfer } from "../../models/Transfer";
 import { JourneyResponse } from '../../models/JourneyResponse';
 import { Section } from '../../models/Section';
 import { performance } from 'perf_hooks';
-import { Connection } from '../../models/Connection';
 import { Calculator } from '../../data/calculator';
 import { MAX_D_C_LONG, MAX_D_C_NORMAL, SECONDS_OF_A_DAY } from '../../constants';
 import { Reliability } from '../../data/reliability';
+import { Metrics } from '../../data/metrics';
 
 // Pointer to reconstruct the journey.
 interface JourneyPointer {
@@ -35,6 +35,9 @@ export class ConnectionScanAlgorithmController {
     // source and target stop
     private static sourceStop: number;
     private static targetStop: number;
+    // target stops of a one to many search and the number of target stops whose earliest arrival time is final
+    private static targetStops: number[];
+    private static numberOfReachedTargetStops: number;
 
     // source time and date
     private static sourceTime: number;
@@ -52,8 +55,15 @@ export class ConnectionScanAlgorithmController {
     private static dates: Date[];
     // index of previous, current and next day
     private static indices: number[];
-    // connection of previous, current and next day
-    private static connections: Connection[];
+    // departure time of the next connection of previous, current and next day
+    private static departureTimes: number[];
+    // uses the walking footpaths between stops, the bounds of the meat and expected arrival time searches use only the
+    // change times because these searches don't walk
+    private static useWalkingFootpaths: boolean;
+    // earliest arrival time of each stop and reached trips of previous, current and next day without the safe change
+    // times. Only calculated along the safe variant if the earliest arrival time at the target is needed too.
+    private static unsafeS: number[];
+    private static unsafeT: boolean[][];
 
     /**
      * Initializes and calls the connection scan algorithm.
@@ -75,19 +85,22 @@ export class ConnectionScanAlgorithmController {
             // converts the source time
             this.sourceTime = Converter.timeToSeconds(req.query.sourceTime)
             this.sourceDate = new Date(req.query.date);
+            this.useWalkingFootpaths = true;
             // initializes the csa algorithm
+            let span = Metrics.startSpan();
             this.init();
+            span = Metrics.endSpan('csaEarliestArrivalTime', 'init', span);
             // calls the csa
-            console.time('connection scan algorithm')
             this.performAlgorithm();
-            console.timeEnd('connection scan algorithm')
+            span = Metrics.endSpan('csaEarliestArrivalTime', 'scan', span);
             // gets the journey in csa format
             const journey: JourneyCSA = this.getJourney();
             // generates the http response which includes all information of the journey
             const journeyResponse = this.getJourneyResponse(journey);
+            span = Metrics.endSpan('csaEarliestArrivalTime', 'journeyExtraction', span);
             res.send(journeyResponse);
+            Metrics.endSpan('csaEarliestArrivalTime', 'serialization', span);
         } catch(error) {
-            console.timeEnd('connection scan algorithm')
             res.status(500).send(error);
         }
     }
@@ -107,6 +120,7 @@ export class ConnectionScanAlgorithmController {
 
         this.sourceTime = sourceTimeInSeconds;
         this.sourceDate = sourceDate;
+        this.useWalkingFootpaths = true;
         // sets the source Weekday
         try {
             // initializes the csa algorithm
@@ -127,7 +141,8 @@ export class ConnectionScanAlgorithmController {
     }
 
     /**
-     * Returns the earliest arrival time at the target stop.
+     * Returns the earliest arrival time at the target stop. Uses only the change times at the stops and no walking
+     * footpaths, like the searches which are bounded by the result.
      * @param sourceStop 
      * @param targetStop 
      * @param sourceDate 
@@ -144,6 +159,7 @@ export class ConnectionScanAlgorithmController {
 
         this.sourceTime = sourceTimeInSeconds;
         this.sourceDate = sourceDate;
+        this.useWalkingFootpaths = false;
         // sets the source Weekday
         try {
             // initializes the csa algorithm
@@ -161,8 +177,74 @@ export class ConnectionScanAlgorithmController {
         }
     }
 
+    /**
+     * Returns the earliest safe arrival time and the earliest arrival time at the target stop. Both are calculated by
+     * one scan because the earliest arrival time is never later than the earliest safe arrival time. Uses only the
+     * change times at the stops and no walking footpaths. Returns null if the target can't be reached.
+     * @param sourceStop 
+     * @param targetStop 
+     * @param sourceDate 
+     * @param sourceTimeInSeconds 
+     * @param maxArrivalTime 
+     * @returns 
+     */
+    public static getEarliestSafeAndUnsafeArrivalTime(sourceStop: number, targetStop: number, sourceDate: Date, sourceTimeInSeconds: number, maxArrivalTime: number): {earliestSafeArrivalTime: number, earliestArrivalTime: number} {
+        this.sourceStop = sourceStop;
+        this.targetStop = targetStop;
+
+        this.sourceTime = sourceTimeInSeconds;
+        this.sourceDate = sourceDate;
+        this.useWalkingFootpaths = false;
+        try {
+            this.init();
+            this.initUnsafeArrays();
+            this.performAlgorithm(true, maxArrivalTime);
+            if(this.s[this.targetStop] === Number.MAX_VALUE){
+                return null;
+            }
+            return {earliestSafeArrivalTime: this.s[this.targetStop], earliestArrivalTime: this.unsafeS[this.targetStop]};
+        } catch (err) {
+            return null;
+        } finally {
+            this.unsafeS = undefined;
+            this.unsafeT = undefined;
+        }
+    }
+
+    /**
+     * Returns the earliest safe arrival time at every stop. The scan stops when the earliest safe arrival times of all
+     * target stops are found, stops which are reached later can have a too late time. Target stops which can't be
+     * reached get Number.MAX_VALUE. Uses only the change times at the stops and no walking footpaths.
+     * @param sourceStop 
+     * @param targetStops 
+     * @param sourceDate 
+     * @param sourceTimeInSeconds 
+     * @param maxArrivalTime 
+     * @returns 
+     */
+    public static getEarliestSafeArrivalTimes(sourceStop: number, targetStops: number[], sourceDate: Date, sourceTimeInSeconds: number, maxArrivalTime: number){
+        this.sourceStop = sourceStop;
+        this.targetStop = undefined;
+        this.targetStops = targetStops;
+        this.numberOfReachedTargetStops = 0;
+
+        this.sourceTime = sourceTimeInSeconds;
+        this.sourceDate = sourceDate;
+        this.useWalkingFootpaths = false;
+        try {
+            this.init();
+            this.performAlgorithm(true, maxArrivalTime);
+            return this.s;
+        } catch (err) {
+            return null;
+        } finally {
+            this.targetStops = undefined;
+        }
+    }
+
     /**
      * Returns the earliest arrival time at every stop. Solves the OneToAll-version of the earliest arrival time problem.
+     * Uses only the change times at the stops and no walking footpaths.
      * @param sourceStop 
      * @param sourceDate 
      * @param sourceTimeInSeconds 
@@ -176,6 +258,7 @@ export class ConnectionScanAlgorithmController {
 
         this.sourceTime = sourceTimeInSeconds;
         this.sourceDate = sourceDate;
+        this.useWalkingFootpaths = false;
         // sets the source Weekday
         try {
             // initializes the csa algorithm
@@ -200,38 +283,45 @@ export class ConnectionScanAlgorithmController {
         let reachedMaxArrivalTime = false;
         // gets the first connection id
         let dayDifference = 0;
-        const numberOfConnections = GoogleTransitData.CONNECTIONS.length;
+        const numberOfConnections = GoogleTransitData.getNumberOfConnections();
         // typescript date format starts the week with sunday, gtfs with monday
         let dayOfCurrentConnection: number;
+        let numberOfScannedConnections = 0;
         // while loop until it founds a solution or it checked connections of the next seven days
         for(let i = 0; i < 8; i++){
             // loop over all connections
             while(this.indices[1] < numberOfConnections){
-                // sets the next connection of previous, current and next day
+                // sets the departure time of the next connection of previous, current and next day
                 for(let j = 0; j < 3; j++) {
                     if(this.indices[j] < numberOfConnections){
-                        this.connections[j] = GoogleTransitData.CONNECTIONS[this.indices[j]];
+                        this.departureTimes[j] = GoogleTransitData.getDepartureTimeOfConnection(this.indices[j]);
                     } else {
-                        this.connections[j] = null;
+                        this.departureTimes[j] = undefined;
                     }
                 }
                 // sets information of current connection
                 dayOfCurrentConnection = this.getNextConnection();
-                let currentConnection = this.connections[dayOfCurrentConnection];
+                let currentConnectionId = this.indices[dayOfCurrentConnection];
                 let currentWeekday = this.weekdays[dayOfCurrentConnection];
                 let currentDate = this.dates[dayOfCurrentConnection];
-                if(dayOfCurrentConnection === 1 && currentConnection.departureTime >= SECONDS_OF_A_DAY){
+                if(dayOfCurrentConnection === 1 && this.departureTimes[1] >= SECONDS_OF_A_DAY){
                     currentDate = this.dates[2];
                 }
                 this.indices[dayOfCurrentConnection] += 1;
+                numberOfScannedConnections++;
                 let dayDifference2 = (dayOfCurrentConnection - 1) * SECONDS_OF_A_DAY;
                 
                 //checks if the connection is available on this weekday
-                if(!GoogleTransitData.isAvailable(currentWeekday, GoogleTransitData.TRIPS[currentConnection.trip].isAvailable)){
+                if(!GoogleTransitData.isConnectionAvailable(currentConnectionId, currentWeekday)){
                     continue;
                 }
+                // reads the values of the connection from the timetable without creating a connection object
+                const departureTimeOfConnection = GoogleTransitData.getDepartureTimeOfConnection(currentConnectionId);
+                const arrivalTimeOfConnection = GoogleTransitData.getArrivalTimeOfConnection(currentConnectionId);
+                const arrivalStop = GoogleTransitData.getArrivalStopOfConnection(currentConnectionId);
+                const tripOfConnection = GoogleTransitData.getTripOfConnection(currentConnectionId);
                 // sets departure time
-                let currentConnectionDepartureTime = currentConnection.departureTime + dayDifference + dayDifference2;
+                let currentConnectionDepartureTime = departureTimeOfConnection + dayDifference + dayDifference2;
 
                 if(maxArrivalTime !== undefined && currentConnectionDepartureTime > maxArrivalTime){
                     reachedMaxArrivalTime = true;
@@ -244,74 +334,87 @@ export class ConnectionScanAlgorithmController {
                     if(reachedTargetStop){
                         break;
                     }
+                } else if(this.targetStops !== undefined) {
+                    // checks if it found already a connection for all target stops
+                    reachedTargetStop = this.foundJourneysToTargets(currentConnectionDepartureTime);
+                    if(reachedTargetStop){
+                        break;
+                    }
                 }
                 
                 
                 // sets arrival time
-                let currentConnectionArrivalTime = currentConnection.arrivalTime + dayDifference + dayDifference2;
+                let currentConnectionArrivalTime = arrivalTimeOfConnection + dayDifference + dayDifference2;
                 if(maxArrivalTime !== undefined && currentConnectionArrivalTime > maxArrivalTime) {
                     continue;
                 }
-                // sets departure and arrival date
-                let currentDepartureDate = new Date(currentDate);
-                let currentArrivalDate = new Date(currentDate);
-                if(Converter.getDayDifference(currentConnection.departureTime) === 0 && Converter.getDayDifference(currentConnection.arrivalTime) === 1){
-                    currentArrivalDate.setDate(currentArrivalDate.getDate() + 1);
+                if(this.unsafeS !== undefined){
+                    this.updateUnsafeArrays(currentConnectionId, currentConnectionDepartureTime, currentConnectionArrivalTime, dayOfCurrentConnection);
                 }
+                // the departure and arrival dates are only created for the journey pointers
+                const arrivesOnNextDay = Converter.getDayDifference(departureTimeOfConnection) === 0 && Converter.getDayDifference(arrivalTimeOfConnection) === 1;
 
-                const departureStop = currentConnection.departureStop;
+                const departureStop = GoogleTransitData.getDepartureStopOfConnection(currentConnectionId);
                 let tripIdOfEnterConnectionAtDepartureStop: number;
                 let isLastConnectionLongDistance: boolean;
                 let currentDelay: number;
                 if(this.j[departureStop].enterConnection !== null){
-                    tripIdOfEnterConnectionAtDepartureStop = GoogleTransitData.CONNECTIONS[this.j[departureStop].enterConnection].trip;
-                    isLastConnectionLongDistance = GoogleTransitData.TRIPS[tripIdOfEnterConnectionAtDepartureStop].isLongDistance;
+                    tripIdOfEnterConnectionAtDepartureStop = GoogleTransitData.getTripOfConnection(this.j[departureStop].enterConnection);
+                    isLastConnectionLongDistance = GoogleTransitData.isLongDistanceTrip(tripIdOfEnterConnectionAtDepartureStop);
                 } 
                 if(safeVariant && isLastConnectionLongDistance && this.j[departureStop].enterConnection !== null){
                     currentDelay = MAX_D_C_LONG;
                 } else if (safeVariant && this.j[departureStop].enterConnection !== null) {
                     currentDelay = MAX_D_C_NORMAL;
                 } else if(givenTripDelays && tripIdOfEnterConnectionAtDepartureStop !== undefined){
-                    currentDelay = GoogleTransitData.TRIPS[tripIdOfEnterConnectionAtDepartureStop].givenDelay;
+                    // arrival delay of the trip at the stop
+                    currentDelay = GoogleTransitData.CONNECTION_ARRIVAL_DELAYS[this.j[departureStop].exitConnection];
                 } else {
                     currentDelay = 0;
                 }
                 
                 // checks if the trip is already used or if the trip can be reached at stop s
-                if(this.t[dayOfCurrentConnection][currentConnection.trip] !== undefined || this.s[departureStop] + currentDelay <= currentConnectionDepartureTime){
+                if(this.t[dayOfCurrentConnection][tripOfConnection] !== undefined || this.s[departureStop] + currentDelay <= currentConnectionDepartureTime){
                     // sets the enter connection of the trip
-                    if(this.t[dayOfCurrentConnection][currentConnection.trip] === undefined){
+                    if(this.t[dayOfCurrentConnection][tripOfConnection] === undefined){
                         let reliability = 1;
                         if(this.j[departureStop].enterConnection !== null){
                             const bufferTime = currentConnectionDepartureTime - this.s[departureStop];
                             reliability = Reliability.getProbabilityOfArrivalTime(-1, bufferTime, isLastConnectionLongDistance)
                         }
                         
-                        this.t[dayOfCurrentConnection][currentConnection.trip] = {
-                            connectionId: currentConnection.id,
-                            departureDate: currentDepartureDate,
+                        this.t[dayOfCurrentConnection][tripOfConnection] = {
+                            connectionId: currentConnectionId,
+                            departureDate: new Date(currentDate),
                             reliability: this.j[departureStop].reliability * reliability,
                         }
                     }
                     // checks if the stop can be reached earlier with the current connection
-                    if(currentConnectionArrivalTime < this.s[currentConnection.arrivalStop]){
+                    if(currentConnectionArrivalTime < this.s[arrivalStop]){
                         // updates the footpaths of the stop
-                        let footpaths: Footpath[] = GoogleTransitData.getAllFootpathsOfADepartureStop(currentConnection.arrivalStop);
+                        let footpaths: Footpath[] = GoogleTransitData.getAllFootpathsOfADepartureStop(arrivalStop);
                         for(let j = 0; j < footpaths.length; j++){
+                            if(!this.useWalkingFootpaths && footpaths[j].arrivalStop !== arrivalStop){
+                                continue;
+                            }
                             if(currentConnectionArrivalTime + footpaths[j].duration < this.s[footpaths[j].arrivalStop]){
                                 // sets the earliest arrival time
                                 this.s[footpaths[j].arrivalStop] = currentConnectionArrivalTime + footpaths[j].duration;
                                 if(givenTripDelays && footpaths[j].arrivalStop === this.targetStop){
-                                    this.s[footpaths[j].arrivalStop] += GoogleTransitData.TRIPS[currentConnection.trip].givenDelay;
+                                    this.s[footpaths[j].arrivalStop] += GoogleTransitData.CONNECTION_ARRIVAL_DELAYS[currentConnectionId];
                                 }
                                 // sets the journey pointer
+                                const currentArrivalDate = new Date(currentDate);
+                                if(arrivesOnNextDay){
+                                    currentArrivalDate.setDate(currentArrivalDate.getDate() + 1);
+                                }
                                 this.j[footpaths[j].arrivalStop] = {
-                                    enterConnection: this.t[dayOfCurrentConnection][currentConnection.trip].connectionId,
-                                    exitConnection: currentConnection.id,
+                                    enterConnection: this.t[dayOfCurrentConnection][tripOfConnection].connectionId,
+                                    exitConnection: currentConnectionId,
                                     footpath: footpaths[j].id,
-                                    departureDate: this.t[dayOfCurrentConnection][currentConnection.trip].departureDate,
+                                    departureDate: this.t[dayOfCurrentConnection][tripOfConnection].departureDate,
                                     arrivalDate: currentArrivalDate,
-                                    reliability: this.t[dayOfCurrentConnection][currentConnection.trip].reliability,
+                                    reliability: this.t[dayOfCurrentConnection][tripOfConnection].reliability,
                                 }
                             }
                         }
@@ -327,20 +430,49 @@ export class ConnectionScanAlgorithmController {
             // updates the required arrays
             this.updateArraysForNextRound();
         }
+        // records the work of the algorithm
+        Metrics.increment('csaEarliestArrivalTime', 'connections_scanned', numberOfScannedConnections);
         // throws an error if it didn't find a connection after seven days.
         if(this.targetStop !== undefined && !reachedTargetStop){
             throw new Error("Couldn't find a connection in the next seven days.")
         }
     }
 
+    /**
+     * Updates the earliest arrival times without the safe change times with a connection. Uses only the change times at
+     * the stops like the safe variant.
+     * @param connectionId 
+     * @param departureTime 
+     * @param arrivalTime 
+     * @param dayOfConnection 
+     */
+    private static updateUnsafeArrays(connectionId: number, departureTime: number, arrivalTime: number, dayOfConnection: number){
+        const departureStop = GoogleTransitData.getDepartureStopOfConnection(connectionId);
+        const arrivalStop = GoogleTransitData.getArrivalStopOfConnection(connectionId);
+        const trip = GoogleTransitData.getTripOfConnection(connectionId);
+        if(!this.unsafeT[dayOfConnection][trip] && this.unsafeS[departureStop] > departureTime){
+            return;
+        }
+        this.unsafeT[dayOfConnection][trip] = true;
+        if(arrivalTime >= this.unsafeS[arrivalStop]){
+            return;
+        }
+        const footpaths: Footpath[] = GoogleTransitData.getAllFootpathsOfADepartureStop(arrivalStop);
+        for(let j = 0; j < footpaths.length; j++){
+            if(footpaths[j].arrivalStop === arrivalStop && arrivalTime + footpaths[j].duration < this.unsafeS[arrivalStop]){
+                this.unsafeS[arrivalStop] = arrivalTime + footpaths[j].duration;
+            }
+        }
+    }
+
     /**
      * Gets the next connection of previous, current and next day which has the smallest departure time.
      * @returns 
      */
     private static getNextConnection(){
-        if(this.connections[0] && ((this.connections[0].departureTime - SECONDS_OF_A_DAY) < this.connections[1].departureTime)) {
+        if(this.departureTimes[0] !== undefined && ((this.departureTimes[0] - SECONDS_OF_A_DAY) < this.departureTimes[1])) {
             return 0;
-        } else if((this.connections[2].departureTime + SECONDS_OF_A_DAY) < this.connections[1].departureTime) {
+        } else if(this.departureTimes[2] !== undefined && (this.departureTimes[2] + SECONDS_OF_A_DAY) < this.departureTimes[1]) {
             return 2;
         } else {
             return 1;
@@ -362,12 +494,29 @@ export class ConnectionScanAlgorithmController {
         return reachedTargetStop;
     }
 
+    /**
+     * Checks if the stopping criterion of the one to many search is fullfilled. The arrival time of a target stop stays
+     * final, so each target stop is only checked until its arrival time is final.
+     * @param currentConnectionDepartureTime 
+     * @returns 
+     */
+    private static foundJourneysToTargets(currentConnectionDepartureTime: number): boolean{
+        while(this.numberOfReachedTargetStops < this.targetStops.length && this.s[this.targetStops[this.numberOfReachedTargetStops]] <= currentConnectionDepartureTime){
+            this.numberOfReachedTargetStops++;
+        }
+        return this.numberOfReachedTargetStops === this.targetStops.length;
+    }
+
     /**
      * Updates the arrays.
      */
     private static updateArraysForNextRound() {
         this.t[1] = this.t[2];
         this.t[2] = new Array(GoogleTransitData.TRIPS.length)
+        if(this.unsafeT !== undefined){
+            this.unsafeT[1] = this.unsafeT[2];
+            this.unsafeT[2] = new Array(GoogleTransitData.TRIPS.length);
+        }
 
         this.weekdays[1] = this.weekdays[2];
         this.weekdays[2] = Calculator.moduloSeven(this.weekdays[2] + 1);
@@ -420,10 +569,13 @@ export class ConnectionScanAlgorithmController {
         this.indices[1] = Searcher.binarySearchOfConnections(this.sourceTime);
         this.indices[2] = 0;
 
-        this.connections = new Array(3);
+        this.departureTimes = new Array(3);
 
         const footpathsOfSourceStop = GoogleTransitData.getAllFootpathsOfADepartureStop(this.sourceStop);
         for(let j = 0; j < footpathsOfSourceStop.length; j++){
+            if(!this.useWalkingFootpaths && footpathsOfSourceStop[j].arrivalStop !== this.sourceStop){
+                continue;
+            }
             if(this.s[footpathsOfSourceStop[j].arrivalStop] > this.sourceTime + footpathsOfSourceStop[j].duration){
                 this.s[footpathsOfSourceStop[j].arrivalStop] = this.sourceTime + footpathsOfSourceStop[j].duration;
                 this.j[footpathsOfSourceStop[j].arrivalStop].footpath = footpathsOfSourceStop[j].id;
@@ -433,6 +585,17 @@ export class ConnectionScanAlgorithmController {
         }
     }
 
+    /**
+     * Initializes the arrays of the earliest arrival times without the safe change times. Must be called after init.
+     */
+    private static initUnsafeArrays() {
+        this.unsafeS = this.s.slice();
+        this.unsafeT = new Array(3);
+        this.unsafeT[0] = new Array(GoogleTransitData.TRIPS.length);
+        this.unsafeT[1] = new Array(GoogleTransitData.TRIPS.length);
+        this.unsafeT[2] = new Array(GoogleTransitData.TRIPS.length);
+    }
+
     /**
      * Reconstructs the journey in csa format from the journey pointers.
      * @param targetStop 
@@ -446,7 +609,7 @@ export class ConnectionScanAlgorithmController {
         // goes backward until it reaches a source stop which has a undefined connection in journey pointer
         while(this.j[currentStop].enterConnection !== null){
             journeyPointersOfRoute.push(this.j[currentStop]);
-            currentStop = GoogleTransitData.CONNECTIONS[this.j[currentStop].enterConnection].departureStop;
+            currentStop = GoogleTransitData.getConnection(this.j[currentStop].enterConnection).departureStop;
         }
         // stores the first journey pointer (contains the initial footpath)
         journeyPointersOfRoute.push(this.j[currentStop]);
@@ -463,8 +626,8 @@ export class ConnectionScanAlgorithmController {
         // generates the legs and transfers for the csa journey representation
         for(let i = journeyPointersOfRoute.length - 1; i >= 0; i--) {
             if(journeyPointersOfRoute[i].enterConnection !== null && journeyPointersOfRoute[i].exitConnection !== null){
-                const enterConnection = GoogleTransitData.CONNECTIONS[journeyPointersOfRoute[i].enterConnection];
-                const exitConnection = GoogleTransitData.CONNECTIONS[journeyPointersOfRoute[i].exitConnection];
+                const enterConnection = GoogleTransitData.getConnection(journeyPointersOfRoute[i].enterConnection);
+                const exitConnection = GoogleTransitData.getConnection(journeyPointersOfRoute[i].exitConnection);
                 const departureStop = GoogleTransitData.STOPS[enterConnection.departureStop];
                 
                 const arrivalStop = GoogleTransitData.STOPS[exitConnection.arrivalStop];
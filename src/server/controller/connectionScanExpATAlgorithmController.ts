@@ -4,14 +4,14 @@ import { Calculator } from "../../data/calculator";
 import { Converter } from "../../data/converter";
 import { GoogleTransitData } from "../../data/google-transit-data";
 import { Searcher } from "../../data/searcher";
-import { Connection } from "../../models/Connection";
 import { ConnectionScanAlgorithmController } from "./connectionScanAlgorithmController";
 import { performance } from 'perf_hooks';
 import { Reliability } from "../../data/reliability";
+import { DecisionGraphBuilder } from "../../data/decision-graph-builder";
+import { ResponseWriter } from "../../data/response-writer";
 import FastPriorityQueue from 'fastpriorityqueue';
 import { MeatResponse } from "../../models/MeatResponse";
-import { TempEdge } from "../../models/TempEdge";
-import { DecisionGraphController } from "./decisionGraphController";
+import { Metrics } from "../../data/metrics";
 
 // profile function entry
 interface SEntry {
@@ -87,19 +87,21 @@ export class ConnectionScanExpATAlgorithmController {
             this.sourceDate = new Date(req.query.date);
 
             // initializes the csa meat algorithm
+            let span = Metrics.startSpan();
             this.init(ALPHA);
+            span = Metrics.endSpan('csaExpectedArrivalTime', 'init', span);
             // calls the csa meat algorithm
-            console.time('connection scan eat algorithm')
             this.performAlgorithm();
-            console.timeEnd('connection scan eat algorithm')
+            span = Metrics.endSpan('csaExpectedArrivalTime', 'scan', span);
             
             // generates the http response which includes all information of the journey incl. the graphs
             const meatResponse = this.extractDecisionGraphs();
-            res.send(meatResponse);
+            span = Metrics.endSpan('csaExpectedArrivalTime', 'decisionGraphExtraction', span);
+            Metrics.observeDecisionGraphSize('csaExpectedArrivalTime', meatResponse.expandedDecisionGraph.links.length);
+            ResponseWriter.sendJson(res, meatResponse, () => Metrics.endSpan('csaExpectedArrivalTime', 'serialization', span));
             this.clearArrays();
         } catch(error) {
             // console.log(error);
-            console.timeEnd('connection scan algorithm')
             res.status(500).send(error);
             this.clearArrays();
         }
@@ -171,67 +173,90 @@ export class ConnectionScanExpATAlgorithmController {
      * Performs the modified version of the profile algorithm to solve the expected arrival time problem.
      */
     private static performAlgorithm() {
+        // connections of the current and previous day which are available on these weekdays
+        let currentDayWeekday = Calculator.moduloSeven(this.currentDate.getDay() - 1);
+        let previousDayWeekday = Calculator.moduloSeven(currentDayWeekday - 1);
+        let currentDayConnections = GoogleTransitData.CONNECTIONS_OF_A_WEEKDAY[currentDayWeekday];
+        let currentDayDepartureTimes = GoogleTransitData.CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY[currentDayWeekday];
+        let previousDayConnections = GoogleTransitData.CONNECTIONS_OF_A_WEEKDAY[previousDayWeekday];
+        let previousDayDepartureTimes = GoogleTransitData.CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY[previousDayWeekday];
         // sets the indices of the current and previous day (starts with maximum arrival time)
-        let currentDayIndex = Searcher.binarySearchOfConnections(this.maxArrivalTime - this.dayOffset) - 1;
-        let previousDayIndex = Searcher.binarySearchOfConnections(this.maxArrivalTime - this.dayOffset + SECONDS_OF_A_DAY) - 1;
+        let currentDayIndex = Searcher.binarySearchOfConnectionsOfWeekday(currentDayWeekday, this.maxArrivalTime - this.dayOffset) - 1;
+        let previousDayIndex = Searcher.binarySearchOfConnectionsOfWeekday(previousDayWeekday, this.maxArrivalTime - this.dayOffset + SECONDS_OF_A_DAY) - 1;
         let lastDepartureTime = this.maxArrivalTime;
-        let currentDayWeekday = Calculator.moduloSeven(this.currentDate.getDay() - 1);
+        let numberOfScannedConnections = 0;
+        // arrival date of connections which arrive after midnight
+        let nextDate = new Date(this.currentDate);
+        nextDate.setDate(nextDate.getDate() + 1);
         // evaluates connections until it reaches the minimum departure time
         while(lastDepartureTime >= this.minDepartureTime){
-            // sets the connections
-            const currentDayConnection = GoogleTransitData.CONNECTIONS[currentDayIndex];
-            const previousDayConnection = GoogleTransitData.CONNECTIONS[previousDayIndex];
-            let currentConnection: Connection;
+            // sets the departure times of the next connections (undefined if all connections of the day are scanned)
+            const currentDayDepartureTime = currentDayIndex >= 0 ? currentDayDepartureTimes[currentDayIndex] : undefined;
+            const previousDayDepartureTime = previousDayIndex >= 0 ? previousDayDepartureTimes[previousDayIndex] : undefined;
+            let currentConnectionId: number;
+            let currentConnectionDepartureStop: number;
+            let currentConnectionArrivalStop: number;
+            let currentConnectionTrip: number;
             let currentConnectionDepartureTime: number;
             let currentConnectionArrivalTime: number;
-            let currentWeekday: number;
-            let currentArrivalDate = new Date(this.currentDate);
+            let currentArrivalDate: Date;
             let currentExpectedDelay: number;
             let currentMaxDelay: number;
             let currentConnectionIsLongDistanceTrip: boolean;
             // checks which connection is the next one
-            if(currentDayConnection && currentDayConnection.departureTime >= Math.max(previousDayConnection.departureTime - SECONDS_OF_A_DAY, 0)){
+            if(currentDayDepartureTime !== undefined && (previousDayDepartureTime === undefined || currentDayDepartureTime >= Math.max(previousDayDepartureTime - SECONDS_OF_A_DAY, 0))){
                 // sets the values of the current day connection
-                currentConnection = currentDayConnection;
-                currentConnectionDepartureTime = currentConnection.departureTime + this.dayOffset;
-                currentConnectionArrivalTime = currentConnection.arrivalTime + this.dayOffset;
+                currentConnectionId = currentDayConnections[currentDayIndex];
+                const arrivalTime = GoogleTransitData.getArrivalTimeOfConnection(currentConnectionId);
+                currentConnectionDepartureTime = currentDayDepartureTime + this.dayOffset;
+                currentConnectionArrivalTime = arrivalTime + this.dayOffset;
                 // checks if the connection arrives at the next day
-                if(currentConnection.arrivalTime >= SECONDS_OF_A_DAY){
-                    currentArrivalDate.setDate(currentArrivalDate.getDate() + 1);
+                if(arrivalTime >= SECONDS_OF_A_DAY){
+                    currentArrivalDate = nextDate;
+                } else {
+                    currentArrivalDate = this.currentDate;
                 }
                 currentDayIndex--;
-                currentWeekday = currentDayWeekday;
-            } else if(previousDayConnection.departureTime >= SECONDS_OF_A_DAY) {
+            } else if(previousDayDepartureTime >= SECONDS_OF_A_DAY) {
                 // sets the values of the previous day connection
-                currentConnection = previousDayConnection;
-                currentConnectionDepartureTime = currentConnection.departureTime + this.dayOffset - SECONDS_OF_A_DAY;
-                currentConnectionArrivalTime = currentConnection.arrivalTime + this.dayOffset - SECONDS_OF_A_DAY;
+                currentConnectionId = previousDayConnections[previousDayIndex];
+                currentConnectionDepartureTime = previousDayDepartureTime + this.dayOffset - SECONDS_OF_A_DAY;
+                currentConnectionArrivalTime = GoogleTransitData.getArrivalTimeOfConnection(currentConnectionId) + this.dayOffset - SECONDS_OF_A_DAY;
+                currentArrivalDate = this.currentDate;
                 previousDayIndex--;
-                currentWeekday = Calculator.moduloSeven(currentDayWeekday - 1);
             } else {
                 // shifts the previous and current day by one
                 if(this.dayOffset === 0){
                     break;
                 }
                 currentDayIndex = previousDayIndex;
-                previousDayIndex = GoogleTransitData.CONNECTIONS.length-1;
+                currentDayWeekday = previousDayWeekday;
+                currentDayConnections = previousDayConnections;
+                currentDayDepartureTimes = previousDayDepartureTimes;
+                previousDayWeekday = Calculator.moduloSeven(previousDayWeekday - 1);
+                previousDayConnections = GoogleTransitData.CONNECTIONS_OF_A_WEEKDAY[previousDayWeekday];
+                previousDayDepartureTimes = GoogleTransitData.CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY[previousDayWeekday];
+                previousDayIndex = previousDayConnections.length - 1;
                 this.dayOffset -= SECONDS_OF_A_DAY;
-                currentDayWeekday = Calculator.moduloSeven(currentDayWeekday - 1);
+                // the dates are not changed because they are referenced by the profiles
+                nextDate = this.currentDate;
+                this.currentDate = new Date(this.currentDate);
                 this.currentDate.setDate(this.currentDate.getDate() - 1);
                 continue;
             }
             // sets the last departure time
             lastDepartureTime = currentConnectionDepartureTime;
-            // checks if the connection is available on this weekday
-            if(!GoogleTransitData.isAvailable(currentWeekday, GoogleTransitData.TRIPS[currentConnection.trip].isAvailable)){
-                continue;
-            }
+            numberOfScannedConnections++;
             // checks if the connection arrives earlier than the maximum arrival time and can be reached from the source stop
-            if(currentConnectionArrivalTime > this.maxArrivalTime || this.earliestArrivalTimes[currentConnection.departureStop] > currentConnectionDepartureTime) {
+            if(currentConnectionArrivalTime > this.maxArrivalTime || this.earliestArrivalTimes[GoogleTransitData.getDepartureStopOfConnection(currentConnectionId)] > currentConnectionDepartureTime) {
                 continue;
             }
+            // reads the values of the connection from the timetable without creating a connection object
+            currentConnectionDepartureStop = GoogleTransitData.getDepartureStopOfConnection(currentConnectionId);
+            currentConnectionArrivalStop = GoogleTransitData.getArrivalStopOfConnection(currentConnectionId);
+            currentConnectionTrip = GoogleTransitData.getTripOfConnection(currentConnectionId);
             // sets the delay values (depends on the type of the trip)
-            if(GoogleTransitData.TRIPS[currentConnection.trip].isLongDistance){
+            if(GoogleTransitData.isLongDistanceConnection(currentConnectionId)){
                 currentExpectedDelay = Reliability.longDistanceExpectedValue;
                 currentMaxDelay = MAX_D_C_LONG;
                 currentConnectionIsLongDistanceTrip = true;
@@ -251,7 +276,7 @@ export class ConnectionScanExpATAlgorithmController {
             let expectedTimeC: number;
             let p: SEntry;
             // checks if the arrival stop of the connection is a target stop (expected arrival time when walking to the target)
-            if(currentConnection.arrivalStop === this.targetStop) {
+            if(currentConnectionArrivalStop === this.targetStop) {
                 time1 = currentConnectionArrivalTime;
                 expectedTime1 = currentConnectionArrivalTime + currentExpectedDelay;
             } else {
@@ -259,10 +284,10 @@ export class ConnectionScanExpATAlgorithmController {
                 expectedTime1 = Number.MAX_VALUE;
             }
             // expected arrival time when remaining seated
-            let stopSequence = currentConnection.stopSequence;
-            if(stopSequence < this.t[currentConnection.trip].stopSequence){
-                time2 = this.t[currentConnection.trip].arrivalTime;
-                expectedTime2 = this.t[currentConnection.trip].expectedArrivalTime;
+            let stopSequence = GoogleTransitData.getStopSequenceOfConnection(currentConnectionId);
+            if(stopSequence < this.t[currentConnectionTrip].stopSequence){
+                time2 = this.t[currentConnectionTrip].arrivalTime;
+                expectedTime2 = this.t[currentConnectionTrip].expectedArrivalTime;
             } else {
                 time2 = Number.MAX_VALUE;
                 expectedTime2 = Number.MAX_VALUE;
@@ -271,8 +296,8 @@ export class ConnectionScanExpATAlgorithmController {
             let expectedArrivalTime = 0;
             let pLastDepartureTime: number = -1;
             // finds all outgoing trips which have a departure time between c_arr and c_arr + maxD_c (and the departure after max delay)
-            for(let j = 0; j < this.s[currentConnection.arrivalStop].length; j++) {
-                p = this.s[currentConnection.arrivalStop][j];
+            for(let j = 0; j < this.s[currentConnectionArrivalStop].length; j++) {
+                p = this.s[currentConnectionArrivalStop][j];
                 if(p.departureTime < currentConnectionArrivalTime){
                     continue;
                 } else{
@@ -307,13 +332,13 @@ export class ConnectionScanExpATAlgorithmController {
             }
 
             // sets the pointer of the t array
-            if(timeC !== Number.MAX_VALUE && timeC < this.t[currentConnection.trip].arrivalTime){
-                this.t[currentConnection.trip] = {
+            if(timeC !== Number.MAX_VALUE && timeC < this.t[currentConnectionTrip].arrivalTime){
+                this.t[currentConnectionTrip] = {
                     arrivalTime: timeC,
                     expectedArrivalTime: expectedTimeC,
                     arrivalDate: currentArrivalDate,
                     connectionArrivalTime: currentConnectionArrivalTime,
-                    connectionArrivalStop: currentConnection.arrivalStop,
+                    connectionArrivalStop: currentConnectionArrivalStop,
                     stopSequence: stopSequence,
                 };
             }
@@ -324,29 +349,31 @@ export class ConnectionScanExpATAlgorithmController {
                 arrivalTime: timeC,
                 expectedArrivalTime: expectedTimeC,
                 departureDate: this.currentDate,
-                arrivalDate: this.t[currentConnection.trip].arrivalDate,
+                arrivalDate: this.t[currentConnectionTrip].arrivalDate,
                 enterTime: currentConnectionDepartureTime,
-                enterStop: currentConnection.departureStop,
-                exitTime: this.t[currentConnection.trip].connectionArrivalTime,
-                exitStop: this.t[currentConnection.trip].connectionArrivalStop,
-                tripId: currentConnection.trip,
-                finalFootpath: this.t[currentConnection.trip].finalFootpath,
+                enterStop: currentConnectionDepartureStop,
+                exitTime: this.t[currentConnectionTrip].connectionArrivalTime,
+                exitStop: this.t[currentConnectionTrip].connectionArrivalStop,
+                tripId: currentConnectionTrip,
+                finalFootpath: this.t[currentConnectionTrip].finalFootpath,
             }
 
             // profile function with minimum expected arrival time of departure stop
-            let q = this.s[currentConnection.departureStop][0];
+            let q = this.s[currentConnectionDepartureStop][0];
             if(p.arrivalTime !== Number.MAX_VALUE) {
                 // checks if q dominates p
                 if(!this.dominates(q, p)){
                     // adds p to the s entry of the departure stop
                     if(q.departureTime !== p.departureTime){
-                        this.s[currentConnection.departureStop].unshift(p)
+                        this.s[currentConnectionDepartureStop].unshift(p)
                     } else {
-                        this.s[currentConnection.departureStop][0] = p;
+                        this.s[currentConnectionDepartureStop][0] = p;
                     }
                 }
             }
         }
+        // records the work of the algorithm
+        Metrics.increment('csaExpectedArrivalTime', 'connections_scanned', numberOfScannedConnections);
     }
 
     /**
@@ -446,8 +473,7 @@ export class ConnectionScanExpATAlgorithmController {
                 clusters: [],
             }
         }
-        let expandedTempEdges: TempEdge[] = [];
-        let arrivalTimesPerStop: Map<string, number[]> = new Map<string, number[]>();
+        const decisionGraphBuilder = new DecisionGraphBuilder();
         // priority queue sorted by the departure times
         let priorityQueue = new FastPriorityQueue<SEntry>((a, b) => {
             return a.departureTime < b.departureTime
@@ -463,25 +489,13 @@ export class ConnectionScanExpATAlgorithmController {
             let p = priorityQueue.poll();
             let tripId = p.tripId;
             // uses the information of the profile function to create an edge
-            let edge: TempEdge = {
-                departureStop: GoogleTransitData.STOPS[p.enterStop].name,
-                departureTime: p.enterTime,
-                arrivalStop: GoogleTransitData.STOPS[p.exitStop].name,
-                arrivalTime: p.exitTime,
-                type: 'Train',
-            }
-            expandedTempEdges.push(edge);
-            if(arrivalTimesPerStop.get(edge.arrivalStop) === undefined) {
-                arrivalTimesPerStop.set(edge.arrivalStop, [edge.arrivalTime]);
-            } else {
-                arrivalTimesPerStop.get(edge.arrivalStop).push(edge.arrivalTime);
-            }
+            decisionGraphBuilder.addEdge(p.enterStop, p.enterTime, p.exitStop, p.exitTime, 'Train');
             // checks if the current profile reaches the target
             if(this.targetStop !== p.exitStop){
                 // sets max delay
                 let maxDelay: number;
                 let isLongDistanceTrip: boolean;
-                if(GoogleTransitData.TRIPS[tripId].isLongDistance){
+                if(GoogleTransitData.isLongDistanceTrip(tripId)){
                     maxDelay = MAX_D_C_LONG;
                     isLongDistanceTrip = true;
                 } else {
@@ -517,7 +531,7 @@ export class ConnectionScanExpATAlgorithmController {
                 }
             } 
         }
-        const decisionGraphs = DecisionGraphController.getDecisionGraphs(expandedTempEdges, arrivalTimesPerStop, this.sourceStop, this.targetStop);
+        const decisionGraphs = decisionGraphBuilder.build(this.targetStop);
         meatResponse.expandedDecisionGraph = decisionGraphs.expandedDecisionGraph;
         meatResponse.compactDecisionGraph = decisionGraphs.compactDecisionGraph;
         return meatResponse;
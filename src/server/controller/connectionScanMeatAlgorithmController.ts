@@ -1,18 +1,21 @@
 import express from "express";
-import { ALPHA, MAX_D_C_LONG, MAX_D_C_NORMAL, NUMBER_OF_DAYS, SECONDS_OF_A_DAY } from "../../constants";
+import { ALPHA, MAX_BATCH_PAIRS, MAX_D_C_LONG, MAX_D_C_NORMAL, NUMBER_OF_DAYS, SECONDS_OF_A_DAY } from "../../constants";
+import { ResponseCache } from "../../data/response-cache";
 import { Calculator } from "../../data/calculator";
 import { Converter } from "../../data/converter";
 import { GoogleTransitData } from "../../data/google-transit-data";
 import { Searcher } from "../../data/searcher";
-import { Connection } from "../../models/Connection";
 import { ConnectionScanAlgorithmController } from "./connectionScanAlgorithmController";
 import { performance } from 'perf_hooks';
 import { Reliability } from "../../data/reliability";
+import { DecisionGraphBuilder } from "../../data/decision-graph-builder";
+import { ResponseWriter } from "../../data/response-writer";
+import { BoundTable } from "../../data/bound-table";
 import FastPriorityQueue from 'fastpriorityqueue';
 import { MeatResponse } from "../../models/MeatResponse";
-import { TempEdge } from "../../models/TempEdge";
-import { DecisionGraphController } from "./decisionGraphController";
+import { MeatBatchResult } from "../../models/MeatBatchResult";
 import { cloneDeep } from "lodash";
+import { Metrics } from "../../data/metrics";
 
 // profile function entry
 interface SEntry {
@@ -30,6 +33,21 @@ interface SEntry {
     calcReliability?: number,
 }
 
+// source and target pair of a batch request
+interface BatchPair {
+    index: number,
+    sourceStop: number,
+    targetStop: number,
+    sourceTime: number,
+}
+
+// earliest safe arrival times at the targets and earliest arrival times at all stops of a source stop and source time of
+// a batch request
+interface SourceBounds {
+    earliestSafeArrivalTimes: Map<number, number>,
+    earliestArrivalTimes: number[],
+}
+
 // information for each trip
 interface TEntry {
     expectedArrivalTime: number,
@@ -62,6 +80,7 @@ export class ConnectionScanMeatAlgorithmController {
 
     // values which can be calculated by the normal csa algorithm
     private static earliestSafeArrivalTimeCSA: number;
+    private static earliestArrivalTimeCSA: number;
     private static earliestArrivalTimes: number[];
 
     /**
@@ -85,19 +104,87 @@ export class ConnectionScanMeatAlgorithmController {
             this.minDepartureTime = Converter.timeToSeconds(req.query.sourceTime);
             this.sourceDate = new Date(req.query.date);
 
+            // returns the cached response if the same request was answered before
+            const cachedMeatResponse = ResponseCache.getMeatResponse('csaMeat', this.sourceStop, this.targetStop, this.minDepartureTime, this.sourceDate, ALPHA);
+            if(cachedMeatResponse !== undefined){
+                res.status(200).send(cachedMeatResponse);
+                return;
+            }
+
             // initializes the csa meat algorithm
+            let span = Metrics.startSpan();
             this.init(ALPHA);
+            span = Metrics.endSpan('csaMinimumExpectedArrivalTime', 'init', span);
             // calls the csa meat algorithm
-            console.time('connection scan meat algorithm')
             this.performAlgorithm();
-            console.timeEnd('connection scan meat algorithm')
+            span = Metrics.endSpan('csaMinimumExpectedArrivalTime', 'scan', span);
             // generates the http response which includes all information of the journey incl. the graphs
             const meatResponse = this.extractDecisionGraphs();
-            res.send(meatResponse);
+            span = Metrics.endSpan('csaMinimumExpectedArrivalTime', 'decisionGraphExtraction', span);
+            Metrics.observeDecisionGraphSize('csaMinimumExpectedArrivalTime', meatResponse.expandedDecisionGraph.links.length);
+            ResponseCache.setMeatResponse('csaMeat', this.sourceStop, this.targetStop, this.minDepartureTime, this.sourceDate, ALPHA, meatResponse);
+            ResponseWriter.sendJson(res, meatResponse, () => Metrics.endSpan('csaMinimumExpectedArrivalTime', 'serialization', span));
             this.clearArrays();
         } catch(error) {
             // console.log(error);
-            console.timeEnd('connection scan algorithm')
+            res.status(500).send(error);
+            this.clearArrays();
+        }
+    }
+
+    /**
+     * Answers the minimum expected arrival time problem for many source and target pairs. The body contains the date, the
+     * source time and the source and target stops (all combinations) and/or a list of pairs. Pairs with the same target
+     * share one profile scan, pairs with the same source and source time share the earliest (safe) arrival times. The
+     * decision graphs are only extracted if decisionGraphs is true.
+     * @param req 
+     * @param res 
+     * @returns 
+     */
+    public static connectionScanMeatBatchRoute(req: express.Request, res: express.Response){
+        try {
+            // checks the parameters of the http request
+            const pairs = this.getBatchPairs(req.body);
+            if(pairs === null || pairs.length === 0 || pairs.length > MAX_BATCH_PAIRS){
+                res.status(400).send();
+                return;
+            }
+            const sourceDate = new Date(req.body.date);
+            const withDecisionGraphs = req.body.decisionGraphs === true;
+            const results: MeatBatchResult[] = new Array(pairs.length);
+            // groups the pairs by target stop. Targets with a single source are grouped by source stop and time.
+            const pairsOfTargets = new Map<number, BatchPair[]>();
+            for(let pair of pairs){
+                if(pair.sourceStop === null || pair.targetStop === null){
+                    results[pair.index] = this.getBatchError(pair, 'Unknown stop.');
+                    continue;
+                }
+                if(!pairsOfTargets.has(pair.targetStop)){
+                    pairsOfTargets.set(pair.targetStop, []);
+                }
+                pairsOfTargets.get(pair.targetStop).push(pair);
+            }
+            const boundsOfSources = this.getBoundsOfSources(pairs, sourceDate, ALPHA);
+            const pairsOfSources = new Map<string, BatchPair[]>();
+            for(let [targetStop, pairsOfTarget] of pairsOfTargets){
+                if(new Set(pairsOfTarget.map(pair => pair.sourceStop)).size > 1){
+                    this.answerPairsOfTarget(targetStop, pairsOfTarget, sourceDate, ALPHA, withDecisionGraphs, boundsOfSources, results);
+                    continue;
+                }
+                for(let pair of pairsOfTarget){
+                    const key = pair.sourceStop + ',' + pair.sourceTime;
+                    if(!pairsOfSources.has(key)){
+                        pairsOfSources.set(key, []);
+                    }
+                    pairsOfSources.get(key).push(pair);
+                }
+            }
+            for(let pairsOfSource of pairsOfSources.values()){
+                this.answerPairsOfSource(pairsOfSource, sourceDate, ALPHA, withDecisionGraphs, boundsOfSources, results);
+            }
+            const span = Metrics.startSpan();
+            ResponseWriter.sendJson(res, { results: results }, () => Metrics.endSpan('csaMinimumExpectedArrivalTimeBatch', 'serialization', span));
+        } catch(error) {
             res.status(500).send(error);
             this.clearArrays();
         }
@@ -185,71 +272,369 @@ export class ConnectionScanMeatAlgorithmController {
         }
     }
   
+    /**
+     * Calculates the bounds of each source stop and source time of the pairs once. The earliest safe arrival times at all
+     * targets of a source are calculated by one scan, the earliest arrival times at all stops for the widest alpha bound
+     * of these targets. Sources without a reachable target get no bounds.
+     * @param pairs 
+     * @param sourceDate 
+     * @param alpha 
+     * @returns 
+     */
+    private static getBoundsOfSources(pairs: BatchPair[], sourceDate: Date, alpha: number): Map<string, SourceBounds> {
+        let span = Metrics.startSpan();
+        const targetStopsOfSources = new Map<string, Set<number>>();
+        const pairsOfSources = new Map<string, BatchPair>();
+        for(let pair of pairs){
+            if(pair.sourceStop === null || pair.targetStop === null){
+                continue;
+            }
+            const key = pair.sourceStop + ',' + pair.sourceTime;
+            if(!targetStopsOfSources.has(key)){
+                targetStopsOfSources.set(key, new Set<number>());
+                pairsOfSources.set(key, pair);
+            }
+            targetStopsOfSources.get(key).add(pair.targetStop);
+        }
+        const boundsOfSources = new Map<string, SourceBounds>();
+        for(let [key, targetStopsOfSource] of targetStopsOfSources){
+            const sourceStop = pairsOfSources.get(key).sourceStop;
+            const sourceTime = pairsOfSources.get(key).sourceTime;
+            const targetStops = Array.from(targetStopsOfSource);
+            const earliestSafeArrivalTimesOfStops = ConnectionScanAlgorithmController.getEarliestSafeArrivalTimes(sourceStop, targetStops, sourceDate, sourceTime, sourceTime + (NUMBER_OF_DAYS * SECONDS_OF_A_DAY));
+            if(earliestSafeArrivalTimesOfStops === null){
+                continue;
+            }
+            const earliestSafeArrivalTimes = new Map<number, number>();
+            let maxArrivalTime = 0;
+            for(let targetStop of targetStops){
+                if(earliestSafeArrivalTimesOfStops[targetStop] === Number.MAX_VALUE){
+                    continue;
+                }
+                earliestSafeArrivalTimes.set(targetStop, earliestSafeArrivalTimesOfStops[targetStop]);
+                maxArrivalTime = Math.max(maxArrivalTime, sourceTime + alpha * (earliestSafeArrivalTimesOfStops[targetStop] - sourceTime));
+            }
+            if(earliestSafeArrivalTimes.size === 0){
+                continue;
+            }
+            const earliestArrivalTimes = ConnectionScanAlgorithmController.getEarliestArrivalTimes(sourceStop, sourceDate, sourceTime, maxArrivalTime);
+            if(earliestArrivalTimes === null){
+                continue;
+            }
+            boundsOfSources.set(key, {earliestSafeArrivalTimes: earliestSafeArrivalTimes, earliestArrivalTimes: earliestArrivalTimes});
+        }
+        Metrics.endSpan('csaMinimumExpectedArrivalTimeBatch', 'init', span);
+        return boundsOfSources;
+    }
+
+    /**
+     * Answers pairs with the same target and different sources with one profile scan. The scan uses the widest alpha bound
+     * and the earliest source time of the pairs and prunes connections which can't be reached from any source. The
+     * results of pairs with a narrower alpha bound can therefore include journeys which a single query of the pair
+     * excludes, these results are flagged with widenedAlphaBound. The other results are the same as the results of single
+     * queries.
+     * @param targetStop 
+     * @param pairs 
+     * @param sourceDate 
+     * @param alpha 
+     * @param withDecisionGraphs 
+     * @param boundsOfSources 
+     * @param results 
+     */
+    private static answerPairsOfTarget(targetStop: number, pairs: BatchPair[], sourceDate: Date, alpha: number, withDecisionGraphs: boolean, boundsOfSources: Map<string, SourceBounds>, results: MeatBatchResult[]){
+        let span = Metrics.startSpan();
+        this.targetStop = targetStop;
+        this.sourceDate = sourceDate;
+        // calculates the bounds of each pair
+        const reachablePairs: BatchPair[] = [];
+        const earliestSafeArrivalTimes: number[] = [];
+        const earliestArrivalTimesAtTarget: number[] = [];
+        const maxArrivalTimesOfPairs: number[] = [];
+        let earliestArrivalTimes: number[] = null;
+        let minDepartureTime = Number.MAX_VALUE;
+        let maxArrivalTime = 0;
+        for(let pair of pairs){
+            const bounds = boundsOfSources.get(pair.sourceStop + ',' + pair.sourceTime);
+            if(bounds === undefined || !bounds.earliestSafeArrivalTimes.has(targetStop)){
+                results[pair.index] = this.getBatchError(pair, "Couldn't find a connection.");
+                continue;
+            }
+            const earliestSafeArrivalTime = bounds.earliestSafeArrivalTimes.get(targetStop);
+            const maxArrivalTimeOfPair = pair.sourceTime + alpha * (earliestSafeArrivalTime - pair.sourceTime);
+            const earliestArrivalTimesOfPair = bounds.earliestArrivalTimes;
+            // a connection is scanned if it can be reached from one of the sources
+            if(earliestArrivalTimes === null){
+                earliestArrivalTimes = earliestArrivalTimesOfPair.slice();
+            } else {
+                for(let i = 0; i < earliestArrivalTimes.length; i++){
+                    earliestArrivalTimes[i] = Math.min(earliestArrivalTimes[i], earliestArrivalTimesOfPair[i]);
+                }
+            }
+            reachablePairs.push(pair);
+            earliestSafeArrivalTimes.push(earliestSafeArrivalTime);
+            earliestArrivalTimesAtTarget.push(earliestArrivalTimesOfPair[targetStop]);
+            maxArrivalTimesOfPairs.push(maxArrivalTimeOfPair);
+            minDepartureTime = Math.min(minDepartureTime, pair.sourceTime);
+            maxArrivalTime = Math.max(maxArrivalTime, maxArrivalTimeOfPair);
+        }
+        if(reachablePairs.length === 0){
+            return;
+        }
+        this.minDepartureTime = minDepartureTime;
+        this.maxArrivalTime = maxArrivalTime;
+        this.earliestArrivalTimes = earliestArrivalTimes;
+        this.initProfiles();
+        span = Metrics.endSpan('csaMinimumExpectedArrivalTimeBatch', 'init', span);
+        // calls the csa meat algorithm once for all sources
+        this.performAlgorithm();
+        span = Metrics.endSpan('csaMinimumExpectedArrivalTimeBatch', 'scan', span);
+        for(let i = 0; i < reachablePairs.length; i++){
+            this.sourceStop = reachablePairs[i].sourceStop;
+            this.minDepartureTime = reachablePairs[i].sourceTime;
+            this.earliestSafeArrivalTimeCSA = earliestSafeArrivalTimes[i];
+            this.earliestArrivalTimeCSA = earliestArrivalTimesAtTarget[i];
+            const result = this.getBatchResult(reachablePairs[i], withDecisionGraphs);
+            if(result.error === undefined && maxArrivalTimesOfPairs[i] < maxArrivalTime){
+                result.widenedAlphaBound = true;
+            }
+            results[reachablePairs[i].index] = result;
+        }
+        Metrics.endSpan('csaMinimumExpectedArrivalTimeBatch', 'decisionGraphExtraction', span);
+        this.clearArrays();
+    }
+
+    /**
+     * Answers pairs with the same source and source time with the bounds of the source, each target needs its own profile
+     * scan. The results are the same as the results of single queries.
+     * @param pairs 
+     * @param sourceDate 
+     * @param alpha 
+     * @param withDecisionGraphs 
+     * @param boundsOfSources 
+     * @param results 
+     */
+    private static answerPairsOfSource(pairs: BatchPair[], sourceDate: Date, alpha: number, withDecisionGraphs: boolean, boundsOfSources: Map<string, SourceBounds>, results: MeatBatchResult[]){
+        let span = Metrics.startSpan();
+        this.sourceStop = pairs[0].sourceStop;
+        this.minDepartureTime = pairs[0].sourceTime;
+        this.sourceDate = sourceDate;
+        const bounds = boundsOfSources.get(this.sourceStop + ',' + this.minDepartureTime);
+        const reachablePairs: BatchPair[] = [];
+        for(let pair of pairs){
+            if(bounds === undefined || !bounds.earliestSafeArrivalTimes.has(pair.targetStop)){
+                results[pair.index] = this.getBatchError(pair, "Couldn't find a connection.");
+                continue;
+            }
+            reachablePairs.push(pair);
+        }
+        if(reachablePairs.length === 0){
+            return;
+        }
+        const earliestArrivalTimes = bounds.earliestArrivalTimes;
+        for(let i = 0; i < reachablePairs.length; i++){
+            // initializes the values of the pair
+            this.targetStop = reachablePairs[i].targetStop;
+            this.earliestSafeArrivalTimeCSA = bounds.earliestSafeArrivalTimes.get(this.targetStop);
+            this.maxArrivalTime = this.minDepartureTime + alpha * (this.earliestSafeArrivalTimeCSA - this.minDepartureTime);
+            this.earliestArrivalTimes = earliestArrivalTimes;
+            this.earliestArrivalTimeCSA = earliestArrivalTimes[this.targetStop];
+            this.initProfiles();
+            // calls the csa meat algorithm
+            this.performAlgorithm();
+            span = Metrics.endSpan('csaMinimumExpectedArrivalTimeBatch', 'scan', span);
+            results[reachablePairs[i].index] = this.getBatchResult(reachablePairs[i], withDecisionGraphs);
+            span = Metrics.endSpan('csaMinimumExpectedArrivalTimeBatch', 'decisionGraphExtraction', span);
+        }
+        this.clearArrays();
+    }
+
+    /**
+     * Gets the result of the current source and target stop from the scanned profiles.
+     * @param pair 
+     * @param withDecisionGraphs 
+     * @returns 
+     */
+    private static getBatchResult(pair: BatchPair, withDecisionGraphs: boolean): MeatBatchResult {
+        let meatResponse: MeatResponse;
+        try {
+            meatResponse = withDecisionGraphs ? this.extractDecisionGraphs() : this.createMeatResponse();
+        } catch(error) {
+            return this.getBatchError(pair, error.message);
+        }
+        const result: MeatBatchResult = {
+            sourceStop: meatResponse.sourceStop,
+            targetStop: meatResponse.targetStop,
+            sourceTime: Converter.secondsToTime(pair.sourceTime),
+            departureTime: meatResponse.departureTime,
+            departureDate: meatResponse.departureDate,
+            meatTime: meatResponse.meatTime,
+            meatDate: meatResponse.meatDate,
+            eatTime: meatResponse.eatTime,
+            esatTime: meatResponse.esatTime,
+        }
+        if(withDecisionGraphs){
+            Metrics.observeDecisionGraphSize('csaMinimumExpectedArrivalTimeBatch', meatResponse.expandedDecisionGraph.links.length);
+            result.expandedDecisionGraph = meatResponse.expandedDecisionGraph;
+            result.compactDecisionGraph = meatResponse.compactDecisionGraph;
+        }
+        return result;
+    }
+
+    /**
+     * Gets the result of a pair which couldn't be answered.
+     * @param pair 
+     * @param message 
+     * @returns 
+     */
+    private static getBatchError(pair: BatchPair, message: string): MeatBatchResult {
+        return {
+            sourceStop: pair.sourceStop !== null ? GoogleTransitData.STOPS[pair.sourceStop].name : undefined,
+            targetStop: pair.targetStop !== null ? GoogleTransitData.STOPS[pair.targetStop].name : undefined,
+            sourceTime: Converter.secondsToTime(pair.sourceTime),
+            error: message,
+        }
+    }
+
+    /**
+     * Reads the pairs of a batch request. The source and target stops are combined with each other, the pairs can have
+     * their own source time. Returns null if the body is invalid. Unknown stops are null.
+     * @param body 
+     * @returns 
+     */
+    private static getBatchPairs(body: any): BatchPair[] {
+        if(!body || typeof body.date !== 'string' || (body.sourceTime !== undefined && typeof body.sourceTime !== 'string')){
+            return null;
+        }
+        const isListOfStrings = (value: any) => Array.isArray(value) && value.every(entry => typeof entry === 'string');
+        const pairs: BatchPair[] = [];
+        if(body.sourceStops !== undefined || body.targetStops !== undefined){
+            if(!isListOfStrings(body.sourceStops) || !isListOfStrings(body.targetStops) || body.sourceTime === undefined ||
+                body.sourceStops.length * body.targetStops.length > MAX_BATCH_PAIRS){
+                return null;
+            }
+            const sourceTime = Converter.timeToSeconds(body.sourceTime);
+            for(let sourceStop of body.sourceStops){
+                for(let targetStop of body.targetStops){
+                    pairs.push({
+                        index: pairs.length,
+                        sourceStop: GoogleTransitData.getStopIdByName(sourceStop),
+                        targetStop: GoogleTransitData.getStopIdByName(targetStop),
+                        sourceTime: sourceTime,
+                    });
+                }
+            }
+        }
+        if(body.pairs !== undefined){
+            if(!Array.isArray(body.pairs)){
+                return null;
+            }
+            for(let pair of body.pairs){
+                if(!pair || typeof pair.sourceStop !== 'string' || typeof pair.targetStop !== 'string'){
+                    return null;
+                }
+                const sourceTime = pair.sourceTime !== undefined ? pair.sourceTime : body.sourceTime;
+                if(typeof sourceTime !== 'string'){
+                    return null;
+                }
+                pairs.push({
+                    index: pairs.length,
+                    sourceStop: GoogleTransitData.getStopIdByName(pair.sourceStop),
+                    targetStop: GoogleTransitData.getStopIdByName(pair.targetStop),
+                    sourceTime: Converter.timeToSeconds(sourceTime),
+                });
+            }
+        }
+        return pairs;
+    }
+
     /**
      * Performs the modified version of the profile algorithm to solve the minimum expected arrival time problem.
      */
     private static performAlgorithm() {
+        // connections of the current and previous day which are available on these weekdays
+        let currentDayWeekday = Calculator.moduloSeven(this.currentDate.getDay() - 1);
+        let previousDayWeekday = Calculator.moduloSeven(currentDayWeekday - 1);
+        let currentDayConnections = GoogleTransitData.CONNECTIONS_OF_A_WEEKDAY[currentDayWeekday];
+        let currentDayDepartureTimes = GoogleTransitData.CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY[currentDayWeekday];
+        let previousDayConnections = GoogleTransitData.CONNECTIONS_OF_A_WEEKDAY[previousDayWeekday];
+        let previousDayDepartureTimes = GoogleTransitData.CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY[previousDayWeekday];
         // sets the indices of the current and previous day (starts with maximum arrival time)
-        let currentDayIndex = Searcher.binarySearchOfConnections(this.maxArrivalTime - this.dayOffset) - 1;
-        let previousDayIndex = Searcher.binarySearchOfConnections(this.maxArrivalTime - this.dayOffset + SECONDS_OF_A_DAY) - 1;
+        let currentDayIndex = Searcher.binarySearchOfConnectionsOfWeekday(currentDayWeekday, this.maxArrivalTime - this.dayOffset) - 1;
+        let previousDayIndex = Searcher.binarySearchOfConnectionsOfWeekday(previousDayWeekday, this.maxArrivalTime - this.dayOffset + SECONDS_OF_A_DAY) - 1;
         let lastDepartureTime = this.maxArrivalTime;
-        let currentDayWeekday = Calculator.moduloSeven(this.currentDate.getDay() - 1);
+        let numberOfScannedConnections = 0;
+        // arrival date of connections which arrive after midnight
+        let nextDate = new Date(this.currentDate);
+        nextDate.setDate(nextDate.getDate() + 1);
         // evaluates connections until it reaches the minimum departure time
         while(lastDepartureTime >= this.minDepartureTime){
-            // sets the connections
-            const currentDayConnection = GoogleTransitData.CONNECTIONS[currentDayIndex];
-            const previousDayConnection = GoogleTransitData.CONNECTIONS[previousDayIndex];
-            let currentConnection: Connection;
+            // sets the departure times of the next connections (undefined if all connections of the day are scanned)
+            const currentDayDepartureTime = currentDayIndex >= 0 ? currentDayDepartureTimes[currentDayIndex] : undefined;
+            const previousDayDepartureTime = previousDayIndex >= 0 ? previousDayDepartureTimes[previousDayIndex] : undefined;
+            let currentConnectionId: number;
+            let currentConnectionDepartureStop: number;
+            let currentConnectionArrivalStop: number;
+            let currentConnectionTrip: number;
             let currentConnectionDepartureTime: number;
             let currentConnectionArrivalTime: number;
-            let currentWeekday: number;
-            let currentArrivalDate = new Date(this.currentDate);
+            let currentArrivalDate: Date;
             let currentExpectedDelay: number;
             let currentMaxDelay: number;
             let currentConnectionIsLongDistanceTrip: boolean;
             // checks which connection is the next one
-            if(currentDayConnection && currentDayConnection.departureTime >= Math.max(previousDayConnection.departureTime - SECONDS_OF_A_DAY, 0)){
+            if(currentDayDepartureTime !== undefined && (previousDayDepartureTime === undefined || currentDayDepartureTime >= Math.max(previousDayDepartureTime - SECONDS_OF_A_DAY, 0))){
                 // sets the values of the current day connection
-                currentConnection = currentDayConnection;
-                currentConnectionDepartureTime = currentConnection.departureTime + this.dayOffset;
-                currentConnectionArrivalTime = currentConnection.arrivalTime + this.dayOffset;
+                currentConnectionId = currentDayConnections[currentDayIndex];
+                const arrivalTime = GoogleTransitData.getArrivalTimeOfConnection(currentConnectionId);
+                currentConnectionDepartureTime = currentDayDepartureTime + this.dayOffset;
+                currentConnectionArrivalTime = arrivalTime + this.dayOffset;
                 // checks if the connection arrives at the next day
-                if(currentConnection.arrivalTime >= SECONDS_OF_A_DAY){
-                    currentArrivalDate.setDate(currentArrivalDate.getDate() + 1);
+                if(arrivalTime >= SECONDS_OF_A_DAY){
+                    currentArrivalDate = nextDate;
+                } else {
+                    currentArrivalDate = this.currentDate;
                 }
                 currentDayIndex--;
-                currentWeekday = currentDayWeekday;
-            } else if(previousDayConnection.departureTime >= SECONDS_OF_A_DAY) {
+            } else if(previousDayDepartureTime >= SECONDS_OF_A_DAY) {
                 // sets the values of the previous day connection
-                currentConnection = previousDayConnection;
-                currentConnectionDepartureTime = currentConnection.departureTime + this.dayOffset - SECONDS_OF_A_DAY;
-                currentConnectionArrivalTime = currentConnection.arrivalTime + this.dayOffset - SECONDS_OF_A_DAY;
+                currentConnectionId = previousDayConnections[previousDayIndex];
+                currentConnectionDepartureTime = previousDayDepartureTime + this.dayOffset - SECONDS_OF_A_DAY;
+                currentConnectionArrivalTime = GoogleTransitData.getArrivalTimeOfConnection(currentConnectionId) + this.dayOffset - SECONDS_OF_A_DAY;
+                currentArrivalDate = this.currentDate;
                 previousDayIndex--;
-                currentWeekday = Calculator.moduloSeven(currentDayWeekday - 1);
             } else {
                 // shifts the previous and current day by one
                 if(this.dayOffset === 0){
                     break;
                 }
                 currentDayIndex = previousDayIndex;
-                previousDayIndex = GoogleTransitData.CONNECTIONS.length-1;
+                currentDayWeekday = previousDayWeekday;
+                currentDayConnections = previousDayConnections;
+                currentDayDepartureTimes = previousDayDepartureTimes;
+                previousDayWeekday = Calculator.moduloSeven(previousDayWeekday - 1);
+                previousDayConnections = GoogleTransitData.CONNECTIONS_OF_A_WEEKDAY[previousDayWeekday];
+                previousDayDepartureTimes = GoogleTransitData.CONNECTION_DEPARTURE_TIMES_OF_A_WEEKDAY[previousDayWeekday];
+                previousDayIndex = previousDayConnections.length - 1;
                 this.dayOffset -= SECONDS_OF_A_DAY;
-                currentDayWeekday = Calculator.moduloSeven(currentDayWeekday - 1);
+                // the dates are not changed because they are referenced by the profiles
+                nextDate = this.currentDate;
+                this.currentDate = new Date(this.currentDate);
                 this.currentDate.setDate(this.currentDate.getDate() - 1);
                 continue;
             }
             // sets the last departure time
             lastDepartureTime = currentConnectionDepartureTime;
-            // checks if the connection is available on this weekday
-            if(!GoogleTransitData.isAvailable(currentWeekday, GoogleTransitData.TRIPS[currentConnection.trip].isAvailable)){
-                continue;
-            }
+            numberOfScannedConnections++;
             // checks if the connection arrives earlier than the maximum arrival time and can be reached from the source stop
-            if(currentConnectionArrivalTime > this.maxArrivalTime || this.earliestArrivalTimes[currentConnection.departureStop] > currentConnectionDepartureTime) {
+            if(currentConnectionArrivalTime > this.maxArrivalTime || this.earliestArrivalTimes[GoogleTransitData.getDepartureStopOfConnection(currentConnectionId)] > currentConnectionDepartureTime) {
                 continue;
             }
+            // reads the values of the connection from the timetable without creating a connection object
+            currentConnectionDepartureStop = GoogleTransitData.getDepartureStopOfConnection(currentConnectionId);
+            currentConnectionArrivalStop = GoogleTransitData.getArrivalStopOfConnection(currentConnectionId);
+            currentConnectionTrip = GoogleTransitData.getTripOfConnection(currentConnectionId);
             // sets the delay values (depends on the type of the trip)
-            if(GoogleTransitData.TRIPS[currentConnection.trip].isLongDistance){
+            if(GoogleTransitData.isLongDistanceConnection(currentConnectionId)){
                 currentExpectedDelay = Reliability.longDistanceExpectedValue;
                 currentMaxDelay = MAX_D_C_LONG;
                 currentConnectionIsLongDistanceTrip = true;
@@ -265,23 +650,23 @@ export class ConnectionScanMeatAlgorithmController {
             let timeC: number;
             let p: SEntry;
             // checks if the arrival stop of the connection is a target stop (expected arrival time when walking to the target)
-            if(currentConnection.arrivalStop === this.targetStop) {
+            if(currentConnectionArrivalStop === this.targetStop) {
                 time1 = currentConnectionArrivalTime + currentExpectedDelay;
             } else {
                 time1 = Number.MAX_VALUE;
             }
             // expected arrival time when remaining seated
-            let stopSequence = currentConnection.stopSequence;
-            if(stopSequence < this.t[currentConnection.trip].stopSequence){
-                time2 = this.t[currentConnection.trip].expectedArrivalTime;
+            let stopSequence = GoogleTransitData.getStopSequenceOfConnection(currentConnectionId);
+            if(stopSequence < this.t[currentConnectionTrip].stopSequence){
+                time2 = this.t[currentConnectionTrip].expectedArrivalTime;
             } else {
                 time2 = Number.MAX_VALUE;
             }
             let expectedArrivalTime = 0;
             let pLastDepartureTime: number = -1;
             // finds all outgoing trips which have a departure time between c_arr and c_arr + maxD_c (and the departure after max delay)
-            for(let j = 0; j < this.s[currentConnection.arrivalStop].length; j++) {
-                p = this.s[currentConnection.arrivalStop][j];
+            for(let j = 0; j < this.s[currentConnectionArrivalStop].length; j++) {
+                p = this.s[currentConnectionArrivalStop][j];
                 if(p.departureTime < currentConnectionArrivalTime){
                     continue;
                 } else{
@@ -305,12 +690,12 @@ export class ConnectionScanMeatAlgorithmController {
             timeC = Math.min(time1, time2, time3);
 
             // sets the pointer of the t array
-            if(timeC !== Number.MAX_VALUE && timeC < this.t[currentConnection.trip].expectedArrivalTime){
-                this.t[currentConnection.trip] = {
+            if(timeC !== Number.MAX_VALUE && timeC < this.t[currentConnectionTrip].expectedArrivalTime){
+                this.t[currentConnectionTrip] = {
                     expectedArrivalTime: timeC,
                     arrivalDate: currentArrivalDate,
                     connectionArrivalTime: currentConnectionArrivalTime,
-                    connectionArrivalStop: currentConnection.arrivalStop,
+                    connectionArrivalStop: currentConnectionArrivalStop,
                     stopSequence: stopSequence,
                 };
             }
@@ -320,45 +705,63 @@ export class ConnectionScanMeatAlgorithmController {
                 departureTime: currentConnectionDepartureTime,
                 expectedArrivalTime: timeC,
                 departureDate: this.currentDate,
-                arrivalDate: this.t[currentConnection.trip].arrivalDate,
+                arrivalDate: this.t[currentConnectionTrip].arrivalDate,
                 enterTime: currentConnectionDepartureTime,
-                enterStop: currentConnection.departureStop,
-                exitTime: this.t[currentConnection.trip].connectionArrivalTime,
-                exitStop: this.t[currentConnection.trip].connectionArrivalStop,
-                tripId: currentConnection.trip,
-                finalFootpath: this.t[currentConnection.trip].finalFootpath,
+                enterStop: currentConnectionDepartureStop,
+                exitTime: this.t[currentConnectionTrip].connectionArrivalTime,
+                exitStop: this.t[currentConnectionTrip].connectionArrivalStop,
+                tripId: currentConnectionTrip,
+                finalFootpath: this.t[currentConnectionTrip].finalFootpath,
             }
 
             // profile function with minimum expected arrival time of departure stop
-            let q = this.s[currentConnection.departureStop][0];
+            let q = this.s[currentConnectionDepartureStop][0];
             if(p.expectedArrivalTime !== Number.MAX_VALUE) {
                 // checks if q dominates p
                 if(!this.dominates(q, p)){
                     // adds p to the s entry of the departure stop
                     if(q.departureTime !== p.departureTime){
-                        this.s[currentConnection.departureStop].unshift(p)
+                        this.s[currentConnectionDepartureStop].unshift(p)
                     } else {
-                        this.s[currentConnection.departureStop][0] = p;
+                        this.s[currentConnectionDepartureStop][0] = p;
                     }
                 }
             }
         }
+        // records the work of the algorithm
+        Metrics.increment('csaMinimumExpectedArrivalTime', 'connections_scanned', numberOfScannedConnections);
     }
 
     /**
      * Initializes the values of the algorithm.
      */
     private static init(alpha: number){
-        this.earliestSafeArrivalTimeCSA = ConnectionScanAlgorithmController.getEarliestArrivalTime(this.sourceStop, this.targetStop, this.sourceDate, this.minDepartureTime, true, this.minDepartureTime + (NUMBER_OF_DAYS * SECONDS_OF_A_DAY));
-        if(this.earliestSafeArrivalTimeCSA === null) {
+        // the earliest safe arrival time is calculated by a scan and not by the bound table: the table only contains minimum
+        // travel times without waiting times, which are lower bounds, and the exact value defines the alpha bound and
+        // the esat of the response
+        // the earliest arrival time at the target is calculated by the same scan
+        const earliestArrivalTimesAtTarget = ConnectionScanAlgorithmController.getEarliestSafeAndUnsafeArrivalTime(this.sourceStop, this.targetStop, this.sourceDate, this.minDepartureTime, this.minDepartureTime + (NUMBER_OF_DAYS * SECONDS_OF_A_DAY));
+        if(earliestArrivalTimesAtTarget === null) {
             throw new Error("Couldn't find a connection.")
         }
+        this.earliestSafeArrivalTimeCSA = earliestArrivalTimesAtTarget.earliestSafeArrivalTime;
+        this.earliestArrivalTimeCSA = earliestArrivalTimesAtTarget.earliestArrivalTime;
 
         // calculates the maximum arrival time of the alpha bounded version of the algorithm
         let difference = alpha * (this.earliestSafeArrivalTimeCSA - this.minDepartureTime);
         this.maxArrivalTime = this.minDepartureTime + difference;
-        this.earliestArrivalTimes = ConnectionScanAlgorithmController.getEarliestArrivalTimes(this.sourceStop, this.sourceDate, this.minDepartureTime, this.maxArrivalTime)
-        
+        // uses the lower bounds of the bound table to prune the search
+        this.earliestArrivalTimes = BoundTable.getEarliestArrivalTimes(this.sourceStop, this.minDepartureTime, this.maxArrivalTime);
+        if(this.earliestArrivalTimes === null){
+            this.earliestArrivalTimes = ConnectionScanAlgorithmController.getEarliestArrivalTimes(this.sourceStop, this.sourceDate, this.minDepartureTime, this.maxArrivalTime);
+        }
+        this.initProfiles();
+    }
+
+    /**
+     * Initializes the profile functions and the trip array for the maximum arrival time.
+     */
+    private static initProfiles(){
         // sets the relevant dates
         this.dayOffset = Converter.getDayOffset(this.maxArrivalTime);
         this.currentDate = new Date(this.sourceDate);
@@ -404,28 +807,30 @@ export class ConnectionScanMeatAlgorithmController {
     }
 
     /**
-     * Extracts the decision graph.
+     * Creates the response with the common values of the journey (without decision graphs). Throws an error if the source
+     * stop can't reach the target.
      * @returns 
      */
-    private static extractDecisionGraphs() {
-        if(this.s[this.sourceStop][0].expectedArrivalTime === Number.MAX_VALUE){
+    private static createMeatResponse(): MeatResponse {
+        const sourceEntry = this.getSourceEntry();
+        if(sourceEntry.expectedArrivalTime === Number.MAX_VALUE){
             throw new Error("Couldn't find a connection.")
         }
         // the minimum expected arrival time
-        let meatTime = this.s[this.sourceStop][0].expectedArrivalTime;
+        let meatTime = sourceEntry.expectedArrivalTime;
         this.meatDate = new Date(this.sourceDate);
         this.meatDate.setDate(this.meatDate.getDate() + Converter.getDayDifference(meatTime));
         let departureDate = new Date(this.sourceDate);
-        departureDate.setDate(this.sourceDate.getDate() + Converter.getDayDifference(this.s[this.sourceStop][0].departureTime));
+        departureDate.setDate(this.sourceDate.getDate() + Converter.getDayDifference(sourceEntry.departureTime));
         // sets the common values of the journey
         let meatResponse: MeatResponse = {
             sourceStop: GoogleTransitData.STOPS[this.sourceStop].name,
             targetStop: GoogleTransitData.STOPS[this.targetStop].name,
-            departureTime: Converter.secondsToTime(this.s[this.sourceStop][0].departureTime),
+            departureTime: Converter.secondsToTime(sourceEntry.departureTime),
             departureDate: departureDate.toLocaleDateString('de-DE'),
             meatTime: Converter.secondsToTime(meatTime),
             meatDate: this.meatDate.toLocaleDateString('de-DE'),
-            eatTime: Converter.secondsToTime(this.earliestArrivalTimes[this.targetStop]),
+            eatTime: Converter.secondsToTime(this.earliestArrivalTimeCSA),
             esatTime: Converter.secondsToTime(this.earliestSafeArrivalTimeCSA),
             expandedDecisionGraph: {
                 nodes: [],
@@ -438,40 +843,52 @@ export class ConnectionScanMeatAlgorithmController {
                 clusters: [],
             }
         }
-        let expandedTempEdges: TempEdge[] = [];
-        let arrivalTimesPerStop: Map<string, number[]> = new Map<string, number[]>();
+        return meatResponse;
+    }
+
+    /**
+     * Gets the first profile entry of the source stop which departs at or after the minimum departure time. The profiles
+     * of a batch scan can contain earlier entries of other sources.
+     * @returns 
+     */
+    private static getSourceEntry(): SEntry {
+        const profile = this.s[this.sourceStop];
+        for(let i = 0; i < profile.length; i++){
+            if(profile[i].departureTime >= this.minDepartureTime){
+                return profile[i];
+            }
+        }
+        return profile[profile.length - 1];
+    }
+
+    /**
+     * Extracts the decision graph.
+     * @returns 
+     */
+    private static extractDecisionGraphs() {
+        const meatResponse = this.createMeatResponse();
+        const sourceEntry = this.getSourceEntry();
+        const decisionGraphBuilder = new DecisionGraphBuilder();
         // priority queue sorted by the departure times
         let priorityQueue = new FastPriorityQueue<SEntry>((a, b) => {
             return a.departureTime < b.departureTime
         });
         // adds the source stop
         let targetStopLabels: SEntry[] = [];
-        this.s[this.sourceStop][0].calcReliability = 1;
+        sourceEntry.calcReliability = 1;
         let stopDepartureCheck = new Map<number, number[]>();
-        priorityQueue.add(this.s[this.sourceStop][0]);
+        priorityQueue.add(sourceEntry);
         while(!priorityQueue.isEmpty()){
             let p = priorityQueue.poll();
             let tripId = p.tripId;
             // uses the information of the profile function to create an edge
-            let edge: TempEdge = {
-                departureStop: GoogleTransitData.STOPS[p.enterStop].name,
-                departureTime: p.enterTime,
-                arrivalStop: GoogleTransitData.STOPS[p.exitStop].name,
-                arrivalTime: p.exitTime,
-                type: 'Train',
-            }
-            expandedTempEdges.push(edge);
-            if(arrivalTimesPerStop.get(edge.arrivalStop) === undefined) {
-                arrivalTimesPerStop.set(edge.arrivalStop, [edge.arrivalTime]);
-            } else {
-                arrivalTimesPerStop.get(edge.arrivalStop).push(edge.arrivalTime);
-            }
+            decisionGraphBuilder.addEdge(p.enterStop, p.enterTime, p.exitStop, p.exitTime, 'Train');
             // checks if the current profile reaches the target
             if(this.targetStop !== p.exitStop){
                 // sets max delay
                 let maxDelay: number;
                 let isLongDistanceTrip: boolean;
-                if(GoogleTransitData.TRIPS[tripId].isLongDistance){
+                if(GoogleTransitData.isLongDistanceTrip(tripId)){
                     maxDelay = MAX_D_C_LONG;
                     isLongDistanceTrip = true;
                 } else {
@@ -522,7 +939,7 @@ export class ConnectionScanMeatAlgorithmController {
         // let meat = this.calculateMEAT(targetStopLabels);
         // console.log(meat);
         // console.log(Converter.secondsToTime(meat));
-        const decisionGraphs = DecisionGraphController.getDecisionGraphs(expandedTempEdges, arrivalTimesPerStop, this.sourceStop, this.targetStop);
+        const decisionGraphs = decisionGraphBuilder.build(this.targetStop);
         meatResponse.expandedDecisionGraph = decisionGraphs.expandedDecisionGraph;
         meatResponse.compactDecisionGraph = decisionGraphs.compactDecisionGraph;
         return meatResponse;
@@ -539,7 +956,7 @@ export class ConnectionScanMeatAlgorithmController {
         let probabilitySum = 0;
         for(let targetStopPair of targetStopPairs){
             let expectedDelay: number;
-            if(GoogleTransitData.TRIPS[targetStopPair.tripId].isLongDistance){
+            if(GoogleTransitData.isLongDistanceTrip(targetStopPair.tripId)){
                 expectedDelay = Reliability.longDistanceExpectedValue;
             } else {
                 expectedDelay = Reliability.normalDistanceExpectedValue;
@@ -0,0 +1,28 @@
+import express from 'express';
+import { DelayFeed } from '../../data/delay-feed';
+
+export class DelayController {
+    /**
+     * Applies the trip updates of a gtfs-realtime message (json format) to the delays.
+     * @param req 
+     * @param res 
+     * @returns 
+     */
+    public static applyFeedMessage(req: express.Request, res: express.Response){
+        // checks the body of the http request
+        if(!req.body || !Array.isArray(req.body.entity)){
+            res.status(400).send();
+            return;
+        }
+        res.send(DelayFeed.applyFeedMessage(req.body, 'http'));
+    }
+
+    /**
+     * Returns the counters and durations of the applied delay updates.
+     * @param req 
+     * @param res 
+     */
+    public static getStatistics(req: express.Request, res: express.Response){
+        res.send(DelayFeed.getStatistics());
+    }
+}
\ No newline at end of file
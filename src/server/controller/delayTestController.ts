@@ -1,5 +1,8 @@
 import { GoogleTransitData } from "../../data/google-transit-data";
+import { DelayFeed } from "../../data/delay-feed";
 import { Reliability } from "../../data/reliability";
+import { ResponseCache } from "../../data/response-cache";
+import { SeededRandom } from "../../data/seeded-random";
 import { ConnectionScanAlgorithmController } from "./connectionScanAlgorithmController";
 
 // stores the information about the earliest trip
@@ -23,12 +26,16 @@ interface Label {
 
 export class DelayTestController {
     /**
-     * Add a random delay to each trip.
+     * Add a random delay to each trip (at all stops). The delays are reproducible if a seed is given.
+     * @param seed 
      */
-    public static addDelaysToTrips(){
+    public static addDelaysToTrips(seed?: number){
+        const random = seed !== undefined ? new SeededRandom(seed) : undefined;
         for(let trip of GoogleTransitData.TRIPS){
-            trip.givenDelay = Reliability.getRandomDelay(trip.isLongDistance)
+            DelayFeed.setTripDelay(trip.id, Reliability.getRandomDelay(trip.isLongDistance, random));
         }
+        // cached responses could depend on the old delays
+        ResponseCache.invalidate();
     }
 
     /**
@@ -54,7 +61,7 @@ export class DelayTestController {
         let currentLabel = expectedArrivalTimes[sourceStop][0];
         while(currentLabel.exitTripAtStop !== targetStop){
             let nextStop = currentLabel.exitTripAtStop;
-            let delay = GoogleTransitData.TRIPS[currentLabel.associatedTrip.tripId].givenDelay;
+            let delay = DelayFeed.getArrivalDelay(currentLabel.associatedTrip.tripId, nextStop);
             let arrivalTime = currentLabel.associatedTrip.tripArrival + delay;
             for(let j = 0; j < expectedArrivalTimes[nextStop].length; j++){
                 if(arrivalTime <= expectedArrivalTimes[nextStop][j].departureTime){
@@ -63,7 +70,7 @@ export class DelayTestController {
                 }
             }
         }
-        let delay = GoogleTransitData.TRIPS[currentLabel.associatedTrip.tripId].givenDelay;
+        let delay = DelayFeed.getArrivalDelay(currentLabel.associatedTrip.tripId, targetStop);
         let arrivalTime = currentLabel.associatedTrip.tripArrival + delay;
         return arrivalTime;
     }
@@ -0,0 +1,13 @@
+import express from 'express';
+import { Metrics } from '../../data/metrics';
+
+export class MetricsController {
+    /**
+     * Returns the durations and counters of the routing algorithms in the text format of prometheus.
+     * @param req 
+     * @param res 
+     */
+    public static getMetrics(req: express.Request, res: express.Response){
+        res.set('Content-Type', 'text/plain; version=0.0.4').send(Metrics.toPrometheusFormat());
+    }
+}
\ No newline at end of file
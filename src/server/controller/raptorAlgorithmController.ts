@@ -1,7 +1,7 @@
 import { Converter } from "../../data/converter";
 import { GoogleTransitData } from "../../data/google-transit-data";
 import { RouteStopMapping } from "../../models/RouteStopMapping";
-import { StopTime } from "../../models/StopTime";
+import { Searcher } from "../../data/searcher";
 import { JourneyResponse } from "../../models/JourneyResponse";
 import { Section } from "../../models/Section";
 import express from "express";
@@ -10,6 +10,7 @@ import { Calculator } from "../../data/calculator";
 import { CHANGE_TIME, SECONDS_OF_A_DAY } from "../../constants";
 import { Reliability } from "../../data/reliability";
 import { JourneyPointerRaptor } from "../../models/JourneyPointerRaptor";
+import { Metrics } from "../../data/metrics";
 
 // entries of the q array
 interface QEntry {
@@ -72,14 +73,17 @@ export class RaptorAlgorithmController {
             this.sourceDate = new Date(req.query.date);
             this.sourceWeekday = Calculator.moduloSeven((this.sourceDate.getDay() - 1));
             // initializes the csa algorithm
+            let span = Metrics.startSpan();
             this.init();
-            console.time('raptor algorithm')
+            span = Metrics.endSpan('raptorEarliestArrivalTime', 'init', span);
             // calls the csa
             this.performAlgorithm();
-            console.timeEnd('raptor algorithm')
+            span = Metrics.endSpan('raptorEarliestArrivalTime', 'rounds', span);
             // generates the http response which includes all information of the journey
             const journeyResponse = this.getJourneyResponse();
+            span = Metrics.endSpan('raptorEarliestArrivalTime', 'journeyExtraction', span);
             res.status(200).send(journeyResponse);
+            Metrics.endSpan('raptorEarliestArrivalTime', 'serialization', span);
         } catch (err) {
             res.status(500).send(err);
         }
@@ -140,6 +144,8 @@ export class RaptorAlgorithmController {
                 break;
             }
         }
+        // records the work of the algorithm
+        Metrics.increment('raptorEarliestArrivalTime', 'rounds', this.k);
     }
 
     /**
@@ -248,35 +254,27 @@ export class RaptorAlgorithmController {
             let r = this.Q[i].r;
             let p = this.Q[i].p;
             // get the earliest trip or r which can be catched at p in round k
-            let tripInfo = this.getEarliestTrip(r, p);
+            let tripInfo = this.getEarliestTrip(r, p, this.Q[i].stopSequence);
             let t = tripInfo.tripId;
             let dayOffset = tripInfo.dayOffset;
             let enterTripAtStop = p;
-            if(t === undefined){
+            if(t === undefined || t === null){
                 continue;
             }
-            let reachedP = false;
-            // loop over all stops of r beggining with p
-            for(let j = 0; j < GoogleTransitData.STOPS_OF_A_ROUTE[r].length; j++){     
+            // loop over all stops of r after p
+            for(let j = this.Q[i].stopSequence + 1; j < GoogleTransitData.STOPS_OF_A_ROUTE[r].length; j++){     
                 let pi = GoogleTransitData.STOPS_OF_A_ROUTE[r][j];
-                if(pi === p){
-                    reachedP = true;
-                    continue;
-                }
-                if(!reachedP){
-                    continue;
-                }
 
                 // gets stop time of stop pi in trip t
-                let stopTime = GoogleTransitData.getStopTimeByTripAndStop(t, pi);
+                let stopTimeId = GoogleTransitData.getStopTimeIdByTripAndPosition(t, j);
 
-                if(!stopTime){
+                if(stopTimeId >= GoogleTransitData.getNumberOfStopTimes()){
                     continue;
                 }
 
                 // sets the arrival and departure time at stop pi
-                let arrivalTime = stopTime.arrivalTime + dayOffset;
-                let departureTime = stopTime.departureTime + dayOffset;
+                let arrivalTime = GoogleTransitData.getArrivalTimeOfStopTime(stopTimeId) + dayOffset;
+                let departureTime = GoogleTransitData.getDepartureTimeOfStopTime(stopTimeId) + dayOffset;
                 if(arrivalTime < tripInfo.tripDeparture){
                     arrivalTime += SECONDS_OF_A_DAY;
                 }
@@ -287,7 +285,7 @@ export class RaptorAlgorithmController {
                 // gets the earliest arrival time at the target stops
                 let earliestTargetStopArrival = this.earliestArrivalTime[this.targetStop];
                 // sets the arrival time + journey pointer
-                if(stopTime && arrivalTime < Math.min(this.earliestArrivalTime[pi], earliestTargetStopArrival)){
+                if(arrivalTime < Math.min(this.earliestArrivalTime[pi], earliestTargetStopArrival)){
                     this.earliestArrivalTimePerRound[this.k][pi] = arrivalTime;
                     this.earliestArrivalTime[pi] = arrivalTime;
                     this.j[pi] = {
@@ -304,12 +302,12 @@ export class RaptorAlgorithmController {
                 }
                 
                 // checks if it is possible to catch an earlier trip at pi in round k
-                if(stopTime && this.earliestArrivalTimePerRound[this.k-1][pi] + CHANGE_TIME < departureTime){
-                    let newT = this.getEarliestTrip(r, pi);
+                if(this.earliestArrivalTimePerRound[this.k-1][pi] + CHANGE_TIME < departureTime){
+                    let newT = this.getEarliestTrip(r, pi, j);
                     if(t !== newT.tripId || dayOffset !== newT.dayOffset){
                         tripInfo = newT;
                         t = tripInfo.tripId;
-                        enterTripAtStop = stopTime.stopId;
+                        enterTripAtStop = GoogleTransitData.getStopOfStopTime(stopTimeId);
                         dayOffset = tripInfo.dayOffset;
                     }
                 }
@@ -365,17 +363,19 @@ export class RaptorAlgorithmController {
      * Gets the earliest trip of route r which can be catched at stop pi in round k.
      * @param r 
      * @param pi 
-     * @param k 
+     * @param position 
      * @returns 
      */
-    private static getEarliestTrip(r: number, pi: number): EarliestTripInfo {
-        let tripId: number; 
+    private static getEarliestTrip(r: number, pi: number, position: number): EarliestTripInfo {
+        let tripId: number = null;
         let tripDeparture: number = Number.MAX_VALUE;
         let earliestTripInfo: EarliestTripInfo;
         
-        let stopTimes: StopTime[] = GoogleTransitData.getStopTimesByStopAndRoute(pi, r);
+        // entries of the departure index of the route at this stop (sorted by departure time)
+        const firstEntry = GoogleTransitData.getFirstEntryOfDepartureIndex(r, position);
+        const lastEntry = firstEntry + GoogleTransitData.TRIPS_OF_A_ROUTE[r].length;
 
-        if(stopTimes.length === 0) {
+        if(firstEntry === lastEntry) {
             earliestTripInfo = {
                 tripId: null,
                 tripDeparture: null,
@@ -392,28 +392,37 @@ export class RaptorAlgorithmController {
         let previousDay = false;
         let currentWeekday = Calculator.moduloSeven(this.sourceWeekday + Converter.getDayDifference(earliestArrival));
         let previousWeekday = Calculator.moduloSeven(currentWeekday - 1);
-        // loops over all stop times until it finds the first departure after the earliestArrival
+        // checks the departures of each day until it finds the first departure after the earliestArrival
         for(let i = 0; i < 8; i ++) {
-            for(let j = 0; j < stopTimes.length; j++) {
-                let stopTime = stopTimes[j];
-                let departureTime = stopTime.departureTime;
-                // checks if the trip is available and if it is a candidat for the earliest trip
-                if(GoogleTransitData.isAvailable(currentWeekday, GoogleTransitData.TRIPS[stopTime.tripId].isAvailable) && (departureTime + earliestArrivalDayOffset) >= earliestArrival 
-                    && (departureTime + earliestArrivalDayOffset) < tripDeparture) {
-                    tripId = stopTime.tripId;
-                    tripDeparture = departureTime + earliestArrivalDayOffset;
+            // finds the first available trip of the current day
+            let entry = Searcher.binarySearchOfDepartureIndex(firstEntry, lastEntry, earliestArrival - earliestArrivalDayOffset);
+            for(; entry < lastEntry; entry++) {
+                let departureTime = GoogleTransitData.DEPARTURE_INDEX_DEPARTURE_TIMES[entry] + earliestArrivalDayOffset;
+                if(departureTime >= tripDeparture){
+                    break;
+                }
+                if(GoogleTransitData.isTripAvailable(GoogleTransitData.DEPARTURE_INDEX_TRIPS[entry], currentWeekday)) {
+                    tripId = GoogleTransitData.DEPARTURE_INDEX_TRIPS[entry];
+                    tripDeparture = departureTime;
                     previousDay = false;
+                    break;
+                }
+            }
+            // finds the first available trip which corresponds to the previous day but could be catched at the current day
+            entry = Searcher.binarySearchOfDepartureIndex(firstEntry, lastEntry, Math.max(earliestArrival - earliestArrivalDayOffset, 0) + SECONDS_OF_A_DAY);
+            for(; entry < lastEntry; entry++) {
+                let departureTimeOfPreviousDay = GoogleTransitData.DEPARTURE_INDEX_DEPARTURE_TIMES[entry] - SECONDS_OF_A_DAY + earliestArrivalDayOffset;
+                if(departureTimeOfPreviousDay >= tripDeparture){
+                    break;
                 }
-                // checks if the trip corresponds to the previous day but could be catched at the current day
-                let departureTimeOfPreviousDay = departureTime - SECONDS_OF_A_DAY;
-                if(GoogleTransitData.isAvailable(previousWeekday, GoogleTransitData.TRIPS[stopTime.tripId].isAvailable) && departureTimeOfPreviousDay >= 0 
-                    && (departureTimeOfPreviousDay + earliestArrivalDayOffset) >= earliestArrival && (departureTimeOfPreviousDay + earliestArrivalDayOffset) < tripDeparture){
-                    tripId = stopTime.tripId;
-                    tripDeparture = departureTimeOfPreviousDay + earliestArrivalDayOffset;
+                if(GoogleTransitData.isTripAvailable(GoogleTransitData.DEPARTURE_INDEX_TRIPS[entry], previousWeekday)) {
+                    tripId = GoogleTransitData.DEPARTURE_INDEX_TRIPS[entry];
+                    tripDeparture = departureTimeOfPreviousDay;
                     previousDay = true;
+                    break;
                 }
             }
-            if(tripId){
+            if(tripId !== null){
                 break;
             }
             previousWeekday = currentWeekday;
@@ -422,7 +431,7 @@ export class RaptorAlgorithmController {
         }
         
         
-        if(tripId){
+        if(tripId !== null){
             // checks if it found a trip at the same day
             let dayOffset: number;
             if(previousDay) {
@@ -493,7 +502,7 @@ export class RaptorAlgorithmController {
                 type = 'Footpath'
             } else {
                 if(lastArrivalTime !== null && lastTripId !== null) {
-                    reliability *= Reliability.getProbabilityOfArrivalTime(-1, departureTime - lastArrivalTime, GoogleTransitData.TRIPS[lastTripId].isLongDistance);
+                    reliability *= Reliability.getProbabilityOfArrivalTime(-1, departureTime - lastArrivalTime, GoogleTransitData.isLongDistanceTrip(lastTripId));
                 }
                 lastTripId = journeyPointers[i].tripId;
                 numberOfLegs++;
@@ -5,14 +5,18 @@ import { GoogleTransitData } from "../../data/google-transit-data";
 import { ConnectionScanAlgorithmController } from "./connectionScanAlgorithmController";
 import FastPriorityQueue from 'fastpriorityqueue';
 import { MeatResponse } from "../../models/MeatResponse";
-import { TempEdge } from "../../models/TempEdge";
-import { ALPHA, MAX_D_C_LONG, MAX_D_C_NORMAL, NUMBER_OF_DAYS, SECONDS_OF_A_DAY } from "../../constants";
+import { MeatRangeResponse } from "../../models/MeatRangeResponse";
+import { ALPHA, MAX_DEPARTURE_WINDOW, MAX_D_C_LONG, MAX_D_C_NORMAL, NUMBER_OF_DAYS, SECONDS_OF_A_DAY } from "../../constants";
+import { ResponseCache } from "../../data/response-cache";
 import { Reliability } from "../../data/reliability";
+import { DecisionGraphBuilder } from "../../data/decision-graph-builder";
+import { ResponseWriter } from "../../data/response-writer";
+import { BoundTable } from "../../data/bound-table";
 import { RouteStopMapping } from "../../models/RouteStopMapping";
-import { StopTime } from "../../models/StopTime";
+import { Searcher } from "../../data/searcher";
 import { performance } from 'perf_hooks';
-import { DecisionGraphController } from "./decisionGraphController";
 import { cloneDeep } from "lodash";
+import { Metrics } from "../../data/metrics";
 
 // entries of the q array
 interface QEntry {
@@ -50,6 +54,8 @@ export class RaptorMeatAlgorithmController {
     private static minDepartureTime: number;
     // earliest safe arrival time of csa
     private static earliestSafeArrivalTimeCSA: number;
+    // earliest arrival time of csa
+    private static earliestArrivalTimeCSA: number;
     // the maximum arrival time of the journey
     private static maxArrivalTime: number;
     // the earliest possible arrival time of each stop
@@ -63,6 +69,8 @@ export class RaptorMeatAlgorithmController {
 
     // transfer counter of raptor algorithm
     private static k: number;
+    // number of labels which are created by the current query (exported as metric)
+    private static numberOfCreatedLabels: number;
 
     // stores for each stop the latest departure time of the last round
     private static latestDepartureTimesOfLastRound: number[];
@@ -105,17 +113,27 @@ export class RaptorMeatAlgorithmController {
             // sets the source weekday
             this.sourceWeekday = Calculator.moduloSeven((this.sourceDate.getDay() - 1));
 
+            // returns the cached response if the same request was answered before
+            const cachedMeatResponse = ResponseCache.getMeatResponse('raptorMeat', this.sourceStop, this.targetStop, this.minDepartureTime, this.sourceDate, ALPHA);
+            if(cachedMeatResponse !== undefined){
+                res.status(200).send(cachedMeatResponse);
+                return;
+            }
+
             // initializes the raptor meat algorithm
+            let span = Metrics.startSpan();
             this.init(ALPHA);
-
-            console.time('raptor meat algorithm')
+            span = Metrics.endSpan('raptorMinimumExpectedArrivalTime', 'init', span);
             // calls the raptor meat algorithm
             this.performAlgorithm();
-            console.timeEnd('raptor meat algorithm')
+            span = Metrics.endSpan('raptorMinimumExpectedArrivalTime', 'rounds', span);
 
             // generates the http response which includes all information of the journey incl. its decision graphs
             const meatResponse = this.extractDecisionGraphs();
-            res.status(200).send(meatResponse);
+            span = Metrics.endSpan('raptorMinimumExpectedArrivalTime', 'decisionGraphExtraction', span);
+            Metrics.observeDecisionGraphSize('raptorMinimumExpectedArrivalTime', meatResponse.expandedDecisionGraph.links.length);
+            ResponseCache.setMeatResponse('raptorMeat', this.sourceStop, this.targetStop, this.minDepartureTime, this.sourceDate, ALPHA, meatResponse);
+            ResponseWriter.sendJson(res, meatResponse, () => Metrics.endSpan('raptorMinimumExpectedArrivalTime', 'serialization', span));
             this.clearArrays();
         } catch (err) {
             // console.log(err);
@@ -124,6 +142,56 @@ export class RaptorMeatAlgorithmController {
         }
     }
 
+    /**
+     * Answers the minimum expected arrival time problem for all departure times between sourceTime and latestSourceTime.
+     * The labels of the stops are profiles of departure times, so the range is answered by a single search whose
+     * maximum arrival time covers the alpha bounds of all departure times. Returns the pareto set of departure times and
+     * expected arrival times without decision graphs.
+     * @param req 
+     * @param res 
+     * @returns 
+     */
+    public static raptorMeatRangeAlgorithm(req: express.Request, res: express.Response) {
+        try {
+            // checks the parameters of the http request
+            if(!req.query || !req.query.sourceStop || !req.query.targetStop || !req.query.sourceTime || !req.query.latestSourceTime || !req.query.date ||
+                typeof req.query.sourceStop !== 'string' || typeof req.query.targetStop !== 'string' || typeof req.query.sourceTime !== 'string' ||
+                typeof req.query.latestSourceTime !== 'string' || typeof req.query.date !== 'string'){
+                res.status(400).send();
+                return;
+            }
+            // gets the source and target stops
+            this.sourceStop = GoogleTransitData.getStopIdByName(req.query.sourceStop);
+            this.targetStop = GoogleTransitData.getStopIdByName(req.query.targetStop);
+            // converts the source times
+            this.minDepartureTime = Converter.timeToSeconds(req.query.sourceTime);
+            const maxDepartureTime = Converter.timeToSeconds(req.query.latestSourceTime);
+            if(!(maxDepartureTime >= this.minDepartureTime) || maxDepartureTime - this.minDepartureTime > MAX_DEPARTURE_WINDOW){
+                res.status(400).send();
+                return;
+            }
+            // sets the source date
+            this.sourceDate = new Date(req.query.date);
+            // sets the source weekday
+            this.sourceWeekday = Calculator.moduloSeven((this.sourceDate.getDay() - 1));
+
+            // initializes the raptor meat algorithm with the bounds of the range
+            let span = Metrics.startSpan();
+            this.init(ALPHA, maxDepartureTime);
+            span = Metrics.endSpan('raptorMinimumExpectedArrivalTimeRange', 'init', span);
+            // calls the raptor meat algorithm once for all departure times
+            this.performAlgorithm('raptorMinimumExpectedArrivalTimeRange');
+            span = Metrics.endSpan('raptorMinimumExpectedArrivalTimeRange', 'rounds', span);
+
+            const meatRangeResponse = this.getMeatRangeResponse(maxDepartureTime);
+            ResponseWriter.sendJson(res, meatRangeResponse, () => Metrics.endSpan('raptorMinimumExpectedArrivalTimeRange', 'serialization', span));
+            this.clearArrays();
+        } catch (err) {
+            res.status(500).send(err);
+            this.clearArrays();
+        }
+    }
+
     /**
      * Tests the raptor meat algorithm.
      * @param sourceStop 
@@ -164,7 +232,7 @@ export class RaptorMeatAlgorithmController {
             const completeDuration = performance.now() - completeStartTime;
 
             let result = {
-                earliestArrivalTime: this.earliestArrivalTimes[this.targetStop],
+                earliestArrivalTime: this.earliestArrivalTimeCSA,
                 earliestSafeArrivalTime: this.earliestSafeArrivalTimeCSA,
                 expectedArrivalTime: this.expectedArrivalTimes[this.sourceStop][0].expectedArrivalTime, 
                 completeDuration: completeDuration,
@@ -226,10 +294,11 @@ export class RaptorMeatAlgorithmController {
     /**
      * Performs the raptor meat algorithm.
      * 
-     * @param targetStops 
+     * @param algorithm 
      */
-     private static performAlgorithm(){
+     private static performAlgorithm(algorithm: string = 'raptorMinimumExpectedArrivalTime'){
         this.k = 0;
+        this.numberOfCreatedLabels = 0;
         while(true){
             // increases round counter
             this.k++;
@@ -256,22 +325,40 @@ export class RaptorMeatAlgorithmController {
                 break;
             }
         }
+        // records the work of the algorithm
+        Metrics.increment(algorithm, 'rounds', this.k);
+        Metrics.increment(algorithm, 'labels_created', this.numberOfCreatedLabels);
     }
 
     /**
-     * Initializes the required arrays.
-     * @param sourceStops 
-     * @param sourceTime 
+     * Initializes the required arrays. The earliest safe arrival time of a range query is calculated for its latest
+     * departure time, so the maximum arrival time is larger than the one of each departure time of the range.
+     * @param alpha 
+     * @param latestDepartureTime 
      */
-    private static init(alpha: number){
-        this.earliestSafeArrivalTimeCSA = ConnectionScanAlgorithmController.getEarliestArrivalTime(this.sourceStop, this.targetStop, this.sourceDate, this.minDepartureTime, true, this.minDepartureTime + (NUMBER_OF_DAYS * SECONDS_OF_A_DAY));
-        if(this.earliestSafeArrivalTimeCSA === null) {
+    private static init(alpha: number, latestDepartureTime: number = this.minDepartureTime){
+        // the earliest safe arrival time is calculated by a scan and not by the bound table: the table only contains minimum
+        // travel times without waiting times, which are lower bounds, and the exact value defines the alpha bound and
+        // the esat of the response
+        // the earliest arrival time at the target is calculated by the same scan if the query has no range
+        const earliestArrivalTimesAtTarget = ConnectionScanAlgorithmController.getEarliestSafeAndUnsafeArrivalTime(this.sourceStop, this.targetStop, this.sourceDate, latestDepartureTime, latestDepartureTime + (NUMBER_OF_DAYS * SECONDS_OF_A_DAY));
+        if(earliestArrivalTimesAtTarget === null) {
             throw new Error("Couldn't find a connection.");
         }
+        this.earliestSafeArrivalTimeCSA = earliestArrivalTimesAtTarget.earliestSafeArrivalTime;
         // calculates the maximum arrival time
         let difference = alpha * (this.earliestSafeArrivalTimeCSA - this.minDepartureTime);
         this.maxArrivalTime = this.minDepartureTime + difference;
-        this.earliestArrivalTimes = ConnectionScanAlgorithmController.getEarliestArrivalTimes(this.sourceStop, this.sourceDate, this.minDepartureTime, this.maxArrivalTime);
+        // uses the lower bounds of the bound table to prune the search
+        this.earliestArrivalTimes = BoundTable.getEarliestArrivalTimes(this.sourceStop, this.minDepartureTime, this.maxArrivalTime);
+        if(this.earliestArrivalTimes === null){
+            this.earliestArrivalTimes = ConnectionScanAlgorithmController.getEarliestArrivalTimes(this.sourceStop, this.sourceDate, this.minDepartureTime, this.maxArrivalTime);
+        }
+        if(latestDepartureTime === this.minDepartureTime){
+            this.earliestArrivalTimeCSA = earliestArrivalTimesAtTarget.earliestArrivalTime;
+        } else {
+            this.earliestArrivalTimeCSA = ConnectionScanAlgorithmController.getEarliestArrivalTime(this.sourceStop, this.targetStop, this.sourceDate, this.minDepartureTime, false, this.maxArrivalTime);
+        }
         
         // creates the arrays
         const numberOfStops = GoogleTransitData.STOPS.length;
@@ -359,13 +446,13 @@ export class RaptorMeatAlgorithmController {
             for(let j = this.Q[i].stopSequence; j >= 0; j--){     
                 let pi = GoogleTransitData.STOPS_OF_A_ROUTE[r][j];
                 // updates the route bag with the departure times of this stop
-                routeBag = this.updateRouteBag(routeBag, pi);
+                routeBag = this.updateRouteBag(routeBag, pi, j);
                 // merges the routeBag in the current round bag of the stop
                 this.mergeBagInExpectedArrivalTimesOfRound(routeBag, pi);
                 
                 // adds the labels of the last round of this stop to the route bag
                 if(this.latestDepartureTimesOfLastRound[pi] !== undefined){
-                    routeBag = this.mergeLastRoundLabelsInRouteBag(r, pi, routeBag);
+                    routeBag = this.mergeLastRoundLabelsInRouteBag(r, pi, j, routeBag);
                 }
             }
         }
@@ -376,18 +463,19 @@ export class RaptorMeatAlgorithmController {
      * Calculates the new expected arrival times of these trips and adds them to the route bag.
      * @param r 
      * @param pi 
+     * @param position 
      * @param routeBag 
      * @returns 
      */
-    private static mergeLastRoundLabelsInRouteBag(r: number, pi: number, routeBag: Label[]){
+    private static mergeLastRoundLabelsInRouteBag(r: number, pi: number, position: number, routeBag: Label[]){
         // gets all trips between the minimum arrival time and the last departure of last round at this stop
-        let newTripInfos: EarliestTripInfo[] = this.getTripsOfInterval(r, pi, this.latestDepartureTimesOfLastRound[pi]);
+        let newTripInfos: EarliestTripInfo[] = this.getTripsOfInterval(r, pi, position, this.latestDepartureTimesOfLastRound[pi]);
         let newLabels: Label[] = []
         // creates a new label for each trip
         for(let newTripInfo of newTripInfos){
             let newExpectedArrivalTime: number = 0;
             // set the trip infos
-            let isLongDistanceTrip = GoogleTransitData.TRIPS[newTripInfo.tripId].isLongDistance;
+            let isLongDistanceTrip = GoogleTransitData.isLongDistanceTrip(newTripInfo.tripId);
             let currentTripArrivalTime = newTripInfo.tripArrival;
             let currentMaxDelay = MAX_D_C_NORMAL;
             if(isLongDistanceTrip){
@@ -426,6 +514,7 @@ export class RaptorMeatAlgorithmController {
             }
             if(newExpectedArrivalTime !== Number.MAX_VALUE){
                 // sets the values of the new label and adds it to the newLabels bag
+                this.numberOfCreatedLabels++;
                 let newLabel: Label = {
                     expectedArrivalTime: newExpectedArrivalTime,
                     departureTime: newTripInfo.departureTime,
@@ -513,16 +602,17 @@ export class RaptorMeatAlgorithmController {
      * Uses the stop times of the current stop to update the departure times of the current stop
      * @param routeBag 
      * @param pi 
+     * @param position 
      * @returns 
      */
-    private static updateRouteBag(routeBag: Label[], pi: number){
+    private static updateRouteBag(routeBag: Label[], pi: number, position: number){
         let newRouteBag: Label[] = [];
         // updates the departure time for each label of the route bag
         for(let label of routeBag){
             // gets the stop time of the trip at this stop
-            let stopTime = GoogleTransitData.getStopTimeByTripAndStop(label.associatedTrip.tripId, pi);
+            let stopTimeId = GoogleTransitData.getStopTimeIdByTripAndPosition(label.associatedTrip.tripId, position);
             // sets the new departure time
-            let departureTime = stopTime.departureTime + label.associatedTrip.dayOffset;
+            let departureTime = GoogleTransitData.getDepartureTimeOfStopTime(stopTimeId) + label.associatedTrip.dayOffset;
             if(departureTime > label.associatedTrip.tripArrival){
                 departureTime -= SECONDS_OF_A_DAY;
             }
@@ -531,6 +621,7 @@ export class RaptorMeatAlgorithmController {
                 continue;
             }
             // sets the values of the new label and adds it to the route bag
+            this.numberOfCreatedLabels++;
             let newLabel: Label = {
                 expectedArrivalTime: label.expectedArrivalTime,
                 departureTime: departureTime,
@@ -690,16 +781,18 @@ export class RaptorMeatAlgorithmController {
      * Gets all trips of the route between maximum departure and minimum arrival at this trip.
      * @param r 
      * @param pi 
-     * @param k 
+     * @param position 
+     * @param latestDeparture 
      * @returns 
      */
-    private static getTripsOfInterval(r: number, pi: number, latestDeparture: number): EarliestTripInfo[] {
+    private static getTripsOfInterval(r: number, pi: number, position: number, latestDeparture: number): EarliestTripInfo[] {
         let earliestTripInfos: EarliestTripInfo[] = [];
 
-        // all stop times of the route at this stop
-        let stopTimes: StopTime[] = GoogleTransitData.getStopTimesByStopAndRoute(pi, r);
+        // entries of the departure index of the route at this stop (sorted by departure time)
+        const firstEntry = GoogleTransitData.getFirstEntryOfDepartureIndex(r, position);
+        const lastEntry = firstEntry + GoogleTransitData.TRIPS_OF_A_ROUTE[r].length;
 
-        if(stopTimes.length === 0 || this.earliestArrivalTimes[pi] === Number.MAX_VALUE) {
+        if(firstEntry === lastEntry || this.earliestArrivalTimes[pi] === Number.MAX_VALUE) {
             return earliestTripInfos;
         }
 
@@ -709,36 +802,76 @@ export class RaptorMeatAlgorithmController {
 
         // sets the earliest possible arrival at this stop
         let earliestArrival = this.earliestArrivalTimes[pi];
-        // sets the offset of the last departure
-        let earliestDepartureDayOffset = Converter.getDayOffset(latestDeparture);
-        // sets the weekdays
-        let currentWeekday = Calculator.moduloSeven(this.sourceWeekday + Converter.getDayDifference(latestDeparture));
-        // loops over all stop times to find all trips of the interval
-        for(let i = Converter.getDayDifference(latestDeparture); i >= Converter.getDayDifference(earliestArrival)-1; i--) {
-            for(let j = stopTimes.length-1; j >= 0; j--) {
-                let stopTime = stopTimes[j];
-                let arrivalTime = stopTime.arrivalTime;
-                let departureTime = stopTime.departureTime;
+        // the arrival time of an entry is at most the maximum dwell time before its departure time
+        let maxDwellTime = GoogleTransitData.MAX_DWELL_TIMES_OF_A_ROUTE[r][position];
+        // sets the offset and the weekday of the first day
+        let firstDay = Converter.getDayDifference(earliestArrival)-1;
+        let earliestDepartureDayOffset = firstDay * SECONDS_OF_A_DAY;
+        let currentWeekday = Calculator.moduloSeven(this.sourceWeekday + firstDay);
+        // finds the trips of the interval for each day (the trip infos are sorted by departure time)
+        for(let i = firstDay; i <= Converter.getDayDifference(latestDeparture); i++) {
+            // first entry which can arrive after the earliest arrival
+            let entry = Searcher.binarySearchOfDepartureIndex(firstEntry, lastEntry, earliestArrival - earliestDepartureDayOffset);
+            let maxDepartureTime = latestDeparture - earliestDepartureDayOffset + maxDwellTime;
+            for(; entry < lastEntry && GoogleTransitData.DEPARTURE_INDEX_DEPARTURE_TIMES[entry] <= maxDepartureTime; entry++) {
+                let tripId = GoogleTransitData.DEPARTURE_INDEX_TRIPS[entry];
+                let arrivalTime = GoogleTransitData.DEPARTURE_INDEX_ARRIVAL_TIMES[entry];
+                let departureTime = GoogleTransitData.DEPARTURE_INDEX_DEPARTURE_TIMES[entry];
                 // checks if the trip is available and if it departs in the given interval
-                if(GoogleTransitData.isAvailable(currentWeekday, GoogleTransitData.TRIPS[stopTime.tripId].isAvailable) && (arrivalTime + earliestDepartureDayOffset) <= latestDeparture 
+                if(GoogleTransitData.isTripAvailable(tripId, currentWeekday) && (arrivalTime + earliestDepartureDayOffset) <= latestDeparture 
                     && (arrivalTime + earliestDepartureDayOffset) >= earliestArrival) {
                     // adds the new trip info
                     let earliestTripInfo: EarliestTripInfo = {
-                        tripId: stopTime.tripId,
+                        tripId: tripId,
                         tripArrival: arrivalTime + earliestDepartureDayOffset,
                         departureTime: departureTime + earliestDepartureDayOffset,
                         dayOffset: earliestDepartureDayOffset,
                     }
-                    earliestTripInfos.unshift(earliestTripInfo);
+                    earliestTripInfos.push(earliestTripInfo);
                 }
             }
-            // sets the new weekday
-            currentWeekday = Calculator.moduloSeven(currentWeekday - 1);
-            earliestDepartureDayOffset -= SECONDS_OF_A_DAY;
+            // sets the next weekday
+            currentWeekday = Calculator.moduloSeven(currentWeekday + 1);
+            earliestDepartureDayOffset += SECONDS_OF_A_DAY;
         }
         return earliestTripInfos;
     }
 
+    /**
+     * Gets the labels of the source stop which depart until the maximum departure time. The labels of a stop are sorted
+     * by departure time and each label has a smaller expected arrival time than all labels with a later departure time,
+     * so they are the pareto set of the range.
+     * @param maxDepartureTime 
+     * @returns 
+     */
+    private static getMeatRangeResponse(maxDepartureTime: number): MeatRangeResponse {
+        const meatRangeResponse: MeatRangeResponse = {
+            sourceStop: GoogleTransitData.STOPS[this.sourceStop].name,
+            targetStop: GoogleTransitData.STOPS[this.targetStop].name,
+            eatTime: Converter.secondsToTime(this.earliestArrivalTimeCSA),
+            results: [],
+        }
+        for(let label of this.expectedArrivalTimes[this.sourceStop]){
+            if(label.departureTime > maxDepartureTime || label.expectedArrivalTime === Number.MAX_VALUE){
+                break;
+            }
+            let departureDate = new Date(this.sourceDate);
+            departureDate.setDate(departureDate.getDate() + Converter.getDayDifference(label.departureTime));
+            let meatDate = new Date(this.sourceDate);
+            meatDate.setDate(meatDate.getDate() + Converter.getDayDifference(label.expectedArrivalTime));
+            meatRangeResponse.results.push({
+                departureTime: Converter.secondsToTime(label.departureTime),
+                departureDate: departureDate.toLocaleDateString('de-DE'),
+                meatTime: Converter.secondsToTime(label.expectedArrivalTime),
+                meatDate: meatDate.toLocaleDateString('de-DE'),
+            });
+        }
+        if(meatRangeResponse.results.length === 0){
+            throw new Error("Couldn't find a connection.");
+        }
+        return meatRangeResponse;
+    }
+
      /**
      * Extracts the decision graph.
      * @returns 
@@ -761,7 +894,7 @@ export class RaptorMeatAlgorithmController {
             departureDate: departureDate.toLocaleDateString('de-DE'),
             meatTime: Converter.secondsToTime(meatTime),
             meatDate: this.meatDate.toLocaleDateString('de-DE'),
-            eatTime: Converter.secondsToTime(this.earliestArrivalTimes[this.targetStop]),
+            eatTime: Converter.secondsToTime(this.earliestArrivalTimeCSA),
             esatTime: Converter.secondsToTime(this.earliestSafeArrivalTimeCSA),
             expandedDecisionGraph: {
                 nodes: [],
@@ -774,8 +907,7 @@ export class RaptorMeatAlgorithmController {
                 clusters: [],
             }
         }
-        let expandedTempEdges: TempEdge[] = [];
-        let arrivalTimesPerStop: Map<string, number[]> = new Map<string, number[]>();
+        const decisionGraphBuilder = new DecisionGraphBuilder();
         // priority queue sorted by the departure times
         let priorityQueue = new FastPriorityQueue<Label>((a, b) => {
             return a.departureTime < b.departureTime
@@ -792,25 +924,13 @@ export class RaptorMeatAlgorithmController {
             let p = priorityQueue.poll();
             let tripId = p.associatedTrip.tripId;
             // uses the information of the label to create an edge
-            let edge: TempEdge = {
-                departureStop: GoogleTransitData.STOPS[p.enterTripAtStop].name,
-                departureTime: p.departureTime,
-                arrivalStop: GoogleTransitData.STOPS[p.exitTripAtStop].name,
-                arrivalTime: p.associatedTrip.tripArrival,
-                type: 'Train',
-            }
-            expandedTempEdges.push(edge);
-            if(arrivalTimesPerStop.get(edge.arrivalStop) === undefined) {
-                arrivalTimesPerStop.set(edge.arrivalStop, [edge.arrivalTime]);
-            } else {
-                arrivalTimesPerStop.get(edge.arrivalStop).push(edge.arrivalTime);
-            }
+            decisionGraphBuilder.addEdge(p.enterTripAtStop, p.departureTime, p.exitTripAtStop, p.associatedTrip.tripArrival, 'Train');
             // checks if the current label reaches the target
             if(p.exitTripAtStop !== this.targetStop){
                 // sets max delay
                 let maxDelay: number;
                 let isLongDistanceTrip: boolean;
-                if(GoogleTransitData.TRIPS[tripId].isLongDistance){
+                if(GoogleTransitData.isLongDistanceTrip(tripId)){
                     maxDelay = MAX_D_C_LONG;
                     isLongDistanceTrip = true;
                 } else {
@@ -864,7 +984,7 @@ export class RaptorMeatAlgorithmController {
         // console.log(meat);
         // console.log(Converter.secondsToTime(meat));
         // gets the two graph representations
-        const decisionGraphs = DecisionGraphController.getDecisionGraphs(expandedTempEdges, arrivalTimesPerStop, this.sourceStop, this.targetStop);
+        const decisionGraphs = decisionGraphBuilder.build(this.targetStop);
         meatResponse.expandedDecisionGraph = decisionGraphs.expandedDecisionGraph;
         meatResponse.compactDecisionGraph = decisionGraphs.compactDecisionGraph;
         return meatResponse;
@@ -881,7 +1001,7 @@ export class RaptorMeatAlgorithmController {
         let probabilitySum = 0;
         for(let targetStopLabel of targetStopLabels){
             let expectedDelay: number;
-            if(GoogleTransitData.TRIPS[targetStopLabel.associatedTrip.tripId].isLongDistance){
+            if(GoogleTransitData.isLongDistanceTrip(targetStopLabel.associatedTrip.tripId)){
                 expectedDelay = Reliability.longDistanceExpectedValue;
             } else {
                 expectedDelay = Reliability.normalDistanceExpectedValue;
@@ -5,14 +5,16 @@ import { GoogleTransitData } from "../../data/google-transit-data";
 import { ConnectionScanAlgorithmController } from "./connectionScanAlgorithmController";
 import FastPriorityQueue from 'fastpriorityqueue';
 import { MeatResponse } from "../../models/MeatResponse";
-import { TempEdge } from "../../models/TempEdge";
 import { ALPHA, CHANGE_TIME, MAX_D_C_LONG, MAX_D_C_NORMAL, NUMBER_OF_DAYS, SECONDS_OF_A_DAY } from "../../constants";
+import { ResponseCache } from "../../data/response-cache";
 import { Reliability } from "../../data/reliability";
+import { DecisionGraphBuilder } from "../../data/decision-graph-builder";
+import { ResponseWriter } from "../../data/response-writer";
 import { RouteStopMapping } from "../../models/RouteStopMapping";
-import { StopTime } from "../../models/StopTime";
+import { Searcher } from "../../data/searcher";
 import { performance } from 'perf_hooks';
-import { DecisionGraphController } from "./decisionGraphController";
 import { cloneDeep } from "lodash";
+import { Metrics } from "../../data/metrics";
 
 // entries of the q array
 interface QEntry {
@@ -63,6 +65,8 @@ export class RaptorMeatTransferLimitationAlgorithmController {
 
     // transfer counter of raptor algorithm
     private static k: number;
+    // number of labels which are created by the current query (exported as metric)
+    private static numberOfCreatedLabels: number;
 
     // stores for each stop the latest departure time of the last round
     private static latestDepartureTimesOfLastRound: number[];
@@ -104,16 +108,27 @@ export class RaptorMeatTransferLimitationAlgorithmController {
 
             this.maxNumberOfRounds = 6;
 
+            // returns the cached response if the same request was answered before
+            const cachedMeatResponse = ResponseCache.getMeatResponse('raptorMeatTransferLimitation', this.sourceStop, this.targetStop, this.minDepartureTime, this.sourceDate, ALPHA);
+            if(cachedMeatResponse !== undefined){
+                res.status(200).send(cachedMeatResponse);
+                return;
+            }
+
             // initializes the raptor meat algorithm
+            let span = Metrics.startSpan();
             this.init(ALPHA);
-            console.time('raptor meat algorithm')
+            span = Metrics.endSpan('raptorMinimumExpectedArrivalTimeTransferLimitation', 'init', span);
             // calls the raptor meat algorithm
             this.performAlgorithm();
-            console.timeEnd('raptor meat algorithm')
+            span = Metrics.endSpan('raptorMinimumExpectedArrivalTimeTransferLimitation', 'rounds', span);
 
             // generates the http response which includes all information of the journey incl. its decision graphs
             const meatResponse = this.extractDecisionGraphs();
-            res.status(200).send(meatResponse);
+            span = Metrics.endSpan('raptorMinimumExpectedArrivalTimeTransferLimitation', 'decisionGraphExtraction', span);
+            Metrics.observeDecisionGraphSize('raptorMinimumExpectedArrivalTimeTransferLimitation', meatResponse.expandedDecisionGraph.links.length);
+            ResponseCache.setMeatResponse('raptorMeatTransferLimitation', this.sourceStop, this.targetStop, this.minDepartureTime, this.sourceDate, ALPHA, meatResponse);
+            ResponseWriter.sendJson(res, meatResponse, () => Metrics.endSpan('raptorMinimumExpectedArrivalTimeTransferLimitation', 'serialization', span));
             this.clearArrays();
         } catch (err) {
             console.log(err);
@@ -129,6 +144,7 @@ export class RaptorMeatTransferLimitationAlgorithmController {
      */
      private static performAlgorithm(){
         this.k = 0;
+        this.numberOfCreatedLabels = 0;
         while(true){
             // increases round counter
             this.k++;
@@ -152,6 +168,9 @@ export class RaptorMeatTransferLimitationAlgorithmController {
                 break;
             }
         }
+        // records the work of the algorithm
+        Metrics.increment('raptorMinimumExpectedArrivalTimeTransferLimitation', 'rounds', this.k);
+        Metrics.increment('raptorMinimumExpectedArrivalTimeTransferLimitation', 'labels_created', this.numberOfCreatedLabels);
     }
 
     /**
@@ -251,13 +270,13 @@ export class RaptorMeatTransferLimitationAlgorithmController {
             for(let j = this.Q[i].stopSequence; j >= 0; j--){     
                 let pi = GoogleTransitData.STOPS_OF_A_ROUTE[r][j];
                 // updates the route bag with the departure times of this stop
-                routeBag = this.updateRouteBag(routeBag, pi);
+                routeBag = this.updateRouteBag(routeBag, pi, j);
                 // merges the routeBag in the current round bag of the stop
                 this.mergeBagInExpectedArrivalTimesOfRound(routeBag, pi);
                 
                 // adds the labels of the last round of this stop to the route bag
                 if(this.latestDepartureTimesOfLastRound[pi] !== undefined){
-                    routeBag = this.mergeLastRoundLabelsInRouteBag(r, pi, routeBag);
+                    routeBag = this.mergeLastRoundLabelsInRouteBag(r, pi, j, routeBag);
                 }
             }
         }
@@ -268,18 +287,19 @@ export class RaptorMeatTransferLimitationAlgorithmController {
      * Calculates the new expected arrival times of these trips and adds them to the route bag.
      * @param r 
      * @param pi 
+     * @param position 
      * @param routeBag 
      * @returns 
      */
-    private static mergeLastRoundLabelsInRouteBag(r: number, pi: number, routeBag: Label[]){
+    private static mergeLastRoundLabelsInRouteBag(r: number, pi: number, position: number, routeBag: Label[]){
         // gets all trips between the minimum arrival time and the last departure of last round at this stop
-        let newTripInfos: EarliestTripInfo[] = this.getTripsOfInterval(r, pi, this.latestDepartureTimesOfLastRound[pi]);
+        let newTripInfos: EarliestTripInfo[] = this.getTripsOfInterval(r, pi, position, this.latestDepartureTimesOfLastRound[pi]);
         let newLabels: Label[] = []
         // creates a new label for each trip
         for(let newTripInfo of newTripInfos){
             let newExpectedArrivalTime: number = 0;
             // set the trip infos
-            let isLongDistanceTrip = GoogleTransitData.TRIPS[newTripInfo.tripId].isLongDistance;
+            let isLongDistanceTrip = GoogleTransitData.isLongDistanceTrip(newTripInfo.tripId);
             let currentTripArrivalTime = newTripInfo.tripArrival;
             let currentMaxDelay = MAX_D_C_NORMAL;
             if(isLongDistanceTrip){
@@ -316,6 +336,7 @@ export class RaptorMeatTransferLimitationAlgorithmController {
             
             if(newExpectedArrivalTime !== Number.MAX_VALUE){
                 // sets the values of the new label and adds it to the newLabels bag
+                this.numberOfCreatedLabels++;
                 let newLabel: Label = {
                     expectedArrivalTime: newExpectedArrivalTime,
                     departureTime: newTripInfo.departureTime,
@@ -402,16 +423,17 @@ export class RaptorMeatTransferLimitationAlgorithmController {
      * Uses the stop times of the current stop to update the departure times of the current stop
      * @param routeBag 
      * @param pi 
+     * @param position 
      * @returns 
      */
-    private static updateRouteBag(routeBag: Label[], pi: number){
+    private static updateRouteBag(routeBag: Label[], pi: number, position: number){
         let newRouteBag: Label[] = [];
         // updates the departure time for each label of the route bag
         for(let label of routeBag){
             // gets the stop time of the trip at this stop
-            let stopTime = GoogleTransitData.getStopTimeByTripAndStop(label.associatedTrip.tripId, pi);
+            let stopTimeId = GoogleTransitData.getStopTimeIdByTripAndPosition(label.associatedTrip.tripId, position);
             // sets the new departure time
-            let departureTime = stopTime.departureTime + label.associatedTrip.dayOffset;
+            let departureTime = GoogleTransitData.getDepartureTimeOfStopTime(stopTimeId) + label.associatedTrip.dayOffset;
             if(departureTime > label.associatedTrip.tripArrival){
                 departureTime -= SECONDS_OF_A_DAY;
             }
@@ -420,6 +442,7 @@ export class RaptorMeatTransferLimitationAlgorithmController {
                 continue;
             }
             // sets the values of the new label and adds it to the route bag
+            this.numberOfCreatedLabels++;
             let newLabel: Label = {
                 expectedArrivalTime: label.expectedArrivalTime,
                 departureTime: departureTime,
@@ -589,16 +612,18 @@ export class RaptorMeatTransferLimitationAlgorithmController {
      * Gets all trips of the route between maximum departure and minimum arrival at this trip.
      * @param r 
      * @param pi 
-     * @param k 
+     * @param position 
+     * @param latestDeparture 
      * @returns 
      */
-    private static getTripsOfInterval(r: number, pi: number, latestDeparture: number): EarliestTripInfo[] {
+    private static getTripsOfInterval(r: number, pi: number, position: number, latestDeparture: number): EarliestTripInfo[] {
         let earliestTripInfos: EarliestTripInfo[] = [];
 
-        // all stop times of the route at this stop
-        let stopTimes: StopTime[] = GoogleTransitData.getStopTimesByStopAndRoute(pi, r);
+        // entries of the departure index of the route at this stop (sorted by departure time)
+        const firstEntry = GoogleTransitData.getFirstEntryOfDepartureIndex(r, position);
+        const lastEntry = firstEntry + GoogleTransitData.TRIPS_OF_A_ROUTE[r].length;
 
-        if(stopTimes.length === 0 || this.earliestArrivalTimes[pi] === Number.MAX_VALUE) {
+        if(firstEntry === lastEntry || this.earliestArrivalTimes[pi] === Number.MAX_VALUE) {
             return earliestTripInfos;
         }
 
@@ -608,32 +633,37 @@ export class RaptorMeatTransferLimitationAlgorithmController {
 
         // sets the earliest possible arrival at this stop
         let earliestArrival = this.earliestArrivalTimes[pi];
-        // sets the offset of the last departure
-        let earliestDepartureDayOffset = Converter.getDayOffset(latestDeparture);
-        // sets the weekdays
-        let currentWeekday = Calculator.moduloSeven(this.sourceWeekday + Converter.getDayDifference(latestDeparture));
-        // loops over all stop times to find all trips of the interval
-        for(let i = Converter.getDayDifference(latestDeparture); i >= Converter.getDayDifference(earliestArrival)-1; i--) {
-            for(let j = stopTimes.length-1; j >= 0; j--) {
-                let stopTime = stopTimes[j];
-                let arrivalTime = stopTime.arrivalTime;
-                let departureTime = stopTime.departureTime;
+        // the arrival time of an entry is at most the maximum dwell time before its departure time
+        let maxDwellTime = GoogleTransitData.MAX_DWELL_TIMES_OF_A_ROUTE[r][position];
+        // sets the offset and the weekday of the first day
+        let firstDay = Converter.getDayDifference(earliestArrival)-1;
+        let earliestDepartureDayOffset = firstDay * SECONDS_OF_A_DAY;
+        let currentWeekday = Calculator.moduloSeven(this.sourceWeekday + firstDay);
+        // finds the trips of the interval for each day (the trip infos are sorted by departure time)
+        for(let i = firstDay; i <= Converter.getDayDifference(latestDeparture); i++) {
+            // first entry which can arrive after the earliest arrival
+            let entry = Searcher.binarySearchOfDepartureIndex(firstEntry, lastEntry, earliestArrival - earliestDepartureDayOffset);
+            let maxDepartureTime = latestDeparture - earliestDepartureDayOffset + maxDwellTime;
+            for(; entry < lastEntry && GoogleTransitData.DEPARTURE_INDEX_DEPARTURE_TIMES[entry] <= maxDepartureTime; entry++) {
+                let tripId = GoogleTransitData.DEPARTURE_INDEX_TRIPS[entry];
+                let arrivalTime = GoogleTransitData.DEPARTURE_INDEX_ARRIVAL_TIMES[entry];
+                let departureTime = GoogleTransitData.DEPARTURE_INDEX_DEPARTURE_TIMES[entry];
                 // checks if the trip is available and if it departs in the given interval
-                if(GoogleTransitData.isAvailable(currentWeekday, GoogleTransitData.TRIPS[stopTime.tripId].isAvailable) && (arrivalTime + earliestDepartureDayOffset) <= latestDeparture 
+                if(GoogleTransitData.isTripAvailable(tripId, currentWeekday) && (arrivalTime + earliestDepartureDayOffset) <= latestDeparture 
                     && (arrivalTime + earliestDepartureDayOffset) >= earliestArrival) {
                     // adds the new trip info
                     let earliestTripInfo: EarliestTripInfo = {
-                        tripId: stopTime.tripId,
+                        tripId: tripId,
                         tripArrival: arrivalTime + earliestDepartureDayOffset,
                         departureTime: departureTime + earliestDepartureDayOffset,
                         dayOffset: earliestDepartureDayOffset,
                     }
-                    earliestTripInfos.unshift(earliestTripInfo);
+                    earliestTripInfos.push(earliestTripInfo);
                 }
             }
-            // sets the new weekday
-            currentWeekday = Calculator.moduloSeven(currentWeekday - 1);
-            earliestDepartureDayOffset -= SECONDS_OF_A_DAY;
+            // sets the next weekday
+            currentWeekday = Calculator.moduloSeven(currentWeekday + 1);
+            earliestDepartureDayOffset += SECONDS_OF_A_DAY;
         }
         return earliestTripInfos;
     }
@@ -686,8 +716,7 @@ export class RaptorMeatTransferLimitationAlgorithmController {
                 clusters: [],
             }
         }
-        let expandedTempEdges: TempEdge[] = [];
-        let arrivalTimesPerStop: Map<string, number[]> = new Map<string, number[]>();
+        const decisionGraphBuilder = new DecisionGraphBuilder();
         // priority queue sorted by the departure times
         let priorityQueue = new FastPriorityQueue<Label>((a, b) => {
             return a.departureTime < b.departureTime
@@ -701,25 +730,13 @@ export class RaptorMeatTransferLimitationAlgorithmController {
             let p = priorityQueue.poll();
             let tripId = p.associatedTrip.tripId;
             // uses the information of the label to create an edge
-            let edge: TempEdge = {
-                departureStop: GoogleTransitData.STOPS[p.enterTripAtStop].name,
-                departureTime: p.departureTime,
-                arrivalStop: GoogleTransitData.STOPS[p.exitTripAtStop].name,
-                arrivalTime: p.associatedTrip.tripArrival,
-                type: 'Train',
-            }
-            expandedTempEdges.push(edge);
-            if(arrivalTimesPerStop.get(edge.arrivalStop) === undefined) {
-                arrivalTimesPerStop.set(edge.arrivalStop, [edge.arrivalTime]);
-            } else {
-                arrivalTimesPerStop.get(edge.arrivalStop).push(edge.arrivalTime);
-            }
+            decisionGraphBuilder.addEdge(p.enterTripAtStop, p.departureTime, p.exitTripAtStop, p.associatedTrip.tripArrival, 'Train');
             // checks if the current label reaches the target
             if(p.exitTripAtStop !== this.targetStop){
                 // sets max delay
                 let maxDelay: number;
                 let isLongDistanceTrip: boolean;
-                if(GoogleTransitData.TRIPS[tripId].isLongDistance){
+                if(GoogleTransitData.isLongDistanceTrip(tripId)){
                     maxDelay = MAX_D_C_LONG;
                     isLongDistanceTrip = true;
                 } else {
@@ -773,7 +790,7 @@ export class RaptorMeatTransferLimitationAlgorithmController {
         // console.log(meat);
         // console.log(Converter.secondsToTime(meat));
         // gets the two graph representations
-        const decisionGraphs = DecisionGraphController.getDecisionGraphs(expandedTempEdges, arrivalTimesPerStop, this.sourceStop, this.targetStop);
+        const decisionGraphs = decisionGraphBuilder.build(this.targetStop);
         meatResponse.expandedDecisionGraph = decisionGraphs.expandedDecisionGraph;
         meatResponse.compactDecisionGraph = decisionGraphs.compactDecisionGraph;
         return meatResponse;
@@ -790,7 +807,7 @@ export class RaptorMeatTransferLimitationAlgorithmController {
         let probabilitySum = 0;
         for(let targetStopLabel of targetStopLabels){
             let expectedDelay: number;
-            if(GoogleTransitData.TRIPS[targetStopLabel.associatedTrip.tripId].isLongDistance){
+            if(GoogleTransitData.isLongDistanceTrip(targetStopLabel.associatedTrip.tripId)){
                 expectedDelay = Reliability.longDistanceExpectedValue;
             } else {
                 expectedDelay = Reliability.normalDistanceExpectedValue;
@@ -1,26 +1,18 @@
 import express from 'express';
-import { GoogleTransitData } from '../../data/google-transit-data';
+import { StopNameIndex } from '../../data/stop-name-index';
 export class StopController {
     /**
-     * Returns a number of stop names which match a given string.
+     * Returns a number of stop names which match a given string (ranked by the quality of the match).
      * @param req 
      * @param res 
      */
     public static getMatchingStops(req: express.Request, res: express.Response){
         try {
             if(req.query && req.query.name && req.query.limit){
-                const limit: Number = Number(req.query.limit)
-                const searchName = req.query.name.toString().toLowerCase();
-                const matchingStopNames: string[] = [];
-                for(let stop of GoogleTransitData.STOPS){
-                    if(matchingStopNames.length - 1 >= limit) {
-                        break;
-                    }
-                    const stopName = stop.name.toLowerCase();
-                    if(stopName.includes(searchName) && !matchingStopNames.includes(stop.name)){
-                        matchingStopNames.push(stop.name);
-                    }
-                }
+                const limit = Number(req.query.limit);
+                // typo-tolerant matching is enabled by default
+                const fuzzy = req.query.fuzzy !== 'false';
+                const matchingStopNames = StopNameIndex.getMatchingNames(req.query.name.toString(), limit, fuzzy);
                 res.send(matchingStopNames);
             }
             else{
@@ -40,15 +32,7 @@ export class StopController {
     public static isValidStop(req: express.Request, res: express.Response){
         try {
             if(req.query && req.query.name){
-                let isValidStop = false;
-                const searchName = req.query.name.toString().toLowerCase();
-                for(let stop of GoogleTransitData.STOPS) {
-                    const stopName = stop.name.toLowerCase();
-                    if(stopName === searchName){
-                        isValidStop = true;
-                        break;
-                    }
-                }
+                const isValidStop = StopNameIndex.getStopId(req.query.name.toString()) !== null;
                 res.status(200).send(isValidStop);
             }
             else{
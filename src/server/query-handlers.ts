@@ -0,0 +1,21 @@
+import express from 'express';
+import { ConnectionScanAlgorithmController } from './controller/connectionScanAlgorithmController';
+import { ConnectionScanExpATAlgorithmController } from './controller/connectionScanExpATAlgorithmController';
+import { ConnectionScanMeatAlgorithmController } from './controller/connectionScanMeatAlgorithmController';
+import { RaptorAlgorithmController } from './controller/raptorAlgorithmController';
+import { RaptorMeatAlgorithmController } from './controller/raptorMeatAlgorithmController';
+import { RaptorMeatTransferLimitationAlgorithmController } from './controller/raptorMeatTransferLimitationController';
+import { RaptorMeatTransferOptimisationAlgorithmController } from './controller/raptorMeatTransferOptimisationAlgorithmController';
+
+// routing queries which can be answered by the query workers
+export const QUERY_HANDLERS: { [name: string]: (req: express.Request, res: express.Response) => void } = {
+    csaEarliestArrivalTime: (req, res) => ConnectionScanAlgorithmController.connectionScanAlgorithmRoute(req, res),
+    csaExpectedArrivalTime: (req, res) => ConnectionScanExpATAlgorithmController.connectionScanExpATAlgorithmRoute(req, res),
+    csaMinimumExpectedArrivalTime: (req, res) => ConnectionScanMeatAlgorithmController.connectionScanMeatAlgorithmRoute(req, res),
+    csaMinimumExpectedArrivalTimeBatch: (req, res) => ConnectionScanMeatAlgorithmController.connectionScanMeatBatchRoute(req, res),
+    raptorEarliestArrivalTime: (req, res) => RaptorAlgorithmController.raptorAlgorithm(req, res),
+    raptorMinimumExpectedArrivalTime: (req, res) => RaptorMeatAlgorithmController.raptorMeatAlgorithm(req, res),
+    raptorMinimumExpectedArrivalTimeRange: (req, res) => RaptorMeatAlgorithmController.raptorMeatRangeAlgorithm(req, res),
+    raptorMinimumExpectedArrivalTimeTransferOptimisation: (req, res) => RaptorMeatTransferOptimisationAlgorithmController.raptorMeatTransferOptimisationAlgorithm(req, res),
+    raptorMinimumExpectedArrivalTimeTransferLimitation: (req, res) => RaptorMeatTransferLimitationAlgorithmController.raptorMeatTransferLimitationAlgorithm(req, res),
+};
\ No newline at end of file
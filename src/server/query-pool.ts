@@ -0,0 +1,231 @@
+import express from 'express';
+import path from 'path';
+import { Worker } from 'worker_threads';
+import { MAX_QUEUED_QUERIES } from '../constants';
+import { QUERY_HANDLERS } from './query-handlers';
+import { Metrics } from '../data/metrics';
+import { ResponseWriter } from '../data/response-writer';
+import { ServiceWindow } from '../data/service-window';
+
+// query which waits for or is answered by a worker
+interface QueryTask {
+    handler: string,
+    query: any,
+    body: any,
+    res: express.Response,
+}
+
+// message of a worker after the query was answered
+interface QueryResult {
+    status: number,
+    body: any,
+    metrics?: any,
+}
+
+export class QueryPool {
+    // worker script (compiled to dist/query-worker.js)
+    private static readonly WORKER_FILE: string = path.join(__dirname, '../query-worker.js');
+    private static sharedSnapshot: SharedArrayBuffer;
+    // columns of the compact timetable (null if the compact timetable is disabled)
+    private static sharedCompactTimetable: SharedArrayBuffer;
+    private static sharedDelays: SharedArrayBuffer;
+    private static sharedBounds: SharedArrayBuffer;
+    private static workers = new Set<Worker>();
+    private static idleWorkers: Worker[] = [];
+    // workers which load the timetable of another service date window
+    private static reloadingWorkers = new Set<Worker>();
+    // resolves the reload of the workers
+    private static finishReload: () => void = null;
+    private static runningTasks = new Map<Worker, QueryTask>();
+    private static queue: QueryTask[] = [];
+    private static numberOfWorkers: number = 0;
+
+    /**
+     * Starts the workers. Each worker loads the timetable from the shared snapshot, uses the shared compact timetable,
+     * delays and bounds and answers one query at a time. Resolves if all workers are ready.
+     * @param numberOfWorkers 
+     * @param sharedSnapshot 
+     * @param sharedCompactTimetable 
+     * @param sharedDelays 
+     * @param sharedBounds 
+     * @returns 
+     */
+    public static init(numberOfWorkers: number, sharedSnapshot: SharedArrayBuffer, sharedCompactTimetable: SharedArrayBuffer, sharedDelays: SharedArrayBuffer, sharedBounds: SharedArrayBuffer): Promise<void> {
+        this.sharedSnapshot = sharedSnapshot;
+        this.sharedCompactTimetable = sharedCompactTimetable;
+        this.sharedDelays = sharedDelays;
+        this.sharedBounds = sharedBounds;
+        this.numberOfWorkers = numberOfWorkers;
+        const startedWorkers: Promise<void>[] = [];
+        for(let i = 0; i < numberOfWorkers; i++){
+            startedWorkers.push(this.startWorker());
+        }
+        return Promise.all(startedWorkers).then(() => {
+            console.log('started ' + numberOfWorkers + ' query workers');
+        });
+    }
+
+    /**
+     * Answers the query with a worker or, if no workers are started, in the main thread. Queries wait for a free
+     * worker and are rejected with 503 if too many queries are waiting.
+     * @param handler 
+     * @param req 
+     * @param res 
+     * @returns 
+     */
+    public static handleQuery(handler: string, req: express.Request, res: express.Response) {
+        // waits for the timetable of the service date window which contains the date of the query
+        const date = new Date((req.query && req.query.date || req.body && req.body.date) as string);
+        if(!ServiceWindow.containsDate(date)){
+            ServiceWindow.loadDate(date).then(() => this.handleQuery(handler, req, res)).catch((error) => {
+                console.log('service date window could not be loaded: ' + error.message);
+                res.status(500).send();
+            });
+            return;
+        }
+        if(this.numberOfWorkers === 0){
+            QUERY_HANDLERS[handler](req, res);
+            return;
+        }
+        if(this.queue.length >= MAX_QUEUED_QUERIES){
+            res.status(503).set('Retry-After', '1').send();
+            return;
+        }
+        this.queue.push({
+            handler: handler,
+            query: req.query,
+            body: req.body,
+            res: res,
+        });
+        this.dispatchQueries();
+    }
+
+    /**
+     * Passes the timetable of another service date window to the workers. Running queries are answered first, waiting
+     * queries are answered with the new timetable. A window usually contains the previous one, only waiting queries of
+     * dates outside of a replaced window load their window again. Resolves if all workers loaded the timetable.
+     * @param sharedSnapshot 
+     * @param sharedCompactTimetable 
+     * @param sharedDelays 
+     * @param sharedBounds 
+     * @returns 
+     */
+    public static reload(sharedSnapshot: SharedArrayBuffer, sharedCompactTimetable: SharedArrayBuffer, sharedDelays: SharedArrayBuffer, sharedBounds: SharedArrayBuffer): Promise<void> {
+        this.sharedSnapshot = sharedSnapshot;
+        this.sharedCompactTimetable = sharedCompactTimetable;
+        this.sharedDelays = sharedDelays;
+        this.sharedBounds = sharedBounds;
+        return new Promise<void>((resolve) => {
+            this.finishReload = resolve;
+            for(let worker of this.idleWorkers){
+                this.reloadWorker(worker);
+            }
+            this.idleWorkers = [];
+            const queue = this.queue;
+            this.queue = [];
+            for(let task of queue){
+                this.handleQuery(task.handler, { query: task.query, body: task.body } as express.Request, task.res);
+            }
+            this.checkReload();
+        });
+    }
+
+    /**
+     * Removes the cached responses of all workers. A worker answers its running query first.
+     */
+    public static invalidateResponseCaches() {
+        for(let worker of this.workers){
+            worker.postMessage({invalidateResponseCache: true});
+        }
+    }
+
+    /**
+     * Sends the shared memory of the current timetable to the worker.
+     * @param worker 
+     */
+    private static reloadWorker(worker: Worker) {
+        this.reloadingWorkers.add(worker);
+        worker.postMessage({sharedSnapshot: this.sharedSnapshot, sharedCompactTimetable: this.sharedCompactTimetable, sharedDelays: this.sharedDelays, sharedBounds: this.sharedBounds});
+    }
+
+    /**
+     * Resolves the reload if no worker answers a query of the previous window or loads the timetable.
+     */
+    private static checkReload() {
+        if(this.finishReload !== null && this.runningTasks.size === 0 && this.reloadingWorkers.size === 0){
+            const finishReload = this.finishReload;
+            this.finishReload = null;
+            finishReload();
+            this.dispatchQueries();
+        }
+    }
+
+    /**
+     * Sends waiting queries to the idle workers.
+     */
+    private static dispatchQueries() {
+        while(this.queue.length > 0 && this.idleWorkers.length > 0){
+            const worker = this.idleWorkers.pop();
+            const task = this.queue.shift();
+            this.runningTasks.set(worker, task);
+            worker.postMessage({handler: task.handler, query: task.query, body: task.body});
+        }
+    }
+
+    /**
+     * Starts a worker and resolves if it loaded the timetable. A crashed worker is replaced by a new one.
+     * @returns 
+     */
+    private static startWorker(): Promise<void> {
+        return new Promise<void>((resolve, reject) => {
+            let isReady = false;
+            const worker = new Worker(this.WORKER_FILE, { workerData: { sharedSnapshot: this.sharedSnapshot, sharedCompactTimetable: this.sharedCompactTimetable, sharedDelays: this.sharedDelays, sharedBounds: this.sharedBounds } });
+            this.workers.add(worker);
+            worker.on('message', (message: QueryResult) => {
+                if(!isReady){
+                    isReady = true;
+                    this.idleWorkers.push(worker);
+                    this.dispatchQueries();
+                    resolve();
+                    return;
+                }
+                // the worker loaded the timetable of another service date window
+                if(this.reloadingWorkers.delete(worker)){
+                    this.idleWorkers.push(worker);
+                    this.checkReload();
+                    return;
+                }
+                const task = this.runningTasks.get(worker);
+                this.runningTasks.delete(worker);
+                Metrics.merge(message.metrics);
+                ResponseWriter.sendJson(task.res.status(message.status), message.body);
+                if(this.finishReload !== null){
+                    this.reloadWorker(worker);
+                    return;
+                }
+                this.idleWorkers.push(worker);
+                this.dispatchQueries();
+            });
+            worker.on('error', (error) => {
+                console.log('query worker failed: ' + error.message);
+            });
+            worker.on('exit', () => {
+                this.workers.delete(worker);
+                if(!isReady){
+                    reject(new Error('query worker could not be started'));
+                    return;
+                }
+                // answers the running query and replaces the worker
+                const task = this.runningTasks.get(worker);
+                if(task !== undefined){
+                    this.runningTasks.delete(worker);
+                    task.res.status(500).send();
+                }
+                this.idleWorkers = this.idleWorkers.filter(idleWorker => idleWorker !== worker);
+                this.reloadingWorkers.delete(worker);
+                this.checkReload();
+                this.startWorker().catch((error) => console.log(error.message));
+            });
+        });
+    }
+}
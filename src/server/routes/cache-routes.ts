@@ -0,0 +1,10 @@
+import express from 'express';
+import { CacheController } from '../controller/cacheController';
+
+const router = express.Router();
+
+router.get('/statistics', (req, res) => {
+    CacheController.getStatistics(req, res);
+});
+
+export default router
\ No newline at end of file
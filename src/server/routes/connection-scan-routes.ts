@@ -1,18 +1,19 @@
 import express from 'express';
-import { ConnectionScanAlgorithmController } from '../controller/connectionScanAlgorithmController';
-import { ConnectionScanExpATAlgorithmController } from '../controller/connectionScanExpATAlgorithmController';
-import { ConnectionScanMeatAlgorithmController } from '../controller/connectionScanMeatAlgorithmController';
+import { QueryPool } from '../query-pool';
 
 
 const router = express.Router();
 router.get('/earliestArrivalTime', (req, res) => {
-    ConnectionScanAlgorithmController.connectionScanAlgorithmRoute(req, res);
+    QueryPool.handleQuery('csaEarliestArrivalTime', req, res);
 });
 router.get('/expectedArrivalTime', (req, res) => {
-    ConnectionScanExpATAlgorithmController.connectionScanExpATAlgorithmRoute(req, res);
+    QueryPool.handleQuery('csaExpectedArrivalTime', req, res);
 });
 router.get('/minimumExpectedArrivalTime', (req, res) => {
-    ConnectionScanMeatAlgorithmController.connectionScanMeatAlgorithmRoute(req, res);
+    QueryPool.handleQuery('csaMinimumExpectedArrivalTime', req, res);
+});
+router.post('/minimumExpectedArrivalTimes', express.json(), (req, res) => {
+    QueryPool.handleQuery('csaMinimumExpectedArrivalTimeBatch', req, res);
 });
 
 export default router
\ No newline at end of file
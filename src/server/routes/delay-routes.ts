@@ -0,0 +1,13 @@
+import express from 'express';
+import { DelayController } from '../controller/delayController';
+
+const router = express.Router();
+
+router.post('/', express.json({ limit: '50mb' }), (req, res) => {
+    DelayController.applyFeedMessage(req, res);
+});
+router.get('/statistics', (req, res) => {
+    DelayController.getStatistics(req, res);
+});
+
+export default router
\ No newline at end of file
@@ -2,11 +2,17 @@ import { Router } from 'express';
 import connectionScanRouter from './connection-scan-routes';
 import raptorRouter from './raptor-routes';
 import stopRouter from './stop-routes'
+import cacheRouter from './cache-routes';
+import metricsRouter from './metrics-routes';
+import delayRouter from './delay-routes';
 
 const routes = Router();
 
 routes.use('/stops', stopRouter);
 routes.use('/connectionScanAlgorithm', connectionScanRouter)
 routes.use('/raptorAlgorithm', raptorRouter)
+routes.use('/cache', cacheRouter)
+routes.use('/metrics', metricsRouter)
+routes.use('/delays', delayRouter)
 
 export default routes;
\ No newline at end of file
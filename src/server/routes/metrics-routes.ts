@@ -0,0 +1,10 @@
+import express from 'express';
+import { MetricsController } from '../controller/metricsController';
+
+const router = express.Router();
+
+router.get('/', (req, res) => {
+    MetricsController.getMetrics(req, res);
+});
+
+export default router
\ No newline at end of file
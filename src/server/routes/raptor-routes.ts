@@ -1,21 +1,21 @@
 import express from 'express';
-import { RaptorAlgorithmController } from '../controller/raptorAlgorithmController';
-import { RaptorMeatAlgorithmController } from '../controller/raptorMeatAlgorithmController';
-import { RaptorMeatTransferLimitationAlgorithmController } from '../controller/raptorMeatTransferLimitationController';
-import { RaptorMeatTransferOptimisationAlgorithmController } from '../controller/raptorMeatTransferOptimisationAlgorithmController';
+import { QueryPool } from '../query-pool';
 
 
 const router = express.Router();
 router.get('/earliestArrivalTime', (req, res) => {
-    RaptorAlgorithmController.raptorAlgorithm(req, res);
+    QueryPool.handleQuery('raptorEarliestArrivalTime', req, res);
 });
 router.get('/minimumExpectedArrivalTime', (req, res) => {
-    RaptorMeatAlgorithmController.raptorMeatAlgorithm(req, res);
+    QueryPool.handleQuery('raptorMinimumExpectedArrivalTime', req, res);
+});
+router.get('/minimumExpectedArrivalTimeRange', (req, res) => {
+    QueryPool.handleQuery('raptorMinimumExpectedArrivalTimeRange', req, res);
 });
 router.get('/minimumExpectedArrivalTimeTransferOptimisation', (req, res) => {
-    RaptorMeatTransferOptimisationAlgorithmController.raptorMeatTransferOptimisationAlgorithm(req, res);
+    QueryPool.handleQuery('raptorMinimumExpectedArrivalTimeTransferOptimisation', req, res);
 });
 router.get('/minimumExpectedArrivalTimeTransferLimitation', (req, res) => {
-    RaptorMeatTransferLimitationAlgorithmController.raptorMeatTransferLimitationAlgorithm(req, res);
+    QueryPool.handleQuery('raptorMinimumExpectedArrivalTimeTransferLimitation', req, res);
 });
 export default router
\ No newline at end of file
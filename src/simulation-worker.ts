@@ -0,0 +1,15 @@
+import { parentPort } from 'worker_threads';
+import { Reliability } from './data/reliability';
+import { MonteCarloSimulation } from './data/monte-carlo-simulation';
+
+// initializes the reliability values which are used to sample the delays
+Reliability.initReliability();
+
+// simulates the batches of the main thread
+parentPort.on('message', (message) => {
+  try {
+    parentPort.postMessage({ result: MonteCarloSimulation.simulateBatch(message.profile, message.seed, message.batchSize) });
+  } catch (err) {
+    parentPort.postMessage({ error: err.message });
+  }
+});
\ No newline at end of file
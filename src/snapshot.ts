@@ -0,0 +1,7 @@
+import { Preprocessor } from './data/preprocessor';
+import { Snapshot } from './data/snapshot';
+
+// preprocesses the gtfs files and writes the snapshot which is loaded at the start of the backend
+Preprocessor.preprocessGoogleTransitData().then(() => {
+    Snapshot.writeSnapshot();
+});
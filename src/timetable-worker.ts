@@ -0,0 +1,31 @@
+import { workerData } from 'worker_threads';
+import { Preprocessor } from './data/preprocessor';
+import { Snapshot } from './data/snapshot';
+import { BoundTable } from './data/bound-table';
+import { ServiceWindow } from './data/service-window';
+import { Generator } from './data/generator';
+import { COMPACT_TIMETABLE } from './constants';
+
+/**
+ * Writes the snapshot and the bound table of the service date window which are loaded by the main thread afterwards.
+ * The gtfs files are only preprocessed if no valid snapshot of the window exists.
+ * @param settings 
+ */
+async function createTimetable(settings: any) {
+  ServiceWindow.setSettings(settings);
+  if(!Snapshot.loadSnapshot()){
+    await Preprocessor.preprocessGoogleTransitData();
+    Snapshot.writeSnapshot();
+  }
+  // the bound table reads the typed arrays if the compact timetable is enabled
+  if(COMPACT_TIMETABLE){
+    Generator.generateCompactTimetable();
+  }
+  // loads or creates the lower bounds of the window
+  BoundTable.init();
+}
+
+createTimetable(workerData).catch((error) => {
+  console.log('timetable of the service date window could not be created: ' + error.message);
+  process.exit(1);
+});
\ No newline at end of file
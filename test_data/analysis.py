@@ -0,0 +1,636 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar analysis engine for the result files of the TestController.
+
+Each dmX_alphaYvZ.csv file is read once into typed numpy columns. Every metric
+of the evaluation is derived from a small set of per-request quantities which
+are aggregated (sum, count, max) as vectorized array operations.
+
+The files are aggregated by the workers of a process pool. Each worker returns
+the partial aggregate of one file and the partial aggregates are merged by the
+parent process. Durations are additionally stored in log-bucketed histograms,
+which give bounded-memory percentiles independent of the number of files.
+
+The ndjson files of the benchmark runner (npm run benchmark) use the same column
+names and are read into the same columns by loadBenchmarkFile.
+"""
+
+import csv
+import json
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# value of Number.MAX_VALUE which marks requests without a result
+INFINITY = 1.7976931348623157e+308
+# columns which identify a request
+REQUEST_COLUMNS = ['Source Stop', 'Target Stop', 'Source Time', 'Source Date']
+# columns which can't be converted to numbers
+TEXT_COLUMNS = ['Source Stop', 'Target Stop', 'Source Date']
+# columns of the benchmark records which can't be converted to numbers
+BENCHMARK_TEXT_COLUMNS = TEXT_COLUMNS + ['Distance Stratum', 'Time Stratum', 'Endpoint']
+# format version of the benchmark files which can be read
+BENCHMARK_SCHEMA_VERSION = 1
+# number of rounds of the transfer optimisation (Raptor MEAT TB columns)
+NUMBER_OF_TB_ROUNDS = 10
+
+# percentiles of the duration quantities
+PERCENTILES = [50, 90, 99, 99.9]
+# duration quantities which are stored in histograms and their labels in the report
+DURATION_QUANTITIES = [
+    ('raptorMeatComplete', 'raptor meat complete duration'),
+    ('raptorMeatInit', 'raptor meat init duration'),
+    ('raptorMeatAlgorithm', 'raptor meat algorithm duration'),
+    ('raptorMeatGraph', 'raptor meat graph duration'),
+    ('raptorMeatInitLoop', 'raptor meat init loop duration'),
+    ('raptorMeatTraverseRoutesLoop', 'raptor meat traverse routes loop duration'),
+    ('raptorMeatUpdateLoop', 'raptor meat update loop duration'),
+    ('raptorMeatTOComplete', 'raptor meat to complete duration'),
+    ('raptorMeatTOInit', 'raptor meat to init duration'),
+    ('raptorMeatTOAlgorithm', 'raptor meat to algorithm duration'),
+    ('raptorMeatTOGraph', 'raptor meat to graph duration'),
+    ('csaMeatComplete', 'csa meat complete duration'),
+    ('csaMeatInit', 'csa meat init duration'),
+    ('csaMeatAlgorithm', 'csa meat algorithm duration'),
+    ('csaMeatGraph', 'csa meat graph duration'),
+    ('csaExpAtComplete', 'csa expat complete duration'),
+    ('csaExpAtInit', 'csa expat init duration'),
+    ('csaExpAtAlgorithm', 'csa expat algorithm duration'),
+    ('csaExpAtGraph', 'csa expat graph duration'),
+]
+
+DM_VALUES = range(1, 3)
+ALPHA_VALUES = range(1, 4)
+NUMBER_OF_FILES = 20
+
+
+def resultFileName(dm, alpha, version, prefix=''):
+    """
+    Returns the name of a result file of the TestController.
+    """
+    return prefix + 'dm' + str(dm) + '_alpha' + str(alpha) + 'v' + str(version) + '.csv'
+
+
+def loadResultFile(path, columnNames=None):
+    """
+    Reads a result file and returns a dict which maps each column to a numpy array.
+    Text columns are stored as object arrays, all other columns as float64 arrays.
+    Only the given columns are converted if column names are passed.
+    """
+    with open(path, newline='') as csvFile:
+        csvReader = csv.reader(csvFile, delimiter=',')
+        header = next(csvReader)
+        rows = [row for row in csvReader if row]
+    columns = {}
+    values = list(zip(*rows)) if rows else [() for _ in header]
+    for name, column in zip(header, values):
+        if columnNames is not None and name not in columnNames:
+            continue
+        if name in TEXT_COLUMNS:
+            columns[name] = np.array(column, dtype=object)
+        else:
+            columns[name] = np.array(column, dtype=np.float64)
+    return columns
+
+
+def concatColumns(tables):
+    """
+    Concatenates the columns of several loaded result files.
+    """
+    if len(tables) == 0:
+        return {}
+    return {name: np.concatenate([table[name] for table in tables]) for name in tables[0]}
+
+
+def loadResults(dm, alpha, numberOfFiles=NUMBER_OF_FILES, prefix=''):
+    """
+    Loads and concatenates all result files of a (dm, alpha) combination.
+    """
+    return concatColumns([loadResultFile(resultFileName(dm, alpha, i, prefix)) for i in range(numberOfFiles)])
+
+
+def meatDurations(columns):
+    """
+    Returns the journey duration of the minimum expected arrival time of each request.
+    """
+    return columns['MEAT'] - columns['Source Time']
+
+
+def _where(mask, values):
+    # quantities which are undefined for a request are stored as nan
+    return np.where(mask, values, np.nan)
+
+
+def deriveQuantities(columns, referenceMeatDurations=None):
+    """
+    Calculates the per-request quantities of the evaluation as column operations.
+    The reference meat durations (alpha -> array) are used to compare the results of different alpha values.
+    Quantities which are undefined for a request contain nan.
+    """
+    sourceTime = columns['Source Time']
+    meatDuration = meatDurations(columns)
+    quantities = {
+        'eat': columns['EAT'] - sourceTime,
+        'esat': columns['ESAT'] - sourceTime,
+        'meat': meatDuration,
+        'raptorMeatComputedRounds': columns['Raptor MEAT Computed Rounds'],
+        'raptorMeatResultRound': columns['Raptor MEAT Rounds Of Result'],
+        'raptorMeatComplete': columns['Raptor MEAT Complete'],
+        'raptorMeatInit': columns['Raptor MEAT Init'],
+        'raptorMeatAlgorithm': columns['Raptor MEAT Algorithm'],
+        'raptorMeatGraph': columns['Raptor MEAT Decision Graph'],
+        'raptorMeatInitLoop': columns['Raptor MEAT Init Loop'],
+        'raptorMeatTraverseRoutesLoop': columns['Raptor MEAT Traverse Routes Loop'],
+        'raptorMeatUpdateLoop': columns['Raptor MEAT Update Loop'],
+        'raptorMeatTOComplete': columns['Raptor MEAT TO Complete'],
+        'raptorMeatTOInit': columns['Raptor MEAT TO Init'],
+        'raptorMeatTOAlgorithm': columns['Raptor MEAT TO Algorithm'],
+        'raptorMeatTOGraph': columns['Raptor MEAT TO Decision Graph'],
+        'csaMeatComplete': columns['CSA MEAT Complete'],
+        'csaMeatInit': columns['CSA MEAT Init'],
+        'csaMeatAlgorithm': columns['CSA MEAT Algorithm'],
+        'csaMeatGraph': columns['CSA MEAT Decision Graph'],
+        'csaExpAtComplete': columns['CSA ExpAT Complete'],
+        'csaExpAtInit': columns['CSA ExpAT Init'],
+        'csaExpAtAlgorithm': columns['CSA ExpAT Algorithm'],
+        'raptorMeatStops': columns['Raptor MEAT Stops in Graph'],
+        'raptorMeatLegs': columns['Raptor MEAT Legs in Graph'],
+        'raptorMeatEdges': columns['Raptor MEAT Edges in Graph'],
+        'raptorMeatTOStops': columns['Raptor MEAT TO Stops in Graph'],
+        'raptorMeatTOLegs': columns['Raptor MEAT TO Legs in Graph'],
+        'raptorMeatTOEdges': columns['Raptor MEAT TO Edges in Graph'],
+    }
+
+    # csa expat results (only requests with a result)
+    successfulCsaExpAt = columns['CSA ExpAT'] != INFINITY
+    expATMeatAbsDiff = (columns['CSA ExpAT'] - sourceTime) - meatDuration
+    quantities['csaExpAtGraph'] = _where(successfulCsaExpAt, columns['CSA ExpAT Decision Graph'])
+    quantities['expATMeatAbsDiff'] = _where(successfulCsaExpAt, expATMeatAbsDiff)
+    quantities['expATMeatRelDiff'] = _where(successfulCsaExpAt, expATMeatAbsDiff/meatDuration)
+    quantities['meatForExpATResults'] = _where(successfulCsaExpAt, meatDuration)
+
+    # differences to the results of smaller alpha values
+    for alpha, referenceMeatDuration in (referenceMeatDurations or {}).items():
+        absDiff = referenceMeatDuration - meatDuration
+        quantities['alpha' + str(alpha) + 'AbsDiff'] = absDiff
+        quantities['alpha' + str(alpha) + 'RelDiff'] = absDiff/referenceMeatDuration
+        quantities['alpha' + str(alpha) + 'Meat'] = referenceMeatDuration
+
+    # known delay results
+    csaKnownDelayDuration = columns['CSA AT Known Delay'] - sourceTime
+    raptorKnownDelayDuration = columns['Raptor MEAT AT Known Delay'] - sourceTime
+    knownDelayAbsDiff = raptorKnownDelayDuration - csaKnownDelayDuration
+    quantities['csaKnownDelay'] = csaKnownDelayDuration
+    quantities['knownDelayAbsDiff'] = knownDelayAbsDiff
+    quantities['knownDelayRelDiff'] = knownDelayAbsDiff/csaKnownDelayDuration
+    quantities['knownDelaySameResult'] = (csaKnownDelayDuration == raptorKnownDelayDuration).astype(np.float64)
+
+    # raptor meat vs. raptor meat transfer optimisation
+    resultRound = columns['Raptor MEAT Rounds Of Result']
+    raptorMeatTOAbsTimeDiff = (columns['Raptor MEAT TO ExpAT'] - sourceTime) - meatDuration
+    raptorMeatTOAbsTransfersDiff = resultRound - columns['Raptor MEAT TO Rounds Of Result']
+    quantities['raptorMeatTOAbsTimeDiff'] = raptorMeatTOAbsTimeDiff
+    quantities['raptorMeatTOAbsTransfersDiff'] = raptorMeatTOAbsTransfersDiff
+    quantities['raptorMeatTORelTimeDiff'] = raptorMeatTOAbsTimeDiff/meatDuration
+    with np.errstate(divide='ignore', invalid='ignore'):
+        quantities['raptorMeatTORelTransfersDiff'] = _where(resultRound > 1, raptorMeatTOAbsTransfersDiff/(resultRound - 1))
+
+    # rounds of the transfer optimisation
+    for j in range(1, NUMBER_OF_TB_ROUNDS + 1):
+        tbDuration = columns['Raptor MEAT TB Algorithm ' + str(j)]
+        tbExpAT = columns['Raptor MEAT TB ExpAT ' + str(j)]
+        computedRound = tbDuration != 0
+        hasResult = computedRound & (tbExpAT != 0)
+        tbExpATDiff = (tbExpAT - sourceTime) - meatDuration
+        quantities['raptorTBAbsDuration' + str(j)] = _where(computedRound, tbDuration)
+        quantities['raptorTBRelDuration' + str(j)] = _where(computedRound, tbDuration/columns['Raptor MEAT Algorithm'])
+        quantities['raptorTBAbsExpATDiff' + str(j)] = _where(hasResult, tbExpATDiff)
+        quantities['raptorTBRelExpATDiff' + str(j)] = _where(hasResult, tbExpATDiff/meatDuration)
+    return quantities
+
+
+class LogHistogram:
+    """
+    Mergeable quantile sketch with logarithmic buckets. Bucket i contains the values in (gamma^(i-1), gamma^i], so every
+    percentile has a relative error of at most the relative accuracy. The number of buckets is bounded by collapsing the
+    lowest buckets.
+    """
+
+    def __init__(self, relativeAccuracy=0.01, maxBuckets=2048):
+        self.gamma = (1 + relativeAccuracy)/(1 - relativeAccuracy)
+        self.logGamma = math.log(self.gamma)
+        self.maxBuckets = maxBuckets
+        self.buckets = {}
+        self.zeroCount = 0
+        self.count = 0
+
+    def add(self, values):
+        """
+        Adds all finite values of an array. Values which are not positive are counted in the zero bucket.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        positive = values[values > 0]
+        self.zeroCount += int(values.size - positive.size)
+        self.count += int(values.size)
+        if positive.size > 0:
+            indices, counts = np.unique(np.ceil(np.log(positive)/self.logGamma).astype(np.int64), return_counts=True)
+            for index, count in zip(indices.tolist(), counts.tolist()):
+                self.buckets[index] = self.buckets.get(index, 0) + count
+            self._collapse()
+
+    def merge(self, other):
+        """
+        Adds the buckets of another histogram with the same relative accuracy.
+        """
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zeroCount += other.zeroCount
+        self.count += other.count
+        self._collapse()
+        return self
+
+    def _collapse(self):
+        # merges the lowest buckets if there are too many buckets
+        if len(self.buckets) <= self.maxBuckets:
+            return
+        indices = sorted(self.buckets)
+        numberOfCollapsedBuckets = len(indices) - self.maxBuckets + 1
+        target = indices[numberOfCollapsedBuckets - 1]
+        for index in indices[:numberOfCollapsedBuckets - 1]:
+            self.buckets[target] += self.buckets.pop(index)
+
+    def bucketValue(self, index):
+        """
+        Returns the representative value of a bucket (relative error of the bucket bounds is minimal).
+        """
+        return 2 * self.gamma**index/(self.gamma + 1)
+
+    def quantile(self, q):
+        """
+        Returns the approximated q-quantile (0 <= q <= 1) of the added values.
+        """
+        if self.count == 0:
+            return float('nan')
+        rank = q * (self.count - 1)
+        cumulativeCount = self.zeroCount
+        if rank < cumulativeCount:
+            return 0.0
+        for index in sorted(self.buckets):
+            cumulativeCount += self.buckets[index]
+            if rank < cumulativeCount:
+                return self.bucketValue(index)
+        return self.bucketValue(max(self.buckets))
+
+    def percentiles(self, percentiles=PERCENTILES):
+        return [self.quantile(percentile/100) for percentile in percentiles]
+
+    def histogram(self, bucketsPerDecade=5):
+        """
+        Returns the histogram with logarithmic bins of width 10^(1/bucketsPerDecade) as (lower bound, upper bound, count)
+        tuples. Empty bins between the lowest and the highest value are returned with count 0, so the bins are
+        contiguous. Values which are not positive are returned in the bin (0, 0).
+        """
+        bins = {}
+        for index, count in self.buckets.items():
+            binIndex = math.floor(math.log10(self.bucketValue(index)) * bucketsPerDecade)
+            bins[binIndex] = bins.get(binIndex, 0) + count
+        histogram = [(0.0, 0.0, self.zeroCount)] if self.zeroCount > 0 else []
+        if bins:
+            for binIndex in range(min(bins), max(bins) + 1):
+                histogram.append((10**(binIndex/bucketsPerDecade), 10**((binIndex + 1)/bucketsPerDecade), bins.get(binIndex, 0)))
+        return histogram
+
+
+class Aggregate:
+    """
+    Sums, counts and maxima of the quantities of a set of requests and histograms of the durations.
+    Counts only include requests for which the quantity is defined, maxima are at least 0.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.sums = {}
+        self.counts = {}
+        self.maxima = {}
+        self.histograms = {}
+
+    @classmethod
+    def fromQuantities(cls, quantities, rows, histogramQuantities=()):
+        aggregate = cls()
+        aggregate.rows = rows
+        for name, values in quantities.items():
+            defined = values[~np.isnan(values)]
+            aggregate.sums[name] = float(np.sum(defined))
+            aggregate.counts[name] = int(defined.size)
+            aggregate.maxima[name] = max(0.0, float(np.max(defined))) if defined.size > 0 else 0.0
+            if name in histogramQuantities:
+                aggregate.histograms[name] = LogHistogram()
+                aggregate.histograms[name].add(defined)
+        return aggregate
+
+    def merge(self, other):
+        """
+        Adds the values of another aggregate. The merged aggregate is equal to the aggregate of all requests of both.
+        """
+        self.rows += other.rows
+        for name, value in other.sums.items():
+            self.sums[name] = self.sums.get(name, 0.0) + value
+            self.counts[name] = self.counts.get(name, 0) + other.counts[name]
+            self.maxima[name] = max(self.maxima.get(name, 0.0), other.maxima[name])
+        for name, histogram in other.histograms.items():
+            if name in self.histograms:
+                self.histograms[name].merge(histogram)
+            else:
+                self.histograms[name] = histogram
+        return self
+
+    def sum(self, name):
+        return self.sums[name]
+
+    def count(self, name):
+        return self.counts[name]
+
+    def max(self, name):
+        return self.maxima[name]
+
+    def average(self, name):
+        """
+        Returns the average of a quantity over all requests for which it is defined.
+        """
+        return divide(self.sums[name], self.counts[name])
+
+
+def divide(numerator, denominator):
+    """
+    Division which returns nan instead of raising an error for empty groups.
+    """
+    if denominator == 0:
+        return float('nan')
+    return numerator/denominator
+
+
+def aggregateResults(columns, referenceMeatDurations=None):
+    """
+    Aggregates the loaded columns of a set of result files.
+    """
+    quantities = deriveQuantities(columns, referenceMeatDurations)
+    histogramQuantities = [name for name, _ in DURATION_QUANTITIES]
+    return Aggregate.fromQuantities(quantities, len(columns['Source Time']), histogramQuantities)
+
+
+def computeMetrics(aggregate, alpha):
+    """
+    Calculates the metrics of the evaluation report from an aggregate of a (dm, alpha) combination.
+    """
+    resultcounter = aggregate.rows
+    average = lambda name: divide(aggregate.sum(name), resultcounter)
+    metrics = {
+        'resultcounter': resultcounter,
+        'averageEat': average('eat'),
+        'averageEsat': average('esat'),
+        'averageMeat': average('meat'),
+        'averageRaptorMeatComputedRounds': average('raptorMeatComputedRounds'),
+        'averageRaptorMeatResultRound': average('raptorMeatResultRound'),
+        'averageRaptorMeatInitLoopDuration': average('raptorMeatInitLoop'),
+        'averageRaptorMeatTraverseRoutesLoopDuration': average('raptorMeatTraverseRoutesLoop'),
+        'averageRaptorMeatUpdateLoopDuration': average('raptorMeatUpdateLoop'),
+    }
+    metrics['maxRaptorMeatComputedRounds'] = aggregate.max('raptorMeatComputedRounds')
+    metrics['maxRaptorMeatResultRound'] = aggregate.max('raptorMeatResultRound')
+    for phase in ['Complete', 'Init', 'Algorithm', 'Graph']:
+        for algorithm, key in [('raptorMeat', 'RaptorMeat'), ('csaMeat', 'CSAMeat'), ('csaExpAt', 'CSAEat')]:
+            metrics['average' + key + phase + 'Duration'] = aggregate.average(algorithm + phase)
+            metrics['max' + key + phase + 'Duration'] = aggregate.max(algorithm + phase)
+
+    for referenceAlpha in range(1, alpha):
+        name = 'alpha' + str(referenceAlpha)
+        key = 'Alpha' + str(referenceAlpha)
+        metrics['average' + key + 'AbsDiff'] = average(name + 'AbsDiff')
+        metrics['max' + key + 'AbsDiff'] = aggregate.max(name + 'AbsDiff')
+        metrics['average' + key + 'RelDiff'] = divide(aggregate.sum(name + 'AbsDiff'), aggregate.sum(name + 'Meat'))
+        metrics['max' + key + 'RelDiff'] = aggregate.max(name + 'RelDiff')
+
+    successfulCsaExpAtCounter = aggregate.count('expATMeatAbsDiff')
+    metrics['averageExpATMeatAbsDiff'] = aggregate.average('expATMeatAbsDiff')
+    metrics['maxExpATMeatAbsDiff'] = aggregate.max('expATMeatAbsDiff')
+    metrics['averageExpATMeatRelDiff'] = divide(aggregate.sum('expATMeatAbsDiff'), aggregate.sum('meatForExpATResults'))
+    metrics['maxExpATMeatRelDiff'] = aggregate.max('expATMeatRelDiff')
+    metrics['unsuccessfulCsaExpAt'] = resultcounter - successfulCsaExpAtCounter
+    metrics['relativeUnsuccessfulCsaExpAt'] = divide(resultcounter - successfulCsaExpAtCounter, resultcounter)
+
+    knownDelaySameResultCounter = int(aggregate.sum('knownDelaySameResult'))
+    metrics['averageKnownDelayAbsDiff'] = average('knownDelayAbsDiff')
+    metrics['maxKnownDelayAbsDiff'] = aggregate.max('knownDelayAbsDiff')
+    metrics['averageKnownDelayRelDiff'] = divide(aggregate.sum('knownDelayAbsDiff'), aggregate.sum('csaKnownDelay'))
+    metrics['maxKnownDelayRelDiff'] = aggregate.max('knownDelayRelDiff')
+    metrics['knownDelaySameResultCounter'] = knownDelaySameResultCounter
+    metrics['relativeSameResultKnownDelay'] = divide(knownDelaySameResultCounter, resultcounter)
+
+    for name in ['Stops', 'Legs', 'Edges']:
+        for algorithm, key in [('raptorMeat', 'RaptorMeat'), ('raptorMeatTO', 'RaptorMeatTO')]:
+            metrics['average' + key + name] = average(algorithm + name)
+            metrics['max' + key + name] = aggregate.max(algorithm + name)
+
+    metrics['averageRaptorMeatTOAbsTimeDiff'] = average('raptorMeatTOAbsTimeDiff')
+    metrics['maxRaptorMeatTOAbsTimeDiff'] = aggregate.max('raptorMeatTOAbsTimeDiff')
+    metrics['averageRaptorMeatTOAbsTransfersDiff'] = average('raptorMeatTOAbsTransfersDiff')
+    metrics['maxRaptorMeatTOAbsTransfersDiff'] = aggregate.max('raptorMeatTOAbsTransfersDiff')
+    metrics['averageRaptorMeatTORelTimeDiff'] = divide(aggregate.sum('raptorMeatTOAbsTimeDiff'), aggregate.sum('meat'))
+    metrics['maxRaptorMeatTORelTimeDiff'] = aggregate.max('raptorMeatTORelTimeDiff')
+    metrics['averageRaptorMeatTORelTransfersDiff'] = divide(aggregate.sum('raptorMeatTOAbsTransfersDiff'), aggregate.sum('raptorMeatResultRound') - resultcounter)
+    metrics['maxRaptorMeatTORelTransfersDiff'] = aggregate.max('raptorMeatTORelTransfersDiff')
+
+    rounds = range(1, NUMBER_OF_TB_ROUNDS + 1)
+    metrics['raptorTBComputedRoundCounter'] = [aggregate.count('raptorTBAbsDuration' + str(j)) for j in rounds]
+    metrics['raptorTBResultCounter'] = [aggregate.count('raptorTBAbsExpATDiff' + str(j)) for j in rounds]
+    for quantity, key in [('AbsDuration', 'AbsDuration'), ('RelDuration', 'RelDuration'),
+                          ('AbsExpATDiff', 'AbsExpATDiffs'), ('RelExpATDiff', 'RelExpATDiffs')]:
+        metrics['averageRaptorTB' + key] = [aggregate.average('raptorTB' + quantity + str(j)) for j in rounds]
+        metrics['maxRaptorTB' + key] = [aggregate.max('raptorTB' + quantity + str(j)) for j in rounds]
+    metrics['relativeNumberOfRaptorTBResults'] = [divide(results, computed) for results, computed in
+                                                  zip(metrics['raptorTBResultCounter'], metrics['raptorTBComputedRoundCounter'])]
+
+    metrics['durationHistograms'] = aggregate.histograms
+    metrics['durationPercentiles'] = {name: histogram.percentiles() for name, histogram in aggregate.histograms.items()}
+    return metrics
+
+
+def aggregateResultFile(dm, alpha, version, prefix='', referenceAlphas=()):
+    """
+    Returns the partial aggregate of a single result file. The result files of the reference alpha values with the same
+    version contain the same requests and are used for the alpha differences.
+    """
+    columns = loadResultFile(resultFileName(dm, alpha, version, prefix))
+    referenceMeatDurations = {}
+    for referenceAlpha in referenceAlphas:
+        referenceColumns = loadResultFile(resultFileName(dm, referenceAlpha, version, prefix), ['Source Time', 'MEAT'])
+        referenceMeatDurations[referenceAlpha] = meatDurations(referenceColumns)
+    return aggregateResults(columns, referenceMeatDurations)
+
+
+def aggregateApproxFile(dm, alpha, version, prefix='approx_'):
+    """
+    Returns the partial aggregate of a single result file of the approximation tests.
+    """
+    columns = loadResultFile(resultFileName(dm, alpha, version, prefix), ['Source Time', 'MEAT', 'Approximated MEAT'])
+    quantities = {
+        'meat': meatDurations(columns),
+        'approxMeatAbsDiff': np.abs(columns['MEAT'] - columns['Approximated MEAT']),
+    }
+    return Aggregate.fromQuantities(quantities, len(columns['Source Time']))
+
+
+def aggregateFiles(worker, tasks, processes=None):
+    """
+    Calls the worker for each task (group key, worker arguments) in a process pool and merges the partial aggregates of
+    each group. Uses the current process if processes is 1.
+    """
+    keys = [key for key, _ in tasks]
+    arguments = [args for _, args in tasks]
+    aggregates = {}
+    executor = None
+    if processes == 1:
+        partialAggregates = (worker(*args) for args in arguments)
+    else:
+        executor = ProcessPoolExecutor(max_workers=processes)
+        partialAggregates = executor.map(worker, *zip(*arguments))
+    try:
+        # merges the partial aggregates as soon as they are available
+        for key, partialAggregate in zip(keys, partialAggregates):
+            if key in aggregates:
+                aggregates[key].merge(partialAggregate)
+            else:
+                aggregates[key] = partialAggregate
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return aggregates
+
+
+def analyseResults(numberOfFiles=NUMBER_OF_FILES, prefix='', dmValues=DM_VALUES, alphaValues=ALPHA_VALUES, processes=None):
+    """
+    Aggregates the result files in parallel and returns the metrics of each (dm, alpha) combination.
+    The meat durations of smaller alpha values are used as reference for the alpha differences.
+    """
+    tasks = []
+    for dm in dmValues:
+        for alpha in alphaValues:
+            referenceAlphas = tuple(referenceAlpha for referenceAlpha in alphaValues if referenceAlpha < alpha)
+            for i in range(numberOfFiles):
+                tasks.append(((dm, alpha), (dm, alpha, i, prefix, referenceAlphas)))
+    aggregates = aggregateFiles(aggregateResultFile, tasks, processes)
+    return {key: computeMetrics(aggregate, key[1]) for key, aggregate in aggregates.items()}
+
+
+def analyseApproxResults(numberOfFiles=NUMBER_OF_FILES, prefix='approx_', dmValues=DM_VALUES, alphaValues=ALPHA_VALUES, processes=None):
+    """
+    Aggregates the result files of the approximation tests in parallel and returns the metrics of each (dm, alpha) combination.
+    """
+    tasks = [((dm, alpha), (dm, alpha, i, prefix)) for dm in dmValues for alpha in alphaValues for i in range(numberOfFiles)]
+    aggregates = aggregateFiles(aggregateApproxFile, tasks, processes)
+    metrics = {}
+    for key, aggregate in aggregates.items():
+        metrics[key] = {
+            'resultCounter': aggregate.rows,
+            'averageApproxMeatAbsDiff': divide(aggregate.sum('approxMeatAbsDiff'), aggregate.rows),
+            'averageApproxMeatRelDiff': divide(aggregate.sum('approxMeatAbsDiff'), aggregate.sum('meat')),
+        }
+    return metrics
+
+
+class _BenchmarkColumns(dict):
+    """
+    Columns of a benchmark file. Columns of algorithms which were not benchmarked contain nan.
+    """
+
+    def __init__(self, columns, numberOfRows):
+        super().__init__(columns)
+        self.numberOfRows = numberOfRows
+
+    def __missing__(self, name):
+        return np.full(self.numberOfRows, np.nan)
+
+
+def loadBenchmarkFile(path, columnNames=None):
+    """
+    Reads a result file of the benchmark runner and returns its metadata and a dict which maps each column to a numpy
+    array (like loadResultFile). Values without result (null) are stored as nan, columns of algorithms which were not
+    benchmarked contain nan.
+    """
+    with open(path, encoding='utf-8') as file:
+        metadata = json.loads(file.readline())['metadata']
+        records = [json.loads(line) for line in file if line.strip()]
+    if metadata['schemaVersion'] != BENCHMARK_SCHEMA_VERSION:
+        raise ValueError(path + ' has schema version ' + str(metadata['schemaVersion']))
+    names = []
+    for record in records[:1]:
+        names = [name for name in record if columnNames is None or name in columnNames]
+    columns = {}
+    for name in names:
+        values = [record.get(name) for record in records]
+        if name in BENCHMARK_TEXT_COLUMNS:
+            columns[name] = np.array(values, dtype=object)
+        else:
+            columns[name] = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    return metadata, _BenchmarkColumns(columns, len(records))
+
+
+def selectRows(columns, mask):
+    """
+    Returns the rows of the columns which are selected by the mask.
+    """
+    return _BenchmarkColumns({name: column[mask] for name, column in columns.items()}, int(np.count_nonzero(mask)))
+
+
+def analyseBenchmark(path, strata=()):
+    """
+    Aggregates a benchmark file and returns its metadata and the metrics of each alpha (and value of the given strata
+    columns, e.g. 'Distance Stratum'). Only queries which were answered successfully for all alpha values are used, the
+    meat durations of smaller alpha values are used as reference for the alpha differences. The metrics additionally
+    contain the percentiles of the latencies, the throughput (queries per second) and the failed requests of the group.
+    Groups whose requests all failed only contain the failed requests.
+    """
+    metadata, columns = loadBenchmarkFile(path)
+    alphas = metadata['settings']['alphas']
+    queryIds = columns['Query Id']
+    # a query of a load replay is sent to each endpoint, so a failed request only excludes the query of its endpoint
+    if 'Endpoint' in columns:
+        requestKeys = np.array([str(int(queryId)) + ' ' + str(endpoint) for queryId, endpoint in zip(queryIds, columns['Endpoint'])])
+    else:
+        requestKeys = queryIds
+    failedRequestKeys = np.unique(requestKeys[columns['Success'] == 0])
+    successful = ~np.isin(requestKeys, failedRequestKeys)
+    groups = [()]
+    for stratum in strata:
+        groups = [group + (value,) for group in groups for value in sorted(set(columns[stratum]))]
+    results = {}
+    for group in groups:
+        groupMask = np.ones(len(queryIds), dtype=bool)
+        for stratum, value in zip(strata, group):
+            groupMask &= columns[stratum] == value
+        referenceMeatDurations = {}
+        for alpha in sorted(alphas):
+            alphaMask = groupMask & (columns['Alpha'] == alpha)
+            # failed requests of the group (e.g. http errors and timeouts of a load replay)
+            errors = int(np.count_nonzero(alphaMask & (columns['Success'] == 0)))
+            errorRate = divide(errors, int(np.count_nonzero(alphaMask)))
+            rows = selectRows(columns, alphaMask & successful)
+            if rows.numberOfRows == 0:
+                if errors > 0:
+                    results[(alpha,) + group] = {'resultcounter': 0, 'errors': errors, 'errorRate': errorRate}
+                continue
+            # reference alpha values which were not benchmarked have no differences
+            references = {referenceAlpha: referenceMeatDurations.get(referenceAlpha, np.full(rows.numberOfRows, np.nan))
+                          for referenceAlpha in range(1, alpha)}
+            aggregate = aggregateResults(rows, references)
+            metrics = computeMetrics(aggregate, alpha)
+            metrics['latencyPercentiles'] = np.percentile(rows['Latency'], PERCENTILES).tolist()
+            # the queries of an alpha value are answered one after another, so their time span is used for the throughput
+            duration = np.max(rows['Completed At']) - np.min(rows['Completed At'] - rows['Latency'])
+            metrics['throughput'] = divide(rows.numberOfRows * 1000, duration)
+            metrics['errors'] = errors
+            metrics['errorRate'] = errorRate
+            results[(alpha,) + group] = metrics
+            referenceMeatDurations[alpha] = meatDurations(rows)
+    return metadata, results
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the result files of a baseline and a candidate build of the backend.
+
+The requests of both runs are joined on (Source Stop, Target Stop, Source Time, Source Date). For each phase the
+speedup (baseline duration / candidate duration) of the joined requests is reported with a bootstrap confidence
+interval. Requests with a different MEAT, Raptor MEAT TO ExpAT or CSA ExpAT are reported as answer regressions.
+
+Exit codes: 0 if the candidate passes, 1 if a gated phase is slower than the threshold, 2 if answers changed.
+"""
+
+import argparse
+import os
+import sys
+import numpy as np
+from analysis import DM_VALUES, ALPHA_VALUES, NUMBER_OF_FILES, REQUEST_COLUMNS, loadResultFile, resultFileName, concatColumns
+
+# duration columns of the phases and their labels in the report
+PHASES = [
+    ('Raptor MEAT Complete', 'raptor meat complete'),
+    ('Raptor MEAT Init', 'raptor meat init'),
+    ('Raptor MEAT Algorithm', 'raptor meat algorithm'),
+    ('Raptor MEAT Init Loop', 'raptor meat init loop'),
+    ('Raptor MEAT Traverse Routes Loop', 'raptor meat traverse routes loop'),
+    ('Raptor MEAT Update Loop', 'raptor meat update loop'),
+    ('Raptor MEAT Decision Graph', 'raptor meat decision graph'),
+    ('Raptor MEAT TO Complete', 'raptor meat to complete'),
+    ('Raptor MEAT TO Init', 'raptor meat to init'),
+    ('Raptor MEAT TO Algorithm', 'raptor meat to algorithm'),
+    ('Raptor MEAT TO Decision Graph', 'raptor meat to decision graph'),
+    ('CSA MEAT Complete', 'csa meat complete'),
+    ('CSA MEAT Init', 'csa meat init'),
+    ('CSA MEAT Algorithm', 'csa meat algorithm'),
+    ('CSA MEAT Decision Graph', 'csa meat decision graph'),
+    ('CSA ExpAT Complete', 'csa expat complete'),
+    ('CSA ExpAT Init', 'csa expat init'),
+    ('CSA ExpAT Algorithm', 'csa expat algorithm'),
+    ('CSA ExpAT Decision Graph', 'csa expat decision graph'),
+]
+# phases which are checked against the slowdown threshold by default
+GATED_PHASES = ['Raptor MEAT Complete', 'Raptor MEAT TO Complete', 'CSA MEAT Complete', 'CSA ExpAT Complete']
+# result columns which must not change between the builds
+ANSWER_COLUMNS = ['MEAT', 'Raptor MEAT TO ExpAT', 'CSA ExpAT']
+
+
+def loadRun(directory, dm, alpha, numberOfFiles):
+    """
+    Loads the result files of a (dm, alpha) combination from the directory of a run.
+    """
+    tables = [loadResultFile(os.path.join(directory, resultFileName(dm, alpha, i))) for i in range(numberOfFiles)]
+    return concatColumns(tables)
+
+
+def requestKeys(columns):
+    return list(zip(*[columns[name].tolist() for name in REQUEST_COLUMNS]))
+
+
+def joinRuns(baseline, candidate):
+    """
+    Returns the row indices of the requests which are contained in both runs (first occurrence of each request).
+    """
+    baselineRows = {}
+    for row, key in enumerate(requestKeys(baseline)):
+        baselineRows.setdefault(key, row)
+    baselineIndices = []
+    candidateIndices = []
+    joinedKeys = set()
+    for row, key in enumerate(requestKeys(candidate)):
+        if key in baselineRows and key not in joinedKeys:
+            joinedKeys.add(key)
+            baselineIndices.append(baselineRows[key])
+            candidateIndices.append(row)
+    return np.array(baselineIndices, dtype=np.int64), np.array(candidateIndices, dtype=np.int64)
+
+
+def bootstrapSpeedups(baselineDurations, candidateDurations, numberOfSamples, confidence, rng):
+    """
+    Calculates the speedup (sum of baseline durations / sum of candidate durations) of each phase (row of the duration
+    matrices) and the bootstrap confidence interval over the joined requests.
+    """
+    baselineSums = np.sum(baselineDurations, axis=1)
+    candidateSums = np.sum(candidateDurations, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speedups = baselineSums/candidateSums
+    numberOfRequests = baselineDurations.shape[1]
+    samples = np.empty((numberOfSamples, baselineDurations.shape[0]))
+    for i in range(numberOfSamples):
+        indices = rng.integers(0, numberOfRequests, numberOfRequests)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            samples[i] = np.sum(baselineDurations[:, indices], axis=1)/np.sum(candidateDurations[:, indices], axis=1)
+    tail = (1 - confidence)/2 * 100
+    lower = np.nanpercentile(samples, tail, axis=0)
+    upper = np.nanpercentile(samples, 100 - tail, axis=0)
+    return speedups, lower, upper
+
+
+def answerRegressions(baseline, candidate, tolerance):
+    """
+    Returns the number of joined requests with a changed and with a worse (later) result of each answer column.
+    """
+    regressions = {}
+    for name in ANSWER_COLUMNS:
+        difference = candidate[name] - baseline[name]
+        regressions[name] = (int(np.sum(np.abs(difference) > tolerance)), int(np.sum(difference > tolerance)))
+    return regressions
+
+
+def compareRuns(baselineDirectory, candidateDirectory, dm, alpha, numberOfFiles, numberOfSamples, confidence, tolerance, rng):
+    """
+    Joins the runs of a (dm, alpha) combination and returns the speedups of the phases and the answer regressions.
+    """
+    baseline = loadRun(baselineDirectory, dm, alpha, numberOfFiles)
+    candidate = loadRun(candidateDirectory, dm, alpha, numberOfFiles)
+    baselineIndices, candidateIndices = joinRuns(baseline, candidate)
+    joinedBaseline = {name: values[baselineIndices] for name, values in baseline.items()}
+    joinedCandidate = {name: values[candidateIndices] for name, values in candidate.items()}
+    phases = [name for name, _ in PHASES if name in joinedBaseline and name in joinedCandidate]
+    comparison = {
+        'baselineRequests': len(baseline['Source Time']),
+        'candidateRequests': len(candidate['Source Time']),
+        'joinedRequests': len(baselineIndices),
+        'speedups': {},
+        'regressions': {},
+    }
+    if len(baselineIndices) == 0:
+        return comparison
+    baselineDurations = np.array([joinedBaseline[name] for name in phases])
+    candidateDurations = np.array([joinedCandidate[name] for name in phases])
+    speedups, lower, upper = bootstrapSpeedups(baselineDurations, candidateDurations, numberOfSamples, confidence, rng)
+    for i, name in enumerate(phases):
+        comparison['speedups'][name] = (float(speedups[i]), float(lower[i]), float(upper[i]))
+    comparison['regressions'] = answerRegressions(joinedBaseline, joinedCandidate, tolerance)
+    return comparison
+
+
+def parseArguments(arguments):
+    parser = argparse.ArgumentParser(description='Compares the result files of a baseline and a candidate build.')
+    parser.add_argument('baseline', help='directory with the result files of the baseline build')
+    parser.add_argument('candidate', help='directory with the result files of the candidate build')
+    parser.add_argument('--dm', type=int, nargs='+', default=list(DM_VALUES), help='delay models')
+    parser.add_argument('--alpha', type=int, nargs='+', default=list(ALPHA_VALUES), help='alpha values')
+    parser.add_argument('--files', type=int, default=NUMBER_OF_FILES, help='number of result files per combination')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='maximal relative slowdown of a gated phase (0.1 = candidate is 10%% slower)')
+    parser.add_argument('--all-phases', dest='allPhases', action='store_true',
+                        help='checks all phases against the threshold instead of the complete durations')
+    parser.add_argument('--samples', type=int, default=1000, help='number of bootstrap samples')
+    parser.add_argument('--confidence', type=float, default=0.95, help='confidence level of the intervals')
+    parser.add_argument('--tolerance', type=float, default=0.0,
+                        help='maximal difference of the answers which is not reported as regression')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the bootstrap samples')
+    return parser.parse_args(arguments)
+
+
+def main(arguments):
+    args = parseArguments(arguments)
+    rng = np.random.default_rng(args.seed)
+    gatedPhases = [name for name, _ in PHASES] if args.allPhases else GATED_PHASES
+    slowPhases = []
+    changedAnswers = []
+    for dm in args.dm:
+        for alpha in args.alpha:
+            comparison = compareRuns(args.baseline, args.candidate, dm, alpha, args.files, args.samples,
+                                     args.confidence, args.tolerance, rng)
+            print('')
+            print('dm: ', dm, ' alpha: ', alpha)
+            print('baseline requests:', comparison['baselineRequests'], ' candidate requests:',
+                  comparison['candidateRequests'], ' joined requests:', comparison['joinedRequests'])
+            print('')
+            print('speedups (baseline/candidate) with ' + str(args.confidence * 100) + '% confidence interval:')
+            for name, label in PHASES:
+                if name not in comparison['speedups']:
+                    continue
+                speedup, lower, upper = comparison['speedups'][name]
+                slowdown = 1/speedup - 1 if speedup > 0 else np.inf
+                exceeded = name in gatedPhases and slowdown > args.threshold
+                if exceeded:
+                    slowPhases.append((dm, alpha, label))
+                print(label + ':', speedup, [lower, upper], 'SLOWDOWN' if exceeded else '')
+            print('')
+            print('answer regressions (changed, worse):')
+            for name, (changed, worse) in comparison['regressions'].items():
+                if changed > 0:
+                    changedAnswers.append((dm, alpha, name))
+                print(name + ':', changed, worse)
+    print('')
+    if changedAnswers:
+        print('changed answers:', changedAnswers)
+    if slowPhases:
+        print('phases above the slowdown threshold:', slowPhases)
+    if changedAnswers:
+        return 2
+    if slowPhases:
+        return 1
+    print('no regressions')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
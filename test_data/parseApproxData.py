@@ -5,39 +5,25 @@ Created on Sun Dec 12 13:06:40 2021
 @author: Jurek
 """
 
-import csv
+from analysis import DM_VALUES, ALPHA_VALUES, analyseApproxResults
 
-for dm in range(1, 3):
-    print('')
-    print('dm: ', dm)
-    
-    for alpha in range(1, 4):
-        print('')
-        print('alpha: ', alpha)
+
+def printReport(results):
+    for dm in DM_VALUES:
         print('')
+        print('dm: ', dm)
         
-        sumApproxMeatAbsDiff = 0
-        
-        sumMeat = 0
-        
-        resultCounter = 0
-        
-        for i in range(0, 20):
-            path = 'approx_dm' + str(dm) + '_alpha' + str(alpha) + 'v' + str(i) + '.csv'
-            with open(path) as csvdatei:
-                csv_reader_object = csv.DictReader(csvdatei, delimiter=',')
-                for row in csv_reader_object:
-                    currentSourceTime = float(row['Source Time'])
-                    currentMeatDuration = float(row['MEAT']) - currentSourceTime
-                    sumMeat += currentMeatDuration
-                    
-                    absDiff = abs(float(row['MEAT']) - float(row['Approximated MEAT']))
-                    sumApproxMeatAbsDiff += absDiff
-                    
-                    resultCounter += 1
-        
-        averageApproxMeatAbsDiff = sumApproxMeatAbsDiff/resultCounter
-        averageApproxMeatRelDiff = sumApproxMeatAbsDiff/sumMeat
-        
-        print('average approx meat absolute difference:', averageApproxMeatAbsDiff)
-        print('average approx meat relative difference:', averageApproxMeatRelDiff)
\ No newline at end of file
+        for alpha in ALPHA_VALUES:
+            print('')
+            print('alpha: ', alpha)
+            print('')
+            
+            metrics = results[(dm, alpha)]
+            
+            print('average approx meat absolute difference:', metrics['averageApproxMeatAbsDiff'])
+            print('average approx meat relative difference:', metrics['averageApproxMeatRelDiff'])
+
+
+if __name__ == '__main__':
+    # the files are aggregated by a process pool, the guard prevents the workers from running the script
+    printReport(analyseApproxResults())
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Prints the report of a result file of the benchmark runner (npm run benchmark).
+
+The records of a load replay (python replayLoad.py) are read in the same way.
+
+usage: python parseBenchmark.py [file] [strata columns, e.g. 'Distance Stratum' or 'Endpoint']
+"""
+
+import sys
+from analysis import PERCENTILES, DURATION_QUANTITIES, analyseBenchmark
+
+
+def printMetadata(metadata):
+    if 'replay' in metadata:
+        replay = metadata['replay']
+        print('replay of:', ', '.join(replay['files']), '(' + str(replay['numberOfRequests']) + ' requests)')
+        print('server:', replay['server'])
+        if replay['rate'] is not None:
+            print('rate (requests per second):', replay['rate'])
+        else:
+            print('concurrency:', replay['concurrency'])
+        return
+    build = metadata['build']
+    feed = metadata['feed']
+    querySet = metadata['querySet']
+    settings = metadata['settings']
+    print('commit:', build['commit'], '(' + str(build['version']) + ', node ' + build['node'] + ')')
+    print('cpu:', build['cpu'], '(' + str(build['numberOfCpus']) + ' cpus)')
+    print('feed:', feed['checksum'], '(' + str(feed['numberOfConnections']) + ' connections)')
+    print('query set:', querySet['name'], 'v' + str(querySet['version']), '(' + str(querySet['numberOfQueries']) + ' queries, seed ' + str(querySet['seed']) + ')')
+    print('algorithms:', ', '.join(settings['algorithms']))
+    print('warmup:', settings['warmup'], 'concurrency:', settings['concurrency'])
+
+
+def printReport(results, strata):
+    for key, metrics in results.items():
+        print('')
+        print('alpha: ', key[0])
+        for stratum, value in zip(strata, key[1:]):
+            print(stratum.lower() + ': ', value)
+        print('')
+        print('requests:', metrics['resultcounter'])
+        print('errors:', metrics['errors'], '(rate ' + str(metrics['errorRate']) + ')')
+        # all requests of the group failed
+        if metrics['resultcounter'] == 0:
+            continue
+        print('throughput (queries per second):', metrics['throughput'])
+        print('latency percentiles (p' + ', p'.join(str(percentile) for percentile in PERCENTILES) + '):', metrics['latencyPercentiles'])
+        print('average meat:', metrics['averageMeat'])
+        print('duration percentiles (p' + ', p'.join(str(percentile) for percentile in PERCENTILES) + '):')
+        for name, label in DURATION_QUANTITIES:
+            print(label + ':', metrics['durationPercentiles'][name])
+
+
+if __name__ == '__main__':
+    fileName = sys.argv[1] if len(sys.argv) > 1 else 'benchmark_default.ndjson'
+    strata = tuple(sys.argv[2:])
+    metadata, results = analyseBenchmark(fileName, strata)
+    printMetadata(metadata)
+    printReport(results, strata)
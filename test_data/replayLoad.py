@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+Replays the requests of result files against a running server (npm run start) and records the latency of each
+request. The requests are read from the columns Source Stop, Target Stop, Source Time and Source Date and sent to
+each chosen endpoint, either at a fixed rate (open loop) or by a fixed number of concurrent clients (closed loop).
+
+The records are written to an ndjson file with the schema of the benchmark runner. The endpoint is stored in the
+column 'Endpoint', so the report is printed per endpoint by: python parseBenchmark.py replay.ndjson Endpoint
+
+usage: python replayLoad.py [result files] [--rate=10 | --concurrency=4] [--endpoints=...] [--output=replay.ndjson]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import time
+import urllib.parse
+import numpy as np
+from analysis import REQUEST_COLUMNS, BENCHMARK_SCHEMA_VERSION, loadResultFile
+
+# endpoints which answer a single request with the query parameters sourceStop, targetStop, sourceTime and date
+ENDPOINTS = [
+    '/raptorAlgorithm/earliestArrivalTime',
+    '/raptorAlgorithm/minimumExpectedArrivalTime',
+    '/raptorAlgorithm/minimumExpectedArrivalTimeTransferOptimisation',
+    '/raptorAlgorithm/minimumExpectedArrivalTimeTransferLimitation',
+    '/connectionScanAlgorithm/earliestArrivalTime',
+    '/connectionScanAlgorithm/expectedArrivalTime',
+    '/connectionScanAlgorithm/minimumExpectedArrivalTime',
+]
+# alpha value of the server (ALPHA in src/constants.ts)
+DEFAULT_ALPHA = 2
+
+
+def loadRequests(paths, limit=None):
+    """
+    Reads the request columns of the result files and returns the requests as dicts. Requests are repeated if the
+    limit is larger than the number of rows.
+    """
+    requests = []
+    for path in paths:
+        columns = loadResultFile(path, REQUEST_COLUMNS)
+        for sourceStop, targetStop, sourceTime, sourceDate in zip(*(columns[name] for name in REQUEST_COLUMNS)):
+            requests.append({
+                'Source Stop': sourceStop,
+                'Target Stop': targetStop,
+                'Source Time': int(sourceTime),
+                'Source Date': sourceDate,
+            })
+    if limit is not None and len(requests) > 0:
+        requests = [requests[i % len(requests)] for i in range(limit)]
+    return requests
+
+
+def toIsoDate(sourceDate):
+    """
+    Converts a date of the result files (d.m.yyyy) to the date format of the query parameters (yyyy-mm-dd).
+    """
+    if '.' not in sourceDate:
+        return sourceDate
+    day, month, year = sourceDate.split('.')
+    return year + '-' + month.zfill(2) + '-' + day.zfill(2)
+
+
+def toTime(seconds):
+    """
+    Converts seconds to the time format of the query parameters (hh:mm:ss).
+    """
+    return '%02d:%02d:%02d' % (seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+def requestPath(endpoint, request):
+    """
+    Returns the path of the http request which answers the request with the endpoint.
+    """
+    return endpoint + '?' + urllib.parse.urlencode({
+        'sourceStop': request['Source Stop'],
+        'targetStop': request['Target Stop'],
+        'sourceTime': toTime(request['Source Time']),
+        'date': toIsoDate(request['Source Date']),
+    })
+
+
+class ConnectionPool:
+    """
+    Keep-alive connections to the server. A new connection is opened if no idle connection exists.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.idleConnections = []
+
+    async def get(self, path, timeout):
+        """
+        Sends a GET request and returns the status and the length of the body. Raises an error if the connection
+        fails or the response takes longer than the timeout (in seconds).
+        """
+        if self.idleConnections:
+            reader, writer = self.idleConnections.pop()
+        else:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), timeout)
+        try:
+            status, bodyLength, keepAlive = await asyncio.wait_for(self._send(reader, writer, path), timeout)
+        except BaseException:
+            writer.close()
+            raise
+        if keepAlive:
+            self.idleConnections.append((reader, writer))
+        else:
+            writer.close()
+        return status, bodyLength
+
+    async def _send(self, reader, writer, path):
+        writer.write(('GET ' + path + ' HTTP/1.1\r\nHost: ' + self.host + '\r\nConnection: keep-alive\r\n\r\n').encode('ascii'))
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip().lower()
+        bodyLength = 0
+        keepAlive = headers.get('connection') != 'close'
+        if headers.get('transfer-encoding') == 'chunked':
+            # large responses are written in chunks by the response writer of the server
+            while True:
+                chunkLength = int((await reader.readline()).split(b';')[0], 16)
+                await reader.readexactly(chunkLength + 2)
+                bodyLength += chunkLength
+                if chunkLength == 0:
+                    break
+        elif 'content-length' in headers:
+            bodyLength = int(headers['content-length'])
+            await reader.readexactly(bodyLength)
+        else:
+            bodyLength = len(await reader.read())
+            keepAlive = False
+        return status, bodyLength, keepAlive
+
+    def close(self):
+        for _, writer in self.idleConnections:
+            writer.close()
+        self.idleConnections = []
+
+
+async def replayTask(pool, task, scheduledTime, startTime, timeout, records):
+    """
+    Answers one task and appends its record. The latency is measured from the scheduled time, so requests which wait
+    for a client or connection include the waiting time.
+    """
+    queryId, alpha, endpoint, request = task
+    record = {'Query Id': queryId, 'Alpha': alpha, 'Endpoint': endpoint}
+    record.update(request)
+    try:
+        status, bodyLength = await pool.get(requestPath(endpoint, request), timeout)
+        record['Status'] = status
+        record['Response Bytes'] = bodyLength
+        record['Success'] = status == 200
+    except (OSError, ValueError, IndexError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        # connection errors and timeouts have no status
+        record['Status'] = None
+        record['Response Bytes'] = None
+        record['Success'] = False
+    completedTime = time.perf_counter()
+    record['Latency'] = (completedTime - scheduledTime) * 1000
+    record['Completed At'] = (completedTime - startTime) * 1000
+    records.append(record)
+
+
+async def replay(server, tasks, rate, concurrency, timeout):
+    """
+    Replays the tasks at the rate if it is set, otherwise with the number of concurrent clients, and returns the records.
+    """
+    pool = ConnectionPool(server.hostname, server.port or 80)
+    try:
+        if rate is not None:
+            return await replayAtRate(pool, tasks, rate, timeout)
+        return await replayWithConcurrency(pool, tasks, concurrency, timeout)
+    finally:
+        pool.close()
+
+
+async def replayAtRate(pool, tasks, rate, timeout):
+    """
+    Sends the tasks at a fixed rate (requests per second) without waiting for the previous responses (open loop).
+    """
+    records = []
+    startTime = time.perf_counter()
+    pending = []
+    for i, task in enumerate(tasks):
+        scheduledTime = startTime + i / rate
+        await asyncio.sleep(max(0, scheduledTime - time.perf_counter()))
+        pending.append(asyncio.ensure_future(replayTask(pool, task, scheduledTime, startTime, timeout, records)))
+    await asyncio.gather(*pending)
+    return records
+
+
+async def replayWithConcurrency(pool, tasks, concurrency, timeout):
+    """
+    Sends the tasks by a fixed number of clients which wait for their previous response (closed loop).
+    """
+    records = []
+    startTime = time.perf_counter()
+    queue = asyncio.Queue()
+    for task in tasks:
+        queue.put_nowait(task)
+
+    async def client():
+        while not queue.empty():
+            task = queue.get_nowait()
+            await replayTask(pool, task, time.perf_counter(), startTime, timeout, records)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return records
+
+
+def createTasks(requests, endpoints, alpha):
+    """
+    Creates a task for each request and endpoint. The endpoints of a request follow each other.
+    """
+    return [(queryId, alpha, endpoint, request) for queryId, request in enumerate(requests) for endpoint in endpoints]
+
+
+def writeRecords(output, metadata, records):
+    """
+    Writes the metadata and the records in the order of their completion.
+    """
+    with open(output, 'w', encoding='utf-8') as file:
+        file.write(json.dumps({'metadata': metadata}) + '\n')
+        for record in sorted(records, key=lambda record: record['Completed At']):
+            file.write(json.dumps(record) + '\n')
+
+
+def printSummary(records):
+    for endpoint in sorted(set(record['Endpoint'] for record in records)):
+        latencies = np.array([record['Latency'] for record in records if record['Endpoint'] == endpoint and record['Success']])
+        errors = sum(1 for record in records if record['Endpoint'] == endpoint and not record['Success'])
+        print(endpoint + ':', len(latencies), 'successful,', errors, 'errors, p50 latency:',
+              np.percentile(latencies, 50) if len(latencies) > 0 else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replays the requests of result files against a running server.')
+    parser.add_argument('files', nargs='+', help='result files whose request columns are replayed')
+    parser.add_argument('--server', default='http://localhost:1337', help='url of the server')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS), help='comma separated paths of the endpoints')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--rate', type=float, help='requests per second which are sent without waiting for responses')
+    mode.add_argument('--concurrency', type=int, default=1, help='number of clients which wait for their responses')
+    parser.add_argument('--limit', type=int, help='number of replayed requests (repeats the requests of the files)')
+    parser.add_argument('--timeout', type=float, default=60, help='timeout of a request in seconds')
+    parser.add_argument('--alpha', type=int, default=DEFAULT_ALPHA, help='alpha value of the server which is stored in the records')
+    parser.add_argument('--output', default='replay.ndjson', help='ndjson file of the records')
+    args = parser.parse_args()
+
+    server = urllib.parse.urlsplit(args.server)
+    endpoints = [endpoint for endpoint in args.endpoints.split(',') if endpoint]
+    requests = loadRequests(args.files, args.limit)
+    tasks = createTasks(requests, endpoints, args.alpha)
+    metadata = {
+        'schemaVersion': BENCHMARK_SCHEMA_VERSION,
+        'createdAt': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'replay': {
+            'server': args.server,
+            'files': args.files,
+            'endpoints': endpoints,
+            'rate': args.rate,
+            'concurrency': None if args.rate is not None else args.concurrency,
+            'timeout': args.timeout,
+            'numberOfRequests': len(requests),
+        },
+        'settings': {
+            'alphas': [args.alpha],
+        },
+    }
+
+    records = asyncio.run(replay(server, tasks, args.rate, args.concurrency, args.timeout))
+    writeRecords(args.output, metadata, records)
+    printSummary(records)
+    print('wrote', len(records), 'records to', args.output)
+
+
+if __name__ == '__main__':
+    main()